@@ -28,4 +28,19 @@ DAY_CACHE_TTL_SEC = 20  # day-column cache lifetime
 HEADER_MAX_COLS = 80
 ONCALL_MAX_COLS = 100
 ONCALL_MAX_ROWS = 1000
+RANGE_CACHE_MAX_BYTES = 64 * 1024 * 1024  # shared (all sessions) range cache budget
+RANGE_CACHE_TTL_SEC = 120  # picks up edits made directly in Google Sheets
+SHEETS_READS_PER_MIN = 60   # per-user Sheets API quota (service account)
+SHEETS_WRITES_PER_MIN = 60
+SHEETS_MAX_ADMIT_WAIT_SEC = 30  # after this a call goes out anyway and may 429
+SHEETS_IO_POOL_SIZE = 4  # worker threads for independent tab reads (1 = sequential)
+SHEETS_IO_TIMEOUT_SEC = 20  # per fan-out; slower tabs are dropped, not awaited
+SNAPSHOT_DISK_DIR = ".oa_cache"  # last workbook snapshot for cold starts ("" disables)
+SNAPSHOT_DISK_MAX_AGE_SEC = 24 * 3600  # older disk copies are ignored rather than served stale
+SNAPSHOT_VERIFY_WRITES = True  # re-read written columns in the background after patching the snapshot
+SNAPSHOT_FULL_RESYNC_SEC = 600  # whole-tab re-read even when probes of column A and the day columns match
+WS_REGISTRY_RECHECK_SEC = 120  # how often the tab list is re-listed to spot new/renamed tabs
+HOURS_LEDGER_RECONCILE_SEC = 300  # ledger weeks older than this are rebuilt from a fresh snapshot in the background
+APPROVAL_SYNC_SEC = 5  # approval mirror reads new rows and open rows' review columns at most this often
+APPROVAL_RESYNC_SEC = 300  # full approval queue reload (picks up rows deleted or reordered by hand)
 HOURS_DEBUG = True   # set False to silence debug prints
@@ -0,0 +1,122 @@
+"""Request-scoped memo and Sheets call tally for chat actions.
+
+One chat request (say an add) resolves the same tab titles, worksheet
+handles, grids, user schedule and weekly hours several times: the
+preflight, the capacity check, the write and the closing "now at Xh" line
+each ask again. ``action_context()`` opens an ``ActionContext`` for the
+request; readers wrap their lookups in ``action_memo`` so repeats within the
+request are dictionary hits, and every governed Sheets call is counted so
+``report()`` shows what the request cost.
+
+Committed writes call ``after_write()``: grids, schedules and hours are
+re-read after a write, titles and worksheet handles are kept. Outside a
+context ``action_memo`` just builds.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import threading
+import time as _pytime
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# memo kinds that a write cannot change
+_WRITE_STABLE = frozenset({"titles", "worksheet"})
+
+
+class ActionContext:
+    """Memo keyed by ``(kind, ...)`` tuples plus per-call Sheets counts."""
+
+    def __init__(self, label: str = ""):
+        self.label = str(label or "")
+        self.started = _pytime.monotonic()
+        self._lock = threading.Lock()
+        self._memo: Dict[Tuple[Hashable, ...], Any] = {}
+        self.calls: Dict[str, int] = {}
+        self.reads = 0
+        self.writes = 0
+        self.memo_hits = 0
+        self.memo_misses = 0
+
+    def memo(self, key: Tuple[Hashable, ...], build: Callable[[], T]) -> T:
+        with self._lock:
+            if key in self._memo:
+                self.memo_hits += 1
+                return self._memo[key]
+            self.memo_misses += 1
+        value = build()
+        with self._lock:
+            return self._memo.setdefault(key, value)
+
+    def forget(self, *kinds: str) -> None:
+        """Drop memo entries of ``kinds`` (all kinds if none given)."""
+        with self._lock:
+            if not kinds:
+                self._memo.clear()
+                return
+            for key in [k for k in self._memo if k[0] in kinds]:
+                del self._memo[key]
+
+    def after_write(self) -> None:
+        with self._lock:
+            for key in [k for k in self._memo if k[0] not in _WRITE_STABLE]:
+                del self._memo[key]
+
+    def count_call(self, kind: str, name: str) -> None:
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+            if kind == "write":
+                self.writes += 1
+            else:
+                self.reads += 1
+
+    def report(self) -> dict:
+        with self._lock:
+            return {
+                "label": self.label,
+                "elapsed_ms": round((_pytime.monotonic() - self.started) * 1000.0, 1),
+                "api_calls": self.reads + self.writes,
+                "reads": self.reads,
+                "writes": self.writes,
+                "by_call": dict(sorted(self.calls.items())),
+                "memo_hits": self.memo_hits,
+                "memo_misses": self.memo_misses,
+            }
+
+
+_current: contextvars.ContextVar[Optional[ActionContext]] = contextvars.ContextVar("action_context", default=None)
+
+
+@contextmanager
+def action_context(label: str = "") -> Iterator[ActionContext]:
+    """Open a context for one request; nested calls (change -> remove + add) share the outer one."""
+    outer = _current.get()
+    if outer is not None:
+        yield outer
+        return
+    ctx = ActionContext(label)
+    token = _current.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _current.reset(token)
+
+
+def current_action() -> Optional[ActionContext]:
+    return _current.get()
+
+
+def action_memo(key: Tuple[Hashable, ...], build: Callable[[], T]) -> T:
+    ctx = _current.get()
+    if ctx is None:
+        return build()
+    return ctx.memo(key, build)
+
+
+def after_write() -> None:
+    ctx = _current.get()
+    if ctx is not None:
+        ctx.after_write()
@@ -0,0 +1,37 @@
+"""Point-in-interval lookups by binary search.
+
+``IntervalIndex`` cuts the line at every interval endpoint once and stores,
+for each elementary segment, the items whose half-open interval covers it.
+"What is active at t" is then a single ``bisect`` instead of a scan over every
+interval, which is what "who is working now" style queries ask each minute.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Generic, Iterable, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class IntervalIndex(Generic[T]):
+    """Items with ``[start, end)`` intervals; ``at(point)`` keeps insertion order."""
+
+    def __init__(self, items: Iterable[Tuple[Any, Any, T]] = ()):
+        items = [(start, end, item) for start, end, item in items if start < end]
+        self._bounds: List[Any] = sorted({p for start, end, _item in items for p in (start, end)})
+        segments: List[List[T]] = [[] for _ in range(max(0, len(self._bounds) - 1))]
+        for start, end, item in items:
+            for i in range(bisect_left(self._bounds, start), bisect_left(self._bounds, end)):
+                segments[i].append(item)
+        self._segments: List[Tuple[T, ...]] = [tuple(seg) for seg in segments]
+        self._size = len(items)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def at(self, point: Any) -> Tuple[T, ...]:
+        i = bisect_right(self._bounds, point) - 1
+        if 0 <= i < len(self._segments):
+            return self._segments[i]
+        return ()
@@ -0,0 +1,125 @@
+"""Lane occupancy bitmaps for schedule tabs.
+
+A UNH/MC tab is a ladder of half-hour slots, each followed by a few lane rows,
+repeated across day columns. ``Occupancy`` holds that as a boolean array
+``filled[col, slot, lane]`` next to the lane rows themselves, so per-slot fill
+counts, open slots and "first lane that stays free for n slots" are array
+operations instead of Python loops over rows and lanes. Cell text is only
+classified once, when the bitmap is built.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class Occupancy:
+    """``filled[i, slot, lane]`` for ``cols[i]``; ``rows[slot, lane]`` is the sheet row (-1 = no such lane)."""
+
+    def __init__(self, filled: np.ndarray, rows: np.ndarray, cols: Sequence[int]):
+        self.filled = filled
+        self.rows = rows
+        self.present = rows >= 0
+        self.cols = tuple(cols)
+        self._col_pos: Dict[int, int] = {c: i for i, c in enumerate(self.cols)}
+
+    @classmethod
+    def from_lane_rows(
+        cls,
+        lane_rows: Sequence[Iterable[int]],
+        cols: Iterable[int],
+        value: Callable[[int, int], Any],
+        blank: Callable[[Any], bool],
+    ) -> "Occupancy":
+        """Classify ``value(row, col)`` for every lane row of every slot in ``cols``."""
+        cols = tuple(cols)
+        lane_rows = [list(rows) for rows in lane_rows]
+        lanes = max((len(rows) for rows in lane_rows), default=0)
+        rows = np.full((len(lane_rows), lanes), -1, dtype=np.int32)
+        filled = np.zeros((len(cols), len(lane_rows), lanes), dtype=bool)
+        for s, slot_rows in enumerate(lane_rows):
+            rows[s, : len(slot_rows)] = slot_rows
+            for lane, r in enumerate(slot_rows):
+                for i, c in enumerate(cols):
+                    filled[i, s, lane] = not blank(value(r, c))
+        return cls(filled, rows, cols)
+
+    @property
+    def slots(self) -> int:
+        return self.rows.shape[0]
+
+    @property
+    def lanes(self) -> int:
+        return self.rows.shape[1]
+
+    def column(self, col: int) -> np.ndarray:
+        """(slots, lanes) filled flags of ``col`` (all empty if the column was not classified)."""
+        pos = self._col_pos.get(col)
+        if pos is None:
+            return np.zeros(self.rows.shape, dtype=bool)
+        return self.filled[pos]
+
+    def open_lanes(self, col: int, lane_mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """(slots, lanes): the lane exists, is allowed by ``lane_mask`` and is empty in ``col``."""
+        out = self.present & ~self.column(col)
+        if lane_mask is not None:
+            out &= lane_mask
+        return out
+
+    def fill_counts(self, col: int) -> np.ndarray:
+        """Filled lanes per slot in ``col``."""
+        return (self.column(col) & self.present).sum(axis=1)
+
+    def open_slots(self, lane_mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """(cols, slots): at least one allowed lane is empty."""
+        out = self.present & ~self.filled
+        if lane_mask is not None:
+            out &= lane_mask
+        return out.any(axis=2)
+
+    def used_lanes(self, cols: Iterable[int]) -> np.ndarray:
+        """(slots, lanes): the lane is filled in any of ``cols``."""
+        picked = [self._col_pos[c] for c in cols if c in self._col_pos]
+        if not picked:
+            return np.zeros(self.rows.shape, dtype=bool)
+        return self.filled[picked].any(axis=0) & self.present
+
+
+def window_open(open_lanes: np.ndarray, need: int) -> np.ndarray:
+    """(slots - need + 1, lanes): the lane is open in all ``need`` slots starting at each slot."""
+    slots, lanes = open_lanes.shape
+    if need <= 0 or need > slots:
+        return np.zeros((0, lanes), dtype=bool)
+    closed = np.zeros((slots + 1, lanes), dtype=np.int32)
+    np.cumsum(~open_lanes, axis=0, out=closed[1:])
+    return (closed[need:] - closed[:-need]) == 0
+
+
+def free_runs(free: np.ndarray, joined: np.ndarray, need: int) -> np.ndarray:
+    """(rows, slots - need + 1): ``need`` free slots start at each slot with no gap between them.
+
+    ``free`` is (rows, slots); ``joined[s]`` says slot ``s + 1`` starts where slot ``s`` ends.
+    """
+    rows, slots = free.shape
+    if need <= 0 or need > slots:
+        return np.zeros((rows, 0), dtype=bool)
+    free_sum = np.zeros((rows, slots + 1), dtype=np.int32)
+    np.cumsum(free, axis=1, out=free_sum[:, 1:])
+    join_sum = np.zeros(slots, dtype=np.int32)
+    np.cumsum(joined, out=join_sum[1:])
+    full = (free_sum[:, need:] - free_sum[:, :-need]) == need
+    unbroken = (join_sum[need - 1 :] - join_sum[: slots - need + 1]) == need - 1
+    return full & unbroken
+
+
+def first_open_window(open_lanes: np.ndarray, need: int, start: int = 0) -> Optional[Tuple[int, int]]:
+    """``(slot, lane)`` of the first window at or after ``start``, wrapping to earlier slots."""
+    ok = window_open(open_lanes, need)
+    hits = np.flatnonzero(ok.any(axis=1))
+    if not hits.size:
+        return None
+    later = hits[hits >= start]
+    slot = int(later[0] if later.size else hits[0])
+    return slot, int(np.argmax(ok[slot]))
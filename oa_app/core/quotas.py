@@ -3,46 +3,74 @@ import gspread
 import streamlit as st
 import gspread.utils as a1
 
+from ..integrations.gspread_io import governed, sheets_governor
+from .range_cache import MISS, shared_range_cache, single_flight
+
 
 def _ws_id(ws) -> str:
     return str(getattr(ws, "id", ws.title))
 
 
+def _ss_id(ws) -> str:
+    sid = getattr(ws, "spreadsheet_id", None)
+    if sid is None:
+        sid = getattr(getattr(ws, "spreadsheet", None), "id", "")
+    return str(sid or "")
+
+
 def _get_ws_version_map():
     return st.session_state.setdefault("WS_VER", {})
 
 
-def bump_ws_version(ws) -> None:
-    """Call after any worksheet write/format to invalidate cached reads."""
+def bump_ws_version(ws, *, columns=None) -> None:
+    """Call after any worksheet write/format to invalidate cached reads.
+
+    ``columns`` (0-based, optional) lets snapshot refreshes re-read only those columns.
+    """
     ver = _get_ws_version_map()
     wid = _ws_id(ws)
     newv = int(ver.get(wid, 0)) + 1
     ver[wid] = newv
+    title = ""
     try:
         title = str(getattr(ws, "title", "") or "").strip()
         if title:
             ver[title] = newv
     except Exception:
         pass
+    try:
+        shared_range_cache().bump(_ss_id(ws), wid, title, columns=columns)
+    except Exception:
+        pass
 
 
-def _safe_batch_get(ws, ranges, *, retries: int = 4, backoff: float = 0.7):
-    # self-initialize cache dict
-    cache = st.session_state.setdefault("WS_RANGE_CACHE", {})
-    key = (getattr(ws, "id", ws.title), tuple(ranges))
-    if key in cache:
-        return cache[key]
+def range_cache_stats() -> dict:
+    return {**shared_range_cache().stats(), "single_flight": single_flight().stats()}
+
+
+def _batch_get_with_retry(ws, ranges, retries: int, backoff: float):
     for i in range(retries):
         try:
-            vals = ws.batch_get(ranges, major_dimension="ROWS")
-            cache[key] = vals
-            return vals
+            return governed(ws.batch_get, ranges, major_dimension="ROWS")
         except Exception as e:
             if "429" in str(e) or "Quota exceeded" in str(e):
-                _pytime.sleep(backoff * (2 ** i)); continue
+                sheets_governor().penalize(backoff * (2 ** i)); continue
             raise
-    vals = ws.batch_get(ranges, major_dimension="ROWS")
-    cache[key] = vals
+    return governed(ws.batch_get, ranges, major_dimension="ROWS")
+
+
+def _safe_batch_get(ws, ranges, *, retries: int = 4, backoff: float = 0.7):
+    cache = shared_range_cache()
+    ss_id, wid, key = _ss_id(ws), _ws_id(ws), tuple(ranges)
+    vals = cache.get(ss_id, wid, key)
+    if vals is not MISS:
+        return vals
+    version = cache.version(ss_id, wid)
+    vals = single_flight().do(
+        ("batch_get", ss_id, wid, key, version),
+        lambda: _batch_get_with_retry(ws, ranges, retries, backoff),
+    )
+    cache.put(ss_id, wid, key, vals, version=version)
     return vals
 
 def read_cols_exact(ws, start_row: int, end_row: int, col_indices: list[int]) -> dict[int, list[str]]:
@@ -0,0 +1,203 @@
+"""Process-wide cache for Sheets range reads.
+
+One instance (via ``st.cache_resource``) is shared by every browser session.
+Entries are keyed by (spreadsheet id, sheet key, ranges) and carry the sheet's
+version at fetch time; ``bump`` makes older entries unreachable. The cache is
+LRU-evicted under ``RANGE_CACHE_MAX_BYTES``.
+
+``SingleFlight`` sits in front of the actual fetches: concurrent misses for the
+same key wait on the first caller's future instead of issuing their own read.
+"""
+
+from __future__ import annotations
+
+import threading
+import time as _pytime
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable, Iterable, TypeVar
+
+import streamlit as st
+
+from .. import config as _config
+
+try:
+    _MAX_BYTES = int(getattr(_config, "RANGE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+except Exception:
+    _MAX_BYTES = 64 * 1024 * 1024
+
+try:
+    _TTL_SEC = float(getattr(_config, "RANGE_CACHE_TTL_SEC", 120))
+except Exception:
+    _TTL_SEC = 120.0
+
+MISS = object()
+_COLUMN_LOG_DEPTH = 64
+T = TypeVar("T")
+
+
+def approx_nbytes(value: Any) -> int:
+    """Cheap size estimate for nested lists of cell strings."""
+    if isinstance(value, str):
+        return 49 + len(value)
+    if isinstance(value, (list, tuple)):
+        return 56 + 8 * len(value) + sum(approx_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return 64 + sum(approx_nbytes(k) + approx_nbytes(v) for k, v in value.items())
+    return 32
+
+
+class SharedRangeCache:
+    def __init__(self, max_bytes: int = _MAX_BYTES, ttl_sec: float = _TTL_SEC):
+        self.max_bytes = int(max_bytes)
+        self.ttl_sec = float(ttl_sec)
+        self._lock = threading.Lock()
+        # key -> (version, stored_at, nbytes, value)
+        self._entries: "OrderedDict[tuple, tuple[int, float, int, Any]]" = OrderedDict()
+        self._versions: dict[tuple[str, str], int] = {}
+        # (ss_id, sheet_key) -> {version: 0-based columns written by that bump, or None if unknown}
+        self._column_log: dict[tuple[str, str], dict[int, frozenset[int] | None]] = {}
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ─────── versions ───────
+    def version(self, ss_id: str, sheet_key: Hashable) -> int:
+        with self._lock:
+            return self._versions.get((str(ss_id), str(sheet_key)), 0)
+
+    def bump(self, ss_id: str, *sheet_keys: Hashable, columns: Iterable[int] | None = None) -> None:
+        """New version for each key; ``columns`` (0-based) says which columns the write touched."""
+        cols = frozenset(int(c) for c in columns) if columns is not None else None
+        with self._lock:
+            for sk in sheet_keys:
+                if sk is None or str(sk) == "":
+                    continue
+                vk = (str(ss_id), str(sk))
+                newv = self._versions.get(vk, 0) + 1
+                self._versions[vk] = newv
+                log = self._column_log.setdefault(vk, {})
+                log[newv] = cols
+                if len(log) > _COLUMN_LOG_DEPTH:
+                    del log[min(log)]
+
+    def columns_changed_since(self, ss_id: str, sheet_key: Hashable, version: int) -> frozenset[int] | None:
+        """Columns written after ``version``; None when any bump in between did not say."""
+        vk = (str(ss_id), str(sheet_key))
+        with self._lock:
+            current = self._versions.get(vk, 0)
+            log = self._column_log.get(vk, {})
+            out: set[int] = set()
+            for v in range(int(version) + 1, current + 1):
+                cols = log.get(v)
+                if cols is None:
+                    return None
+                out |= cols
+            return frozenset(out)
+
+    # ─────── entries ───────
+    def get(self, ss_id: str, sheet_key: Hashable, ranges: Hashable) -> Any:
+        key = (str(ss_id), str(sheet_key), ranges)
+        now = _pytime.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            current = self._versions.get((str(ss_id), str(sheet_key)), 0)
+            if entry is None:
+                self.misses += 1
+                return MISS
+            version, stored_at, nbytes, value = entry
+            if version != current or (self.ttl_sec > 0 and now - stored_at > self.ttl_sec):
+                self._drop(key)
+                self.misses += 1
+                return MISS
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, ss_id: str, sheet_key: Hashable, ranges: Hashable, value: Any, *, version: int | None = None) -> None:
+        """Store ``value``; pass the ``version`` read before fetching so a racing bump wins."""
+        key = (str(ss_id), str(sheet_key), ranges)
+        nbytes = approx_nbytes(value)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if version is None:
+                version = self._versions.get((str(ss_id), str(sheet_key)), 0)
+            self._drop(key)
+            self._entries[key] = (int(version), _pytime.time(), nbytes, value)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes and self._entries:
+                old_key = next(iter(self._entries))
+                self._drop(old_key)
+                self.evictions += 1
+
+    def _drop(self, key) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[2]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
+
+
+@st.cache_resource(show_spinner=False)
+def shared_range_cache() -> SharedRangeCache:
+    return SharedRangeCache()
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: dict[Hashable, Future] = {}
+        self.calls = 0
+        self.saved = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run ``fn`` once per ``key`` at a time; concurrent callers share its result or error."""
+        with self._lock:
+            fut = self._inflight.get(key)
+            leader = fut is None
+            if leader:
+                fut = Future()
+                self._inflight[key] = fut
+                self.calls += 1
+            else:
+                self.saved += 1
+        if not leader:
+            return fut.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"calls": self.calls, "saved": self.saved, "in_flight": len(self._inflight)}
+
+
+@st.cache_resource(show_spinner=False)
+def single_flight() -> SingleFlight:
+    return SingleFlight()
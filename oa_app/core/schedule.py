@@ -3,15 +3,21 @@ import gspread
 from typing import Dict, List, Optional, Tuple
 from ..config import HEADER_MAX_COLS, DAY_CACHE_TTL_SEC, OA_PREFIX
 from .models import TimeBlock, SheetInfo
+from .occupancy import Occupancy, first_open_window
 from .quotas import first_row, read_cols_exact, read_day_column_map_cached, invalidate_day_cache
 from .utils import (
     normalize_day, fmt_time, is_time_token, time_slots,
 )
-import time as _pytime
+from ..integrations.gspread_io import retry_429
+from .ws_registry import worksheet_registry
 from .utils import canon_name_like_cell, fmt_time
 from .utils import matches_exact_oa_label
 from .quotas import read_day_column_map_cached, invalidate_day_cache
 
+def _lane_is_empty(v) -> bool:
+    v = str(v or "").strip()
+    return v == "" or v.lower() in {"oa:", "goa:"}
+
 class Schedule:
     def __init__(self, ss: gspread.Spreadsheet):
         self.ss = ss
@@ -20,15 +26,11 @@ class Schedule:
 
     def _load_ws_map(self):
         if self._ws_map is not None: return
-        for i in range(4):
-            try:
-                sheets = self.ss.worksheets(); break
-            except Exception as e:
-                if "429" in str(e) or "Quota exceeded" in str(e):
-                    _pytime.sleep(0.7 * (2 ** i)); continue
-                raise
+        registry = worksheet_registry(self.ss)
+        if registry is not None:
+            sheets = registry.worksheets()
         else:
-            sheets = self.ss.worksheets()
+            sheets = retry_429(self.ss.worksheets, retries=4, backoff=0.7)
         self._ws_map = {ws.title: ws for ws in sheets}
 
     def _build_header_map(self, header_row: list[str]) -> Dict[str,int]:
@@ -119,14 +121,14 @@ class Schedule:
     def _read_rows_from_map(self, row_map: Dict[int, str], rows: List[int]) -> List[str]:
         return [row_map.get(r, "") for r in rows]
 
+    def _open_lanes(self, day_col_map: Dict[int, str], blocks: List[TimeBlock]):
+        """(len(blocks), lanes) bitmap: the lane row exists and is empty in this day column."""
+        occ = Occupancy.from_lane_rows([b.lane_rows for b in blocks], [0], lambda r, _c: day_col_map.get(r, ""), _lane_is_empty)
+        return occ.open_lanes(0)
+
     def _find_empty_lane_index(self, day_col_map: Dict[int, str], blocks: List[TimeBlock]) -> Optional[int]:
-        lane_count = self._lane_count_for_blocks(blocks)
-        for lane_idx in range(lane_count):
-            rows = [b.lane_rows[lane_idx] for b in blocks]
-            vals = self._read_rows_from_map(day_col_map, rows)
-            if all(v.strip() == "" or v.strip().lower() in {"oa:", "goa:"} for v in vals):
-                return lane_idx
-        return None
+        hit = first_open_window(self._open_lanes(day_col_map, blocks), len(blocks))
+        return hit[1] if hit else None
 
     def _suggest_next_window(self, info: SheetInfo, col: int, day_col_map: Dict[int, str], start_from: time, needed_slots: int) -> Optional[Tuple[time, time]]:
         times = info.times_sorted
@@ -135,18 +137,11 @@ class Schedule:
             start_idx = next(i for i,t in enumerate(times) if (t.hour, t.minute) >= (start_from.hour, start_from.minute))
         except StopIteration:
             start_idx = 0
-        for j in range(start_idx, len(times) - needed_slots + 1):
-            blocks = [info.blocks_by_time[times[j+k]] for k in range(needed_slots)]
-            if self._find_empty_lane_index(day_col_map, blocks) is not None:
-                s = times[j]; e_dt = datetime.combine(date.today(), s) + timedelta(minutes=30*needed_slots)
-                return s, e_dt.time()
-        for j in range(0, start_idx):
-            if j + needed_slots <= len(times):
-                blocks = [info.blocks_by_time[times[j+k]] for k in range(needed_slots)]
-                if self._find_empty_lane_index(day_col_map, blocks) is not None:
-                    s = times[j]; e_dt = datetime.combine(date.today(), s) + timedelta(minutes=30*needed_slots)
-                    return s, e_dt.time()
-        return None
+        open_lanes = self._open_lanes(day_col_map, [info.blocks_by_time[t] for t in times])
+        hit = first_open_window(open_lanes, needed_slots, start=start_idx)
+        if hit is None: return None
+        s = times[hit[0]]; e_dt = datetime.combine(date.today(), s) + timedelta(minutes=30*needed_slots)
+        return s, e_dt.time()
 
     def _batch_write_cells(self, info: SheetInfo, col: int, rows: List[int], values: List[str]):
         data = []
@@ -0,0 +1,660 @@
+"""Workbook snapshot of the active schedule tabs.
+
+Fetches every active tab's grid in one ``values.batchGet`` and keeps the result
+per spreadsheet until one of those tabs is bumped via ``bump_ws_version``.
+Grids are also parked in the shared range cache so other sessions reuse them.
+Title resolution stays with the caller (see ``schedule_query.workbook_snapshot``).
+
+When a tab was bumped by our own ``WritePlan`` (which records the columns it
+wrote), the refresh re-reads just those columns and splices them into the
+previous grid; tabs whose version did not move are reused as is. A change we
+did not make (a bump without a column log, or TTL expiry picking up edits from
+other OAs or straight in Sheets) is found with a probe instead of a whole-tab
+read: column A and the tab's day columns (as ``services.tab_layout`` finds
+them) are read and fingerprinted, and only the columns whose fingerprint moved
+are spliced in. A changed column A, an unknown layout and
+``SNAPSHOT_FULL_RESYNC_SEC`` still re-read whole tabs.
+
+A committed ``WritePlan`` patches the newest snapshot in place of that re-read:
+the written cells are spliced into copies of the touched grids under the new
+tab versions (``patch_snapshot``), listeners carry derived indexes over, and a
+background read of the written columns verifies the patch. A mismatch bumps
+those columns again so the next load re-reads them.
+
+Each fetch is also written to a gzip'd JSON file under ``SNAPSHOT_DISK_DIR``.
+After a restart the disk copy is served stale-while-revalidate: the first
+render uses it while a background refresh fetches the live grids.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import gzip
+import json
+import os
+import threading
+import time as _pytime
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Callable, Iterable, Mapping, TypeVar
+
+import gspread.utils as a1
+import streamlit as st
+
+from .. import config as _config
+from ..config import ONCALL_MAX_COLS, ONCALL_MAX_ROWS
+from ..integrations.gspread_io import submit_background, with_backoff
+from .range_cache import MISS, shared_range_cache, single_flight
+
+_SESSION_KEY = "WB_SNAPSHOT"
+_SNAPSHOT_RANGE_TAG = "snapshot"
+_DISK_FORMAT = 1
+_REFRESH_WAIT_SEC = 30.0
+
+try:
+    _DISK_DIR = str(getattr(_config, "SNAPSHOT_DISK_DIR", ".oa_cache") or "")
+    _DISK_MAX_AGE_SEC = float(getattr(_config, "SNAPSHOT_DISK_MAX_AGE_SEC", 24 * 3600))
+except Exception:
+    _DISK_DIR, _DISK_MAX_AGE_SEC = ".oa_cache", 24 * 3600.0
+
+try:
+    _VERIFY_WRITES = bool(getattr(_config, "SNAPSHOT_VERIFY_WRITES", True))
+except Exception:
+    _VERIFY_WRITES = True
+
+try:
+    _FULL_RESYNC_SEC = float(getattr(_config, "SNAPSHOT_FULL_RESYNC_SEC", 600))
+except Exception:
+    _FULL_RESYNC_SEC = 600.0
+
+# ss_id -> in-flight background refresh started for a stale (disk) snapshot
+_refreshing: dict[str, Future] = {}
+_refresh_lock = threading.Lock()
+# ss_ids fetched live by this process; from then on the disk copy is never newer.
+_live_ids: set[str] = set()
+# ss_id -> newest live (non-stale) snapshot in this process; base for delta refreshes
+_last_live: dict[str, "WorkbookSnapshot"] = {}
+# fn(old_grid, new_grid, written_cells) for every grid replaced by patch_snapshot
+_patch_listeners: list[Callable[[list, list, frozenset], None]] = []
+# fn(grid) -> 0-based day columns of the tab's layout; what a refresh probe reads
+_day_column_finders: list[Callable[[list], Iterable[int]]] = []
+_need_fresh: contextvars.ContextVar[bool] = contextvars.ContextVar("snapshot_need_fresh", default=False)
+F = TypeVar("F", bound=Callable)
+
+
+def fresh_snapshots(fn: F) -> F:
+    """Decorator for write handlers: never decide a write from a stale disk snapshot."""
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        token = _need_fresh.set(True)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _need_fresh.reset(token)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def needs_fresh() -> bool:
+    """True inside a ``fresh_snapshots`` handler."""
+    return _need_fresh.get()
+
+
+def grid_a1_range() -> str:
+    """The fixed A1 window every schedule grid reader uses (e.g. ``A1:CV1000``)."""
+    end_col_letter = a1.rowcol_to_a1(1, ONCALL_MAX_COLS).split("1")[0]
+    return f"A1:{end_col_letter}{ONCALL_MAX_ROWS}"
+
+
+def _quoted(title: str) -> str:
+    return "'" + str(title).replace("'", "''") + "'"
+
+
+def _versions_for(ss_id: str, titles: Iterable[str]) -> tuple[tuple[str, int], ...]:
+    cache = shared_range_cache()
+    return tuple((t, cache.version(ss_id, t)) for t in titles)
+
+
+@dataclass(frozen=True)
+class WorkbookSnapshot:
+    ss_id: str
+    titles: tuple[str, ...]
+    grids: Mapping[str, list[list[str]]]
+    versions: tuple[tuple[str, int], ...]
+    fetched_at: float
+    stale: bool = False
+    resynced_at: float = 0.0  # last whole-tab read behind these grids
+    # title -> {col0: fingerprint}, filled lazily for the columns a probe compares
+    fingerprints: dict[str, dict[int, int]] = field(default_factory=dict, compare=False, repr=False)
+
+    def has(self, title: str) -> bool:
+        return title in self.grids
+
+    def grid(self, title: str) -> list[list[str]] | None:
+        """Rows for ``title`` (read-only, shared by every consumer) or None."""
+        return self.grids.get(title)
+
+    def column_fingerprint(self, title: str, col0: int) -> int:
+        per_tab = self.fingerprints.setdefault(title, {})
+        fp = per_tab.get(col0)
+        if fp is None:
+            grid = self.grids.get(title) or []
+            fp = per_tab[col0] = _column_fingerprint(row[col0] if col0 < len(row) else "" for row in grid)
+        return fp
+
+
+# ─────── Delta refresh ───────
+def _trimmed_column(values: Iterable[str]) -> list[str]:
+    vals = list(values)
+    while vals and not vals[-1]:
+        vals.pop()
+    return vals
+
+
+def _column_fingerprint(values: Iterable[str]) -> int:
+    return hash(tuple(_trimmed_column(values)))
+
+
+def day_column_finder(fn: Callable[[list], Iterable[int]]) -> Callable[[list], Iterable[int]]:
+    """Register ``fn(grid) -> day columns``; refresh probes read column A plus these."""
+    if fn not in _day_column_finders:
+        _day_column_finders.append(fn)
+    return fn
+
+
+def _probe_columns(grid: list[list[str]]) -> list[int] | None:
+    """Column A and the day columns of ``grid``, or None if no finder knows its layout."""
+    found: set[int] = set()
+    for fn in list(_day_column_finders):
+        try:
+            found.update(int(c) for c in fn(grid) or ())
+        except Exception:
+            continue
+    return sorted(found | {0}) if found else None
+
+
+def _col_letter(col0: int) -> str:
+    return a1.rowcol_to_a1(1, col0 + 1).rstrip("0123456789")
+
+
+def _splice_columns(grid: list[list[str]], columns: Mapping[int, list[str]]) -> list[list[str]]:
+    """Copy of ``grid`` with ``columns`` replaced, trimmed like a Sheets ROWS read."""
+    height = max([len(grid)] + [len(v) for v in columns.values()])
+    out: list[list[str]] = []
+    for r in range(height):
+        base = grid[r] if r < len(grid) else []
+        row = list(base)
+        touched = False
+        for c, vals in columns.items():
+            new = vals[r] if r < len(vals) else ""
+            old = row[c] if c < len(row) else ""
+            if new == old:
+                continue
+            touched = True
+            if c >= len(row):
+                row.extend([""] * (c + 1 - len(row)))
+            row[c] = new
+        if touched:
+            while row and not row[-1]:
+                row.pop()
+            out.append(row)
+        else:
+            out.append(base)
+    while out and not out[-1]:
+        out.pop()
+    return out
+
+
+def _read_columns(ss, wanted: list[tuple[str, int]]) -> dict[tuple[str, int], list[str]]:
+    """One COLUMNS-major ``values.batchGet`` for ``(title, col0)`` pairs."""
+    if not wanted:
+        return {}
+    resp = with_backoff(
+        ss.values_batch_get,
+        [f"{_quoted(t)}!{_col_letter(c)}1:{_col_letter(c)}{ONCALL_MAX_ROWS}" for t, c in wanted],
+        params={"majorDimension": "COLUMNS"},
+    ) or {}
+    value_ranges = list(resp.get("valueRanges") or [])
+    out: dict[tuple[str, int], list[str]] = {}
+    for idx, key in enumerate(wanted):
+        block = value_ranges[idx] if idx < len(value_ranges) else {}
+        values = block.get("values") or [[]]
+        out[key] = list(values[0] if values else [])
+    return out
+
+
+def _delta_refresh(ss, base: "WorkbookSnapshot", wanted: tuple[str, ...]) -> "WorkbookSnapshot | None":
+    """Bring ``base`` up to the current versions reading as few columns as possible.
+
+    Columns logged by our own writes are re-read directly. Tabs bumped without a
+    log, and every tab once the TTL has passed, are probed (column A plus the
+    day columns) and only columns whose fingerprint differs are spliced in.
+    None when ``base`` cannot serve as a starting point (other titles, stale,
+    due a ``SNAPSHOT_FULL_RESYNC_SEC`` whole read).
+    """
+    cache = shared_range_cache()
+    now = _pytime.time()
+    if base.stale or base.titles != wanted or now - (base.resynced_at or base.fetched_at) > _FULL_RESYNC_SEC:
+        return None
+    expired = (now - base.fetched_at) > cache.ttl_sec
+    ss_id = base.ss_id
+    old_versions = dict(base.versions)
+    versions = _versions_for(ss_id, wanted)
+    column_reads: dict[str, list[int]] = {}
+    probes: dict[str, list[int]] = {}
+    full_reads: list[str] = []
+    for title, version in versions:
+        moved = version != old_versions.get(title)
+        if not moved and not expired:
+            continue
+        cols = cache.columns_changed_since(ss_id, title, old_versions.get(title, 0)) if moved else frozenset()
+        if cols is not None and not expired:
+            if cols:
+                column_reads[title] = sorted(cols)
+            continue
+        probe_cols = _probe_columns(base.grids[title])
+        if probe_cols is None:
+            full_reads.append(title)
+        else:
+            probes[title] = sorted(set(probe_cols) | set(cols or ()))
+
+    grids = dict(base.grids)
+    fingerprints = {t: dict(fps) for t, fps in base.fingerprints.items()}
+    fresh = _read_columns(
+        ss,
+        [(t, c) for t, cols in column_reads.items() for c in cols]
+        + [(t, c) for t, cols in probes.items() for c in cols],
+    )
+    spliced: dict[str, dict[int, list[str]]] = {}
+    for title, cols in column_reads.items():
+        spliced[title] = {c: fresh[(title, c)] for c in cols}
+    for title, cols in probes.items():
+        fps = {c: _column_fingerprint(fresh[(title, c)]) for c in cols}
+        if fps[0] != base.column_fingerprint(title, 0):
+            full_reads.append(title)  # bands moved: the layout itself may have changed
+            continue
+        changed = {c: fresh[(title, c)] for c, fp in fps.items() if fp != base.column_fingerprint(title, c)}
+        if changed:
+            spliced[title] = changed
+        fingerprints.setdefault(title, {}).update(fps)
+    for title, cols in spliced.items():
+        grids[title] = _splice_columns(base.grids[title], cols)
+        per_tab = fingerprints.setdefault(title, {})
+        for col0, vals in cols.items():
+            per_tab[col0] = _column_fingerprint(vals)
+    if full_reads:
+        rng = grid_a1_range()
+        resp = with_backoff(
+            ss.values_batch_get,
+            [f"{_quoted(t)}!{rng}" for t in full_reads],
+            params={"majorDimension": "ROWS"},
+        ) or {}
+        value_ranges = list(resp.get("valueRanges") or [])
+        for idx, title in enumerate(full_reads):
+            block = value_ranges[idx] if idx < len(value_ranges) else {}
+            grids[title] = [list(row) for row in (block.get("values") or [])]
+            fingerprints.pop(title, None)
+
+    rng = grid_a1_range()
+    for title, version in versions:
+        if expired or version != old_versions.get(title):
+            cache.put(ss_id, title, (_SNAPSHOT_RANGE_TAG, rng), grids[title], version=version)
+    snap = WorkbookSnapshot(
+        ss_id=ss_id,
+        titles=wanted,
+        grids=MappingProxyType(grids),
+        versions=versions,
+        # Spliced grids are only as fresh as the base unless every tab was just probed.
+        fetched_at=now if expired else base.fetched_at,
+        resynced_at=base.resynced_at or base.fetched_at,
+        fingerprints=fingerprints,
+    )
+    _last_live[ss_id] = snap
+    if spliced or full_reads:
+        save_snapshot_to_disk(snap)
+    return snap
+
+
+# ─────── Write-through patching ───────
+def on_grid_patched(fn: Callable[[list, list, frozenset], None]) -> Callable[[list, list, frozenset], None]:
+    """Register ``fn(old_grid, new_grid, cells)``; called when a write replaces a grid."""
+    if fn not in _patch_listeners:
+        _patch_listeners.append(fn)
+    return fn
+
+
+def _splice_cells(grid: list[list[str]], cells: Mapping[tuple[int, int], str]) -> list[list[str]]:
+    """Copy of ``grid`` with ``cells`` rewritten (untouched rows shared), trimmed like a ROWS read."""
+    out = list(grid)
+    by_row: dict[int, list[tuple[int, str]]] = {}
+    for (r, c), value in cells.items():
+        by_row.setdefault(r, []).append((c, value))
+    for r, updates in by_row.items():
+        if r >= len(out):
+            out.extend([[] for _ in range(r + 1 - len(out))])
+        row = list(out[r])
+        for c, value in updates:
+            if c >= len(row):
+                row.extend([""] * (c + 1 - len(row)))
+            row[c] = value
+        while row and not row[-1]:
+            row.pop()
+        out[r] = row
+    while out and not out[-1]:
+        out.pop()
+    return out
+
+
+def patch_snapshot(ss, writes: Mapping[str, Mapping[tuple[int, int], str]]) -> WorkbookSnapshot | None:
+    """Apply a committed write to the newest live snapshot instead of re-reading it.
+
+    ``writes`` maps tab title -> {(row0, col0): value}; a tab with no values (a
+    formatting-only write) keeps its grid. Returns None (and leaves the normal
+    refresh path to do the work) when the snapshot is stale, past its TTL, or
+    any of its tabs moved by something other than this one write.
+    """
+    ss_id = str(getattr(ss, "id", ""))
+    base = _last_live.get(ss_id)
+    cache = shared_range_cache()
+    if base is None or base.stale or (_pytime.time() - base.fetched_at) > cache.ttl_sec:
+        return None
+    old_versions = dict(base.versions)
+    versions = _versions_for(ss_id, base.titles)
+    for title, version in versions:
+        if version != old_versions.get(title, 0) + (1 if title in writes else 0):
+            return None
+
+    grids = dict(base.grids)
+    replaced: list[tuple[list, list, frozenset]] = []
+    for title, cells in writes.items():
+        if title not in grids or not cells:
+            continue
+        old_grid = grids[title]
+        new_grid = _splice_cells(old_grid, cells)
+        grids[title] = new_grid
+        replaced.append((old_grid, new_grid, frozenset(cells)))
+
+    rng = grid_a1_range()
+    for title, version in versions:
+        if title in writes:
+            cache.put(ss_id, title, (_SNAPSHOT_RANGE_TAG, rng), grids[title], version=version)
+    snap = WorkbookSnapshot(
+        ss_id=ss_id,
+        titles=base.titles,
+        grids=MappingProxyType(grids),
+        versions=versions,
+        fetched_at=base.fetched_at,
+        resynced_at=base.resynced_at,
+        fingerprints={
+            t: {c: fp for c, fp in fps.items() if not any(col0 == c for _, col0 in writes.get(t, ()))}
+            for t, fps in base.fingerprints.items()
+        },
+    )
+    _last_live[ss_id] = snap
+    try:
+        by_id = st.session_state.setdefault(_SESSION_KEY, {})
+        current = by_id.get(ss_id)
+        if current is None or current.titles == snap.titles:
+            by_id[ss_id] = snap
+    except Exception:
+        pass
+    for old_grid, new_grid, cells in replaced:
+        for fn in list(_patch_listeners):
+            try:
+                fn(old_grid, new_grid, cells)
+            except Exception:
+                pass
+    if replaced:
+        save_snapshot_to_disk(snap)
+        if _VERIFY_WRITES:
+            try:
+                submit_background(lambda: _verify_patch(ss, snap, writes))
+            except Exception:
+                pass
+    return snap
+
+
+def _verify_patch(ss, snap: WorkbookSnapshot, writes: Mapping[str, Mapping[tuple[int, int], str]]) -> dict[str, set[int]]:
+    """Re-read the written columns; bump any that disagree with the patched grid."""
+    probe = [
+        (title, col0)
+        for title, cells in writes.items()
+        if cells and title in snap.grids
+        for col0 in sorted({c for _, c in cells})
+    ]
+    if not probe:
+        return {}
+    resp = with_backoff(
+        ss.values_batch_get,
+        [f"{_quoted(t)}!{_col_letter(c)}1:{_col_letter(c)}{ONCALL_MAX_ROWS}" for t, c in probe],
+        params={"majorDimension": "COLUMNS"},
+    ) or {}
+    value_ranges = list(resp.get("valueRanges") or [])
+    cache = shared_range_cache()
+    current = dict(_versions_for(snap.ss_id, snap.titles))
+    bad: dict[str, set[int]] = {}
+    for idx, (title, col0) in enumerate(probe):
+        block = value_ranges[idx] if idx < len(value_ranges) else {}
+        values = block.get("values") or [[]]
+        fresh = list(values[0] if values else [])
+        mine = [row[col0] if col0 < len(row) else "" for row in snap.grids[title]]
+        if _trimmed_column(fresh) != _trimmed_column(mine):
+            bad.setdefault(title, set()).add(col0)
+    for title, cols in bad.items():
+        if current.get(title) == dict(snap.versions).get(title):
+            cache.bump(snap.ss_id, title, columns=cols)
+    return bad
+
+
+def fetch_workbook_snapshot(ss, titles: Iterable[str]) -> WorkbookSnapshot:
+    """One ``values.batchGet`` for all ``titles``; bypasses every cache."""
+    wanted = tuple(dict.fromkeys(t for t in titles if t))
+    ss_id = str(getattr(ss, "id", ""))
+    versions = _versions_for(ss_id, wanted)
+    now = _pytime.time()
+    grids: dict[str, list[list[str]]] = {}
+    if wanted:
+        rng = grid_a1_range()
+        resp = with_backoff(
+            ss.values_batch_get,
+            [f"{_quoted(t)}!{rng}" for t in wanted],
+            params={"majorDimension": "ROWS"},
+        ) or {}
+        value_ranges = list(resp.get("valueRanges") or [])
+        cache = shared_range_cache()
+        for idx, (title, version) in enumerate(versions):
+            block = value_ranges[idx] if idx < len(value_ranges) else {}
+            grids[title] = [list(row) for row in (block.get("values") or [])]
+            cache.put(ss_id, title, (_SNAPSHOT_RANGE_TAG, rng), grids[title], version=version)
+    snap = WorkbookSnapshot(
+        ss_id=ss_id,
+        titles=wanted,
+        grids=MappingProxyType(grids),
+        versions=versions,
+        fetched_at=now,
+        resynced_at=now,
+    )
+    if wanted:
+        _live_ids.add(ss_id)
+        _last_live[ss_id] = snap
+        save_snapshot_to_disk(snap)
+    return snap
+
+
+# ─────── Disk copy ───────
+def _disk_path(ss_id: str) -> str | None:
+    if not _DISK_DIR or not ss_id:
+        return None
+    safe = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in ss_id)
+    return os.path.join(_DISK_DIR, f"wb_snapshot_{safe}.json.gz")
+
+
+def save_snapshot_to_disk(snap: WorkbookSnapshot) -> None:
+    """Best effort; written to a temp file and swapped in so readers never see half a file."""
+    path = _disk_path(snap.ss_id)
+    if path is None:
+        return
+    payload = {
+        "format": _DISK_FORMAT,
+        "ss_id": snap.ss_id,
+        "titles": list(snap.titles),
+        "fetched_at": snap.fetched_at,
+        "grids": {t: snap.grids[t] for t in snap.titles},
+    }
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6) as fh:
+            json.dump(payload, fh, separators=(",", ":"))
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.remove(tmp)
+        except Exception:
+            pass
+
+
+def load_snapshot_from_disk(ss_id: str, titles: Iterable[str]) -> WorkbookSnapshot | None:
+    """Stale snapshot from disk if it covers ``titles`` and is younger than SNAPSHOT_DISK_MAX_AGE_SEC."""
+    path = _disk_path(str(ss_id))
+    if path is None or not os.path.exists(path):
+        return None
+    wanted = tuple(dict.fromkeys(t for t in titles if t))
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            payload = json.load(fh)
+        if payload.get("format") != _DISK_FORMAT or payload.get("ss_id") != str(ss_id):
+            return None
+        fetched_at = float(payload.get("fetched_at") or 0)
+        grids = payload.get("grids") or {}
+    except Exception:
+        return None
+    if _pytime.time() - fetched_at > _DISK_MAX_AGE_SEC or any(t not in grids for t in wanted):
+        return None
+    kept = {t: grids[t] for t in wanted}
+    return WorkbookSnapshot(
+        ss_id=str(ss_id),
+        titles=wanted,
+        grids=MappingProxyType(kept),
+        versions=_versions_for(str(ss_id), wanted),
+        fetched_at=fetched_at,
+        resynced_at=fetched_at,
+        stale=True,
+    )
+
+
+def _cold_start(ss_id: str, wanted: tuple[str, ...]) -> bool:
+    """Disk copies only stand in until the first live fetch (and before any local write)."""
+    if ss_id in _live_ids:
+        return False
+    return all(v == 0 for _, v in _versions_for(ss_id, wanted))
+
+
+def _refresh_pending(ss_id: str) -> bool:
+    with _refresh_lock:
+        fut = _refreshing.get(ss_id)
+        return fut is not None and not fut.done()
+
+
+def _await_refresh(ss_id: str) -> None:
+    with _refresh_lock:
+        fut = _refreshing.get(ss_id)
+    if fut is not None:
+        try:
+            fut.result(timeout=_REFRESH_WAIT_SEC)
+        except Exception:
+            pass
+
+
+def _start_refresh(ss, ss_id: str, wanted: tuple[str, ...]) -> bool:
+    """Kick off (or join) the background fetch behind a stale snapshot."""
+    with _refresh_lock:
+        fut = _refreshing.get(ss_id)
+        if fut is not None and not fut.done():
+            return True
+        try:
+            _refreshing[ss_id] = submit_background(
+                lambda: single_flight().do(
+                    ("snapshot", ss_id, _versions_for(ss_id, wanted)),
+                    lambda: fetch_workbook_snapshot(ss, wanted),
+                )
+            )
+        except Exception:
+            return False
+        return True
+
+
+def _snapshot_from_shared(ss_id: str, wanted: tuple[str, ...]) -> WorkbookSnapshot | None:
+    cache = shared_range_cache()
+    rng = grid_a1_range()
+    versions = _versions_for(ss_id, wanted)
+    grids: dict[str, list[list[str]]] = {}
+    for title in wanted:
+        grid = cache.get(ss_id, title, (_SNAPSHOT_RANGE_TAG, rng))
+        if grid is MISS:
+            return None
+        grids[title] = grid
+    now = _pytime.time()
+    last = _last_live.get(ss_id)
+    return WorkbookSnapshot(
+        ss_id=ss_id,
+        titles=wanted,
+        grids=MappingProxyType(grids),
+        versions=versions,
+        fetched_at=now,
+        resynced_at=last.resynced_at if last is not None and last.titles == wanted else now,
+    )
+
+
+def load_workbook_snapshot(ss, titles: Iterable[str]) -> WorkbookSnapshot:
+    """Session-held snapshot; rebuilt when the title set, a tab version or the TTL changes it."""
+    wanted = tuple(dict.fromkeys(t for t in titles if t))
+    by_id = st.session_state.setdefault(_SESSION_KEY, {})
+    ss_id = str(getattr(ss, "id", ""))
+    snap = by_id.get(ss_id)
+    if (
+        snap is not None
+        and not snap.stale
+        and snap.titles == wanted
+        and snap.versions == _versions_for(ss_id, wanted)
+        and (_pytime.time() - snap.fetched_at) <= shared_range_cache().ttl_sec
+    ):
+        return snap
+    need_fresh = _need_fresh.get()
+    if snap is not None and snap.stale:
+        if not need_fresh and snap.titles == wanted and _refresh_pending(ss_id):
+            return snap
+        if need_fresh:
+            _await_refresh(ss_id)
+    snap = _snapshot_from_shared(ss_id, wanted) if wanted else None
+    base = _last_live.get(ss_id)
+    if snap is None and wanted and base is not None:
+        versions = _versions_for(ss_id, wanted)
+        snap = single_flight().do(
+            ("snapshot-delta", ss_id, versions),
+            lambda: _delta_refresh(ss, base, wanted),
+        )
+    if snap is None and wanted and not need_fresh and _cold_start(ss_id, wanted):
+        disk = load_snapshot_from_disk(ss_id, wanted)
+        if disk is not None and _start_refresh(ss, ss_id, wanted):
+            snap = disk
+    if snap is None:
+        snap = single_flight().do(
+            ("snapshot", ss_id, _versions_for(ss_id, wanted)),
+            lambda: fetch_workbook_snapshot(ss, wanted),
+        )
+    by_id[ss_id] = snap
+    return snap
+
+
+def invalidate_workbook_snapshot(ss_id: str | None = None) -> None:
+    by_id = st.session_state.setdefault(_SESSION_KEY, {})
+    if ss_id is None:
+        by_id.clear()
+        _last_live.clear()
+    else:
+        by_id.pop(str(ss_id), None)
+        _last_live.pop(str(ss_id), None)
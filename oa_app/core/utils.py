@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import re
 import unicodedata
 from datetime import date, datetime, time, timedelta
@@ -91,11 +92,68 @@ def clean_dash(text: str) -> str:
     return s
 
 
-def parse_time_str(t: str) -> time:
-    t = (t or "").strip().lower().replace(".", "")
-    t = re.sub(r"\b(\d{1,2}(?::\d{2})?)\s*([ap])\b", lambda m: f"{m.group(1)}{m.group(2)}m", t)
-    if t in {"24:00", "24", "midnight", "12am", "12:00am"}:
-        return time(0, 0)
+# ─────── Time labels ───────
+# Every spelling of a 30-minute grid time we expect in a sheet or a chat message,
+# precomputed so the common case is one dict lookup and dateutil only sees misses.
+def _grid_times() -> list[time]:
+    return [time(h, m) for h in range(24) for m in (0, 30)]
+
+
+def _build_time_str_table() -> dict[str, time]:
+    """Keys as ``parse_time_str`` normalizes its input (lowercase, no dots)."""
+    table: dict[str, time] = {}
+    for t in _grid_times():
+        h12 = t.hour % 12 or 12
+        suffix = "am" if t.hour < 12 else "pm"
+        mins = [f":{t.minute:02d}"] + ([""] if t.minute == 0 else [])
+        for hh in {str(h12), f"{h12:02d}"}:
+            for mm in mins:
+                for sep in ("", " "):
+                    table[f"{hh}{mm}{sep}{suffix}"] = t
+        for hh in {str(t.hour), f"{t.hour:02d}"}:
+            table[f"{hh}:{t.minute:02d}"] = t
+    return table
+
+
+def _build_time_label_table() -> dict[str, datetime]:
+    """Keys as ``parse_time_label`` normalizes its input (``"7:00 PM"``, ``"07 PM"``)."""
+    table: dict[str, datetime] = {}
+    for t in _grid_times():
+        h12 = t.hour % 12 or 12
+        suffix = "AM" if t.hour < 12 else "PM"
+        value = datetime(1900, 1, 1, t.hour, t.minute)
+        for hh in {str(h12), f"{h12:02d}"}:
+            table[f"{hh}:{t.minute:02d} {suffix}"] = value
+            if t.minute == 0:
+                table[f"{hh} {suffix}"] = value
+    return table
+
+
+_TIME_STR_TABLE = _build_time_str_table()
+_TIME_LABEL_TABLE = _build_time_label_table()
+_AMPM_SUFFIX_RE = re.compile(r"\s*(am|pm)\s*$", re.I)
+_AP_SHORT_RE = re.compile(r"\b(\d{1,2}(?::\d{2})?)\s*([ap])\b")
+
+
+def parse_time_label(value: str) -> datetime | None:
+    """A sheet time label (``"7:00 PM"``, ``"7 PM"``, ``"7:00pm"``) as ``strptime`` reads it, else None."""
+    txt = (value or "").strip()
+    if not txt:
+        return None
+    txt = _AMPM_SUFFIX_RE.sub(lambda m: f" {m.group(1).upper()}", txt)
+    hit = _TIME_LABEL_TABLE.get(txt)
+    if hit is not None:
+        return hit
+    for fmt in ("%I:%M %p", "%I %p"):
+        try:
+            return datetime.strptime(txt, fmt)
+        except Exception:
+            continue
+    return None
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_time_slow(t: str) -> time | None:
     try:
         dt = dateparser.parse(t)
         return time(dt.hour, dt.minute)
@@ -105,7 +163,21 @@ def parse_time_str(t: str) -> time:
             hh = int(m.group(1)) % 24
             mm = int(m.group(2) or 0)
             return time(hh, mm)
+        return None
+
+
+def parse_time_str(t: str) -> time:
+    t = (t or "").strip().lower().replace(".", "")
+    t = _AP_SHORT_RE.sub(lambda m: f"{m.group(1)}{m.group(2)}m", t)
+    if t in {"24:00", "24", "midnight", "12am", "12:00am"}:
+        return time(0, 0)
+    hit = _TIME_STR_TABLE.get(t)
+    if hit is not None:
+        return hit
+    found = _parse_time_slow(t)
+    if found is None:
         raise ValueError(f"Could not parse time: {t}")
+    return found
 
 
 def has_ampm(s: str) -> str | None:
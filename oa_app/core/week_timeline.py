@@ -0,0 +1,172 @@
+"""One person's week of shifts as integer minutes since Sunday 00:00.
+
+Request validation used to re-parse every ``"%I:%M %p"`` pair of the user's
+schedule into datetimes for each check (conflicts, the break rule, removing
+the shift being changed). ``WeekTimeline`` parses the schedule once into
+sorted ``Span``s; overlap queries and the continuous run around a proposed
+shift are bisects over those lists. Clock labels are parsed through a small
+LRU, so building a timeline is integer work after the first request.
+
+Shifts that end at or before their start run past midnight into the next day,
+so an overnight On-Call block and an early-morning request the next day are
+compared like any other pair of shifts.
+"""
+
+from __future__ import annotations
+
+import functools
+from bisect import bisect_left, bisect_right
+from datetime import datetime, time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from .labor_rules import MAX_CONTINUOUS_MINS, MIN_BREAK_MINS, merge_minute_runs
+
+WEEK_DAYS = ("sunday", "monday", "tuesday", "wednesday", "thursday", "friday", "saturday")
+DAY_MINUTES = 24 * 60
+WEEK_MINUTES = 7 * DAY_MINUTES
+
+ClockValue = Union[str, time, datetime]
+
+
+@functools.lru_cache(maxsize=1024)
+def _label_minutes(label: str) -> Optional[int]:
+    try:
+        t = datetime.strptime(label, "%I:%M %p")
+    except ValueError:
+        return None
+    return t.hour * 60 + t.minute
+
+
+def clock_minutes(value: ClockValue) -> Optional[int]:
+    """Minutes after midnight of a ``"%I:%M %p"`` label, ``time`` or ``datetime``."""
+    if isinstance(value, (datetime, time)):
+        return value.hour * 60 + value.minute
+    return _label_minutes(str(value or "").strip())
+
+
+def clock_label(minutes: int) -> str:
+    """``fmt_time`` style label for a minute offset (the day part is dropped)."""
+    h, m = divmod(int(minutes) % DAY_MINUTES, 60)
+    return f"{(h % 12) or 12}:{m:02d} {'AM' if h < 12 else 'PM'}"
+
+
+class Span(NamedTuple):
+    start: int
+    end: int
+    source: str = ""
+
+    @property
+    def minutes(self) -> int:
+        return self.end - self.start
+
+    @property
+    def day(self) -> str:
+        return WEEK_DAYS[(self.start // DAY_MINUTES) % 7]
+
+    @property
+    def labels(self) -> Tuple[str, str]:
+        return clock_label(self.start), clock_label(self.end)
+
+
+def make_span(day_canon: str, start: ClockValue, end: ClockValue, source: str = "") -> Optional[Span]:
+    """Span for a day-relative window; ``None`` if the day or either time does not parse."""
+    day = str(day_canon or "").strip().lower()
+    start_min, end_min = clock_minutes(start), clock_minutes(end)
+    if day not in WEEK_DAYS or start_min is None or end_min is None:
+        return None
+    if end_min <= start_min:
+        end_min += DAY_MINUTES
+    base = WEEK_DAYS.index(day) * DAY_MINUTES
+    return Span(base + start_min, base + end_min, source)
+
+
+class WeekTimeline:
+    """Sorted spans of one person's week; immutable (``add``/``subtract`` return new timelines)."""
+
+    def __init__(self, spans: Iterable[Span] = ()):
+        self.spans: Tuple[Span, ...] = tuple(sorted(s for s in spans if s.end > s.start))
+        self._starts = [s.start for s in self.spans]
+        self._longest = max((s.minutes for s in self.spans), default=0)
+        self._runs: Dict[int, Tuple[List[int], List[int]]] = {}
+
+    @classmethod
+    def from_schedule(cls, user_sched: dict) -> "WeekTimeline":
+        """Timeline of a ``{day: {bucket: [(start, end), ...]}}`` schedule; unparseable rows are skipped."""
+        spans = []
+        for day_canon, buckets in (user_sched or {}).items():
+            for source, ranges in (buckets or {}).items():
+                for start_s, end_s in ranges or []:
+                    span = make_span(day_canon, start_s, end_s, str(source))
+                    if span is not None:
+                        spans.append(span)
+        return cls(spans)
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    # ─────── overlap ───────
+    def overlapping(self, span: Span) -> List[Span]:
+        """Spans sharing at least a minute with ``span``, by start."""
+        lo = bisect_right(self._starts, span.start - self._longest)
+        hi = bisect_left(self._starts, span.end)
+        return [s for s in self.spans[lo:hi] if s.end > span.start]
+
+    def add(self, span: Span) -> "WeekTimeline":
+        return WeekTimeline(self.spans + (span,))
+
+    def subtract(self, span: Span, *, source: Optional[str] = None) -> "WeekTimeline":
+        """Timeline with ``span`` cut out of every overlapping span (of ``source`` only, if given)."""
+        if not any(source is None or s.source == source for s in self.overlapping(span)):
+            return self
+        out: List[Span] = []
+        for s in self.spans:
+            if s.end <= span.start or s.start >= span.end or (source is not None and s.source != source):
+                out.append(s)
+                continue
+            if s.start < span.start:
+                out.append(Span(s.start, span.start, s.source))
+            if span.end < s.end:
+                out.append(Span(span.end, s.end, s.source))
+        return WeekTimeline(out)
+
+    # ─────── continuous runs ───────
+    def runs(self, min_break_mins: int = MIN_BREAK_MINS) -> List[Tuple[int, int]]:
+        """Merged runs of work; gaps shorter than ``min_break_mins`` do not end a run."""
+        starts, ends = self._run_lists(min_break_mins)
+        return list(zip(starts, ends))
+
+    def _run_lists(self, min_break_mins: int) -> Tuple[List[int], List[int]]:
+        key = int(min_break_mins)
+        found = self._runs.get(key)
+        if found is None:
+            merged = merge_minute_runs(((s.start, s.end) for s in self.spans), min_break_mins=key)
+            found = self._runs[key] = ([a for a, _b in merged], [b for _a, b in merged])
+        return found
+
+    def run_with(self, span: Span, min_break_mins: int = MIN_BREAK_MINS) -> Tuple[int, int]:
+        """The run ``span`` would be part of if it were added."""
+        gap = int(min_break_mins)
+        starts, ends = self._run_lists(gap)
+        lo, hi = span.start, span.end
+        i = bisect_right(starts, span.start)
+        if i and span.start - ends[i - 1] < gap:
+            lo, hi = starts[i - 1], max(hi, ends[i - 1])
+        while i < len(starts) and starts[i] - hi < gap:
+            hi = max(hi, ends[i])
+            i += 1
+        return lo, hi
+
+    def violates_break_rule(
+        self,
+        span: Span,
+        *,
+        max_continuous_mins: int = MAX_CONTINUOUS_MINS,
+        min_break_mins: int = MIN_BREAK_MINS,
+    ) -> bool:
+        """Would adding ``span`` make its run longer than ``max_continuous_mins``?
+
+        Only the run ``span`` joins is checked; runs elsewhere in the week are
+        not the request's doing.
+        """
+        lo, hi = self.run_with(span, min_break_mins)
+        return hi - lo > int(max_continuous_mins)
@@ -0,0 +1,157 @@
+"""Batched worksheet writes.
+
+A ``WritePlan`` collects cell values, background colours and note lines for a
+chat action and sends them as one ``spreadsheets.batchUpdate`` (``updateCells``
+and ``repeatCell`` requests side by side). The batch is applied atomically by
+Sheets, so an action either lands completely or not at all. Once it has landed
+the written values are patched into the workbook snapshot, so the next render
+does not have to re-read the tabs.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+
+from ..integrations.gspread_io import with_backoff
+from .action_context import after_write
+from .quotas import bump_ws_version
+from .snapshot import patch_snapshot
+
+
+def _sheet_id(ws) -> int | None:
+    sid = getattr(ws, "id", None)
+    if sid is None:
+        sid = (getattr(ws, "_properties", {}) or {}).get("sheetId")
+    return int(sid) if sid is not None else None
+
+
+def _grid_range(sheet_id: int, row0: int, col0: int) -> dict:
+    return {
+        "sheetId": sheet_id,
+        "startRowIndex": row0,
+        "endRowIndex": row0 + 1,
+        "startColumnIndex": col0,
+        "endColumnIndex": col0 + 1,
+    }
+
+
+_NUMBER_RE = re.compile(r"^[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?$")
+
+
+def _user_entered(value: str) -> dict:
+    """``userEnteredValue`` Sheets would store for ``value`` typed in (``USER_ENTERED``).
+
+    Formulas, plain numbers and booleans are sent typed, and a leading
+    apostrophe forces text, as with ``update_cell``. Dates, times, currency and
+    percentages stay text: they display the same, only without a number format.
+    """
+    if value.startswith("'"):
+        return {"stringValue": value[1:]}
+    if value.startswith("="):
+        return {"formulaValue": value}
+    text = value.strip()
+    if _NUMBER_RE.match(text):
+        return {"numberValue": float(text)}
+    if text.upper() in ("TRUE", "FALSE"):
+        return {"boolValue": text.upper() == "TRUE"}
+    return {"stringValue": value}
+
+
+@dataclass
+class WritePlan:
+    requests: list[dict] = field(default_factory=list)
+    # (sheet_id, row0, col0) -> value, in staging order; later writes win.
+    values: dict[tuple[int, int, int], str] = field(default_factory=dict)
+    _worksheets: dict[int, object] = field(default_factory=dict)
+
+    def _track(self, ws) -> int:
+        sid = _sheet_id(ws)
+        if sid is None:
+            raise ValueError(f"Worksheet '{getattr(ws, 'title', '?')}' has no sheet id.")
+        self._worksheets.setdefault(sid, ws)
+        return sid
+
+    # ─────── staging (all coordinates 0-based) ───────
+    def set_value(self, ws, row0: int, col0: int, value: str) -> "WritePlan":
+        sid = self._track(ws)
+        self.values[(sid, row0, col0)] = str(value or "")
+        return self
+
+    def clear_value(self, ws, row0: int, col0: int) -> "WritePlan":
+        return self.set_value(ws, row0, col0, "")
+
+    def set_background(self, ws, row0: int, col0: int, rgb: dict) -> "WritePlan":
+        sid = self._track(ws)
+        self.requests.append(
+            {
+                "repeatCell": {
+                    "range": _grid_range(sid, row0, col0),
+                    "cell": {"userEnteredFormat": {"backgroundColor": rgb}},
+                    "fields": "userEnteredFormat.backgroundColor",
+                }
+            }
+        )
+        return self
+
+    def append_note(self, ws, row0: int, col0: int, note: str) -> "WritePlan":
+        """Note lines are plain values; the caller picks the free row from its own read."""
+        return self.set_value(ws, row0, col0, note)
+
+    # ─────── commit ───────
+    def body(self) -> dict:
+        value_requests = []
+        for (sid, row0, col0), value in self.values.items():
+            cell = {"userEnteredValue": _user_entered(value)} if value else {}
+            value_requests.append(
+                {
+                    "updateCells": {
+                        "range": _grid_range(sid, row0, col0),
+                        "rows": [{"values": [cell]}],
+                        "fields": "userEnteredValue",
+                    }
+                }
+            )
+        return {"requests": value_requests + list(self.requests)}
+
+    def __len__(self) -> int:
+        return len(self.values) + len(self.requests)
+
+    def cell_values(self, sheet_id: int) -> dict[tuple[int, int], str]:
+        """0-based ``(row, col) -> value`` this plan writes on ``sheet_id``."""
+        return {(row0, col0): value for (sid, row0, col0), value in self.values.items() if sid == sheet_id}
+
+    def value_columns(self, sheet_id: int) -> set[int]:
+        """0-based columns whose values this plan changes on ``sheet_id`` (formatting excluded)."""
+        return {col0 for (sid, _row0, col0) in self.values if sid == sheet_id}
+
+    @property
+    def worksheets(self) -> list:
+        return list(self._worksheets.values())
+
+    def commit(self):
+        """Send everything in one batchUpdate; bumps versions of the touched tabs and patches the snapshot.
+
+        A committed plan is emptied, so committing it again is a no-op.
+        """
+        if not len(self):
+            return None
+        first_ws = next(iter(self._worksheets.values()))
+        resp = with_backoff(first_ws.spreadsheet.batch_update, self.body())
+        after_write()
+        for sid, ws in self._worksheets.items():
+            try:
+                bump_ws_version(ws, columns=self.value_columns(sid))
+            except Exception:
+                pass
+        try:
+            patch_snapshot(
+                first_ws.spreadsheet,
+                {getattr(ws, "title", ""): self.cell_values(sid) for sid, ws in self._worksheets.items()},
+            )
+        except Exception:
+            pass
+        self.requests.clear()
+        self.values.clear()
+        self._worksheets.clear()
+        return resp
@@ -0,0 +1,153 @@
+"""Worksheet handle registry.
+
+One ``fetch_sheet_metadata`` (via ``ss.worksheets()``) yields every tab's title,
+sheet id, hidden flag and grid size plus a ready ``Worksheet`` handle, so
+``ss.worksheet(title)`` no longer costs a metadata round trip per call. The
+registry hangs off the Spreadsheet handle (shared by all sessions) and is only
+rebuilt when the tab list or a tab's grid size changes: a periodic light
+re-check, an unknown title, or an explicit invalidation after adding a tab.
+"""
+
+from __future__ import annotations
+
+import threading
+import time as _pytime
+from dataclasses import dataclass
+
+from gspread.exceptions import WorksheetNotFound
+
+from .. import config as _config
+from .action_context import action_memo
+from ..integrations.gspread_io import retry_429
+
+try:
+    _RECHECK_SEC = float(getattr(_config, "WS_REGISTRY_RECHECK_SEC", 120))
+except Exception:
+    _RECHECK_SEC = 120.0
+
+_MISSING_TITLE_REFRESH_SEC = 10.0
+_ATTR = "_oa_ws_registry"
+_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class TabMeta:
+    title: str
+    sheet_id: int | None
+    index: int
+    hidden: bool
+    row_count: int
+    col_count: int
+
+
+def _tab_meta(ws, index: int) -> TabMeta:
+    props = getattr(ws, "_properties", {}) or {}
+    grid = props.get("gridProperties") or {}
+    sheet_id = getattr(ws, "id", None)
+    if sheet_id is None:
+        sheet_id = props.get("sheetId")
+    try:
+        rows = int(getattr(ws, "row_count", None) or grid.get("rowCount") or 0)
+        cols = int(getattr(ws, "col_count", None) or grid.get("columnCount") or 0)
+    except Exception:
+        rows, cols = 0, 0
+    return TabMeta(
+        title=str(getattr(ws, "title", "") or ""),
+        sheet_id=sheet_id,
+        index=int(props.get("index", index)),
+        hidden=bool(props.get("hidden", False)),
+        row_count=rows,
+        col_count=cols,
+    )
+
+
+class WorksheetRegistry:
+    def __init__(self, ss_id: str, worksheets: list):
+        self.ss_id = str(ss_id)
+        self.tabs: tuple[TabMeta, ...] = tuple(_tab_meta(ws, i) for i, ws in enumerate(worksheets))
+        self._handles = {meta.title: ws for meta, ws in zip(self.tabs, worksheets)}
+        self._by_id = {meta.sheet_id: meta for meta in self.tabs if meta.sheet_id is not None}
+        self.built_at = self.checked_at = _pytime.time()
+
+    @property
+    def signature(self) -> tuple:
+        """What a re-check compares; a resized tab counts as changed so its ``TabMeta`` is fresh."""
+        return tuple((m.sheet_id, m.title, m.hidden, m.row_count, m.col_count) for m in self.tabs)
+
+    def titles(self, *, include_hidden: bool = False) -> list[str]:
+        return [m.title for m in self.tabs if include_hidden or not m.hidden]
+
+    def meta(self, title: str) -> TabMeta | None:
+        return next((m for m in self.tabs if m.title == title), None)
+
+    def by_id(self, sheet_id) -> TabMeta | None:
+        try:
+            return self._by_id.get(int(sheet_id))
+        except Exception:
+            return None
+
+    def worksheet(self, title: str):
+        return self._handles.get(title)
+
+    def worksheets(self, *, include_hidden: bool = True) -> list:
+        return [self._handles[m.title] for m in self.tabs if include_hidden or not m.hidden]
+
+
+def worksheet_registry(ss, *, refresh: bool = False) -> WorksheetRegistry | None:
+    """Registry for ``ss`` (None if the handle cannot list its tabs)."""
+    if ss is None or not callable(getattr(ss, "worksheets", None)):
+        return None
+    reg = getattr(ss, _ATTR, None)
+    now = _pytime.time()
+    if reg is not None and not refresh and now - reg.checked_at <= _RECHECK_SEC:
+        return reg
+    with _lock:
+        reg = getattr(ss, _ATTR, None)
+        if reg is not None and not refresh and now - reg.checked_at <= _RECHECK_SEC:
+            return reg
+        try:
+            fresh = WorksheetRegistry(getattr(ss, "id", ""), list(retry_429(ss.worksheets) or []))
+        except Exception:
+            return reg
+        if reg is not None and reg.signature == fresh.signature:
+            # Same tabs: keep the existing handles, just note the check.
+            reg.checked_at = fresh.checked_at
+            return reg
+        try:
+            setattr(ss, _ATTR, fresh)
+        except Exception:
+            pass
+        return fresh
+
+
+def invalidate_worksheet_registry(ss) -> None:
+    try:
+        setattr(ss, _ATTR, None)
+    except Exception:
+        pass
+
+
+def open_worksheet(ss, title: str):
+    """Registry-backed ``ss.worksheet(title)``; raises WorksheetNotFound like gspread."""
+    return action_memo(("worksheet", str(getattr(ss, "id", "")), title), lambda: _open_worksheet(ss, title))
+
+
+def _open_worksheet(ss, title: str):
+    reg = worksheet_registry(ss)
+    if reg is None:
+        return retry_429(ss.worksheet, title)
+    ws = reg.worksheet(title)
+    if ws is None and _pytime.time() - reg.checked_at > _MISSING_TITLE_REFRESH_SEC:
+        reg = worksheet_registry(ss, refresh=True) or reg
+        ws = reg.worksheet(title)
+    if ws is None:
+        raise WorksheetNotFound(title)
+    return ws
+
+
+def visible_titles(ss, *, include_hidden: bool = False) -> list[str]:
+    def build() -> list[str]:
+        reg = worksheet_registry(ss)
+        return reg.titles(include_hidden=include_hidden) if reg is not None else []
+
+    return list(action_memo(("titles", str(getattr(ss, "id", "")), include_hidden), build))
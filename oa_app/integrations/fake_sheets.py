@@ -0,0 +1,485 @@
+"""In-memory stand-in for the slice of gspread this app uses.
+
+``FakeSpreadsheet`` / ``FakeWorksheet`` answer the same calls the services make
+(``worksheets``, ``worksheet``, ``batch_get``, ``get``, ``get_all_values``,
+``update_cell``, ``update``, ``append_row``, ``batch_update``,
+``values_batch_get``, ``fetch_sheet_metadata`` with ``includeGridData``,
+``add_worksheet``) against plain Python grids. A shared ``FakeSheetsBackend``
+adds per-call latency, injects 429s and counts every call, so the whole read /
+write pipeline can be benchmarked and regression-tested offline.
+
+``seeded_spreadsheet()`` builds a workbook with UNH, MC, On-Call and roster tabs
+laid out like the live one.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import Counter
+from typing import Callable, Iterable, Mapping, Sequence
+
+import gspread.utils as a1
+from gspread.exceptions import APIError, WorksheetNotFound
+
+from ..config import OA_SCHEDULE_SHEETS, ROSTER_NAME_COLUMN_HEADER, ROSTER_SHEET
+
+_WRITE_METHODS = {"add_worksheet", "append_row", "batch_update", "update", "update_cell"}
+
+
+class _QuotaResponse:
+    """Just enough of ``requests.Response`` for ``gspread.exceptions.APIError``."""
+
+    status_code = 429
+    text = "Quota exceeded for quota metric 'Read requests'"
+
+    def json(self) -> dict:
+        return {"error": {"code": 429, "message": self.text, "status": "RESOURCE_EXHAUSTED"}}
+
+
+class FakeSheetsBackend:
+    def __init__(
+        self,
+        *,
+        latency_sec: float = 0.0,
+        jitter_sec: float = 0.0,
+        quota_error_rate: float = 0.0,
+        seed: int = 0,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.latency_sec = float(latency_sec)
+        self.jitter_sec = float(jitter_sec)
+        self.quota_error_rate = float(quota_error_rate)
+        self._sleep = sleep
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._fail_next = 0
+        self.calls: Counter = Counter()
+        self.log: list[tuple[str, str]] = []
+        self.quota_errors = 0
+
+    def fail_next(self, n: int = 1) -> None:
+        """The next ``n`` calls raise a 429 regardless of ``quota_error_rate``."""
+        with self._lock:
+            self._fail_next += int(n)
+
+    def reset_counts(self) -> None:
+        with self._lock:
+            self.calls.clear()
+            self.log.clear()
+            self.quota_errors = 0
+
+    def call(self, method: str, target: str = "") -> None:
+        """Account one API round trip; sleeps for the latency and may raise a 429."""
+        with self._lock:
+            self.calls[method] += 1
+            self.log.append((method, target))
+            fail = self._fail_next > 0 or (
+                self.quota_error_rate > 0 and self._rng.random() < self.quota_error_rate
+            )
+            if self._fail_next > 0:
+                self._fail_next -= 1
+            if fail:
+                self.quota_errors += 1
+            delay = self.latency_sec + (self._rng.uniform(0, self.jitter_sec) if self.jitter_sec else 0.0)
+        if delay > 0:
+            self._sleep(delay)
+        if fail:
+            raise APIError(_QuotaResponse())
+
+    def stats(self) -> dict:
+        with self._lock:
+            writes = sum(n for m, n in self.calls.items() if m in _WRITE_METHODS)
+            total = sum(self.calls.values())
+            return {
+                "calls": dict(self.calls),
+                "total": total,
+                "reads": total - writes,
+                "writes": writes,
+                "quota_errors": self.quota_errors,
+            }
+
+
+# ─────── A1 helpers ───────
+def _split_range(rng: str) -> tuple[str | None, str]:
+    if "!" not in rng:
+        return None, rng
+    title, cells = rng.rsplit("!", 1)
+    title = title.strip()
+    if len(title) >= 2 and title[0] == title[-1] == "'":
+        title = title[1:-1].replace("''", "'")
+    return title, cells
+
+
+def _bounds(cells: str, rows: int, cols: int) -> tuple[int, int, int, int]:
+    """0-based, end-exclusive (r0, r1, c0, c1) for an A1 range clipped to the grid size."""
+    gr = a1.a1_range_to_grid_range(cells)
+    r0 = int(gr.get("startRowIndex", 0))
+    c0 = int(gr.get("startColumnIndex", 0))
+    r1 = int(gr.get("endRowIndex", rows))
+    c1 = int(gr.get("endColumnIndex", cols))
+    return r0, r1, c0, c1
+
+
+def _trimmed(rows: list[list[str]]) -> list[list[str]]:
+    out = []
+    for row in rows:
+        row = list(row)
+        while row and row[-1] == "":
+            row.pop()
+        out.append(row)
+    while out and not out[-1]:
+        out.pop()
+    return out
+
+
+def _entered_text(uev: dict) -> str:
+    """Displayed text of a ``userEnteredValue`` (formulas are stored, not evaluated)."""
+    if "numberValue" in uev:
+        num = float(uev["numberValue"])
+        return str(int(num)) if num.is_integer() else repr(num)
+    if "boolValue" in uev:
+        return "TRUE" if uev["boolValue"] else "FALSE"
+    return str(next(iter(uev.values()), "")) if uev else ""
+
+
+class FakeWorksheet:
+    def __init__(self, spreadsheet: "FakeSpreadsheet", title: str, sheet_id: int, rows: int, cols: int, index: int):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.id = sheet_id
+        self.index = index
+        self.hidden = False
+        self._cells: list[list[str]] = [[""] * cols for _ in range(rows)]
+        self._backgrounds: dict[tuple[int, int], dict] = {}
+
+    # ─────── metadata ───────
+    @property
+    def row_count(self) -> int:
+        return len(self._cells)
+
+    @property
+    def col_count(self) -> int:
+        return len(self._cells[0]) if self._cells else 0
+
+    @property
+    def _properties(self) -> dict:
+        return {
+            "sheetId": self.id,
+            "title": self.title,
+            "index": self.index,
+            "hidden": self.hidden,
+            "gridProperties": {"rowCount": self.row_count, "columnCount": self.col_count},
+        }
+
+    # ─────── local access (no accounting) ───────
+    def _ensure(self, rows: int, cols: int) -> None:
+        if cols > self.col_count:
+            for row in self._cells:
+                row.extend([""] * (cols - len(row)))
+        width = max(cols, self.col_count)
+        while len(self._cells) < rows:
+            self._cells.append([""] * width)
+
+    def set_values(self, values: Sequence[Sequence[object]], row0: int = 0, col0: int = 0) -> None:
+        """Seed cells without going through the backend."""
+        values = [list(r) for r in values]
+        self._ensure(row0 + len(values), col0 + max((len(r) for r in values), default=0))
+        for r, row in enumerate(values):
+            for c, v in enumerate(row):
+                self._cells[row0 + r][col0 + c] = "" if v is None else str(v)
+
+    def set_background(self, row0: int, col0: int, rgb: dict | None) -> None:
+        if rgb:
+            self._backgrounds[(row0, col0)] = dict(rgb)
+        else:
+            self._backgrounds.pop((row0, col0), None)
+
+    def values(self) -> list[list[str]]:
+        return _trimmed(self._cells)
+
+    def _read(self, cells: str, major_dimension: str | None = None) -> list[list[str]]:
+        r0, r1, c0, c1 = _bounds(cells, self.row_count, self.col_count)
+        rows = [
+            [row[c] if c < len(row) else "" for c in range(c0, c1)]
+            for row in self._cells[r0:r1]
+        ]
+        if str(major_dimension or "ROWS").upper() == "COLUMNS":
+            width = c1 - c0
+            rows = [[row[c] for row in rows] for c in range(width)] if rows else []
+        return _trimmed(rows)
+
+    # ─────── gspread surface ───────
+    def batch_get(self, ranges: Iterable[str], major_dimension=None, **_kw) -> list[list[list[str]]]:
+        ranges = list(ranges)
+        self.spreadsheet.backend.call("batch_get", self.title)
+        return [self._read(_split_range(r)[1], major_dimension) for r in ranges]
+
+    def get(self, range_name: str | None = None, major_dimension=None, **_kw) -> list[list[str]]:
+        self.spreadsheet.backend.call("get", self.title)
+        if not range_name:
+            return self.values()
+        return self._read(_split_range(range_name)[1], major_dimension)
+
+    def get_all_values(self, **_kw) -> list[list[str]]:
+        self.spreadsheet.backend.call("get_all_values", self.title)
+        return self.values()
+
+    def get_all_records(self, head: int = 1, **_kw) -> list[dict]:
+        self.spreadsheet.backend.call("get_all_records", self.title)
+        rows = self.values()
+        if len(rows) < head:
+            return []
+        header = rows[head - 1]
+        return [
+            {h: (row[i] if i < len(row) else "") for i, h in enumerate(header)}
+            for row in rows[head:]
+        ]
+
+    def row_values(self, row: int, **_kw) -> list[str]:
+        self.spreadsheet.backend.call("row_values", self.title)
+        rows = self.values()
+        return list(rows[row - 1]) if 0 < row <= len(rows) else []
+
+    def update_cell(self, row: int, col: int, value) -> dict:
+        self.spreadsheet.backend.call("update_cell", self.title)
+        self.set_values([[value]], row - 1, col - 1)
+        return {"updatedCells": 1}
+
+    def update(self, values=None, range_name: str | None = None, **_kw) -> dict:
+        # Accept the pre-6.0 ``update(range_name, values)`` order too.
+        if isinstance(values, str) and not isinstance(range_name, str):
+            values, range_name = range_name, values
+        self.spreadsheet.backend.call("update", self.title)
+        rows = [list(r) for r in (values or [])]
+        r0, _r1, c0, _c1 = _bounds(_split_range(range_name or "A1")[1], self.row_count, self.col_count)
+        self.set_values(rows, r0, c0)
+        return {"updatedCells": sum(len(r) for r in rows)}
+
+    def append_row(self, values: Sequence[object], **_kw) -> dict:
+        self.spreadsheet.backend.call("append_row", self.title)
+        row = len(self.values())
+        self.set_values([list(values)], row, 0)
+        cells = f"A{row + 1}:{a1.rowcol_to_a1(row + 1, max(1, len(values)))}"
+        return {"updates": {"updatedRange": f"'{self.title}'!{cells}", "updatedRows": 1}}
+
+    def batch_update(self, data: Iterable[Mapping], **_kw) -> dict:
+        self.spreadsheet.backend.call("batch_update", self.title)
+        total = 0
+        for item in data:
+            r0, _r1, c0, _c1 = _bounds(_split_range(item["range"])[1], self.row_count, self.col_count)
+            rows = [list(r) for r in (item.get("values") or [])]
+            self.set_values(rows, r0, c0)
+            total += sum(len(r) for r in rows)
+        return {"totalUpdatedCells": total}
+
+
+class FakeSpreadsheet:
+    def __init__(self, backend: FakeSheetsBackend | None = None, *, id: str = "fake-ss", title: str = "OA Schedule"):
+        self.backend = backend or FakeSheetsBackend()
+        self.id = id
+        self.title = title
+        self._worksheets: list[FakeWorksheet] = []
+        self._next_sheet_id = 1000
+
+    # ─────── local access (no accounting) ───────
+    def seed(self, title: str, values: Sequence[Sequence[object]], *, rows: int | None = None, cols: int | None = None) -> FakeWorksheet:
+        """Create (or replace the contents of) ``title`` without going through the backend."""
+        ws = self._find(title)
+        if ws is None:
+            ws = self._new_worksheet(title, rows or max(len(values), 1), cols or max((len(r) for r in values), default=1))
+        ws._cells = [[""] * ws.col_count for _ in range(ws.row_count)]
+        ws.set_values(values)
+        return ws
+
+    def _find(self, title: str) -> FakeWorksheet | None:
+        return next((ws for ws in self._worksheets if ws.title == title), None)
+
+    def _by_id(self, sheet_id) -> FakeWorksheet:
+        ws = next((w for w in self._worksheets if w.id == int(sheet_id)), None)
+        if ws is None:
+            raise WorksheetNotFound(str(sheet_id))
+        return ws
+
+    def _new_worksheet(self, title: str, rows: int, cols: int, index: int | None = None) -> FakeWorksheet:
+        if self._find(title) is not None:
+            raise ValueError(f"A sheet with the name '{title}' already exists.")
+        self._next_sheet_id += 1
+        ws = FakeWorksheet(self, title, self._next_sheet_id, int(rows), int(cols), len(self._worksheets))
+        if index is None:
+            self._worksheets.append(ws)
+        else:
+            self._worksheets.insert(int(index), ws)
+        for i, w in enumerate(self._worksheets):
+            w.index = i
+        return ws
+
+    # ─────── gspread surface ───────
+    def worksheets(self, exclude_hidden: bool = False) -> list[FakeWorksheet]:
+        self.backend.call("fetch_sheet_metadata")
+        return [ws for ws in self._worksheets if not (exclude_hidden and ws.hidden)]
+
+    def worksheet(self, title: str) -> FakeWorksheet:
+        self.backend.call("fetch_sheet_metadata", title)
+        ws = self._find(title)
+        if ws is None:
+            raise WorksheetNotFound(title)
+        return ws
+
+    def get_worksheet_by_id(self, sheet_id) -> FakeWorksheet:
+        self.backend.call("fetch_sheet_metadata", str(sheet_id))
+        return self._by_id(sheet_id)
+
+    def add_worksheet(self, title: str, rows: int, cols: int, index: int | None = None) -> FakeWorksheet:
+        self.backend.call("add_worksheet", title)
+        return self._new_worksheet(title, rows, cols, index)
+
+    def values_batch_get(self, ranges: Iterable[str], params: Mapping | None = None) -> dict:
+        ranges = list(ranges)
+        self.backend.call("values_batch_get", ",".join(ranges))
+        major = (params or {}).get("majorDimension")
+        out = []
+        for rng in ranges:
+            title, cells = _split_range(rng)
+            ws = self._find(title or "")
+            if ws is None:
+                raise WorksheetNotFound(title or rng)
+            values = ws._read(cells, major)
+            block = {"range": rng, "majorDimension": major or "ROWS"}
+            if values:
+                block["values"] = values
+            out.append(block)
+        return {"spreadsheetId": self.id, "valueRanges": out}
+
+    def fetch_sheet_metadata(self, params: Mapping | None = None) -> dict:
+        params = dict(params or {})
+        self.backend.call("fetch_sheet_metadata", ",".join(params.get("ranges") or []))
+        ranges = list(params.get("ranges") or [])
+        if not ranges:
+            return {"spreadsheetId": self.id, "sheets": [{"properties": ws._properties} for ws in self._worksheets]}
+        sheets = []
+        for rng in ranges:
+            title, cells = _split_range(rng)
+            ws = self._find(title or "")
+            if ws is None:
+                raise WorksheetNotFound(title or rng)
+            entry: dict = {"properties": ws._properties}
+            if params.get("includeGridData"):
+                r0, r1, c0, c1 = _bounds(cells, ws.row_count, ws.col_count)
+                row_data = []
+                for r in range(r0, min(r1, ws.row_count)):
+                    cells_out = []
+                    for c in range(c0, min(c1, ws.col_count)):
+                        value = ws._cells[r][c]
+                        cell: dict = {}
+                        if value:
+                            cell["userEnteredValue"] = {"stringValue": value}
+                            cell["formattedValue"] = value
+                        rgb = ws._backgrounds.get((r, c))
+                        if rgb:
+                            cell["userEnteredFormat"] = {"backgroundColor": dict(rgb)}
+                        cells_out.append(cell)
+                    row_data.append({"values": cells_out})
+                entry["data"] = [{"startRow": r0, "startColumn": c0, "rowData": row_data}]
+            sheets.append(entry)
+        return {"spreadsheetId": self.id, "sheets": sheets}
+
+    def batch_update(self, body: Mapping) -> dict:
+        self.backend.call("batch_update")
+        replies = []
+        for req in body.get("requests") or []:
+            if "updateCells" in req:
+                spec = req["updateCells"]
+                rng = spec["range"]
+                ws = self._by_id(rng["sheetId"])
+                for r_off, row in enumerate(spec.get("rows") or []):
+                    for c_off, cell in enumerate(row.get("values") or []):
+                        uev = (cell or {}).get("userEnteredValue") or {}
+                        value = _entered_text(uev)
+                        ws.set_values([[value]], rng["startRowIndex"] + r_off, rng["startColumnIndex"] + c_off)
+            elif "repeatCell" in req:
+                spec = req["repeatCell"]
+                rng = spec["range"]
+                ws = self._by_id(rng["sheetId"])
+                rgb = ((spec.get("cell") or {}).get("userEnteredFormat") or {}).get("backgroundColor")
+                for r in range(rng["startRowIndex"], rng["endRowIndex"]):
+                    for c in range(rng["startColumnIndex"], rng["endColumnIndex"]):
+                        ws.set_background(r, c, rgb)
+            elif "addSheet" in req:
+                props = req["addSheet"].get("properties") or {}
+                grid = props.get("gridProperties") or {}
+                ws = self._new_worksheet(props["title"], grid.get("rowCount", 1000), grid.get("columnCount", 26))
+                replies.append({"addSheet": {"properties": ws._properties}})
+                continue
+            replies.append({})
+        return {"spreadsheetId": self.id, "replies": replies}
+
+
+# ─────── Realistic layouts ───────
+_WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+_WEEK = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+
+
+def _half_hours(start_hour: int, end_hour: int) -> list[str]:
+    out = []
+    for h in range(start_hour, end_hour):
+        for m in (0, 30):
+            hh = h % 12 or 12
+            out.append(f"{hh}:{m:02d} {'AM' if h < 12 else 'PM'}")
+    return out
+
+
+def unh_mc_layout(
+    people: Sequence[str],
+    *,
+    lanes: int = 3,
+    start_hour: int = 7,
+    end_hour: int = 24,
+    fill: float = 0.35,
+    seed: int = 0,
+) -> list[list[str]]:
+    """Weekday grid: one time row per half hour followed by ``lanes`` name rows."""
+    rng = random.Random(seed)
+    grid = [["Time"] + list(_WEEKDAYS)]
+    for label in _half_hours(start_hour, end_hour):
+        grid.append([label] + [""] * len(_WEEKDAYS))
+        for _ in range(lanes):
+            row = [""]
+            for _day in _WEEKDAYS:
+                row.append(f"OA: {rng.choice(people)}" if people and rng.random() < fill else "")
+            grid.append(row)
+    return grid
+
+
+def oncall_layout(
+    people: Sequence[str],
+    *,
+    blocks: Sequence[str] = ("7:00 AM - 12:00 PM", "12:00 PM - 5:00 PM", "5:00 PM - 11:59 PM"),
+    lanes: int = 2,
+    seed: int = 0,
+) -> list[list[str]]:
+    """Sun–Sat grid: one range label row per block followed by ``lanes`` name rows."""
+    rng = random.Random(seed)
+    grid = [[""] + list(_WEEK)]
+    for label in blocks:
+        grid.append([label] + [""] * len(_WEEK))
+        for _ in range(lanes):
+            grid.append([""] + [rng.choice(people) if people and rng.random() < 0.6 else "" for _ in _WEEK])
+    return grid
+
+
+def seeded_spreadsheet(
+    backend: FakeSheetsBackend | None = None,
+    *,
+    people: Sequence[str] = ("Alex Kim", "Sam Lee", "Jordan Park", "Riley Chen", "Taylor Diaz", "Morgan Wu"),
+    oncall_title: str = "On Call 4/13 - 4/19",
+    seed: int = 0,
+) -> FakeSpreadsheet:
+    """Workbook with UNH, MC, On-Call and roster tabs shaped like production."""
+    ss = FakeSpreadsheet(backend)
+    ss.seed(OA_SCHEDULE_SHEETS[0], unh_mc_layout(people, seed=seed), rows=1000, cols=26)
+    ss.seed(OA_SCHEDULE_SHEETS[1], unh_mc_layout(people, seed=seed + 1), rows=1000, cols=26)
+    ss.seed(oncall_title, oncall_layout(people, seed=seed + 2), rows=200, cols=26)
+    ss.seed(ROSTER_SHEET, [[ROSTER_NAME_COLUMN_HEADER]] + [[p] for p in people], rows=200, cols=5)
+    return ss
@@ -5,24 +5,178 @@ Centralizes Streamlit secrets auth + basic retry/backoff for quota bursts.
 
 from __future__ import annotations
 
+import contextvars
 import random
+import threading
 import time
-from typing import Callable, TypeVar
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Callable, Hashable, Mapping, TypeVar
 
 import gspread
 import streamlit as st
 from google.oauth2.service_account import Credentials
 from gspread.exceptions import APIError
 
+from .. import config as _config
+from ..core.action_context import current_action
+
+try:
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except Exception:  # pragma: no cover - older/newer Streamlit layouts
+    add_script_run_ctx = get_script_run_ctx = None
+
 T = TypeVar("T")
 
+# ─────── Quota governor ───────
+# Sheets allows ~60 read and ~60 write requests per minute per user (the
+# service account). Every call below is admitted through one token bucket per
+# kind, so sessions pace themselves instead of each discovering the limit via
+# 429s. Waiting callers are served by priority: writes/locks, then interactive
+# reads, then background refreshes.
+
+PRIORITY_WRITE = 0
+PRIORITY_INTERACTIVE = 1
+PRIORITY_BACKGROUND = 2
+
+try:
+    _READS_PER_MIN = int(getattr(_config, "SHEETS_READS_PER_MIN", 60))
+    _WRITES_PER_MIN = int(getattr(_config, "SHEETS_WRITES_PER_MIN", 60))
+    _MAX_ADMIT_WAIT_SEC = float(getattr(_config, "SHEETS_MAX_ADMIT_WAIT_SEC", 30))
+except Exception:
+    _READS_PER_MIN, _WRITES_PER_MIN, _MAX_ADMIT_WAIT_SEC = 60, 60, 30.0
+
+_WRITE_FN_NAMES = {
+    "add_worksheet", "append_row", "append_rows", "batch_clear", "batch_update",
+    "clear", "del_worksheet", "delete_rows", "format", "insert_row", "insert_rows",
+    "update", "update_acell", "update_cell", "update_cells", "update_title",
+    "values_append", "values_batch_update", "values_clear", "values_update",
+}
+
+_priority_var: contextvars.ContextVar[int | None] = contextvars.ContextVar("sheets_priority", default=None)
+
+
+@contextmanager
+def sheets_priority(priority: int):
+    """Run the enclosed Sheets calls at ``priority`` (PRIORITY_* constants)."""
+    token = _priority_var.set(int(priority))
+    try:
+        yield
+    finally:
+        _priority_var.reset(token)
+
+
+def _is_quota_error(e: BaseException) -> bool:
+    sc = getattr(getattr(e, "response", None), "status_code", None)
+    s = str(e).lower()
+    return sc == 429 or "429" in s or "quota exceeded" in s
+
+
+def call_kind(fn: Callable) -> str:
+    name = str(getattr(fn, "__name__", "") or "")
+    return "write" if name in _WRITE_FN_NAMES else "read"
+
+
+class QuotaGovernor:
+    def __init__(self, reads_per_min: int = _READS_PER_MIN, writes_per_min: int = _WRITES_PER_MIN):
+        self._cond = threading.Condition()
+        now = time.monotonic()
+        # kind -> [capacity, tokens, refill_per_sec, last_refill]
+        self._buckets = {
+            "read": [float(reads_per_min), float(reads_per_min), reads_per_min / 60.0, now],
+            "write": [float(writes_per_min), float(writes_per_min), writes_per_min / 60.0, now],
+        }
+        self._waiting = {"read": [0, 0, 0], "write": [0, 0, 0]}
+        self._cooldown_until = 0.0
+        self.admitted = {"read": 0, "write": 0}
+        self.throttled = 0
+        self.quota_errors = 0
+        self.wait_sec = 0.0
+
+    def _refill(self, kind: str, now: float) -> None:
+        b = self._buckets[kind]
+        b[1] = min(b[0], b[1] + (now - b[3]) * b[2])
+        b[3] = now
+
+    def acquire(self, kind: str, priority: int, *, max_wait: float = _MAX_ADMIT_WAIT_SEC) -> bool:
+        """Block until a ``kind`` token is free for ``priority``; False if ``max_wait`` ran out."""
+        kind = "write" if kind == "write" else "read"
+        priority = min(max(int(priority), PRIORITY_WRITE), PRIORITY_BACKGROUND)
+        t0 = time.monotonic()
+        deadline = t0 + max_wait
+        with self._cond:
+            self._waiting[kind][priority] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(kind, now)
+                    ahead = any(self._waiting[kind][p] for p in range(priority))
+                    cooling = now < self._cooldown_until
+                    b = self._buckets[kind]
+                    if not cooling and not ahead and b[1] >= 1.0:
+                        b[1] -= 1.0
+                        self.admitted[kind] += 1
+                        self.wait_sec += now - t0
+                        return True
+                    if now >= deadline:
+                        self.throttled += 1
+                        self.wait_sec += now - t0
+                        return False
+                    if cooling:
+                        pause = self._cooldown_until - now
+                    else:
+                        pause = max(0.01, (1.0 - b[1]) / b[2]) if b[1] < 1.0 else 0.05
+                    self._cond.wait(min(pause, deadline - now, 1.0))
+            finally:
+                self._waiting[kind][priority] -= 1
+                self._cond.notify_all()
+
+    def penalize(self, delay: float) -> None:
+        """A 429 came back: hold every caller for ``delay`` seconds."""
+        with self._cond:
+            self.quota_errors += 1
+            self._cooldown_until = max(self._cooldown_until, time.monotonic() + max(0.0, delay))
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            now = time.monotonic()
+            for kind in self._buckets:
+                self._refill(kind, now)
+            return {
+                "admitted": dict(self.admitted),
+                "tokens": {k: round(b[1], 2) for k, b in self._buckets.items()},
+                "throttled": self.throttled,
+                "quota_errors": self.quota_errors,
+                "wait_sec": round(self.wait_sec, 3),
+                "cooling_sec": round(max(0.0, self._cooldown_until - now), 3),
+            }
+
+
+@st.cache_resource(show_spinner=False)
+def sheets_governor() -> QuotaGovernor:
+    return QuotaGovernor()
+
+
+def governed(fn: Callable[..., T], *args, **kwargs) -> T:
+    """Single Sheets call admitted by the governor (no retries)."""
+    kind = call_kind(fn)
+    priority = _priority_var.get()
+    if priority is None:
+        priority = PRIORITY_WRITE if kind == "write" else PRIORITY_INTERACTIVE
+    sheets_governor().acquire(kind, priority)
+    action = current_action()
+    if action is not None:
+        action.count_call(kind, str(getattr(fn, "__name__", "") or "call"))
+    return fn(*args, **kwargs)
+
 
 def with_backoff(fn: Callable[..., T], *args, **kwargs) -> T:
     """Retry gspread calls on 429/5xx with exponential backoff + jitter."""
     base = 0.6
     for i in range(6):
         try:
-            return fn(*args, **kwargs)
+            return governed(fn, *args, **kwargs)
         except Exception as e:  # noqa: BLE001
             sc = getattr(getattr(e, "response", None), "status_code", None)
             transient = isinstance(e, APIError) and sc in (429, 500, 502, 503, 504)
@@ -31,7 +185,11 @@ def with_backoff(fn: Callable[..., T], *args, **kwargs) -> T:
             if transient or textual_quota:
                 if i == 5:
                     raise
-                time.sleep(base * (2 ** i) + random.uniform(0, 0.4))
+                delay = base * (2 ** i) + random.uniform(0, 0.4)
+                if _is_quota_error(e):
+                    sheets_governor().penalize(delay)
+                else:
+                    time.sleep(delay)
                 continue
             raise
 
@@ -40,14 +198,93 @@ def retry_429(fn: Callable[..., T], *args, retries: int = 5, backoff: float = 0.
     """Generic retry helper for 429 bursts on non-batch gspread ops."""
     for i in range(retries):
         try:
-            return fn(*args, **kwargs)
+            return governed(fn, *args, **kwargs)
         except Exception as e:  # noqa: BLE001
-            s = str(e).lower()
-            if "429" in s or "quota exceeded" in s:
-                time.sleep(backoff * (2 ** i))
+            if _is_quota_error(e):
+                sheets_governor().penalize(backoff * (2 ** i))
                 continue
             raise
-    return fn(*args, **kwargs)
+    return governed(fn, *args, **kwargs)
+
+
+# ─────── I/O executor ───────
+# Independent tab reads (UNH, MC, On-Call) can be in flight together. Workers
+# inherit the caller's Streamlit script context (session_state keeps working)
+# and its contextvars, so the governor still sees the caller's priority.
+
+try:
+    _IO_POOL_SIZE = int(getattr(_config, "SHEETS_IO_POOL_SIZE", 4))
+    _IO_TIMEOUT_SEC = float(getattr(_config, "SHEETS_IO_TIMEOUT_SEC", 20))
+except Exception:
+    _IO_POOL_SIZE, _IO_TIMEOUT_SEC = 4, 20.0
+
+_io_local = threading.local()
+
+
+@st.cache_resource(show_spinner=False)
+def sheets_io_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=max(1, _IO_POOL_SIZE), thread_name_prefix="sheets-io")
+
+
+def _in_worker(fn: Callable[[], T], script_ctx) -> Callable[[], T]:
+    ctx = contextvars.copy_context()
+
+    def run() -> T:
+        thread = threading.current_thread()
+        _io_local.active = True
+        if add_script_run_ctx is not None and script_ctx is not None:
+            add_script_run_ctx(thread, script_ctx)
+        try:
+            return ctx.run(fn)
+        finally:
+            _io_local.active = False
+            if add_script_run_ctx is not None and script_ctx is not None:
+                # Pooled threads outlive the run; don't leave a stale session attached.
+                setattr(thread, "streamlit_script_run_ctx", None)
+
+    return run
+
+
+def run_parallel(calls: Mapping[Hashable, Callable[[], T]], *, timeout: float | None = None) -> dict:
+    """Run independent Sheets calls on the I/O pool.
+
+    Returns ``{key: result}`` for the calls that finished within ``timeout``
+    seconds without raising; the others are left out, so callers treat them
+    like any other failed read. Runs inline when the pool has one worker, for a
+    single call, or when already on a pool thread (no nested fan-out).
+    """
+    timeout = _IO_TIMEOUT_SEC if timeout is None else float(timeout)
+    out: dict = {}
+    if _IO_POOL_SIZE <= 1 or len(calls) <= 1 or getattr(_io_local, "active", False):
+        for key, fn in calls.items():
+            try:
+                out[key] = fn()
+            except Exception:
+                pass
+        return out
+
+    script_ctx = get_script_run_ctx() if get_script_run_ctx is not None else None
+    pool = sheets_io_executor()
+    futures = {key: pool.submit(_in_worker(fn, script_ctx)) for key, fn in calls.items()}
+    wait(list(futures.values()), timeout=timeout)
+    for key, fut in futures.items():
+        if not fut.done():
+            fut.cancel()
+            continue
+        if fut.cancelled() or fut.exception() is not None:
+            continue
+        out[key] = fut.result()
+    return out
+
+
+def submit_background(fn: Callable[[], T]) -> Future:
+    """Fire-and-forget refresh on the I/O pool at PRIORITY_BACKGROUND (no session context)."""
+
+    def run() -> T:
+        with sheets_priority(PRIORITY_BACKGROUND):
+            return fn()
+
+    return sheets_io_executor().submit(_in_worker(run, None))
 
 
 @st.cache_resource(show_spinner=False)
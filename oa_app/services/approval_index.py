@@ -0,0 +1,176 @@
+"""Idempotency keys and an open-request index for the Sheets approval queue.
+
+``submit_request`` must not queue the same request twice (a double click, a
+rerun after a timeout). In Sheets mode that check used to read up to 1000
+queue rows and compare seven fields, before every submit and again on a
+failed append. Each row now carries ``request_key()``, a hash of the
+normalized payload, in its ``Key`` column; ``ApprovalIndex`` maps the keys of
+open (PENDING / PROCESSING) rows to their ID and row number, so the check is a
+dictionary lookup plus a one-row read to confirm the hit.
+
+The index is shared by all sessions and rebuilt from the approval mirror
+after each sync, which is what picks up rows added or reviewed straight in
+Google Sheets; local submits and status changes update it in place.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time as _pytime
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Mapping, NamedTuple, Optional
+
+import streamlit as st
+
+from .approval_mirror import OPEN_STATUSES
+
+# payload fields, in key order
+KEY_FIELDS = ("Requester", "Action", "Campus", "Day", "Start", "End", "Details")
+
+
+def request_key(*, requester: str, action: str, campus: str, day: str, start: str, end: str, details: str) -> str:
+    """Stable key for a request payload (fields compared the way dedupe always has: stripped, exact)."""
+    parts = (requester, action, campus, day, start, end, details)
+    raw = "\x1f".join(str(p or "").strip() for p in parts)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def row_key(row: Mapping[str, object]) -> str:
+    """The row's stored key, or one computed from its fields (rows queued before the Key column)."""
+    stored = str(row.get("Key", "") or "").strip()
+    if stored:
+        return stored
+    fields = [row.get(name, "") for name in KEY_FIELDS]
+    return request_key(
+        requester=fields[0], action=fields[1], campus=fields[2], day=fields[3], start=fields[4], end=fields[5], details=fields[6]
+    )
+
+
+class OpenRef(NamedTuple):
+    req_id: str
+    row: int  # 0 while an append's row number is not known yet
+    status: str
+
+
+@dataclass
+class _QueueIndex:
+    by_key: Dict[str, OpenRef] = field(default_factory=dict)
+    key_by_row: Dict[int, str] = field(default_factory=dict)
+    built_at: float = 0.0
+
+
+class ApprovalIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queues: Dict[str, _QueueIndex] = {}
+        self.hits = 0
+        self.misses = 0
+        self.rebuilds = 0
+
+    def load(self, ss_id: str, rows: Iterable[Mapping[str, object]]) -> None:
+        """Replace the index from a complete read of the queue (claims still being appended are kept)."""
+        queue = _QueueIndex(built_at=_pytime.time())
+        seen_ids = set()
+        for row in rows:
+            seen_ids.add(str(row.get("ID", "") or "").strip())
+            status = str(row.get("Status", "") or "").strip().upper()
+            if status not in OPEN_STATUSES:
+                continue
+            key = row_key(row)
+            try:
+                rownum = int(row.get("_row", 0) or 0)
+            except Exception:
+                rownum = 0
+            queue.by_key.setdefault(key, OpenRef(str(row.get("ID", "") or "").strip(), rownum, status))
+            if rownum:
+                queue.key_by_row[rownum] = key
+        with self._lock:
+            held = self._queues.get(str(ss_id))
+            for key, ref in (held.by_key.items() if held is not None else ()):
+                if not ref.row and ref.req_id not in seen_ids:
+                    queue.by_key.setdefault(key, ref)
+            self._queues[str(ss_id)] = queue
+            self.rebuilds += 1
+
+    def lookup(self, ss_id: str, key: str) -> Optional[OpenRef]:
+        with self._lock:
+            queue = self._queues.get(str(ss_id))
+            ref = queue.by_key.get(key) if queue is not None else None
+            if ref is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return ref
+
+    def claim(self, ss_id: str, key: str, req_id: str) -> Optional[OpenRef]:
+        """Reserve ``key`` for a new request; returns the open request already holding it instead."""
+        with self._lock:
+            queue = self._queues.setdefault(str(ss_id), _QueueIndex())
+            held = queue.by_key.get(key)
+            if held is not None:
+                return held
+            queue.by_key[key] = OpenRef(str(req_id), 0, "PENDING")
+            return None
+
+    def placed(self, ss_id: str, key: str, req_id: str, row: int) -> None:
+        """Record the row a claimed request landed on."""
+        with self._lock:
+            queue = self._queues.get(str(ss_id))
+            if queue is None or queue.by_key.get(key, OpenRef("", 0, "")).req_id != str(req_id):
+                return
+            queue.by_key[key] = OpenRef(str(req_id), int(row), "PENDING")
+            if row:
+                queue.key_by_row[int(row)] = key
+
+    def release(self, ss_id: str, key: str, req_id: str = "") -> None:
+        with self._lock:
+            queue = self._queues.get(str(ss_id))
+            if queue is None:
+                return
+            ref = queue.by_key.get(key)
+            if ref is not None and (not req_id or ref.req_id == str(req_id)):
+                del queue.by_key[key]
+                queue.key_by_row.pop(ref.row, None)
+
+    def set_status(self, ss_id: str, row: int, status: str) -> None:
+        """Follow a local status change; a reviewed request stops blocking resubmits."""
+        status = str(status or "").strip().upper()
+        with self._lock:
+            queue = self._queues.get(str(ss_id))
+            key = queue.key_by_row.get(int(row)) if queue is not None else None
+            if key is None:
+                return
+            ref = queue.by_key.get(key)
+            if ref is None or ref.row != int(row):
+                return
+            if status in OPEN_STATUSES:
+                queue.by_key[key] = ref._replace(status=status)
+            else:
+                del queue.by_key[key]
+                del queue.key_by_row[int(row)]
+
+    def invalidate(self, ss_id: Optional[str] = None) -> None:
+        with self._lock:
+            if ss_id is None:
+                self._queues.clear()
+            else:
+                self._queues.pop(str(ss_id), None)
+
+    def clear(self) -> None:
+        self.invalidate()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queues": len(self._queues),
+                "open": sum(len(q.by_key) for q in self._queues.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "rebuilds": self.rebuilds,
+            }
+
+
+@st.cache_resource(show_spinner=False)
+def approval_index() -> ApprovalIndex:
+    return ApprovalIndex()
@@ -0,0 +1,210 @@
+"""Shared local mirror of the approval queue.
+
+The chat handler, the approver inbox and "My Requests" each re-read the whole
+queue (``A1:M500`` / ``A1:M1000``, or the newest 500 Supabase rows) on a
+five-second TTL, under different window sizes that never shared a cache
+entry. ``ApprovalMirror`` keeps one copy of the queue per spreadsheet for all
+sessions instead. A sync fetches only what it does not have: rows past the
+last sheet row read (Supabase: created at or after the newest
+``created_at``), plus the rows from the first open request down to the
+cursor, since review happens after the append. Those re-read rows must still
+carry the IDs the mirror has for them; a row deleted or inserted by hand
+shifts them and forces a full reload, as does ``APPROVAL_RESYNC_SEC``.
+Status changes made from this process are patched straight in.
+
+Readers take copies of the newest ``max_rows`` rows, whatever window they ask
+for.
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+import time as _pytime
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import streamlit as st
+
+from .. import config as _config
+
+try:
+    _SYNC_SEC = float(getattr(_config, "APPROVAL_SYNC_SEC", 5))
+except Exception:
+    _SYNC_SEC = 5.0
+try:
+    _RESYNC_SEC = float(getattr(_config, "APPROVAL_RESYNC_SEC", 300))
+except Exception:
+    _RESYNC_SEC = 300.0
+
+OPEN_STATUSES = frozenset({"PENDING", "PROCESSING"})
+
+
+@dataclass
+class MirroredQueue:
+    rows: List[dict] = field(default_factory=list)  # oldest first
+    by_id: Dict[str, int] = field(default_factory=dict)  # ID -> position in rows
+    row_count: int = 1  # Sheets cursor: last sheet row read (1 = header only)
+    created_cursor: str = ""  # Supabase cursor: newest created_at seen
+    synced_at: float = 0.0
+    loaded_at: float = 0.0
+
+
+def _is_open(row: Mapping[str, object]) -> bool:
+    return str(row.get("Status", "") or "").strip().upper() in OPEN_STATUSES
+
+
+class ApprovalMirror:
+    def __init__(self, sync_sec: float = _SYNC_SEC, resync_sec: float = _RESYNC_SEC):
+        self.sync_sec = float(sync_sec)
+        self.resync_sec = float(resync_sec)
+        self._lock = threading.Lock()
+        self._queues: Dict[str, MirroredQueue] = {}
+        self.syncs = 0
+        self.reloads = 0
+        self.patches = 0
+
+    # ─────── sync planning ───────
+    def due(self, ss_id: str, now: Optional[float] = None) -> Optional[str]:
+        """"reload", "tail" or None (fresh enough)."""
+        now = _pytime.time() if now is None else now
+        with self._lock:
+            queue = self._queues.get(str(ss_id))
+            if queue is None or now - queue.loaded_at >= self.resync_sec:
+                return "reload"
+            if now - queue.synced_at >= self.sync_sec:
+                return "tail"
+            return None
+
+    def cursors(self, ss_id: str) -> Tuple[int, str]:
+        """(last sheet row read, newest created_at) for the next tail fetch."""
+        with self._lock:
+            queue = self._queues.get(str(ss_id)) or MirroredQueue()
+            return queue.row_count, queue.created_cursor
+
+    def open_rows(self, ss_id: str) -> List[dict]:
+        with self._lock:
+            queue = self._queues.get(str(ss_id))
+            return [dict(row) for row in (queue.rows if queue is not None else ()) if _is_open(row)]
+
+    def all_rows(self, ss_id: str) -> List[dict]:
+        with self._lock:
+            queue = self._queues.get(str(ss_id))
+            return [dict(row) for row in (queue.rows if queue is not None else ())]
+
+    def touch(self, ss_id: str) -> None:
+        """Make the next read sync (a local append the mirror has not seen yet)."""
+        with self._lock:
+            queue = self._queues.get(str(ss_id))
+            if queue is not None:
+                queue.synced_at = 0.0
+
+    # ─────── updates ───────
+    def replace(self, ss_id: str, rows: Iterable[dict], *, row_count: int = 1, created_cursor: str = "") -> None:
+        now = _pytime.time()
+        queue = MirroredQueue(row_count=int(row_count), created_cursor=str(created_cursor or ""), synced_at=now, loaded_at=now)
+        for row in rows:
+            _put(queue, dict(row))
+        with self._lock:
+            self._queues[str(ss_id)] = queue
+            self.reloads += 1
+
+    def extend(self, ss_id: str, rows: Iterable[dict], *, row_count: int = 0, created_cursor: str = "") -> int:
+        """Add rows past the cursor (a row whose ID is already mirrored replaces it); returns how many were new."""
+        added = 0
+        with self._lock:
+            queue = self._queues.setdefault(str(ss_id), MirroredQueue())
+            for row in rows:
+                added += _put(queue, dict(row))
+            queue.row_count = max(queue.row_count, int(row_count or 0))
+            queue.created_cursor = max(queue.created_cursor, str(created_cursor or ""))
+            queue.synced_at = _pytime.time()
+            self.syncs += 1
+        return added
+
+    def appended(self, ss_id: str, row: dict) -> bool:
+        """Take a row this process just appended, if it lands right at the cursor (else the next sync reads it)."""
+        rownum = int(row.get("_row", 0) or 0)
+        with self._lock:
+            queue = self._queues.get(str(ss_id))
+            if queue is None or not rownum or rownum != queue.row_count + 1:
+                return False
+            _put(queue, dict(row))
+            queue.row_count = rownum
+            return True
+
+    def patch(self, ss_id: str, fields: Mapping[str, object], *, req_id: str = "", row: int = 0) -> bool:
+        """Update one mirrored request in place, found by ID or sheet row."""
+        with self._lock:
+            queue = self._queues.get(str(ss_id))
+            if queue is None:
+                return False
+            pos = queue.by_id.get(str(req_id).strip()) if req_id else None
+            if pos is None and row:
+                pos = next((i for i, r in enumerate(queue.rows) if r.get("_row") == int(row)), None)
+            if pos is None:
+                return False
+            queue.rows[pos].update(fields)
+            self.patches += 1
+            return True
+
+    # ─────── reads ───────
+    def find(self, ss_id: str, *, req_id: str = "", row: int = 0) -> Optional[dict]:
+        with self._lock:
+            queue = self._queues.get(str(ss_id))
+            if queue is None:
+                return None
+            if req_id:
+                pos = queue.by_id.get(str(req_id).strip())
+                if pos is not None:
+                    return dict(queue.rows[pos])
+            if row:
+                for r in queue.rows:
+                    if r.get("_row") == int(row):
+                        return dict(r)
+            return None
+
+    def rows(self, ss_id: str, max_rows: int, *, newest_first: bool = False) -> List[dict]:
+        """Copies of the newest ``max_rows`` mirrored requests."""
+        with self._lock:
+            queue = self._queues.get(str(ss_id))
+            window = queue.rows[-int(max_rows):] if queue is not None and int(max_rows) > 0 else []
+            out = copy.deepcopy(window)
+        return out[::-1] if newest_first else out
+
+    def invalidate(self, ss_id: Optional[str] = None) -> None:
+        with self._lock:
+            if ss_id is None:
+                self._queues.clear()
+            else:
+                self._queues.pop(str(ss_id), None)
+
+    def clear(self) -> None:
+        self.invalidate()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queues": len(self._queues),
+                "rows": sum(len(q.rows) for q in self._queues.values()),
+                "syncs": self.syncs,
+                "reloads": self.reloads,
+                "patches": self.patches,
+            }
+
+
+def _put(queue: MirroredQueue, row: dict) -> int:
+    rid = str(row.get("ID", "") or "").strip()
+    pos = queue.by_id.get(rid) if rid else None
+    if pos is not None:
+        queue.rows[pos] = row
+        return 0
+    if rid:
+        queue.by_id[rid] = len(queue.rows)
+    queue.rows.append(row)
+    return 1
+
+
+@st.cache_resource(show_spinner=False)
+def approval_mirror() -> ApprovalMirror:
+    return ApprovalMirror()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import re
 from datetime import datetime
 from uuid import uuid4
 
@@ -10,8 +11,12 @@ import streamlit as st
 
 from ..config import APPROVAL_SHEET
 from ..core.quotas import bump_ws_version
+from ..core.range_cache import single_flight
+from ..core.ws_registry import invalidate_worksheet_registry, open_worksheet
 from ..integrations.gspread_io import with_backoff
 from ..integrations.supabase_io import get_supabase, supabase_enabled, with_retry
+from .approval_index import approval_index, request_key, row_key
+from .approval_mirror import OPEN_STATUSES, approval_mirror
 
 
 _HEADERS = [[
@@ -28,7 +33,13 @@ _HEADERS = [[
     "ReviewedBy",
     "ReviewedAt",
     "ReviewNote",
+    "Key",
 ]]
+_LAST_COL = "N"
+_UPDATED_ROW_RE = re.compile(r"![A-Z]+(\d+)")
+_TAIL_CHUNK = 500  # sheet rows per tail read
+_REVIEW_FIELDS = ("Status", "ReviewedBy", "ReviewedAt", "ReviewNote")  # columns J:M
+_DB_RELOAD_ROWS = 1000
 
 
 def _map_db_row(row: dict) -> dict:
@@ -128,7 +139,31 @@ def find_matching_open_request(
                 return mapped
         return None
 
-    rows = read_requests(ss, max_rows=1000)
+    key = request_key(
+        requester=requester, action=action, campus=campus, day=day, start=start, end=end, details=details
+    )
+    if want_statuses <= OPEN_STATUSES:
+        index = approval_index()
+        ss_id = str(getattr(ss, "id", ""))
+        sync_requests(ss)
+        ref = index.lookup(ss_id, key)
+        if ref is None:
+            return None
+        if not ref.row:
+            # claimed by a submit in this process whose row number we do not know
+            return {"ID": ref.req_id, "Status": ref.status, "Key": key, "_row": 0}
+        confirmed = _read_row(ss, ref.row)
+        if (
+            confirmed is not None
+            and str(confirmed.get("ID", "")).strip() == ref.req_id
+            and row_key(confirmed) == key
+            and str(confirmed.get("Status", "")).strip().upper() in want_statuses
+        ):
+            return confirmed
+        sync_requests(ss, reload=True)
+        rows = approval_mirror().all_rows(ss_id)
+    else:
+        rows = read_requests(ss, max_rows=1000)
     for row in rows:
         if _same_request_payload(
             row,
@@ -160,30 +195,64 @@ def get_request(
         data = list(getattr(resp, "data", None) or [])
         return _map_db_row(data[0]) if data else None
 
-    rows = read_requests(ss, max_rows=int(max_rows))
-    if req_id:
-        for item in rows:
-            if str(item.get("ID", "")).strip() == str(req_id).strip():
-                return item
-    if row:
-        for item in rows:
-            try:
-                if int(item.get("_row", 0)) == int(row):
-                    return item
-            except Exception:
-                continue
+    # the mirror says where the request is; its row is re-read so the status is current
+    ss_id = str(getattr(ss, "id", ""))
+    mirror = approval_mirror()
+    sync_requests(ss)
+    for attempt in range(2):
+        if attempt:
+            sync_requests(ss, reload=True)
+        known = mirror.find(ss_id, req_id=req_id, row=row)
+        rownum = int((known or {}).get("_row") or row or 0)
+        fresh = _read_row(ss, rownum) if rownum else None
+        if fresh is not None and (not req_id or str(fresh.get("ID", "")).strip() == str(req_id).strip()):
+            mirror.patch(ss_id, fresh, row=rownum)
+            return fresh
+        if not req_id:
+            return None
     return None
 
 
 def ensure_approval_sheet(ss: gspread.Spreadsheet) -> gspread.Worksheet:
     try:
-        return with_backoff(ss.worksheet, APPROVAL_SHEET)
+        return open_worksheet(ss, APPROVAL_SHEET)
     except gspread.WorksheetNotFound:
         ws = with_backoff(ss.add_worksheet, title=APPROVAL_SHEET, rows=2000, cols=20)
-        with_backoff(ws.update, range_name="A1:M1", values=_HEADERS)
+        invalidate_worksheet_registry(ss)
+        with_backoff(ws.update, range_name=f"A1:{_LAST_COL}1", values=_HEADERS)
         return ws
 
 
+def _sheet_rows(values: list, first_row: int) -> list[dict]:
+    """Queue rows mapped onto the standard headers (columns are positional: writes address J:M)."""
+    out: list[dict] = []
+    for i, row in enumerate(values, start=first_row):
+        if not any(str(x).strip() for x in row):
+            continue
+        item = {name: (row[j] if j < len(row) else "") for j, name in enumerate(_HEADERS[0])}
+        item["_row"] = i
+        out.append(item)
+    return out
+
+
+def _read_row(ss: gspread.Spreadsheet, row: int) -> dict | None:
+    """One queue row by number."""
+    ws = ensure_approval_sheet(ss)
+    values = with_backoff(ws.get, f"A{int(row)}:{_LAST_COL}{int(row)}") or []
+    got = _sheet_rows(values[:1], int(row))
+    return got[0] if got else None
+
+
+def _appended_row(resp) -> int:
+    """Row number from an ``append_row`` response (0 if the response does not say)."""
+    try:
+        updated = str(((resp or {}).get("updates") or {}).get("updatedRange") or "")
+    except Exception:
+        return 0
+    m = _UPDATED_ROW_RE.search(updated)
+    return int(m.group(1)) if m else 0
+
+
 def submit_request(
     ss: gspread.Spreadsheet,
     *,
@@ -245,16 +314,24 @@ def submit_request(
             if existing:
                 return str(existing.get("ID", "")).strip()
             raise
+        approval_mirror().touch(str(getattr(ss, "id", "")))
         return rid
 
+    key = request_key(
+        requester=requester, action=action, campus=campus, day=day, start=start, end=end, details=details
+    )
+    index = approval_index()
+    ss_id = str(getattr(ss, "id", ""))
+    held = index.claim(ss_id, key, rid)
+    if held is not None:
+        return held.req_id
+
     ws = ensure_approval_sheet(ss)
+    values = [rid, now, requester, action, campus, day, start, end, details, "PENDING", "", "", "", key]
     try:
-        with_backoff(
-            ws.append_row,
-            [rid, now, requester, action, campus, day, start, end, details, "PENDING", "", "", ""],
-            value_input_option="RAW",
-        )
+        resp = with_backoff(ws.append_row, values, value_input_option="RAW")
     except Exception:
+        index.release(ss_id, key, rid)
         existing = find_matching_open_request(
             ss,
             requester=requester,
@@ -268,31 +345,123 @@ def submit_request(
         if existing:
             return str(existing.get("ID", "")).strip()
         raise
+    rownum = _appended_row(resp)
+    index.placed(ss_id, key, rid, rownum)
+    if not approval_mirror().appended(ss_id, {**dict(zip(_HEADERS[0], values)), "_row": rownum}):
+        approval_mirror().touch(ss_id)
     bump_ws_version(ws)
     return rid
 
 
-def read_requests(ss: gspread.Spreadsheet, *, max_rows: int = 500) -> list[dict]:
-    if _use_db():
-        sb = get_supabase()
+def _sync_sheet(ss: gspread.Spreadsheet, ss_id: str, reload: bool) -> None:
+    """Re-read the rows from the first open request to the cursor, then the rows past it.
+
+    Every re-read row must still carry the ID the mirror has for it. A row
+    deleted or inserted by hand shifts them, and the mirror is then reloaded
+    instead of patched.
+    """
+    mirror = approval_mirror()
+    ws = ensure_approval_sheet(ss)
+    row_count = 1
+    if not reload:
+        row_count, _ = mirror.cursors(ss_id)
+        ids_by_row = {int(r["_row"]): str(r.get("ID", "")).strip() for r in mirror.all_rows(ss_id) if r.get("_row")}
+        open_rows = sorted(int(r["_row"]) for r in mirror.open_rows(ss_id) if r.get("_row"))
+        first = open_rows[0] if open_rows else row_count
+        ranges = [f"A{row_count + 1}:{_LAST_COL}{row_count + _TAIL_CHUNK}"]
+        if row_count > 1:
+            ranges.append(f"A{first}:{_LAST_COL}{row_count}")
+        got = with_backoff(ws.batch_get, ranges) or []
+        known = [list(r) for r in (got[1] if len(got) > 1 else [])]
+        for rownum in range(first, row_count + 1) if row_count > 1 else ():
+            cells = known[rownum - first] if rownum - first < len(known) else []
+            if rownum in ids_by_row and str(cells[0] if cells else "").strip() != ids_by_row[rownum]:
+                reload = True
+                break
+        if not reload:
+            for rownum in open_rows:
+                cells = known[rownum - first]
+                review = {name: (cells[9 + j] if 9 + j < len(cells) else "") for j, name in enumerate(_REVIEW_FIELDS)}
+                mirror.patch(ss_id, review, req_id=ids_by_row[rownum])
+            values = [list(r) for r in (got[0] if got else [])]
+    if reload:
+        row_count = 1
+        values = [list(r) for r in with_backoff(ws.get, f"A2:{_LAST_COL}{1 + _TAIL_CHUNK}") or []]
+    fresh: list[dict] = []
+    while True:
+        fresh.extend(_sheet_rows(values, row_count + 1))
+        row_count += len(values)
+        if len(values) < _TAIL_CHUNK:
+            break
+        values = [list(r) for r in with_backoff(ws.get, f"A{row_count + 1}:{_LAST_COL}{row_count + _TAIL_CHUNK}") or []]
+    if reload:
+        mirror.replace(ss_id, fresh, row_count=row_count)
+    else:
+        mirror.extend(ss_id, fresh, row_count=row_count)
+    approval_index().load(ss_id, mirror.all_rows(ss_id))
+
+
+def _sync_db(ss_id: str, reload: bool) -> None:
+    """Fetch rows created since the cursor and the review fields of rows still open."""
+    mirror = approval_mirror()
+    sb = get_supabase()
+    if reload:
         resp = with_retry(
-            lambda: sb.table("approvals").select("*").order("created_at", desc=True).limit(int(max_rows)).execute()
+            lambda: sb.table("approvals").select("*").order("created_at", desc=True).limit(_DB_RELOAD_ROWS).execute()
         )
-        return [_map_db_row(row) for row in getattr(resp, "data", None) or []]
+        rows = [_map_db_row(raw) for raw in reversed(list(getattr(resp, "data", None) or []))]
+        cursor = max((str(r.get("Created", "") or "") for r in rows), default="")
+        mirror.replace(ss_id, rows, created_cursor=cursor)
+        return
 
-    ws = ensure_approval_sheet(ss)
-    values = with_backoff(ws.get, f"A1:M{max_rows}") or []
-    if not values or len(values) < 2:
-        return []
-    headers = [str(h).strip() for h in values[0]]
-    out: list[dict] = []
-    for i, row in enumerate(values[1:], start=2):
-        if not any(str(x).strip() for x in row):
-            continue
-        item = {headers[j]: (row[j] if j < len(row) else "") for j in range(len(headers))}
-        item["_row"] = i
-        out.append(item)
-    return out
+    _, cursor = mirror.cursors(ss_id)
+    open_ids = [str(r.get("ID", "")) for r in mirror.open_rows(ss_id) if r.get("ID")]
+    if open_ids:
+        resp = with_retry(
+            lambda: sb.table("approvals")
+            .select("id,status,reviewed_by,reviewed_at,review_note,error_message")
+            .in_("id", open_ids)
+            .execute()
+        )
+        for raw in getattr(resp, "data", None) or []:
+            mapped = _map_db_row(raw)
+            mirror.patch(ss_id, {k: mapped[k] for k in (*_REVIEW_FIELDS, "ErrorMessage")}, req_id=mapped["ID"])
+
+    def tail():
+        query = sb.table("approvals").select("*")
+        if cursor:
+            # created_at is second resolution: re-read the cursor's second, the mirror dedupes by ID
+            query = query.gte("created_at", cursor)
+        return query.order("created_at").limit(_DB_RELOAD_ROWS).execute()
+
+    resp = with_retry(tail)
+    rows = [_map_db_row(raw) for raw in getattr(resp, "data", None) or []]
+    mirror.extend(ss_id, rows, created_cursor=max((str(r.get("Created", "") or "") for r in rows), default=""))
+
+
+def sync_requests(ss: gspread.Spreadsheet, *, force: bool = False, reload: bool = False) -> None:
+    """Bring the shared mirror up to date when it is due (``force``: now, ``reload``: from scratch)."""
+    ss_id = str(getattr(ss, "id", ""))
+    due = "reload" if reload else approval_mirror().due(ss_id)
+    if due is None and force:
+        due = "tail"
+    if due is None:
+        return
+    use_db = _use_db()
+
+    def run() -> None:
+        if use_db:
+            _sync_db(ss_id, due == "reload")
+        else:
+            _sync_sheet(ss, ss_id, due == "reload")
+
+    single_flight().do(("approvals", ss_id, due), run)
+
+
+def read_requests(ss: gspread.Spreadsheet, *, max_rows: int = 500) -> list[dict]:
+    """The newest ``max_rows`` requests from the shared mirror (Sheets: sheet order, Supabase: newest first)."""
+    sync_requests(ss)
+    return approval_mirror().rows(str(getattr(ss, "id", "")), int(max_rows), newest_first=_use_db())
 
 
 def set_status(
@@ -321,11 +490,21 @@ def set_status(
             with_retry(lambda: sb.table("approvals").update(payload).eq("id", req_id).execute())
         except Exception:
             current = get_request(ss, req_id=req_id)
-            if str((current or {}).get("Status", "")).strip().upper() == str(status or "").strip().upper():
-                return
-            raise
+            if str((current or {}).get("Status", "")).strip().upper() != str(status or "").strip().upper():
+                raise
+        approval_mirror().patch(
+            str(getattr(ss, "id", "")),
+            {"Status": status, "ReviewedBy": reviewed_by, "ReviewedAt": now, "ReviewNote": note, "ErrorMessage": error_message},
+            req_id=req_id,
+        )
         return
 
+    if req_id:
+        # the caller's row may be stale (rows deleted or inserted by hand): find the request by ID
+        current = get_request(ss, req_id=req_id, row=row)
+        if current is None:
+            raise ValueError(f"Request {req_id} is no longer in the approval sheet")
+        row = int(current.get("_row", 0) or 0)
     if not row:
         raise ValueError("set_status requires row in Sheets mode")
     ws = ensure_approval_sheet(ss)
@@ -334,6 +513,13 @@ def set_status(
     except Exception:
         current = get_request(ss, row=row)
         if str((current or {}).get("Status", "")).strip().upper() == str(status or "").strip().upper():
+            approval_index().set_status(str(getattr(ss, "id", "")), row, status)
             return
         raise
+    approval_mirror().patch(
+        str(getattr(ss, "id", "")),
+        {"Status": status, "ReviewedBy": reviewed_by, "ReviewedAt": now, "ReviewNote": note},
+        row=row,
+    )
+    approval_index().set_status(str(getattr(ss, "id", "")), row, status)
     bump_ws_version(ws)
@@ -9,6 +9,7 @@ import streamlit as st
 
 from ..config import AUDIT_SHEET
 from ..core.utils import fmt_time
+from ..core.ws_registry import invalidate_worksheet_registry, open_worksheet
 from ..integrations.gspread_io import with_backoff
 from ..integrations.supabase_io import get_supabase, supabase_enabled, with_retry
 
@@ -24,9 +25,10 @@ def _use_db() -> bool:
 
 def ensure_audit_sheet(ss: gspread.Spreadsheet) -> gspread.Worksheet:
     try:
-        return with_backoff(ss.worksheet, AUDIT_SHEET)
+        return open_worksheet(ss, AUDIT_SHEET)
     except gspread.WorksheetNotFound:
         ws = with_backoff(ss.add_worksheet, title=AUDIT_SHEET, rows=2000, cols=10)
+        invalidate_worksheet_registry(ss)
         with_backoff(ws.update, range_name="A1:H1", values=_HEADERS)
         return ws
 
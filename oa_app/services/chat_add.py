@@ -5,16 +5,21 @@ from typing import List, Optional, Tuple, Dict, Callable
 import re
 import streamlit as st
 import gspread
+import numpy as np
 from .hours import invalidate_hours_caches
 
 from .locks import get_or_create_locks_sheet, acquire_fcfs_lock, lock_key
 from ..core.utils import fmt_time
-from .hours import total_hours_from_unh_mc_and_neighbor
+from ..core.snapshot import fresh_snapshots
+from ..core.write_plan import WritePlan
+from ..core.ws_registry import open_worksheet, visible_titles
+from .hours_ledger import HoursEvent, record_event, week_hours
+from .schedule_index import schedule_index
+from .tab_layout import tab_layout
 from .schedule_query import (
     get_user_schedule,
     _read_grid,
     _canon_day_from_header,
-    _TIME_CELL_RE,
     _parse_time_cell,
     _RANGE_RE,
     _cached_ws_titles,
@@ -44,7 +49,7 @@ def _resolve_campus_title(ss, requested_campus_or_tab: Optional[str], sidebar_ta
     titles = _cached_ws_titles(getattr(ss, "id", "")) or []
     if not titles:
         try:
-            titles = [w.title for w in ss.worksheets() if not getattr(w, "_properties", {}).get("hidden", False)]
+            titles = visible_titles(ss)
         except Exception:
             titles = []
     if not titles:
@@ -286,26 +291,13 @@ def _header_day_cols(grid: List[List[str]], dbg: Optional[Callable[[str], None]]
     return best
 
 def _time_row_indices(grid: List[List[str]]) -> List[int]:
-    out: List[int] = []
-    for r, row in enumerate(grid):
-        c0 = (row[0] if len(row) >= 1 else "") or ""
-        if _TIME_CELL_RE.match(c0) and _parse_time_cell(c0):
-            out.append(r)
-    return out
+    return schedule_index(grid).time_rows
 
 def _slot_bands_by_time(grid: List[List[str]]) -> Dict[str, Tuple[int, int]]:
     bands: Dict[str, Tuple[int, int]] = {}
-    rows = _time_row_indices(grid)
-    if not rows:
-        return bands
-    rows = rows + [len(grid)]
-    for i in range(len(rows) - 1):
-        r0, r1 = rows[i], rows[i + 1]
-        start_label = (grid[r0][0] if len(grid[r0]) >= 1 else "") or ""
-        dt = _parse_time_cell(start_label)
-        if dt:
-            label = dt.strftime("%I:%M %p").lstrip("0")
-            bands[label] = (r0, r1)
+    for band in schedule_index(grid).time_bands:
+        label = band.start.strftime("%I:%M %p").lstrip("0")
+        bands[label] = (band.r0, band.r1)
     return bands
 
 # ───────────────────────── On-Call inference from blocks ─────────────────────────
@@ -353,12 +345,7 @@ def _check_unh_mc_capacity_via_grid(
     if not grid:
         return False, ["sheet empty"], {}
 
-    day_cols = _header_day_cols(grid, dbg=dbg)
-    if day_canon not in day_cols:
-        c_guess = _find_day_col_anywhere(grid, day_canon)
-        if c_guess is not None:
-            day_cols = dict(day_cols)
-            day_cols[day_canon] = c_guess
+    day_cols = tab_layout(grid).unh_mc_day_cols(day_canon)
 
     if day_canon not in day_cols:
         if debug and dbg:
@@ -367,7 +354,12 @@ def _check_unh_mc_capacity_via_grid(
         return False, [f"Could not read weekday header (day '{day_canon}' missing)."], {}
     c0 = day_cols[day_canon]
 
+    idx = schedule_index(grid)
     bands = _slot_bands_by_time(grid)
+    slot_of = {band.start.strftime("%I:%M %p").lstrip("0"): s for s, band in enumerate(idx.time_bands)}
+    occ = idx.occupancy(day_cols.values(), _is_blankish)
+    filled = occ.column(c0)
+    counts = occ.fill_counts(c0)
     slots = _range_to_slots(start_dt, end_dt)
     reasons: List[str] = []
     detail: Dict[str, Dict[str, object]] = {}
@@ -378,34 +370,32 @@ def _check_unh_mc_capacity_via_grid(
 
     for (sdt, _edt) in slots:
         label = sdt.strftime("%I:%M %p").lstrip("0")
-        band = bands.get(label)
-        if not band:
+        s = slot_of.get(label)
+        if s is None:
             reasons.append(f"{label} — no time-row band in sheet")
             continue
 
-        r0, r1 = band
-        lane_rows = list(range(r0 + 1, r1))
-        vals = [(grid[rr][c0] if rr < len(grid) and c0 < len(grid[rr]) else "") for rr in lane_rows]
-
-        filled_rows = [i for i, v in enumerate(vals) if not _is_blankish(v)]
-        empty_rows  = [i for i, v in enumerate(vals) if _is_blankish(v)]
+        lane_rows = list(idx.time_bands[s].lane_rows)
+        n_filled = int(counts[s])
+        filled_rows = [int(i) for i in np.flatnonzero(filled[s, : len(lane_rows)])]
+        empty_rows = [int(i) for i in np.flatnonzero(~filled[s, : len(lane_rows)])]
         detail[label] = {
             "lane_rows": lane_rows,
-            "vals": vals,
+            "vals": [idx.cell(rr, c0) for rr in lane_rows],
             "filled_rows": filled_rows,
             "empty_rows": empty_rows,
             "col0": c0
         }
 
         if debug and dbg:
-            dbg(f"⏱️ {label}: rows {[rr+1 for rr in lane_rows]} → {vals} (filled={len(filled_rows)}, empty_lanes={empty_rows})")
+            dbg(f"⏱️ {label}: rows {[rr+1 for rr in lane_rows]} → {detail[label]['vals']} (filled={n_filled}, empty_lanes={empty_rows})")
 
         if per_slot_cap is None:
             if not empty_rows:
                 reasons.append(f"{label} — no empty cells")
         else:
-            if len(filled_rows) >= per_slot_cap:
-                reasons.append(f"{label} — at capacity ({len(filled_rows)}/{per_slot_cap})")
+            if n_filled >= per_slot_cap:
+                reasons.append(f"{label} — at capacity ({n_filled}/{per_slot_cap})")
 
     ok = (len(reasons) == 0)
     return ok, reasons, detail
@@ -468,32 +458,10 @@ def _check_oncall_capacity_via_grid(
         for r_idx, row in first_rows:
             dbg(f"🧰 Row {r_idx+1} preview: {row}")
 
-    day_cols = _day_cols_from_first_row(grid, dbg=dbg)
-
-    if day_canon not in day_cols:
-        hdr = _header_day_cols(grid, dbg=dbg)
-        for k, v in hdr.items():
-            day_cols.setdefault(k, v)
-        if dbg:
-            dbg(f"🧰 merged _header_day_cols → {day_cols}")
-
-    if day_canon not in day_cols:
-        inferred = _infer_day_cols_by_blocks(grid, dbg=dbg)
-        for k, v in inferred.items():
-            day_cols.setdefault(k, v)
-        if dbg:
-            dbg(f"🧰 merged _infer_day_cols_by_blocks → {day_cols}")
-
-    if day_canon not in day_cols:
-        c_guess = _find_day_col_anywhere(grid, day_canon)
-        if c_guess is not None:
-            day_cols[day_canon] = c_guess
-            if dbg: dbg(f"🧰 _find_day_col_anywhere → {day_cols}")
-    if day_canon not in day_cols:
-        c_guess2 = _find_day_col_fuzzy(grid, day_canon, dbg=dbg)
-        if c_guess2 is not None:
-            day_cols[day_canon] = c_guess2
-            if dbg: dbg(f"🧰 _find_day_col_fuzzy → {day_cols}")
+    layout = tab_layout(grid)
+    day_cols = layout.oncall_day_cols(day_canon)
+    if dbg:
+        dbg(f"🧰 layout {layout.fingerprint & 0xFFFFFF:06x} day columns → {day_cols}")
 
     if day_canon not in day_cols:
         if debug and dbg:
@@ -595,7 +563,7 @@ def _find_working_oncall_ws(
 
     if not cached:
         try:
-            all_titles = [w.title for w in ss.worksheets() if _ONCALL_TITLE_RE.search(w.title)]
+            all_titles = [t for t in visible_titles(ss, include_hidden=True) if _ONCALL_TITLE_RE.search(t)]
             for t in all_titles:
                 if t not in ordered_titles:
                     ordered_titles.append(t)
@@ -607,7 +575,7 @@ def _find_working_oncall_ws(
 
     for title in ordered_titles:
         try:
-            ws = ss.worksheet(title)
+            ws = open_worksheet(ss, title)
         except Exception:
             continue
         if dbg: dbg(f"🔎 Checking On-Call tab: {title}")
@@ -621,6 +589,7 @@ def _find_working_oncall_ws(
     return None
 
 # ───────────────────────── Main entry ─────────────────────────
+@fresh_snapshots
 def handle_add(
     st, ss, schedule, *,
     actor_name: str, canon_target_name: str,
@@ -676,7 +645,7 @@ def handle_add(
     dbg(f"🧭 Day raw={repr(day)} canon={day_canon!r}")
 
     # 20h weekly cap (pre)
-    week_hours_now = total_hours_from_unh_mc_and_neighbor(ss, schedule, canon_target_name)
+    week_hours_now = week_hours(ss, schedule, canon_target_name)
     dbg(f"📈 Weekly hours before: {week_hours_now:.1f}h")
     if week_hours_now + (req_minutes / 60.0) > 20.0:
         fail(f"More than 20 hours: have {week_hours_now:.1f}h; request {req_minutes/60:.1f}h.")
@@ -686,7 +655,7 @@ def handle_add(
     if campus_kind == "ONCALL":
         # Directly open the tab by title; do NOT build SheetInfo here (it expects weekday headers).
         try:
-            ws0 = ss.worksheet(sheet_title)
+            ws0 = open_worksheet(ss, sheet_title)
         except Exception as e:
             fail(f"Could not open worksheet '{sheet_title}': {e}")
     else:
@@ -742,29 +711,9 @@ def handle_add(
         # Resolve the column for this weekday (with rich debug)
         grid = _read_grid(ws)
         dbg(f"🧩 Top row (first 12 cols): { (grid[0][:12] if grid and grid[0] else []) }")
-        day_cols = _day_cols_from_first_row(grid, dbg=dbg)
-        if day_canon not in day_cols:
-            hdr = _header_day_cols(grid, dbg=dbg)
-            for k2, v2 in hdr.items():
-                day_cols.setdefault(k2, v2)
-            dbg(f"🧰 merged _header_day_cols → {day_cols}")
-
-        if day_canon not in day_cols:
-            inferred = _infer_day_cols_by_blocks(grid, dbg=dbg)
-            for k2, v2 in inferred.items():
-                day_cols.setdefault(k2, v2)
-            dbg(f"🧰 merged _infer_day_cols_by_blocks → {day_cols}")
-
-        if day_canon not in day_cols:
-            c_guess = _find_day_col_anywhere(grid, day_canon)
-            if c_guess is not None:
-                day_cols[day_canon] = c_guess
-                dbg(f"🧰 _find_day_col_anywhere → {day_cols}")
-        if day_canon not in day_cols:
-            c_guess2 = _find_day_col_fuzzy(grid, day_canon, dbg=dbg)
-            if c_guess2 is not None:
-                day_cols[day_canon] = c_guess2
-                dbg(f"🧰 _find_day_col_fuzzy → {day_cols}")
+        layout = tab_layout(grid)
+        day_cols = layout.oncall_day_cols(day_canon)
+        dbg(f"🧰 layout {layout.fingerprint & 0xFFFFFF:06x} day columns → {day_cols}")
 
         if day_canon not in day_cols:
             # Dump a small grid preview into the error so we can see what's actually in that header row
@@ -787,25 +736,24 @@ def handle_add(
         if not lane_rows:
             fail("On-Call block has no lane rows defined.")
 
-        wrote = False
+        plan = WritePlan()
         for rr in lane_rows:
             v = grid[rr][c0] if (rr < len(grid) and c0 < len(grid[rr])) else ""
             if _is_blankish(v):
-                ws.update_cell(rr + 1, c1 + 1, f"OA: {canon_target_name}")  # gspread is 1-based
-                wrote = True
-                # Force hours + pictorial recompute after On-Call add
-                try:
-                    invalidate_hours_caches()  # bumps HOURS_EPOCH for compute_hours_fast cache_data
-                    ts = datetime.now().timestamp()
-                    st.session_state["schedule_refresh_key"] = ts
-                    st.session_state["hours_refresh_key"] = ts
-                except Exception:
-                    pass
-
-                dbg(f"📝 Wrote at r{rr+1}, c{c1+1} → 'OA: {canon_target_name}'")
+                plan.set_value(ws, rr, c1, f"OA: {canon_target_name}")
+                dbg(f"📝 Staged r{rr+1}, c{c1+1} → 'OA: {canon_target_name}'")
                 break
-        if not wrote:
+        if not len(plan):
             fail("On-Call block filled before write; please retry.")
+        plan.commit()
+        # Force hours + pictorial recompute after On-Call add
+        try:
+            invalidate_hours_caches()  # bumps HOURS_EPOCH for compute_hours_fast cache_data
+            ts = datetime.now().timestamp()
+            st.session_state["schedule_refresh_key"] = ts
+            st.session_state["hours_refresh_key"] = ts
+        except Exception:
+            pass
 
         target_title = ws.title
 
@@ -823,13 +771,9 @@ def handle_add(
         if not won:
             fail("Another request just claimed this window. Try again.")
 
-        # Write per 30-min band
-        grid = _read_grid(ws0)
-        day_cols = _header_day_cols(grid, dbg=dbg)
-        if day_canon not in day_cols:
-            c_guess = _find_day_col_anywhere(grid, day_canon)
-            if c_guess is not None:
-                day_cols = dict(day_cols); day_cols[day_canon] = c_guess
+        # Stage one write per 30-min band; the local copy tracks staged cells
+        grid = [list(row) for row in _read_grid(ws0)]
+        day_cols = tab_layout(grid).unh_mc_day_cols(day_canon)
         if day_canon not in day_cols:
             _debug_dump_header_scan(grid, dbg)
             _debug_dump_grid_head(ws0.title, grid, dbg)
@@ -842,6 +786,7 @@ def handle_add(
 
         bands = _slot_bands_by_time(grid)
 
+        plan = WritePlan()
         for (sdt, _edt) in req_slots:
             label = sdt.strftime("%I:%M %p").lstrip("0")
             band = bands.get(label)
@@ -867,10 +812,9 @@ def handle_add(
             for rr in lane_rows:
                 v = grid[rr][c0] if (rr < len(grid) and c0 < len(grid[rr])) else ""
                 if _is_blankish(v):
-                    # ✅ Correct: row is 1-based, col is col_1based
-                    ws0.update_cell(rr + 1, col_1based, f"OA: {canon_target_name}")
+                    plan.set_value(ws0, rr, c0, f"OA: {canon_target_name}")
                     wrote = True
-                    dbg(f"📝 Wrote at r{rr+1}, c{col_1based} → 'OA: {canon_target_name}'")
+                    dbg(f"📝 Staged r{rr+1}, c{col_1based} → 'OA: {canon_target_name}'")
                     # Keep local grid in sync for subsequent slots
                     if rr < len(grid):
                         if c0 >= len(grid[rr]):
@@ -880,11 +824,22 @@ def handle_add(
             if not wrote:
                 fail(f"Slot {label} filled before write; please retry.")
 
+        # One batchUpdate for the whole range: all slots land or none do
+        plan.commit()
+        try:
+            invalidate_hours_caches()
+            ts = datetime.now().timestamp()
+            st.session_state["schedule_refresh_key"] = ts
+            st.session_state["hours_refresh_key"] = ts
+        except Exception:
+            pass
 
         target_title = ws0.title
 
+    record_event(ss, HoursEvent("add", canon_target_name, day_canon, campus_kind, req_minutes))
+
     # Success
-    fresh_total = total_hours_from_unh_mc_and_neighbor(ss, schedule, canon_target_name)
+    fresh_total = week_hours(ss, schedule, canon_target_name)
     return (
         f" Added **{canon_target_name}** on **{target_title}** "
         f"({day_canon.title()} {fmt_time(start_dt)}–{fmt_time(end_dt)}). "
@@ -8,57 +8,71 @@ import gspread
 import streamlit as st
 
 from ..core.utils import fmt_time
+from ..core.snapshot import fresh_snapshots
+from ..core.write_plan import WritePlan
+from ..core.ws_registry import open_worksheet
 from .chat_add import (
     _ensure_dt,
     _is_half_hour_boundary_dt,
     _range_to_slots,
     _canon_input_day,
-    _day_cols_from_first_row,
-    _header_day_cols,
-    _find_day_col_anywhere,
-    _find_day_col_fuzzy,
-    _infer_day_cols_by_blocks,
     _resolve_campus_title,
 )
 from .schedule_query import _TIME_CELL_RE, _RANGE_RE, _parse_time_cell, _read_grid
+from .schedule_index import schedule_index
+from .tab_layout import tab_layout
 
 
 _ORANGE = {"red": 1.0, "green": 0.65, "blue": 0.0}
 _RED = {"red": 0.95, "green": 0.25, "blue": 0.25}
 
 
+def _loose_norm(s: str) -> str:
+    c = str(s).replace("\xa0", " ").strip().lower()
+    c = re.sub(r"\b(oa|goa)\s*:\s*", "", c, flags=re.I)
+    return re.sub(r"\s+", " ", c)
+
+
+def _loose_target(canon_name: str) -> str:
+    t = str(canon_name).replace("\xa0", " ").strip().lower()
+    return re.sub(r"\s+", " ", t)
+
+
+def _loose_contains(cell_norm: str, target: str) -> bool:
+    return target in cell_norm
+
+
 def _cell_has_name_loose(cell: str, canon_name: str) -> bool:
     if not cell or not canon_name:
         return False
-    c = str(cell).replace("\xa0", " ").strip().lower()
-    c = re.sub(r"\b(oa|goa)\s*:\s*", "", c, flags=re.I)
-    c = re.sub(r"\s+", " ", c)
-    t = str(canon_name).replace("\xa0", " ").strip().lower()
-    t = re.sub(r"\s+", " ", t)
-    return t in c
+    return _loose_contains(_loose_norm(cell), _loose_target(canon_name))
+
 
+def _loose_name_cells(grid: List[List[str]], canon_name: str) -> frozenset[tuple[int, int]]:
+    """Every ``(row, col)`` of ``grid`` that ``_cell_has_name_loose`` accepts, via the shared index."""
+    if not canon_name:
+        return frozenset()
+    return schedule_index(grid).find_cells(
+        _loose_target(canon_name), normalize=_loose_norm, test=_loose_contains
+    )
 
-def _format_cells(ws: gspread.Worksheet, coords: list[tuple[int, int]], rgb: dict) -> None:
+
+def _format_cells(
+    ws: gspread.Worksheet,
+    coords: list[tuple[int, int]],
+    rgb: dict,
+    *,
+    plan: WritePlan | None = None,
+) -> None:
+    """Colour ``coords``; staged on ``plan`` if given, otherwise committed right away."""
     if not coords:
         return
-    requests = []
+    own_plan = plan is None
+    plan = plan if plan is not None else WritePlan()
     for (r0, c0) in coords:
-        requests.append(
-            {
-                "repeatCell": {
-                    "range": {
-                        "sheetId": ws.id,
-                        "startRowIndex": r0,
-                        "endRowIndex": r0 + 1,
-                        "startColumnIndex": c0,
-                        "endColumnIndex": c0 + 1,
-                    },
-                    "cell": {"userEnteredFormat": {"backgroundColor": rgb}},
-                    "fields": "userEnteredFormat.backgroundColor",
-                }
-            }
-        )
-    ws.spreadsheet.batch_update({"requests": requests})
+        plan.set_background(ws, r0, c0, rgb)
+    if own_plan:
+        plan.commit()
 
 
 def _resolve_oncall_day_col(
@@ -66,23 +80,10 @@ def _resolve_oncall_day_col(
     day_canon: str,
     dbg: Optional[Callable[[str], None]] = None,
 ) -> int | None:
-    day_cols = _day_cols_from_first_row(grid, dbg=dbg)
-    if day_canon not in day_cols:
-        hdr = _header_day_cols(grid, dbg=dbg)
-        for k, v in hdr.items():
-            day_cols.setdefault(k, v)
-    if day_canon not in day_cols:
-        inferred = _infer_day_cols_by_blocks(grid, dbg=dbg)
-        for k, v in inferred.items():
-            day_cols.setdefault(k, v)
-    if day_canon not in day_cols:
-        c_guess = _find_day_col_anywhere(grid, day_canon)
-        if c_guess is not None:
-            day_cols[day_canon] = c_guess
-    if day_canon not in day_cols:
-        c_guess2 = _find_day_col_fuzzy(grid, day_canon, dbg=dbg)
-        if c_guess2 is not None:
-            day_cols[day_canon] = c_guess2
+    layout = tab_layout(grid)
+    day_cols = layout.oncall_day_cols(day_canon)
+    if dbg:
+        dbg(f"🧭 layout {layout.fingerprint & 0xFFFFFF:06x} → {day_cols}")
     return day_cols.get(day_canon)
 
 
@@ -106,6 +107,7 @@ def _collect_oncall_targets(
         return [], []
 
     label_rows.append(len(grid))
+    name_cells = _loose_name_cells(grid, canon_target_name)
     target_coords: list[tuple[int, int]] = []
     matched_blocks: list[tuple[datetime, datetime]] = []
     seen_blocks: set[tuple[datetime, datetime]] = set()
@@ -133,10 +135,7 @@ def _collect_oncall_targets(
 
         found = False
         for rr in range(r_label + 1, r_next):
-            if rr >= len(grid) or day_col >= len(grid[rr]):
-                continue
-            v = (grid[rr][day_col] if day_col < len(grid[rr]) else "") or ""
-            if _cell_has_name_loose(v, canon_target_name):
+            if (rr, day_col) in name_cells:
                 target_coords.append((rr, day_col))
                 found = True
 
@@ -149,6 +148,7 @@ def _collect_oncall_targets(
     return target_coords, matched_blocks
 
 
+@fresh_snapshots
 def handle_callout(
     st, ss, schedule, *,
     canon_target_name: str,
@@ -156,8 +156,13 @@ def handle_callout(
     day: str,
     start, end,
     covered_by: Optional[str] = None,
+    plan: WritePlan | None = None,
 ) -> str:
-    """Mark a callout on the sheet: red for uncovered, orange for covered."""
+    """Mark a callout on the sheet: red for uncovered, orange for covered.
+
+    The colours are staged on ``plan`` when one is given (the caller commits it
+    together with its note), otherwise written right away.
+    """
     debug_log: List[str] = []
 
     def dbg(msg: str):
@@ -181,7 +186,7 @@ def handle_callout(
     dbg(f"Using sheet: {sheet_title} ({campus_kind})")
 
     try:
-        ws = ss.worksheet(sheet_title)
+        ws = open_worksheet(ss, sheet_title)
     except Exception as e:
         fail(f"Could not open worksheet '{sheet_title}': {e}")
 
@@ -218,15 +223,12 @@ def handle_callout(
             start_dt = min(bs for bs, _ in matched_blocks)
             end_dt = max(be for _, be in matched_blocks)
     else:
-        day_cols = _header_day_cols(grid, dbg=dbg)
-        if day_canon not in day_cols:
-            c_guess = _find_day_col_anywhere(grid, day_canon)
-            if c_guess is not None:
-                day_cols[day_canon] = c_guess
+        day_cols = tab_layout(grid).unh_mc_day_cols(day_canon)
         if day_canon not in day_cols:
             fail(f"Could not read weekday header (day '{day_canon}' missing).")
 
         c0 = day_cols[day_canon]
+        name_cells = _loose_name_cells(grid, canon_target_name)
         rows = [
             r for r, row in enumerate(grid)
             if len(row) >= 1 and _TIME_CELL_RE.match(row[0] or "") and _parse_time_cell(row[0])
@@ -245,8 +247,7 @@ def handle_callout(
             r0, r1 = bands[label]
             lane_rows = list(range(r0 + 1, r1))
             for rr in lane_rows:
-                v = (grid[rr][c0] if (rr < len(grid) and c0 < len(grid[rr])) else "") or ""
-                if _cell_has_name_loose(v, canon_target_name):
+                if (rr, c0) in name_cells:
                     target_coords.append((rr, c0))
                     break
 
@@ -254,7 +255,7 @@ def handle_callout(
             fail(f"{canon_target_name} not found in UNH/MC lanes for the selected window.")
 
     color = _ORANGE if (covered_by or "").strip() else _RED
-    _format_cells(ws, target_coords, color)
+    _format_cells(ws, target_coords, color, plan=plan)
 
     label = f"{day_canon.title()} {fmt_time(start_dt)}-{fmt_time(end_dt)}"
     if (covered_by or "").strip():
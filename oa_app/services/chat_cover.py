@@ -7,24 +7,26 @@ from dateutil import parser as dateparser
 import gspread
 
 from ..core.utils import fmt_time
+from ..core.snapshot import fresh_snapshots
+from ..core.write_plan import WritePlan
+from ..core.ws_registry import open_worksheet
 from .chat_add import (
     _ensure_dt,
     _is_half_hour_boundary_dt,
     _range_to_slots,
     _canon_input_day,
-    _header_day_cols,
-    _find_day_col_anywhere,
     _resolve_campus_title,
 )
 from .chat_callout import (
     _ORANGE,
     _RED,
-    _cell_has_name_loose,
+    _loose_name_cells,
     _collect_oncall_targets,
     _format_cells,
     _resolve_oncall_day_col,
 )
 from .schedule_query import _TIME_CELL_RE, _parse_time_cell, _read_grid
+from .tab_layout import tab_layout
 
 
 def _a1_col(idx_1_based: int) -> str:
@@ -37,13 +39,9 @@ def _a1_col(idx_1_based: int) -> str:
 
 
 def _weekly_swaps_col_from_grid(grid: List[List[str]], campus_kind: str) -> int:
-    header_targets = {"shift swaps for the week"}
-    for r in range(min(3, len(grid))):
-        row = grid[r]
-        for c, raw in enumerate(row):
-            val = str(raw or "").strip().lower()
-            if val in header_targets:
-                return c
+    col = tab_layout(grid).swaps_col
+    if col is not None:
+        return col
     return 10 if campus_kind == "ONCALL" else 8
 
 
@@ -138,6 +136,7 @@ def _append_weekly_swap_note(
     *,
     note_col: int,
     note: str,
+    plan: WritePlan,
 ) -> None:
     col_1_based = note_col + 1
     col_a1 = _a1_col(col_1_based)
@@ -156,9 +155,10 @@ def _append_weekly_swap_note(
     if target_row is None:
         target_row = max(3, len(flat) + 1)
 
-    ws.update(f"{col_a1}{target_row}", [[note]])
+    plan.append_note(ws, target_row - 1, note_col, note)
 
 
+@fresh_snapshots
 def handle_cover(
     st,
     ss,
@@ -198,7 +198,7 @@ def handle_cover(
     dbg(f"Using sheet: {sheet_title} ({campus_kind})")
 
     try:
-        ws = ss.worksheet(sheet_title)
+        ws = open_worksheet(ss, sheet_title)
     except Exception as e:
         fail(f"Could not open worksheet '{sheet_title}': {e}")
 
@@ -237,15 +237,12 @@ def handle_cover(
             start_dt = min(bs for bs, _ in matched_blocks)
             end_dt = max(be for _, be in matched_blocks)
     else:
-        day_cols = _header_day_cols(grid, dbg=dbg)
-        if day_canon not in day_cols:
-            c_guess = _find_day_col_anywhere(grid, day_canon)
-            if c_guess is not None:
-                day_cols[day_canon] = c_guess
+        day_cols = tab_layout(grid).unh_mc_day_cols(day_canon)
         if day_canon not in day_cols:
             fail(f"Could not read weekday header (day '{day_canon}' missing).")
 
         day_col = day_cols[day_canon]
+        name_cells = _loose_name_cells(grid, canon_target_name)
         rows = [
             r
             for r, row in enumerate(grid)
@@ -264,8 +261,7 @@ def handle_cover(
                 continue
             r0, r1 = bands[label]
             for rr in range(r0 + 1, r1):
-                v = (grid[rr][day_col] if (rr < len(grid) and day_col < len(grid[rr])) else "") or ""
-                if _cell_has_name_loose(v, canon_target_name):
+                if (rr, day_col) in name_cells:
                     target_coords.append((rr, day_col))
                     break
 
@@ -277,7 +273,8 @@ def handle_cover(
     if not red_coords:
         fail(f"No red callout found for {canon_target_name} in the selected window.")
 
-    _format_cells(ws, red_coords, _ORANGE)
+    plan = WritePlan()
+    _format_cells(ws, red_coords, _ORANGE, plan=plan)
 
     note_col = _weekly_swaps_col_from_grid(grid, campus_kind)
     note_date = _note_date_label(grid, campus_kind, day_col, day_canon)
@@ -286,7 +283,8 @@ def handle_cover(
         f"{(actor_name or '').strip() or 'Someone'} covering {canon_target_name} | "
         f"{note_date} | {_fmt_note_time(start_dt)}-{_fmt_note_time(end_dt)} | {campus_label}"
     )
-    _append_weekly_swap_note(ws, note_col=note_col, note=note)
+    _append_weekly_swap_note(ws, note_col=note_col, note=note, plan=plan)
+    plan.commit()
 
     label = f"{day_canon.title()} {fmt_time(start_dt)}-{fmt_time(end_dt)}"
     return f"Cover marked for **{canon_target_name}** on **{sheet_title}** ({label}) - **orange**."
@@ -6,6 +6,9 @@ import gspread
 import streamlit as st
 
 from ..core.utils import fmt_time
+from ..core.snapshot import fresh_snapshots
+from ..core.write_plan import WritePlan
+from ..core.ws_registry import open_worksheet
 from .locks import get_or_create_locks_sheet, acquire_fcfs_lock, lock_key
 from .schedule_query import (
     _TIME_CELL_RE,
@@ -13,18 +16,19 @@ from .schedule_query import (
     _RANGE_RE,
     _parse_time_cell,
 )
+from .tab_layout import tab_layout
 from .chat_add import (
     _ensure_dt, _is_half_hour_boundary_dt, _range_to_slots,
     _canon_input_day,
-    _day_cols_from_first_row, _header_day_cols,
-    _find_day_col_anywhere, _find_day_col_fuzzy,
-    _infer_day_cols_by_blocks, _find_oncall_block_row_bounds,
+    _find_oncall_block_row_bounds,
     _find_working_oncall_ws, _resolve_campus_title,
     _is_blankish,
 )
-from .hours import total_hours_from_unh_mc_and_neighbor, invalidate_hours_caches
+from .hours import invalidate_hours_caches
+from .hours_ledger import HoursEvent, record_event, week_hours
 
 
+@fresh_snapshots
 def handle_remove(
     st, ss, schedule, *,
     canon_target_name: str,
@@ -72,12 +76,13 @@ def handle_remove(
     dbg(f"🧭 Day parsed: {day_canon}")
 
     any_removed = False  # track for cache invalidation
+    removed_minutes = 0
 
     # ---------- ON-CALL ----------
     if campus_kind == "ONCALL":
         # Open tab directly (avoid schedule._get_sheet which expects weekday headers)
         try:
-            ws = ss.worksheet(sheet_title)
+            ws = open_worksheet(ss, sheet_title)
         except Exception as e:
             fail(f"Could not open worksheet '{sheet_title}': {e}")
 
@@ -93,23 +98,7 @@ def handle_remove(
             fail("On-Call sheet is empty.")
 
         # Discover column for this weekday
-        day_cols = _day_cols_from_first_row(grid, dbg=dbg)
-        if day_canon not in day_cols:
-            hdr = _header_day_cols(grid, dbg=dbg)
-            for k2, v2 in hdr.items():
-                day_cols.setdefault(k2, v2)
-        if day_canon not in day_cols:
-            inferred = _infer_day_cols_by_blocks(grid, dbg=dbg)
-            for k2, v2 in inferred.items():
-                day_cols.setdefault(k2, v2)
-        if day_canon not in day_cols:
-            c_guess = _find_day_col_anywhere(grid, day_canon)
-            if c_guess is not None:
-                day_cols[day_canon] = c_guess
-        if day_canon not in day_cols:
-            c_guess2 = _find_day_col_fuzzy(grid, day_canon, dbg=dbg)
-            if c_guess2 is not None:
-                day_cols[day_canon] = c_guess2
+        day_cols = tab_layout(grid).oncall_day_cols(day_canon)
         if day_canon not in day_cols:
             fail(f"Could not read weekday header from '{ws.title}'.")
 
@@ -126,16 +115,17 @@ def handle_remove(
         if not lane_rows:
             fail("On-Call block has no lane rows defined.")
 
-        removed = False
+        plan = WritePlan()
         for rr in lane_rows:
             v = grid[rr][c0] if (rr < len(grid) and c0 < len(grid[rr])) else ""
             if v and canon_target_name.lower() in v.lower():
-                ws.update_cell(rr + 1, c1 + 1, "")  # gspread is 1-based
-                removed = True
-                any_removed = True
-                dbg(f"🧹 Cleared row {rr+1}, col {c1+1} → '{v}'")
-        if not removed:
+                plan.clear_value(ws, rr, c1)
+                dbg(f"🧹 Staged clear row {rr+1}, col {c1+1} → '{v}'")
+        if not len(plan):
             fail(f"{canon_target_name} not found in block '{want_s} – {want_e}'.")
+        plan.commit()
+        any_removed = True
+        removed_minutes = 30 * len(req_slots)
 
         target_title = ws.title
 
@@ -143,12 +133,8 @@ def handle_remove(
     else:
         info = schedule._get_sheet(sheet_title)
         ws0: gspread.Worksheet = getattr(info, "ws", info)
-        grid = _read_grid(ws0)
-        day_cols = _header_day_cols(grid, dbg=dbg)
-        if day_canon not in day_cols:
-            c_guess = _find_day_col_anywhere(grid, day_canon)
-            if c_guess is not None:
-                day_cols[day_canon] = c_guess
+        grid = [list(row) for row in _read_grid(ws0)]
+        day_cols = tab_layout(grid).unh_mc_day_cols(day_canon)
         if day_canon not in day_cols:
             fail(f"Could not read weekday header (day '{day_canon}' missing).")
 
@@ -166,6 +152,7 @@ def handle_remove(
             if _parse_time_cell(grid[r0][0])
         }
 
+        plan = WritePlan()
         for (sdt, _edt) in _range_to_slots(start_dt, end_dt):
             label = sdt.strftime("%I:%M %p").lstrip("0")
             if label not in bands:
@@ -176,17 +163,21 @@ def handle_remove(
             for rr in lane_rows:
                 v = grid[rr][c0] if (rr < len(grid) and c0 < len(grid[rr])) else ""
                 if v and canon_target_name.lower() in v.lower():
-                    ws0.update_cell(rr + 1, col_1based, "")   # ← write to correct column
+                    plan.clear_value(ws0, rr, c0)
                     cleared = True
-                    any_removed = True
-                    dbg(f"🧹 Cleared {label} r{rr+1} c{col_1based}")
+                    dbg(f"🧹 Staged clear {label} r{rr+1} c{col_1based}")
                     # keep local grid in sync for subsequent slots
                     if rr < len(grid):
                         if c0 >= len(grid[rr]):
                             grid[rr] = list(grid[rr]) + [""] * (c0 + 1 - len(grid[rr]))
                         grid[rr][c0] = ""
-            if not cleared:
+            if cleared:
+                removed_minutes += 30
+            else:
                 dbg(f"⚠️ {label}: {canon_target_name} not found in any lane.")
+        if len(plan):
+            plan.commit()
+            any_removed = True
         target_title = ws0.title
 
     # Invalidate caches / trigger UI refresh (totals + pictorial), mirroring handle_add
@@ -199,8 +190,11 @@ def handle_remove(
         except Exception:
             pass
 
+    if removed_minutes:
+        record_event(ss, HoursEvent("remove", canon_target_name, day_canon, campus_kind, removed_minutes))
+
     # Success message
-    fresh_total = total_hours_from_unh_mc_and_neighbor(ss, schedule, canon_target_name)
+    fresh_total = week_hours(ss, schedule, canon_target_name)
     return (
         f"Removed **{canon_target_name}** from **{target_title}** "
         f"({day_canon.title()} {fmt_time(start_dt)}–{fmt_time(end_dt)}). "
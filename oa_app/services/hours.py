@@ -2,25 +2,28 @@ from __future__ import annotations
 
 import os
 import re
-from datetime import datetime, timedelta
-from typing import Iterable, List, Optional, Tuple, Dict
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
 
 import gspread
-import gspread.utils as a1
 import streamlit as st
 
 from ..config import (
     OA_SCHEDULE_SHEETS,
     AUDIT_SHEET,
     LOCKS_SHEET,
-    ONCALL_MAX_COLS,
-    ONCALL_MAX_ROWS,
     ONCALL_SHEET_OVERRIDE,
     ROSTER_SHEET,
 )
-from ..core.quotas import _safe_batch_get
 from ..core import week_range as week_range_mod
-from . import schedule_query
+from ..core.snapshot import WorkbookSnapshot
+from ..core.utils import name_key, normalize_campus
+from ..core.ws_registry import open_worksheet, visible_titles
+from . import callouts_db, pickups_db, schedule_query
+from .schedule_index import schedule_index
 
 
 def _hours_debug_enabled() -> bool:
@@ -44,38 +47,18 @@ _DENY_LOW = {
 }
 
 
-@st.cache_data(ttl=120, show_spinner=False)
 def _cached_visible_titles(ss_id: str) -> list[str]:
     ss = st.session_state.get("_SS_HANDLE_BY_ID", {}).get(ss_id)
     if not ss:
         return []
-    try:
-        ws_all = ss.worksheets()
-    except Exception:
-        return []
-    titles: list[str] = []
-    for ws in ws_all:
-        try:
-            hidden = bool(getattr(ws, "_properties", {}).get("hidden", False))
-        except Exception:
-            hidden = False
-        if hidden:
-            continue
-        title = str(getattr(ws, "title", "") or "").strip()
-        if not title or title.lower() in _DENY_LOW:
-            continue
-        titles.append(title)
-    return titles
+    return [t for t in visible_titles(ss) if t.strip() and t.strip().lower() not in _DENY_LOW]
 
 
 def _three_titles_unh_mc_oncall(ss: gspread.Spreadsheet) -> list[str]:
     ss_id = getattr(ss, "id", "")
-    titles = _cached_visible_titles(ss_id)
+    titles = _cached_visible_titles(ss_id) or visible_titles(ss)
     if not titles:
-        try:
-            titles = [ws.title for ws in ss.worksheets() if not bool(getattr(ws, "_properties", {}).get("hidden", False))]
-        except Exception:
-            return []
+        return []
 
     unh_cfg, mc_cfg = OA_SCHEDULE_SHEETS[0], OA_SCHEDULE_SHEETS[1]
 
@@ -162,12 +145,8 @@ def _three_titles_unh_mc_oncall(ss: gspread.Spreadsheet) -> list[str]:
 
 
 _SPLIT_RE = re.compile(r"[,\n/&+]|(?:\s+\band\b\s+)", re.I)
-_PREFIX_RE = re.compile(r"^\s*(?:OA|GOA|On[-\s]*Call)\s*:\s*", re.I)
-
-
-def _canon(s: str) -> str:
-    s = _PREFIX_RE.sub("", s or "")
-    return " ".join("".join(ch for ch in s.lower() if ch.isalnum() or ch.isspace()).split())
+# Same key as the schedule parser and the hours ledger (``name_key`` per name run)
+_canon = schedule_query._norm_name
 
 
 def _cell_mentions_person(cell_value: str, canon_name: str) -> bool:
@@ -180,15 +159,31 @@ def _cell_mentions_person(cell_value: str, canon_name: str) -> bool:
     return any(_canon(p) == target for p in parts)
 
 
-def _count_half_hour_grid(ws: gspread.Worksheet, canon_name: str) -> float:
-    end_col_letter = a1.rowcol_to_a1(1, ONCALL_MAX_COLS).split("1")[0]
-    values = _safe_batch_get(ws, [f"A1:{end_col_letter}{ONCALL_MAX_ROWS}"])[0] or []
-    total = 0.0
-    for row in values:
-        for cell in (row or []):
-            if _cell_mentions_person(str(cell), canon_name):
-                total += 0.5
-    return total
+def _mention_keys(cell_value: str) -> Set[str]:
+    """Canonical names ``_cell_mentions_person`` would accept for this cell."""
+    keys = {_canon(cell_value)}
+    keys.update(_canon(p) for p in (p.strip() for p in _SPLIT_RE.split(str(cell_value))) if p)
+    return keys
+
+
+def _mention_counts(grid: List[List[str]], first_row: int = 0) -> Dict[str, Dict[int, int]]:
+    """Inverted index over ``grid[first_row:]``: canonical name -> {column: cells mentioning it}.
+
+    Built once per grid (memoized on its ``ScheduleIndex``), so per-person hours
+    are dictionary reads instead of a scan of every cell.
+    """
+    def build() -> Dict[str, Dict[int, int]]:
+        counts: Dict[str, Dict[int, int]] = {}
+        for row in grid[first_row:]:
+            for c, cell in enumerate(row or []):
+                if not cell:
+                    continue
+                for key in _mention_keys(str(cell)):
+                    per_col = counts.setdefault(key, {})
+                    per_col[c] = per_col.get(c, 0) + 1
+        return counts
+
+    return schedule_index(grid).memo(("hours_mention_counts", first_row), build)
 
 
 _DAY_ALIASES = {
@@ -228,33 +223,6 @@ def _find_header_row_with_days(values: List[List[str]], max_scan_rows: int = 10)
     return None, {}
 
 
-def _count_oncall_by_day_headers(ws: gspread.Worksheet, canon_name: str) -> float:
-    end_col_letter = a1.rowcol_to_a1(1, ONCALL_MAX_COLS).split("1")[0]
-    grid = _safe_batch_get(ws, [f"A1:{end_col_letter}{ONCALL_MAX_ROWS}"])[0] or []
-    header_r, day_by_col = _find_header_row_with_days(grid)
-
-    def weight_for_col(cidx: int) -> float:
-        day = day_by_col.get(cidx)
-        if not day:
-            return 5.0
-        return 5.0 if day in _WEEKDAYS else 4.0
-
-    total = 0.0
-    if header_r is None:
-        for row in grid:
-            for cell in (row or []):
-                if _cell_mentions_person(str(cell), canon_name):
-                    total += 5.0
-        return total
-
-    for r in range(header_r + 1, len(grid)):
-        row = grid[r] or []
-        for c, cell in enumerate(row, start=1):
-            if _cell_mentions_person(str(cell), canon_name):
-                total += weight_for_col(c - 1)
-    return total
-
-
 def _mins_between_12h(start: str, end: str) -> int:
     try:
         sd = datetime.strptime(str(start).strip(), "%I:%M %p")
@@ -281,58 +249,156 @@ def _hours_from_user_sched(user_sched: dict) -> float:
     return float(total_mins) / 60.0
 
 
-@st.cache_data(show_spinner=False)
-def compute_hours_fast(_ss, _schedule, canon_name: str, epoch) -> float:
-    titles = _three_titles_unh_mc_oncall(_ss)
-    if len(titles) < 1:
-        return 0.0
+# ─────── Single-pass hours ───────
+_TITLE_CAMPUS = ("UNH", "MC", "ONCALL")  # position in _three_titles_unh_mc_oncall
 
+
+class HoursSlot(NamedTuple):
+    """Minutes one rule counted: a lane range, an On-Call block or a column of name mentions."""
+
+    title: str
+    campus: str
+    day: Optional[str]
+    start: str
+    end: str
+    minutes: int
+    rule: str
+
+
+@dataclass
+class HoursBreakdown:
+    name: str
+    slots: Tuple[HoursSlot, ...] = ()
+    errors: Tuple[str, ...] = ()
+
+    @property
+    def minutes(self) -> int:
+        return sum(slot.minutes for slot in self.slots)
+
+    @property
+    def hours(self) -> float:
+        return self.minutes / 60.0
+
+    def by_rule(self) -> Dict[str, int]:
+        out: Dict[str, int] = {}
+        for slot in self.slots:
+            out[slot.rule] = out.get(slot.rule, 0) + slot.minutes
+        return out
+
+
+_SCHEDULE_KINDS = (("UNH", "UNH", "lane_range"), ("MC", "MC", "lane_range"), ("On-Call", "ONCALL", "oncall_block"))
+_MAX_BREAKDOWNS = 512
+_breakdown_lock = threading.Lock()
+# (ss_id, titles, canon name) -> (grids it was computed from, breakdown)
+_breakdowns: "OrderedDict[tuple, Tuple[tuple, HoursBreakdown]]" = OrderedDict()
+
+
+def _schedule_slots(ss, titles: List[str], canon_name: str) -> List[HoursSlot]:
+    """The person's lane ranges and On-Call blocks, from the schedule parser."""
+    user_sched = schedule_query.get_user_schedule_for_titles(
+        ss,
+        None,
+        canon_name,
+        unh_title=titles[0] if len(titles) >= 1 else None,
+        mc_title=titles[1] if len(titles) >= 2 else None,
+        oncall_title=titles[2] if len(titles) >= 3 else None,
+    )
+    out: List[HoursSlot] = []
+    for day, buckets in (user_sched or {}).items():
+        if not isinstance(buckets, dict):
+            continue
+        for pos, (key, campus, rule) in enumerate(_SCHEDULE_KINDS):
+            title = titles[pos] if pos < len(titles) else ""
+            for pair in buckets.get(key, []) or []:
+                try:
+                    start, end = pair
+                except Exception:
+                    continue
+                out.append(HoursSlot(title, campus, day, start, end, _mins_between_12h(start, end), rule))
+    return out
+
+
+def _mention_slots(grid: List[List[str]], title: str, campus: str, canon_name: str) -> List[HoursSlot]:
+    """Cells that mention the person, per column: 30 min each, On-Call 5 h (4 h on weekends)."""
+    target = _canon(canon_name)
+    if campus == "ONCALL":
+        header_r, day_by_col = _find_header_row_with_days(grid)
+        per_col = _mention_counts(grid, 0 if header_r is None else header_r + 1).get(target, {})
+        out = []
+        for c, n in sorted(per_col.items()):
+            day = day_by_col.get(c)
+            hours_each = 5.0 if not day or day in _WEEKDAYS else 4.0
+            out.append(HoursSlot(title, campus, day, "", "", int(hours_each * 60) * n, "oncall_mention"))
+        return out
+    day_by_col = {c: day for day, c in schedule_index(grid).day_cols.items()}
+    per_col = _mention_counts(grid).get(target, {})
+    return [
+        HoursSlot(title, campus, day_by_col.get(c), "", "", 30 * n, "half_hour_mention")
+        for c, n in sorted(per_col.items())
+    ]
+
+
+def _tab_grid(ss, title: str) -> Optional[List[List[str]]]:
     try:
-        unh_title = titles[0] if len(titles) >= 1 else None
-        mc_title = titles[1] if len(titles) >= 2 else None
-        on_title = titles[2] if len(titles) >= 3 else None
-        user_sched = schedule_query.get_user_schedule_for_titles(
-            _ss,
-            _schedule,
-            canon_name,
-            unh_title=unh_title,
-            mc_title=mc_title,
-            oncall_title=on_title,
-        )
-        h = _hours_from_user_sched(user_sched)
-        if h > 0:
-            return h
-
-        user_sched2 = schedule_query.get_user_schedule(_ss, _schedule, canon_name)
-        h2 = _hours_from_user_sched(user_sched2)
-        if h2 > 0:
-            return h2
+        return schedule_query._read_grid(open_worksheet(ss, title))
     except Exception:
-        pass
+        return None
 
-    total_unh = total_mc = total_on = 0.0
-    for idx, label in enumerate(("UNH", "MC")):
-        if len(titles) <= idx:
-            continue
-        title = titles[idx]
-        try:
-            ws = _ss.worksheet(title)
-            subtotal = _count_half_hour_grid(ws, canon_name)
-        except Exception:
-            subtotal = 0.0
-        if label == "UNH":
-            total_unh = subtotal
-        else:
-            total_mc = subtotal
 
-    if len(titles) >= 3:
-        try:
-            ws_on = _ss.worksheet(titles[2])
-            total_on = _count_oncall_by_day_headers(ws_on, canon_name)
-        except Exception:
-            total_on = 0.0
+def hours_breakdown(ss, canon_name: str) -> HoursBreakdown:
+    """This week's hours for one person from one pass over the UNH, MC and On-Call grids.
+
+    Lane ranges and On-Call blocks are counted first; only when they add up
+    to nothing are plain name mentions counted instead, from the same grids.
+    The result is cached, zeros included, for as long as those grid objects
+    are current (a write or a snapshot refresh replaces them). Tabs that fail
+    are listed in ``errors``.
+    """
+    titles = list(_three_titles_unh_mc_oncall(ss))[:3]
+    if not titles:
+        return HoursBreakdown(canon_name)
+    grids = tuple(_tab_grid(ss, title) for title in titles)
+    key = (str(getattr(ss, "id", "")), tuple(titles), _canon(canon_name))
+    with _breakdown_lock:
+        hit = _breakdowns.get(key)
+        if hit is not None and all(a is b for a, b in zip(hit[0], grids)) and None not in grids:
+            _breakdowns.move_to_end(key)
+            return hit[1]
+
+    errors: List[str] = []
+    try:
+        slots = _schedule_slots(ss, titles, canon_name)
+    except Exception as e:
+        errors.append(f"schedule: {e}")
+        slots = []
+    if not any(slot.minutes for slot in slots):
+        slots = []
+        for pos, (title, grid) in enumerate(zip(titles, grids)):
+            if grid is None:
+                errors.append(f"{title}: grid unavailable")
+                continue
+            try:
+                slots.extend(_mention_slots(grid, title, _TITLE_CAMPUS[pos], canon_name))
+            except Exception as e:
+                errors.append(f"{title}: {e}")
+
+    out = HoursBreakdown(canon_name, tuple(slot for slot in slots if slot.minutes), tuple(errors))
+    if None not in grids:
+        with _breakdown_lock:
+            _breakdowns[key] = (grids, out)
+            while len(_breakdowns) > _MAX_BREAKDOWNS:
+                _breakdowns.popitem(last=False)
+    return out
+
+
+def clear_hours_breakdowns() -> None:
+    with _breakdown_lock:
+        _breakdowns.clear()
+
 
-    return total_unh + total_mc + total_on
+@st.cache_data(show_spinner=False)
+def compute_hours_fast(_ss, _schedule, canon_name: str, epoch) -> float:
+    return hours_breakdown(_ss, canon_name).hours
 
 
 def invalidate_hours_caches():
@@ -340,53 +406,182 @@ def invalidate_hours_caches():
 
 
 def total_hours_from_unh_mc_and_neighbor(_ss: gspread.Spreadsheet, _schedule, canon_name: str) -> float:
-    titles = _three_titles_unh_mc_oncall(_ss)
-    if len(titles) < 1:
-        return 0.0
+    return hours_breakdown(_ss, canon_name).hours
 
-    try:
-        unh_title = titles[0] if len(titles) >= 1 else None
-        mc_title = titles[1] if len(titles) >= 2 else None
-        on_title = titles[2] if len(titles) >= 3 else None
-        user_sched = schedule_query.get_user_schedule_for_titles(
-            _ss,
-            _schedule,
-            canon_name,
-            unh_title=unh_title,
-            mc_title=mc_title,
-            oncall_title=on_title,
-        )
-        h = _hours_from_user_sched(user_sched)
-        if h > 0:
-            return h
-
-        user_sched2 = schedule_query.get_user_schedule(_ss, _schedule, canon_name)
-        h2 = _hours_from_user_sched(user_sched2)
-        if h2 > 0:
-            return h2
-    except Exception:
-        pass
 
-    total_unh = total_mc = total_on = 0.0
-    for idx, label in enumerate(("UNH", "MC")):
-        if len(titles) <= idx:
-            continue
-        title = titles[idx]
+# ─────── Whole-roster hours ───────
+_CAMPUS_ORDER = ("UNH", "MC", "ONCALL")
+
+
+@dataclass
+class PersonHours:
+    """One person's week, in minutes: ``day -> campus -> minutes`` per source."""
+
+    name: str
+    scheduled: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    callouts: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    pickups: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    @staticmethod
+    def _add(table: Dict[str, Dict[str, int]], day: str, campus: str, mins: int) -> None:
+        per_campus = table.setdefault(day, {})
+        per_campus[campus] = per_campus.get(campus, 0) + int(mins)
+
+    def day_minutes(self, day: str) -> int:
+        """Scheduled minutes minus callouts plus pickups for ``day`` (never negative)."""
+        net = sum((self.scheduled.get(day) or {}).values())
+        net -= sum((self.callouts.get(day) or {}).values())
+        net += sum((self.pickups.get(day) or {}).values())
+        return max(0, net)
+
+    @property
+    def daily_minutes(self) -> Dict[str, int]:
+        days = set(self.scheduled) | set(self.callouts) | set(self.pickups)
+        return {day: self.day_minutes(day) for day in days}
+
+    @property
+    def scheduled_minutes(self) -> int:
+        return sum(sum(v.values()) for v in self.scheduled.values())
+
+    @property
+    def callout_minutes(self) -> int:
+        return sum(sum(v.values()) for v in self.callouts.values())
+
+    @property
+    def pickup_minutes(self) -> int:
+        return sum(sum(v.values()) for v in self.pickups.values())
+
+    @property
+    def week_minutes(self) -> int:
+        return max(0, self.scheduled_minutes - self.callout_minutes + self.pickup_minutes)
+
+    def campus_minutes(self, campus: str) -> int:
+        """Scheduled minutes on one campus (``UNH``, ``MC`` or ``ONCALL``)."""
+        return sum(int(v.get(campus, 0)) for v in self.scheduled.values())
+
+
+def _campus_for_title(title: str, position: int) -> str:
+    campus = normalize_campus(title, "")
+    if campus in _CAMPUS_ORDER:
+        return campus
+    return _CAMPUS_ORDER[min(position, len(_CAMPUS_ORDER) - 1)]
+
+
+def _week_bounds_for_snapshot(titles: Iterable[str]) -> Tuple[date, date]:
+    today = week_range_mod.la_today()
+    for title in titles:
         try:
-            ws = _ss.worksheet(title)
-            subtotal = _count_half_hour_grid(ws, canon_name)
+            wr = week_range_mod.week_range_from_title(title, today=today)
         except Exception:
-            subtotal = 0.0
-        if label == "UNH":
-            total_unh = subtotal
-        else:
-            total_mc = subtotal
+            wr = None
+        if wr:
+            return wr
+    start = today - timedelta(days=(today.weekday() + 1) % 7)
+    return start, start + timedelta(days=6)
+
 
-    if len(titles) >= 3:
+def _person(out: Dict[str, PersonHours], name: str) -> Optional[PersonHours]:
+    key = name_key(name)
+    if not key:
+        return None
+    entry = out.get(key)
+    if entry is None:
+        entry = out[key] = PersonHours(name=name)
+    return entry
+
+
+def _scheduled_unh_mc(out: Dict[str, PersonHours], grid: List[List[str]], campus: str) -> None:
+    idx = schedule_index(grid)
+    day_cols = idx.day_cols
+    for band in idx.time_bands:
+        for day, c in day_cols.items():
+            if c == 0:
+                continue
+            for person in idx.band_people(band.lane_rows, c).values():
+                entry = _person(out, person["name"])
+                if entry is not None:
+                    PersonHours._add(entry.scheduled, day, campus, 30)
+
+
+def _scheduled_oncall(out: Dict[str, PersonHours], grid: List[List[str]], title: str) -> None:
+    idx = schedule_index(grid)
+    seen: Set[Tuple[str, str, datetime, datetime]] = set()
+    for day, c in idx.oncall_day_cols(schedule_query._week_bounds_for_grid(title)).items():
+        for band in idx.oncall_bands(c):
+            end = band.end if band.end > band.start else band.end + timedelta(days=1)
+            mins = int((end - band.start).total_seconds() // 60)
+            for person in idx.band_people(band.lane_rows, c).values():
+                entry = _person(out, person["name"])
+                if entry is None or (entry.name, day, band.start, band.end) in seen:
+                    continue
+                seen.add((entry.name, day, band.start, band.end))
+                PersonHours._add(entry.scheduled, day, "ONCALL", mins)
+
+
+def _fold_db_rows(
+    out: Dict[str, PersonHours],
+    rows: Iterable[dict],
+    *,
+    name_field: str,
+    bucket: str,
+) -> None:
+    for row in rows:
+        name = str(row.get(name_field) or "").strip()
         try:
-            ws_on = _ss.worksheet(titles[2])
-            total_on = _count_oncall_by_day_headers(ws_on, canon_name)
+            day = date.fromisoformat(str(row.get("event_date") or "")[:10]).strftime("%A").lower()
+            mins = int(round(float(row.get("duration_hours") or 0.0) * 60))
         except Exception:
-            total_on = 0.0
+            continue
+        if mins <= 0:
+            continue
+        entry = _person(out, name)
+        if entry is not None:
+            campus = normalize_campus(row.get("campus"), "") or "UNH"
+            PersonHours._add(getattr(entry, bucket), day, campus, mins)
+
+
+def compute_hours_for_all(
+    snapshot: WorkbookSnapshot,
+    *,
+    week_bounds: Optional[Tuple[date, date]] = None,
+    include_adjustments: bool = True,
+) -> Dict[str, PersonHours]:
+    """Everyone's week from one walk of each snapshot tab, keyed by ``name_key``.
+
+    Scheduled minutes come from the shared ``ScheduleIndex`` of each grid;
+    callouts and pickups for the week are folded in from one range query per
+    table instead of one per person.
+    """
+    out: Dict[str, PersonHours] = {}
+    titles = [t for t in (snapshot.titles if snapshot is not None else ()) if snapshot.has(t)]
+    for pos, title in enumerate(titles):
+        grid = snapshot.grid(title) or []
+        if not grid:
+            continue
+        campus = _campus_for_title(title, pos)
+        if campus == "ONCALL":
+            _scheduled_oncall(out, grid, title)
+        else:
+            _scheduled_unh_mc(out, grid, campus)
 
-    return total_unh + total_mc + total_on
+    if include_adjustments:
+        week_start, week_end = week_bounds or _week_bounds_for_snapshot(reversed(titles))
+        try:
+            _fold_db_rows(
+                out,
+                callouts_db.list_callouts_in_range(week_start=week_start, week_end=week_end),
+                name_field="caller_name",
+                bucket="callouts",
+            )
+        except Exception:
+            pass
+        try:
+            _fold_db_rows(
+                out,
+                pickups_db.list_pickups_in_range(week_start=week_start, week_end=week_end),
+                name_field="picker_name",
+                bucket="pickups",
+            )
+        except Exception:
+            pass
+    return out
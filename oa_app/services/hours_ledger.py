@@ -0,0 +1,349 @@
+"""Weekly hours per person, kept current by the actions that change them.
+
+The sidebar total, the add path's 20h check and the callout/pickup summary
+used to re-derive a person's week from the sheets (and every adjustment note)
+on each call. ``HoursLedger`` keeps one ``PersonHours`` per (spreadsheet,
+week, person) instead: scheduled minutes are seeded by one
+``compute_hours_for_all`` pass over the workbook snapshot, a person's
+callouts and pickups by their first adjustment scan, and from then on the
+add / remove / callout / pickup actions apply ``HoursEvent``s to it. Lookups
+are dictionary reads.
+
+Adjustment events carry the signature the adjustment scan dedupes on, so an
+event for a note the seeding scan already counted is a no-op. A lookup on a
+week older than ``HOURS_LEDGER_RECONCILE_SEC`` rebuilds it from a fresh
+snapshot in the background and records how far the ledger had drifted
+(edits made straight in Google Sheets are the usual cause). A rebuild that
+an event lands during is dropped and retried, so it cannot erase that event.
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+import time as _pytime
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Callable, Deque, Dict, Hashable, NamedTuple, Optional, Set, Tuple
+
+import streamlit as st
+
+from .. import config as _config
+from ..core.action_context import action_memo
+from ..core.utils import name_key
+from ..integrations.gspread_io import submit_background
+from . import schedule_query
+from .hours import PersonHours, _week_bounds_for_snapshot, compute_hours_for_all, total_hours_from_unh_mc_and_neighbor
+
+try:
+    _RECONCILE_SEC = float(getattr(_config, "HOURS_LEDGER_RECONCILE_SEC", 300))
+except Exception:
+    _RECONCILE_SEC = 300.0
+
+_DRIFT_LOG_DEPTH = 32
+_SCANNED = ""  # campus key for adjustment minutes that come from the per-day scan
+
+# event kind -> (PersonHours table, sign)
+_EVENT_TABLES = {
+    "add": ("scheduled", 1),
+    "remove": ("scheduled", -1),
+    "callout": ("callouts", 1),
+    "pickup": ("pickups", 1),
+}
+
+
+class HoursEvent(NamedTuple):
+    kind: str  # add | remove | callout | pickup
+    person: str
+    day: str
+    campus: str  # UNH | MC | ONCALL
+    minutes: int
+    signature: Optional[Hashable] = None  # adjustment-scan dedupe key (callouts/pickups)
+
+
+class DriftReport(NamedTuple):
+    ss_id: str
+    week_start: date
+    at: float
+    drift: Dict[str, int]  # name_key -> ledger minus fresh scheduled minutes (non-zero only)
+
+
+@dataclass
+class LedgerWeek:
+    people: Dict[str, PersonHours]
+    built_at: float
+    adjusted: Set[str] = field(default_factory=set)  # name keys whose callouts/pickups are loaded
+    signatures: Dict[str, Set[Hashable]] = field(default_factory=dict)
+    events: int = 0
+    reconciling: bool = False
+
+
+class HoursLedger:
+    def __init__(self, reconcile_sec: float = _RECONCILE_SEC):
+        self.reconcile_sec = float(reconcile_sec)
+        self._lock = threading.Lock()
+        self._weeks: Dict[Tuple[str, date], LedgerWeek] = {}
+        self.drift_log: Deque[DriftReport] = deque(maxlen=_DRIFT_LOG_DEPTH)
+        self.hits = 0
+        self.misses = 0
+        self.events = 0
+        self.reconciles = 0
+        self.skipped_reconciles = 0
+
+    # ─────── weeks ───────
+    def load(self, ss_id: str, week_start: date, people: Dict[str, PersonHours]) -> None:
+        """Replace the week's scheduled minutes; loaded adjustments are dropped with it."""
+        with self._lock:
+            self._weeks[(str(ss_id), week_start)] = LedgerWeek(people=dict(people), built_at=_pytime.time())
+
+    def has_week(self, ss_id: str, week_start: date) -> bool:
+        with self._lock:
+            return (str(ss_id), week_start) in self._weeks
+
+    def person(self, ss_id: str, week_start: date, name: str) -> Optional[PersonHours]:
+        """Copy of one person's week; None if the week is not loaded (empty if they have no hours)."""
+        key = name_key(name)
+        with self._lock:
+            week = self._weeks.get((str(ss_id), week_start))
+            if week is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry = week.people.get(key)
+            return copy.deepcopy(entry) if entry is not None else PersonHours(name=name)
+
+    # ─────── adjustments ───────
+    def has_adjustments(self, ss_id: str, week_start: date, name: str) -> bool:
+        with self._lock:
+            week = self._weeks.get((str(ss_id), week_start))
+            return week is not None and name_key(name) in week.adjusted
+
+    def load_adjustments(
+        self,
+        ss_id: str,
+        week_start: date,
+        name: str,
+        *,
+        callouts: Dict[str, int],
+        pickups: Dict[str, int],
+        signatures: Set[Hashable] = frozenset(),
+    ) -> bool:
+        """Seed one person's callouts/pickups from a per-day scan; False if the week is not loaded."""
+        key = name_key(name)
+        if not key:
+            return False
+        with self._lock:
+            week = self._weeks.get((str(ss_id), week_start))
+            if week is None:
+                return False
+            entry = week.people.setdefault(key, PersonHours(name=name))
+            entry.callouts = {day: {_SCANNED: int(mins)} for day, mins in callouts.items() if mins}
+            entry.pickups = {day: {_SCANNED: int(mins)} for day, mins in pickups.items() if mins}
+            week.adjusted.add(key)
+            week.signatures[key] = set(signatures)
+            return True
+
+    # ─────── events ───────
+    def apply(self, ss_id: str, week_start: date, event: HoursEvent) -> bool:
+        """Fold ``event`` into a loaded week; False when there is nothing to update.
+
+        Scheduled events need the week loaded; callout/pickup events also need
+        the person's adjustments loaded (a later scan will count them instead).
+        """
+        table_name, sign = _EVENT_TABLES[event.kind]
+        key = name_key(event.person)
+        mins = int(event.minutes)
+        if not key or mins <= 0:
+            return False
+        with self._lock:
+            week = self._weeks.get((str(ss_id), week_start))
+            if week is None:
+                return False
+            if table_name != "scheduled":
+                if key not in week.adjusted:
+                    return False
+                seen = week.signatures.setdefault(key, set())
+                if event.signature is not None:
+                    if event.signature in seen:
+                        return False
+                    seen.add(event.signature)
+            entry = week.people.setdefault(key, PersonHours(name=event.person))
+            per_campus = getattr(entry, table_name).setdefault(event.day, {})
+            per_campus[event.campus] = max(0, per_campus.get(event.campus, 0) + sign * mins)
+            week.events += 1
+            self.events += 1
+            return True
+
+    # ─────── reconciliation ───────
+    def claim_reconcile(self, ss_id: str, week_start: date, now: Optional[float] = None) -> bool:
+        """True (once) when the week is older than ``reconcile_sec`` and no rebuild is pending."""
+        now = _pytime.time() if now is None else now
+        with self._lock:
+            week = self._weeks.get((str(ss_id), week_start))
+            if week is None or week.reconciling or now - week.built_at < self.reconcile_sec:
+                return False
+            week.reconciling = True
+            return True
+
+    def event_mark(self, ss_id: str, week_start: date) -> Optional[int]:
+        """Events applied to the week so far; pass to ``reconcile`` as ``since``."""
+        with self._lock:
+            week = self._weeks.get((str(ss_id), week_start))
+            return week.events if week is not None else None
+
+    def reconcile(
+        self, ss_id: str, week_start: date, people: Dict[str, PersonHours], *, since: Optional[int] = None
+    ) -> Optional[Dict[str, int]]:
+        """Replace the week with a fresh parse; returns (and logs) per-person scheduled drift.
+
+        With ``since`` (an ``event_mark`` taken before the parse was read), an
+        event applied in the meantime may or may not be in the parse, so the
+        week is kept and None returned; the next lookup claims a retry.
+        """
+        with self._lock:
+            week = self._weeks.get((str(ss_id), week_start))
+            if week is not None and since is not None and week.events != since:
+                self.skipped_reconciles += 1
+                return None
+            drift: Dict[str, int] = {}
+            if week is not None:
+                for key in set(week.people) | set(people):
+                    held = week.people.get(key)
+                    fresh = people.get(key)
+                    delta = (held.scheduled_minutes if held else 0) - (fresh.scheduled_minutes if fresh else 0)
+                    if delta:
+                        drift[key] = delta
+            self._weeks[(str(ss_id), week_start)] = LedgerWeek(people=dict(people), built_at=_pytime.time())
+            self.reconciles += 1
+            self.drift_log.append(DriftReport(str(ss_id), week_start, _pytime.time(), drift))
+            return drift
+
+    def release_reconcile(self, ss_id: str, week_start: date) -> None:
+        with self._lock:
+            week = self._weeks.get((str(ss_id), week_start))
+            if week is not None:
+                week.reconciling = False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._weeks.clear()
+            self.drift_log.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            last = self.drift_log[-1] if self.drift_log else None
+            return {
+                "weeks": len(self._weeks),
+                "hits": self.hits,
+                "misses": self.misses,
+                "events": self.events,
+                "reconciles": self.reconciles,
+                "skipped_reconciles": self.skipped_reconciles,
+                "last_drift": dict(last.drift) if last else {},
+            }
+
+
+@st.cache_resource(show_spinner=False)
+def hours_ledger() -> HoursLedger:
+    return HoursLedger()
+
+
+# ─────── spreadsheet glue ───────
+def current_week_bounds() -> Tuple[date, date]:
+    """Sunday..Saturday of today (LA), the week the live schedule tabs describe."""
+    return _week_bounds_for_snapshot(())
+
+
+def _fresh_people(ss) -> Optional[Dict[str, PersonHours]]:
+    snap = schedule_query.workbook_snapshot(ss)
+    if snap is None:
+        return None
+    return compute_hours_for_all(snap, include_adjustments=False)
+
+
+def _ensure_week(ss, ledger: HoursLedger, week_start: date) -> bool:
+    ss_id = str(getattr(ss, "id", ""))
+    if ledger.has_week(ss_id, week_start):
+        if ledger.claim_reconcile(ss_id, week_start):
+            try:
+                submit_background(lambda: reconcile_week(ss, week_start=week_start))
+            except Exception:
+                ledger.release_reconcile(ss_id, week_start)
+        return True
+    people = _fresh_people(ss)
+    if people is None:
+        return False
+    ledger.load(ss_id, week_start, people)
+    return True
+
+
+def person_hours(ss, name: str, *, week_bounds: Optional[Tuple[date, date]] = None) -> Optional[PersonHours]:
+    """One person's week from the ledger, seeding it on first use; None without a snapshot."""
+    ledger = hours_ledger()
+    week_start = (week_bounds or current_week_bounds())[0]
+    if not _ensure_week(ss, ledger, week_start):
+        return None
+    return ledger.person(str(getattr(ss, "id", "")), week_start, name)
+
+
+def week_hours(ss, schedule, name: str) -> float:
+    """Scheduled hours this week from the ledger; a sheet parse only when no snapshot could seed it.
+
+    A loaded week is authoritative: someone it has no minutes for has 0 hours
+    (drift is the reconcile pass's job, not a per-render re-parse).
+    """
+
+    def build() -> float:
+        entry = person_hours(ss, name)
+        if entry is not None:
+            return entry.scheduled_minutes / 60.0
+        return total_hours_from_unh_mc_and_neighbor(ss, schedule, name)
+
+    return action_memo(("hours", str(getattr(ss, "id", "")), name_key(name)), build)
+
+
+def person_adjustments(
+    ss,
+    name: str,
+    *,
+    week_bounds: Tuple[date, date],
+    scan: Callable[[], Tuple[Dict[str, int], Dict[str, int], Set[Hashable]]],
+) -> Optional[PersonHours]:
+    """``person_hours`` with callouts/pickups loaded; ``scan`` returns (callouts, pickups, signatures) per day."""
+    ledger = hours_ledger()
+    ss_id = str(getattr(ss, "id", ""))
+    week_start = week_bounds[0]
+    if not _ensure_week(ss, ledger, week_start):
+        return None
+    if not ledger.has_adjustments(ss_id, week_start, name):
+        callouts, pickups, signatures = scan()
+        ledger.load_adjustments(ss_id, week_start, name, callouts=callouts, pickups=pickups, signatures=signatures)
+    return ledger.person(ss_id, week_start, name)
+
+
+def record_event(ss, event: HoursEvent, *, week_bounds: Optional[Tuple[date, date]] = None) -> bool:
+    """Apply an action's hours to the ledger (no-op if its week was never loaded)."""
+    try:
+        week_start = (week_bounds or current_week_bounds())[0]
+        return hours_ledger().apply(str(getattr(ss, "id", "")), week_start, event)
+    except Exception:
+        return False
+
+
+def reconcile_week(ss, *, week_start: Optional[date] = None) -> Optional[Dict[str, int]]:
+    """Rebuild a week from a fresh snapshot; returns scheduled-minute drift per ``name_key``.
+
+    None when there was no snapshot or an action's event raced the read (retried later).
+    """
+    ledger = hours_ledger()
+    ss_id = str(getattr(ss, "id", ""))
+    week_start = week_start or current_week_bounds()[0]
+    try:
+        mark = ledger.event_mark(ss_id, week_start)
+        people = _fresh_people(ss)
+        if people is None:
+            return None
+        return ledger.reconcile(ss_id, week_start, people, since=mark)
+    finally:
+        ledger.release_reconcile(ss_id, week_start)
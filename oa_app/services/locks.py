@@ -2,36 +2,35 @@ from datetime import datetime, timezone
 from gspread import WorksheetNotFound
 import gspread
 from gspread.exceptions import APIError
-import time as _pytime
 from ..config import LOCKS_SHEET
 from ..core.quotas import _safe_batch_get
+from ..core.ws_registry import invalidate_worksheet_registry, open_worksheet
+from ..integrations.gspread_io import PRIORITY_WRITE, retry_429, sheets_priority
 
 def _retry_429(fn, *args, retries: int = 5, backoff: float = 0.8, **kwargs):
-    for i in range(retries):
-        try:
-            return fn(*args, **kwargs)
-        except Exception as e:
-            s = str(e).lower()
-            if "429" in s or "quota exceeded" in s:
-                _pytime.sleep(backoff * (2 ** i))
-                continue
-            raise
-    return fn(*args, **kwargs)
+    # Lock reads and writes jump the governor queue: FCFS depends on their timing.
+    with sheets_priority(PRIORITY_WRITE):
+        return retry_429(fn, *args, retries=retries, backoff=backoff, **kwargs)
 
 def get_or_create_locks_sheet(ss) -> "gspread.Worksheet":
     try:
-        return _retry_429(ss.worksheet, LOCKS_SHEET)
+        with sheets_priority(PRIORITY_WRITE):
+            return open_worksheet(ss, LOCKS_SHEET)
     except WorksheetNotFound:
         pass
     try:
         ws = _retry_429(ss.add_worksheet, title=LOCKS_SHEET, rows=2000, cols=6)
+        invalidate_worksheet_registry(ss)
     except APIError as e:
         if "already exists" in str(e).lower():
-            ws = _retry_429(ss.worksheet, LOCKS_SHEET)
+            invalidate_worksheet_registry(ss)
+            with sheets_priority(PRIORITY_WRITE):
+                ws = open_worksheet(ss, LOCKS_SHEET)
         else:
             raise
     try:
-        block = _safe_batch_get(ws, ["A1:F1"])[0]
+        with sheets_priority(PRIORITY_WRITE):
+            block = _safe_batch_get(ws, ["A1:F1"])[0]
         if not (block and block[0] and any(c.strip() for c in block[0])):
             _retry_429(ws.update, range_name="A1:F1",
                        values=[["Key","Actor","ISOTime","Status","Row","Notes"]])
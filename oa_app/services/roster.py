@@ -8,6 +8,7 @@ import streamlit as st
 
 from ..config import ROSTER_SHEET, ROSTER_NAME_COLUMN_HEADER, ROSTER_NAME_HEADER_ALIASES
 from ..core.utils import name_key
+from ..core.ws_registry import open_worksheet
 from ..integrations.gspread_io import open_spreadsheet, retry_429
 
 
@@ -16,7 +17,7 @@ def load_roster(sheet_url: str) -> List[str]:
     """Read hired OA names from the roster sheet."""
     ss = open_spreadsheet(sheet_url)
     try:
-        ws = retry_429(ss.worksheet, ROSTER_SHEET)
+        ws = open_worksheet(ss, ROSTER_SHEET)
     except Exception:
         return []
 
@@ -0,0 +1,302 @@
+"""Parsed view of one schedule grid, shared by every reader.
+
+``schedule_index(grid)`` returns the ``ScheduleIndex`` for a grid object. The
+snapshot hands out the same grid object until the tab's version changes, so the
+index (time bands, day columns, On-Call blocks, per-cell occupants, normalized
+cell text, lane occupancy bitmaps) is built once per tab version and reused by ``schedule_query``,
+``availability``, ``pickup_scan`` and ``chat_add`` across reruns and sessions.
+Everything is computed lazily; a consumer only pays for what it asks.
+
+Name lookups go through an inverted index: cells are grouped by their
+normalized text once, so "where is this person" tests each distinct text
+(a few dozen names) instead of every cell, and the answer is memoized per name.
+
+When a write patches a grid in the snapshot, the new grid's index starts from
+the old one: per-cell parses of untouched cells carry over, and so does the
+tab structure unless a written cell could move a time label, block label or
+day header.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+from ..core.occupancy import Occupancy
+from ..core.snapshot import on_grid_patched
+from . import schedule_query as sq
+
+_MAX_INDEXES = 32
+_lock = threading.Lock()
+# id(grid) -> index (the index holds the grid, so the id cannot be reused while cached)
+_indexes: "OrderedDict[int, ScheduleIndex]" = OrderedDict()
+# Memo keys (or first element of tuple keys) that only depend on the tab's structure.
+_STRUCTURE_MEMOS = frozenset(
+    {"time_bands", "lane_bands", "day_cols", "oncall_day_cols", "oncall_bands", "is_range"}
+)
+
+
+class TimeBand(NamedTuple):
+    """A half-hour row label in column A and the lane rows below it (``r0 + 1 .. r1 - 1``)."""
+
+    r0: int
+    r1: int
+    start: datetime
+
+    @property
+    def end(self) -> datetime:
+        return self.start + timedelta(minutes=30)
+
+    @property
+    def lane_rows(self) -> range:
+        return range(self.r0 + 1, self.r1)
+
+
+class BlockBand(NamedTuple):
+    """An On-Call range label (e.g. ``7:00 AM - 12:00 PM``) and the lane rows below it."""
+
+    r_label: int
+    r_next: int
+    start: datetime
+    end: datetime
+
+    @property
+    def lane_rows(self) -> range:
+        return range(self.r_label + 1, self.r_next)
+
+
+class ScheduleIndex:
+    def __init__(self, grid: List[List[str]]):
+        self.grid = grid
+        self._memo: Dict[Any, Any] = {}
+        self._cell_norm: Dict[Tuple[int, int], str] = {}
+        self._people: Dict[Tuple[int, int], Tuple[Dict[str, str], ...]] = {}
+
+    def memo(self, key: Any, build: Callable[[], Any]) -> Any:
+        """Per-index cache for consumer-specific derived data."""
+        try:
+            return self._memo[key]
+        except KeyError:
+            value = self._memo[key] = build()
+            return value
+
+    def patched(self, grid: List[List[str]], cells: FrozenSet[Tuple[int, int]]) -> "ScheduleIndex":
+        """Index for ``grid``, which is this grid with ``cells`` rewritten."""
+        idx = ScheduleIndex(grid)
+        idx._cell_norm = {k: v for k, v in self._cell_norm.items() if k not in cells}
+        idx._people = {k: v for k, v in self._people.items() if k not in cells}
+        if len(grid) == len(self.grid) and not any(
+            self._structural(r, c) or idx._structural(r, c) for r, c in cells
+        ):
+            for key, value in self._memo.items():
+                name = key[0] if isinstance(key, tuple) else key
+                if name in _STRUCTURE_MEMOS and not (name == "is_range" and key[1:] in cells):
+                    idx._memo[key] = value
+        return idx
+
+    def _structural(self, r: int, c: int) -> bool:
+        """Could the text at ``(r, c)`` take part in time bands, day columns or On-Call blocks?"""
+        if c == 0:
+            return True
+        text = str(self.cell(r, c)).strip()
+        if not text:
+            return False
+        return bool(
+            sq._TIME_CELL_RE.match(text)
+            or sq._RANGE_RE.match(text)
+            or sq._MMDD_TOKEN_RE.search(text)
+            or sq._canon_day_from_header(text)
+        )
+
+    # ─────── cells ───────
+    def cell(self, r: int, c: int) -> str:
+        row = self.grid[r] if 0 <= r < len(self.grid) else []
+        return (row[c] if 0 <= c < len(row) else "") or ""
+
+    def cell_norm(self, r: int, c: int) -> str:
+        key = (r, c)
+        norm = self._cell_norm.get(key)
+        if norm is None:
+            norm = self._cell_norm[key] = sq._norm_name(str(self.cell(r, c)))
+        return norm
+
+    def has_name(self, r: int, c: int, name_norm: str) -> bool:
+        """``schedule_query._cell_has_name`` against the cached normalized cell."""
+        if not name_norm:
+            return False
+        return sq._norm_has_name(self.cell_norm(r, c), name_norm)
+
+    def people(self, r: int, c: int) -> Tuple[Dict[str, str], ...]:
+        key = (r, c)
+        found = self._people.get(key)
+        if found is None:
+            found = self._people[key] = tuple(sq._people_from_cell(self.cell(r, c)))
+        return found
+
+    def band_people(self, rows: range, c: int) -> Dict[str, Dict[str, str]]:
+        """Distinct people (first mention wins) in column ``c`` over ``rows``."""
+        out: Dict[str, Dict[str, str]] = {}
+        for rr in rows:
+            for person in self.people(rr, c):
+                out.setdefault(person["key"], person)
+        return out
+
+    # ─────── inverted name lookups ───────
+    def texts(self, normalize: Callable[[str], str]) -> Dict[str, Tuple[Tuple[int, int], ...]]:
+        """Non-empty cells grouped by ``normalize(cell)``; built once per normalizer."""
+        return self.memo(("texts", normalize), lambda: self._build_texts(normalize))
+
+    def _build_texts(self, normalize: Callable[[str], str]) -> Dict[str, Tuple[Tuple[int, int], ...]]:
+        out: Dict[str, List[Tuple[int, int]]] = {}
+        for r, row in enumerate(self.grid):
+            for c, cell in enumerate(row or []):
+                if cell:
+                    out.setdefault(normalize(str(cell)), []).append((r, c))
+        return {text: tuple(cells) for text, cells in out.items()}
+
+    def find_cells(
+        self,
+        needle: str,
+        *,
+        normalize: Callable[[str], str],
+        test: Callable[[str, str], bool],
+    ) -> FrozenSet[Tuple[int, int]]:
+        """Cells whose normalized text passes ``test(text, needle)``; memoized per needle.
+
+        ``normalize`` and ``test`` are part of the memo key, so pass module-level
+        functions rather than lambdas.
+        """
+        def build() -> FrozenSet[Tuple[int, int]]:
+            hits: set = set()
+            for text, cells in self.texts(normalize).items():
+                if test(text, needle):
+                    hits.update(cells)
+            return frozenset(hits)
+
+        return self.memo(("find_cells", normalize, test, needle), build)
+
+    def name_cells(self, name_norm: str) -> FrozenSet[Tuple[int, int]]:
+        """Every cell ``has_name(r, c, name_norm)`` is true for."""
+        if not name_norm:
+            return frozenset()
+        return self.find_cells(name_norm, normalize=sq._norm_name, test=sq._norm_has_name)
+
+    # ─────── UNH / MC structure ───────
+    @property
+    def time_bands(self) -> Tuple[TimeBand, ...]:
+        return self.memo("time_bands", self._build_time_bands)
+
+    def _build_time_bands(self) -> Tuple[TimeBand, ...]:
+        rows: List[Tuple[int, datetime]] = []
+        for r, row in enumerate(self.grid):
+            col0 = str((row[0] if row else "") or "")
+            if sq._TIME_CELL_RE.match(col0):
+                start = sq._parse_time_cell(col0)
+                if start:
+                    rows.append((r, start))
+        ends = [r for r, _ in rows[1:]] + [len(self.grid)]
+        return tuple(TimeBand(r0, r1, start) for (r0, start), r1 in zip(rows, ends))
+
+    @property
+    def lane_bands(self) -> Dict[int, TimeBand]:
+        """Lane row -> the half-hour band it belongs to."""
+        return self.memo(
+            "lane_bands",
+            lambda: {rr: band for band in self.time_bands for rr in band.lane_rows},
+        )
+
+    def occupancy(self, cols: Iterable[int], blank: Callable[[Any], bool]) -> Occupancy:
+        """Lane bitmap of ``cols`` over the time bands; ``blank`` is part of the memo key."""
+        cols = tuple(sorted(set(cols)))
+        return self.memo(
+            ("occupancy", blank, cols),
+            lambda: Occupancy.from_lane_rows([band.lane_rows for band in self.time_bands], cols, self.cell, blank),
+        )
+
+    @property
+    def time_rows(self) -> List[int]:
+        return [band.r0 for band in self.time_bands]
+
+    @property
+    def day_cols(self) -> Dict[str, int]:
+        """Weekday columns as ``_unh_mc_intervals`` detects them (copy; callers may edit)."""
+        return dict(self.memo("day_cols", self._build_day_cols))
+
+    def _build_day_cols(self) -> Dict[str, int]:
+        day_cols = sq._scan_day_columns(self.grid)
+        if len(day_cols) < 2:
+            day_cols = sq._scan_day_hits_anywhere(self.grid)
+        return day_cols
+
+    # ─────── On-Call structure ───────
+    def oncall_day_cols(self, week_bounds: Optional[Tuple[date, date]]) -> Dict[str, int]:
+        return dict(self.memo(("oncall_day_cols", week_bounds), lambda: self._build_oncall_day_cols(week_bounds)))
+
+    def _build_oncall_day_cols(self, week_bounds) -> Dict[str, int]:
+        grid = self.grid
+        day_cols = sq._scan_day_columns(grid, week_bounds=week_bounds, max_rows=15)
+        if len(day_cols) < 2:
+            for day, col in sq._scan_day_hits_anywhere(grid, week_bounds=week_bounds, max_rows=30).items():
+                day_cols.setdefault(day, col)
+        if len(day_cols) < 2:
+            for day, col in sq._infer_oncall_day_columns(grid, week_bounds=week_bounds).items():
+                day_cols.setdefault(day, col)
+        return day_cols
+
+    def _is_range(self, r: int, c: int) -> bool:
+        return self.memo(("is_range", r, c), lambda: bool(sq._RANGE_RE.match(str(self.cell(r, c)).strip())))
+
+    def oncall_bands(self, c: int) -> Tuple[BlockBand, ...]:
+        """Range-labelled blocks for day column ``c`` (label in that column or in column A)."""
+        return self.memo(("oncall_bands", c), lambda: self._build_oncall_bands(c))
+
+    def _build_oncall_bands(self, c: int) -> Tuple[BlockBand, ...]:
+        label_rows = [r for r in range(len(self.grid)) if self._is_range(r, 0) or self._is_range(r, c)]
+        if not label_rows:
+            return ()
+        out: List[BlockBand] = []
+        for r_label, r_next in zip(label_rows, label_rows[1:] + [len(self.grid)]):
+            cell = self.cell(r_label, c)
+            range_txt = cell if self._is_range(r_label, c) else self.cell(r_label, 0)
+            match = sq._RANGE_RE.match(range_txt) if range_txt else None
+            if not match:
+                continue
+            start = sq._parse_time_cell(match.group(1))
+            end = sq._parse_time_cell(match.group(2))
+            if start and end:
+                out.append(BlockBand(r_label, r_next, start, end))
+        return tuple(out)
+
+
+def schedule_index(grid: List[List[str]]) -> ScheduleIndex:
+    """Shared index for ``grid`` (keyed by object identity, LRU-bounded)."""
+    key = id(grid)
+    with _lock:
+        idx = _indexes.get(key)
+        if idx is not None and idx.grid is grid:
+            _indexes.move_to_end(key)
+            return idx
+        idx = ScheduleIndex(grid)
+        _indexes[key] = idx
+        while len(_indexes) > _MAX_INDEXES:
+            _indexes.popitem(last=False)
+        return idx
+
+
+@on_grid_patched
+def _carry_over(old_grid: List[List[str]], new_grid: List[List[str]], cells: FrozenSet[Tuple[int, int]]) -> None:
+    with _lock:
+        old = _indexes.get(id(old_grid))
+        if old is None or old.grid is not old_grid:
+            return
+        _indexes[id(new_grid)] = old.patched(new_grid, cells)
+        _indexes.move_to_end(id(new_grid))
+        while len(_indexes) > _MAX_INDEXES:
+            _indexes.popitem(last=False)
+
+
+def clear_schedule_indexes() -> None:
+    with _lock:
+        _indexes.clear()
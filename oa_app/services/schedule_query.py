@@ -1,4 +1,5 @@
 # oa_app/schedule_query.py
+import copy
 import time
 import re
 from datetime import datetime, timedelta, date
@@ -6,7 +7,6 @@ from typing import Dict, List, Tuple, Optional, Set, Any
 from zoneinfo import ZoneInfo
 import streamlit as st
 import gspread
-import gspread.utils as a1
 import pandas as pd
 import plotly.express as px
 
@@ -14,8 +14,6 @@ from ..config import (
     OA_SCHEDULE_SHEETS,   # e.g. ["UNH (OA and GOAs)", "MC (OA and GOAs)"]
     AUDIT_SHEET,
     LOCKS_SHEET,
-    ONCALL_MAX_COLS,
-    ONCALL_MAX_ROWS,
     ROSTER_SHEET,
 )
 # Optional override; if missing, treat as None
@@ -26,6 +24,12 @@ except Exception:
 
 from ..core.quotas import _safe_batch_get
 from ..core import week_range as week_range_mod
+from ..core.intervals import IntervalIndex
+from ..core.utils import name_key, parse_time_label
+from ..core.action_context import action_memo
+from ..core.snapshot import WorkbookSnapshot, grid_a1_range, load_workbook_snapshot, needs_fresh
+from ..core.ws_registry import open_worksheet, visible_titles
+from ..integrations.gspread_io import governed, run_parallel
 
 # ──────────────────────────────────────────────────────────────────────────────
 # 2) Normalize the OA name (case-insensitive substring matching)
@@ -38,17 +42,25 @@ _WEEKEND_SET = {"saturday", "sunday"}
 _LA_TZ = ZoneInfo("America/Los_Angeles")
 
 
+# Punctuation that ends a name inside a cell; apostrophes, hyphens and dots stay inside one
+_NAME_BREAK_RE = re.compile(r"[^\w\s'’.\-]+")
+
+
 def _norm_name(s: str) -> str:
+    """``name_key`` of each name-like run of ``s``, so cell matches agree with the hours ledger."""
     s = _PREFIX_RE.sub("", s or "")
-    s = re.sub(r"[^\w\s]", " ", s)
-    return " ".join(s.lower().split())
+    return " ".join(k for k in (name_key(part) for part in _NAME_BREAK_RE.split(s)) if k)
 
 
 def _cell_has_name(cell: str, name_norm: str) -> bool:
     if not cell or not name_norm:
         return False
-    cell_norm = _norm_name(str(cell))
-    if not cell_norm:
+    return _norm_has_name(_norm_name(str(cell)), name_norm)
+
+
+def _norm_has_name(cell_norm: str, name_norm: str) -> bool:
+    """Whole-word match of an already normalized name inside an already normalized cell."""
+    if not cell_norm or not name_norm:
         return False
     return bool(re.search(rf"(?<!\w){re.escape(name_norm)}(?!\w)", cell_norm))
 
@@ -257,12 +269,6 @@ _RANGE_RE = re.compile(
     re.I,
 )
 
-def _parse_time_cell(s: str) -> Optional[datetime]:
-    try:
-        return datetime.strptime(s.strip(), "%I:%M %p")
-    except Exception:
-        return None
-
 def _fmt(dt: datetime) -> str:
     try:
         return dt.strftime("%-I:%M %p")  # POSIX
@@ -280,16 +286,7 @@ _RANGE_RE = re.compile(
 
 
 def _parse_time_cell(s: str) -> Optional[datetime]:
-    txt = (s or "").strip()
-    if not txt:
-        return None
-    txt = re.sub(r"\s*(am|pm)\s*$", lambda m: f" {m.group(1).upper()}", txt, flags=re.I)
-    for fmt in ("%I:%M %p", "%I %p"):
-        try:
-            return datetime.strptime(txt, fmt)
-        except Exception:
-            continue
-    return None
+    return parse_time_label(s)
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Robust worksheet resolution (handles disconnects)
@@ -312,31 +309,22 @@ def _list_worksheets_with_retry(ss: gspread.Spreadsheet, attempts: int = 4, base
     """Retry listing worksheets to survive transient RemoteDisconnected."""
     for i in range(attempts):
         try:
-            return ss.worksheets()
+            return governed(ss.worksheets)
         except Exception:
             if i == attempts - 1:
                 return None
             time.sleep(base_sleep * (2 ** i))
     return None
-@st.cache_data(ttl=60, show_spinner=False)
 def _cached_ws_titles(ss_id: str) -> list[str]:
     """
-    Cached list of *visible* worksheet titles for this Spreadsheet id.
+    *Visible* worksheet titles for this Spreadsheet id, from the shared
+    worksheet registry (one metadata fetch, re-listed only when tabs change).
     Uses the Spreadsheet handle we stashed in session_state (set in app.py).
     """
     ss = st.session_state.get("_SS_HANDLE_BY_ID", {}).get(ss_id)
     if ss is None:
         return []
-    try:
-        lst = ss.worksheets()
-    except Exception:
-        return []
-    titles = []
-    for w in lst:
-        hidden = bool(getattr(w, "_properties", {}).get("hidden", False))
-        if not hidden:
-            titles.append(w.title)
-    return titles
+    return visible_titles(ss)
 
 def _open_three(ss: gspread.Spreadsheet) -> List[str]:
     """
@@ -347,7 +335,7 @@ def _open_three(ss: gspread.Spreadsheet) -> List[str]:
     out: List[str] = []
 
     # 1) Try cached titles first
-    titles = _cached_ws_titles(getattr(ss, "id", ""))
+    titles = visible_titles(ss)
     def _resolve_from_titles(all_titles: list[str], wanted: str) -> Optional[str]:
         want = (wanted or "").strip().lower()
         by_low = {t.strip().lower(): t for t in all_titles}
@@ -441,7 +429,7 @@ def _open_three(ss: gspread.Spreadsheet) -> List[str]:
     unh_cfg, mc_cfg = OA_SCHEDULE_SHEETS[0], OA_SCHEDULE_SHEETS[1]
     out: List[str] = []
 
-    titles = _cached_ws_titles(getattr(ss, "id", ""))
+    titles = visible_titles(ss)
 
     def _resolve_from_titles(all_titles: list[str], wanted: str) -> Optional[str]:
         want = (wanted or "").strip().lower()
@@ -597,105 +585,61 @@ def _open_three(ss: gspread.Spreadsheet) -> List[str]:
     return final
 
 
-def _read_grid(ws: gspread.Worksheet) -> List[List[str]]:
-    end_col_letter = a1.rowcol_to_a1(1, ONCALL_MAX_COLS).split("1")[0]
-    return _safe_batch_get(ws, [f"A1:{end_col_letter}{ONCALL_MAX_ROWS}"])[0] or []
-
-def _unh_mc_intervals(ws: gspread.Worksheet, name_norm: str) -> Dict[str, List[Tuple[datetime, datetime]]]:
-    grid = _read_grid(ws)
-    if not grid:
-        return {}
+def workbook_snapshot(ss: gspread.Spreadsheet) -> Optional[WorkbookSnapshot]:
+    """UNH, MC and On-Call grids from one batched read (None if unavailable)."""
+    if ss is None:
+        return None
 
-    # 3.1 Identify structure
-    header = grid[0] if grid else []
-    day_cols: Dict[str, int] = {}
-    for c, val in enumerate(header):
-        d = _canon_day_from_header(val)
-        if d and d not in day_cols:
-            day_cols[d] = c
+    def build() -> Optional[WorkbookSnapshot]:
+        try:
+            return load_workbook_snapshot(ss, _open_three(ss))
+        except Exception:
+            return None
 
-    # Col 0 contains time row labels; find their row indices
-    time_rows: List[int] = []
-    for r, row in enumerate(grid):
-        col0 = (row[0] if len(row) >= 1 else "") or ""
-        if _TIME_CELL_RE.match(col0) and _parse_time_cell(col0):
-            time_rows.append(r)
+    return action_memo(("grid", str(getattr(ss, "id", "")), needs_fresh()), build)
 
-    if not time_rows:
-        return {}
 
-    # Sentinel at bottom
-    time_rows.append(len(grid))
+def _read_grid(ws: gspread.Worksheet) -> List[List[str]]:
+    snap = workbook_snapshot(getattr(ws, "spreadsheet", None))
+    if snap is not None:
+        grid = snap.grid(ws.title)
+        if grid is not None:
+            return grid
+    return _safe_batch_get(ws, [grid_a1_range()])[0] or []
 
-    # 3.2 Build “hit” intervals
-    hits: Dict[str, List[Tuple[datetime, datetime]]] = {d: [] for d in day_cols}
-    for i in range(len(time_rows) - 1):
-        r0 = time_rows[i]
-        r1 = time_rows[i + 1]
 
-        start_label = (grid[r0][0] if len(grid[r0]) >= 1 else "") or ""
-        start_dt = _parse_time_cell(start_label)
-        if not start_dt:
-            continue
-        end_dt = start_dt + timedelta(minutes=30)
+def _grid_index(ws: gspread.Worksheet):
+    """Shared ``ScheduleIndex`` for the worksheet's current grid."""
+    from .schedule_index import schedule_index
 
-        for day, c in day_cols.items():
-            if c == 0:
-                continue  # skip time column
-
-            # Gather all text from the slot rows between this time row and the next
-            parts: List[str] = []
-            for rr in range(r0 + 1, r1):
-                val = grid[rr][c] if len(grid[rr]) > c else ""
-                if val:
-                    parts.append(str(val))
-            blob = " ".join(parts).strip().lower()
-            if blob and _cell_has_name(blob, name_norm):
-                hits[day].append((start_dt, end_dt))
+    return schedule_index(_read_grid(ws))
 
-    return hits
 
 def _unh_mc_intervals(ws: gspread.Worksheet, name_norm: str) -> Dict[str, List[Tuple[datetime, datetime]]]:
-    grid = _read_grid(ws)
-    if not grid:
-        return {}
-
-    day_cols = _scan_day_columns(grid)
-    if len(day_cols) < 2:
-        day_cols = _scan_day_hits_anywhere(grid)
-    if not day_cols:
+    idx = _grid_index(ws)
+    if not idx.grid:
         return {}
 
-    time_rows: List[int] = []
-    for r, row in enumerate(grid):
-        col0 = (row[0] if len(row) >= 1 else "") or ""
-        if _TIME_CELL_RE.match(col0) and _parse_time_cell(col0):
-            time_rows.append(r)
-
-    if not time_rows:
+    day_cols = idx.day_cols
+    if not day_cols or not idx.time_bands:
         return {}
 
-    time_rows.append(len(grid))
     hits: Dict[str, List[Tuple[datetime, datetime]]] = {d: [] for d in day_cols}
-    for r0, r1 in zip(time_rows, time_rows[1:]):
-        start_label = (grid[r0][0] if len(grid[r0]) >= 1 else "") or ""
-        start_dt = _parse_time_cell(start_label)
-        if not start_dt:
-            continue
-        end_dt = start_dt + timedelta(minutes=30)
-
-        for day, c in day_cols.items():
-            if c == 0:
-                continue
-            found = False
-            for rr in range(r0 + 1, r1):
-                val = grid[rr][c] if len(grid[rr]) > c else ""
-                if val and _cell_has_name(str(val), name_norm):
-                    found = True
-                    break
-            if found:
-                hits[day].append((start_dt, end_dt))
-
+    days_by_col: Dict[int, List[str]] = {}
+    for day, c in day_cols.items():
+        if c != 0:
+            days_by_col.setdefault(c, []).append(day)
+
+    lane_bands = idx.lane_bands
+    found = set()
+    for rr, c in idx.name_cells(name_norm):
+        band = lane_bands.get(rr)
+        if band is not None:
+            for day in days_by_col.get(c, ()):
+                found.add((day, band))
+
+    for day, band in sorted(found, key=lambda hit: hit[1].r0):
+        hits[day].append((band.start, band.end))
     return hits
 
 
@@ -730,96 +674,26 @@ def _unh_mc_ranges(ws: gspread.Worksheet, name_norm: str) -> Dict[str, List[Tupl
 # ──────────────────────────────────────────────────────────────────────────────
 
 def _oncall_blocks(ws: gspread.Worksheet, name_norm: str) -> Dict[str, List[Tuple[str, str]]]:
-    grid = _read_grid(ws)
-    if not grid:
+    idx = _grid_index(ws)
+    if not idx.grid:
         return {}
 
-    # 4.1 Identify structure (day columns from row 0)
-    day_cols: Dict[str, int] = {}
-    for c, top in enumerate(grid[0]):
-        d = _canon_day_from_header(top)
-        if d and d not in day_cols:
-            day_cols[d] = c
-
-    per_day: Dict[str, Set[Tuple[str, str]]] = {d: set() for d in day_cols}
-
-    # 4.2 Extract blocks per day
-    for day, c in day_cols.items():
-        current_range: Optional[Tuple[str, str]] = None
-        for r in range(1, len(grid)):
-            cell = (grid[r][c] if len(grid[r]) > c else "") or ""
-            m = _RANGE_RE.match(cell) if cell else None
-            if m:
-                s_raw, e_raw = m.group(1), m.group(2)
-                sdt, edt = _parse_time_cell(s_raw), _parse_time_cell(e_raw)
-                if sdt and edt:
-                    current_range = (_fmt(sdt), _fmt(edt))
-                else:
-                    current_range = None
-            else:
-                if current_range and _cell_has_name(cell, name_norm):
-                    per_day[day].add(current_range)
-
-    # Dedup + sort by start time
-    out: Dict[str, List[Tuple[str, str]]] = {}
-    for d, blocks in per_day.items():
-        sorted_blocks = sorted(blocks, key=lambda ab: _parse_time_cell(ab[0]) or datetime.min)
-        if sorted_blocks:
-            out[d] = list(sorted_blocks)
-    return out
-
-# ──────────────────────────────────────────────────────────────────────────────
-# Public API used by app.py
-# ──────────────────────────────────────────────────────────────────────────────
-
-def _oncall_blocks(ws: gspread.Worksheet, name_norm: str) -> Dict[str, List[Tuple[str, str]]]:
-    grid = _read_grid(ws)
-    if not grid:
-        return {}
-
-    week_bounds = _week_bounds_for_grid(getattr(ws, "title", ""))
-    day_cols = _scan_day_columns(grid, week_bounds=week_bounds, max_rows=15)
-    if len(day_cols) < 2:
-        for day, col in _scan_day_hits_anywhere(grid, week_bounds=week_bounds, max_rows=30).items():
-            day_cols.setdefault(day, col)
-    if len(day_cols) < 2:
-        for day, col in _infer_oncall_day_columns(grid, week_bounds=week_bounds).items():
-            day_cols.setdefault(day, col)
+    day_cols = idx.oncall_day_cols(_week_bounds_for_grid(getattr(ws, "title", "")))
     if not day_cols:
         return {}
 
+    rows_by_col: Dict[int, Set[int]] = {}
+    for rr, c in idx.name_cells(name_norm):
+        rows_by_col.setdefault(c, set()).add(rr)
+
     per_day: Dict[str, Set[Tuple[str, str]]] = {d: set() for d in day_cols}
     for day, c in day_cols.items():
-        label_rows: List[int] = []
-        for r in range(len(grid)):
-            col0 = (grid[r][0] if len(grid[r]) > 0 else "") or ""
-            cell = (grid[r][c] if len(grid[r]) > c else "") or ""
-            if _RANGE_RE.match(str(col0).strip()) or _RANGE_RE.match(str(cell).strip()):
-                label_rows.append(r)
-
-        if not label_rows:
+        hit_rows = rows_by_col.get(c)
+        if not hit_rows:
             continue
-        label_rows.append(len(grid))
-
-        for r_label, r_next in zip(label_rows, label_rows[1:]):
-            col0 = (grid[r_label][0] if len(grid[r_label]) > 0 else "") or ""
-            cell = (grid[r_label][c] if len(grid[r_label]) > c else "") or ""
-            range_txt = cell if _RANGE_RE.match(str(cell).strip()) else col0
-            match = _RANGE_RE.match(range_txt) if range_txt else None
-            if not match:
-                continue
-
-            sdt = _parse_time_cell(match.group(1))
-            edt = _parse_time_cell(match.group(2))
-            if not (sdt and edt):
-                continue
-            current_range = (_fmt(sdt), _fmt(edt))
-
-            for rr in range(r_label + 1, r_next):
-                lane_cell = (grid[rr][c] if len(grid[rr]) > c else "") or ""
-                if _cell_has_name(lane_cell, name_norm):
-                    per_day[day].add(current_range)
-                    break
+        for band in idx.oncall_bands(c):
+            if any(rr in hit_rows for rr in band.lane_rows):
+                per_day[day].add((_fmt(band.start), _fmt(band.end)))
 
     out: Dict[str, List[Tuple[str, str]]] = {}
     for d, blocks in per_day.items():
@@ -830,169 +704,162 @@ def _oncall_blocks(ws: gspread.Worksheet, name_norm: str) -> Dict[str, List[Tupl
 
 
 def _unh_mc_people_ranges(ws: gspread.Worksheet) -> Dict[str, List[Dict[str, str]]]:
-    grid = _read_grid(ws)
-    if not grid:
+    idx = _grid_index(ws)
+    if not idx.grid:
         return {}
 
-    day_cols = _scan_day_columns(grid)
-    if len(day_cols) < 2:
-        day_cols = _scan_day_hits_anywhere(grid)
-    if not day_cols:
-        return {}
-
-    time_rows: List[int] = []
-    for r, row in enumerate(grid):
-        col0 = (row[0] if len(row) >= 1 else "") or ""
-        if _TIME_CELL_RE.match(col0) and _parse_time_cell(col0):
-            time_rows.append(r)
-
-    if not time_rows:
+    day_cols = idx.day_cols
+    if not day_cols or not idx.time_bands:
         return {}
 
-    time_rows.append(len(grid))
     per_day_people: Dict[str, Dict[str, Dict[str, Any]]] = {day: {} for day in day_cols}
-
-    for r0, r1 in zip(time_rows, time_rows[1:]):
-        start_label = (grid[r0][0] if len(grid[r0]) >= 1 else "") or ""
-        start_dt = _parse_time_cell(start_label)
-        if not start_dt:
-            continue
-        end_dt = start_dt + timedelta(minutes=30)
-
+    for band in idx.time_bands:
         for day, c in day_cols.items():
             if c == 0:
                 continue
-
-            band_people: Dict[str, Dict[str, str]] = {}
-            for rr in range(r0 + 1, r1):
-                value = grid[rr][c] if len(grid[rr]) > c else ""
-                for person in _people_from_cell(value):
-                    band_people.setdefault(person["key"], person)
-
-            for key, person in band_people.items():
-                entry = per_day_people[day].setdefault(
-                    key,
-                    {
-                        "name": person["name"],
-                        "role": person["role"],
-                        "intervals": [],
-                    },
-                )
-                if not entry.get("role") and person.get("role"):
-                    entry["role"] = person["role"]
-                entry["intervals"].append((start_dt, end_dt))
+            for key, person in idx.band_people(band.lane_rows, c).items():
+                _add_person_interval(per_day_people[day], key, person, band.start, band.end)
 
     return _format_people_ranges(per_day_people)
 
 
 def _oncall_people_ranges(ws: gspread.Worksheet) -> Dict[str, List[Dict[str, str]]]:
-    grid = _read_grid(ws)
-    if not grid:
+    idx = _grid_index(ws)
+    if not idx.grid:
         return {}
 
-    week_bounds = _week_bounds_for_grid(getattr(ws, "title", ""))
-    day_cols = _scan_day_columns(grid, week_bounds=week_bounds, max_rows=15)
-    if len(day_cols) < 2:
-        for day, col in _scan_day_hits_anywhere(grid, week_bounds=week_bounds, max_rows=30).items():
-            day_cols.setdefault(day, col)
-    if len(day_cols) < 2:
-        for day, col in _infer_oncall_day_columns(grid, week_bounds=week_bounds).items():
-            day_cols.setdefault(day, col)
+    day_cols = idx.oncall_day_cols(_week_bounds_for_grid(getattr(ws, "title", "")))
     if not day_cols:
         return {}
 
     per_day_people: Dict[str, Dict[str, Dict[str, Any]]] = {day: {} for day in day_cols}
-
     for day, c in day_cols.items():
-        label_rows: List[int] = []
-        for r in range(len(grid)):
-            col0 = (grid[r][0] if len(grid[r]) > 0 else "") or ""
-            cell = (grid[r][c] if len(grid[r]) > c else "") or ""
-            if _RANGE_RE.match(str(col0).strip()) or _RANGE_RE.match(str(cell).strip()):
-                label_rows.append(r)
-
-        if not label_rows:
-            continue
-        label_rows.append(len(grid))
-
-        for r_label, r_next in zip(label_rows, label_rows[1:]):
-            col0 = (grid[r_label][0] if len(grid[r_label]) > 0 else "") or ""
-            cell = (grid[r_label][c] if len(grid[r_label]) > c else "") or ""
-            range_txt = cell if _RANGE_RE.match(str(cell).strip()) else col0
-            match = _RANGE_RE.match(range_txt) if range_txt else None
-            if not match:
-                continue
-
-            start_dt = _parse_time_cell(match.group(1))
-            end_dt = _parse_time_cell(match.group(2))
-            if not (start_dt and end_dt):
-                continue
-
-            band_people: Dict[str, Dict[str, str]] = {}
-            for rr in range(r_label + 1, r_next):
-                lane_cell = (grid[rr][c] if len(grid[rr]) > c else "") or ""
-                for person in _people_from_cell(lane_cell):
-                    band_people.setdefault(person["key"], person)
-
-            for key, person in band_people.items():
-                entry = per_day_people[day].setdefault(
-                    key,
-                    {
-                        "name": person["name"],
-                        "role": person["role"],
-                        "intervals": [],
-                    },
-                )
-                if not entry.get("role") and person.get("role"):
-                    entry["role"] = person["role"]
-                entry["intervals"].append((start_dt, end_dt))
+        for band in idx.oncall_bands(c):
+            for key, person in idx.band_people(band.lane_rows, c).items():
+                _add_person_interval(per_day_people[day], key, person, band.start, band.end)
 
     return _format_people_ranges(per_day_people)
 
 
-def _time_in_named_window(start_txt: str, end_txt: str, when: datetime) -> bool:
-    start_dt = _parse_time_cell(start_txt)
-    end_dt = _parse_time_cell(end_txt)
-    if not (start_dt and end_dt):
-        return False
-
-    now_min = (when.hour * 60) + when.minute
-    start_min = (start_dt.hour * 60) + start_dt.minute
-    end_min = (end_dt.hour * 60) + end_dt.minute
-
-    if end_min <= start_min:
-        end_min += 24 * 60
-        if now_min < start_min:
-            now_min += 24 * 60
+def _add_person_interval(
+    people: Dict[str, Dict[str, Any]],
+    key: str,
+    person: Dict[str, str],
+    start_dt: datetime,
+    end_dt: datetime,
+) -> None:
+    entry = people.setdefault(
+        key,
+        {
+            "name": person["name"],
+            "role": person["role"],
+            "intervals": [],
+        },
+    )
+    if not entry.get("role") and person.get("role"):
+        entry["role"] = person["role"]
+    entry["intervals"].append((start_dt, end_dt))
 
-    return start_min <= now_min < end_min
 
+def _day_entry_index(rows: List[Dict[str, str]], *, source: str) -> IntervalIndex:
+    """Working-now entries of one day, indexed by minute of the day.
 
-def _working_entries_for_day(
-    rows: List[Dict[str, str]],
-    *,
-    source: str,
-    when: datetime,
-) -> List[Dict[str, str]]:
-    out: List[Dict[str, str]] = []
+    Entries are kept in (start, name) order. A window that ends at or before
+    its start (``7:00 PM - 12:00 AM``) covers the rest of the day and the early
+    hours before its end.
+    """
+    entries = []
     for row in rows or []:
         start_txt = str(row.get("start") or "").strip()
         end_txt = str(row.get("end") or "").strip()
         if not start_txt or not end_txt:
             continue
-        if not _time_in_named_window(start_txt, end_txt, when):
+        start_dt = _parse_time_cell(start_txt)
+        end_dt = _parse_time_cell(end_txt)
+        if not (start_dt and end_dt):
             continue
-        out.append(
-            {
-                "source": source,
-                "name": str(row.get("name") or "").strip(),
-                "role": str(row.get("role") or "").strip(),
-                "start": start_txt,
-                "end": end_txt,
-            }
-        )
-    out.sort(key=lambda row: (_parse_time_cell(row.get("start", "")) or datetime.min, row.get("name", "")))
-    return out
+        entry = {
+            "source": source,
+            "name": str(row.get("name") or "").strip(),
+            "role": str(row.get("role") or "").strip(),
+            "start": start_txt,
+            "end": end_txt,
+        }
+        entries.append(((start_dt, entry["name"]), entry, start_dt.hour * 60 + start_dt.minute, end_dt.hour * 60 + end_dt.minute))
+    entries.sort(key=lambda item: item[0])
+
+    spans = []
+    for _key, entry, start_min, end_min in entries:
+        if end_min > start_min:
+            spans.append((start_min, end_min, entry))
+        else:
+            spans.append((start_min, 24 * 60, entry))
+            spans.append((0, end_min, entry))
+    return IntervalIndex(spans)
+
+
+class WorkingTimeline:
+    """The week's schedule as "who's on" interval indexes, per source and weekday.
+
+    Each source tab is parsed the first time a query needs it; after that any
+    minute of the week is answered with a binary search. Build one per
+    snapshot version and keep it (see ``page.cached_people_working_now``).
+    """
+
+    def __init__(self, ss: gspread.Spreadsheet):
+        self.ss = ss
+        self.titles = _open_three(ss)
+        self._days: Dict[str, Dict[str, IntervalIndex]] = {}
+
+    def _source_days(self, source: str) -> Dict[str, IntervalIndex]:
+        found = self._days.get(source)
+        if found is not None:
+            return found
+        pos = {"UNH": 0, "MC": 1, "On-Call": 2}[source]
+        if len(self.titles) <= pos:
+            return {}
+        try:
+            ws = open_worksheet(self.ss, self.titles[pos])
+            per_day = _oncall_people_ranges(ws) if source == "On-Call" else _unh_mc_people_ranges(ws)
+        except Exception:
+            return {}  # not kept: the next query retries the read
+        found = self._days[source] = {day: _day_entry_index(rows, source=source) for day, rows in per_day.items()}
+        return found
+
+    def entries_at(self, source: str, day_canon: str, minute: int) -> List[Dict[str, str]]:
+        index = self._source_days(source).get(day_canon)
+        return [dict(entry) for entry in index.at(minute)] if index is not None else []
+
+    def people_working_at(self, when: Optional[datetime] = None) -> Dict[str, Any]:
+        local_now = _coerce_la_datetime(when)
+        day_canon = local_now.strftime("%A").lower()
+        minute = local_now.hour * 60 + local_now.minute
+        show_oncall = should_show_oncall_now(local_now)
+
+        result: Dict[str, Any] = {
+            "day": day_canon,
+            "display_mode": "oncall" if show_oncall else "campus",
+            "when_local": local_now.isoformat(timespec="minutes"),
+            "when_label": local_now.strftime("%A, %b %d at %I:%M %p").replace(" 0", " "),
+            "entries": [],
+            "sources": [],
+            "sheet_titles": {},
+        }
+
+        if show_oncall:
+            result["sources"] = ["On-Call"]
+            if len(self.titles) < 3:
+                return result
+            result["sheet_titles"]["On-Call"] = self.titles[2]
+            result["entries"] = self.entries_at("On-Call", day_canon, minute)
+            return result
+
+        sources = ["UNH", "MC"][: len(self.titles)]
+        result["sources"] = sources
+        for pos, source in enumerate(sources):
+            result["sheet_titles"][source] = self.titles[pos]
+            result["entries"].extend(self.entries_at(source, day_canon, minute))
+        return result
 
 
 def get_people_working_now(
@@ -1000,68 +867,45 @@ def get_people_working_now(
     *,
     when: Optional[datetime] = None,
 ) -> Dict[str, Any]:
-    local_now = _coerce_la_datetime(when)
-    day_canon = local_now.strftime("%A").lower()
-    titles = _open_three(ss)
-    show_oncall = should_show_oncall_now(local_now)
-
-    result: Dict[str, Any] = {
-        "day": day_canon,
-        "display_mode": "oncall" if show_oncall else "campus",
-        "when_local": local_now.isoformat(timespec="minutes"),
-        "when_label": local_now.strftime("%A, %b %d at %I:%M %p").replace(" 0", " "),
-        "entries": [],
-        "sources": [],
-        "sheet_titles": {},
-    }
+    return WorkingTimeline(ss).people_working_at(when)
 
-    if show_oncall:
-        result["sources"] = ["On-Call"]
-        if len(titles) < 3:
-            return result
-        result["sheet_titles"]["On-Call"] = titles[2]
-        try:
-            ws_on = ss.worksheet(titles[2])
-            per_day = _oncall_people_ranges(ws_on)
-            result["entries"] = _working_entries_for_day(
-                per_day.get(day_canon, []),
-                source="On-Call",
-                when=local_now,
-            )
-        except Exception:
-            result["entries"] = []
-        return result
 
-    source_specs = []
-    if len(titles) >= 1:
-        source_specs.append(("UNH", titles[0]))
-    if len(titles) >= 2:
-        source_specs.append(("MC", titles[1]))
+def _fill_user_blocks(
+    ss: gspread.Spreadsheet,
+    result: Dict[str, Dict[str, List[Tuple[str, str]]]],
+    name_norm: str,
+    *,
+    unh_title: str | None,
+    mc_title: str | None,
+    oncall_title: str | None,
+) -> None:
+    """Read the UNH, MC and On-Call tabs side by side and merge the user's blocks into ``result``."""
+
+    def unh_mc(title: str):
+        return lambda: _unh_mc_ranges(open_worksheet(ss, title), name_norm)  # Mon–Fri
 
-    result["sources"] = [src for src, _title in source_specs]
-    for source, title in source_specs:
-        result["sheet_titles"][source] = title
-        try:
-            ws = ss.worksheet(title)
-            per_day = _unh_mc_people_ranges(ws)
-            result["entries"].extend(
-                _working_entries_for_day(
-                    per_day.get(day_canon, []),
-                    source=source,
-                    when=local_now,
-                )
-            )
-        except Exception:
-            continue
+    def oncall(title: str):
+        return lambda: _oncall_blocks(open_worksheet(ss, title), name_norm)  # Sun–Sat
 
-    result["entries"].sort(
-        key=lambda row: (
-            result["sources"].index(row.get("source", "")) if row.get("source", "") in result["sources"] else 99,
-            _parse_time_cell(row.get("start", "")) or datetime.min,
-            row.get("name", ""),
-        )
-    )
-    return result
+    calls = {}
+    if unh_title:
+        calls["UNH"] = unh_mc(unh_title)
+    if mc_title:
+        calls["MC"] = unh_mc(mc_title)
+    if oncall_title:
+        calls["On-Call"] = oncall(oncall_title)
+    if not calls:
+        return
+
+    # Load the shared snapshot once here so the workers don't all race for it.
+    workbook_snapshot(ss)
+    found = run_parallel(calls)
+
+    for kind in ("UNH", "MC"):
+        for d, blocks in (found.get(kind) or {}).items():
+            result[d][kind] = blocks
+    for d, blocks in (found.get("On-Call") or {}).items():
+        result[d]["On-Call"].extend(blocks)
 
 
 def get_user_schedule(ss: gspread.Spreadsheet, _schedule_unused, oa_name: str) -> Dict[str, Dict[str, List[Tuple[str, str]]]]:
@@ -1072,6 +916,11 @@ def get_user_schedule(ss: gspread.Spreadsheet, _schedule_unused, oa_name: str) -
         ...
       }
     """
+    key = ("user_schedule", str(getattr(ss, "id", "")), name_key(oa_name), needs_fresh())
+    return copy.deepcopy(action_memo(key, lambda: _user_schedule(ss, oa_name)))
+
+
+def _user_schedule(ss: gspread.Spreadsheet, oa_name: str) -> Dict[str, Dict[str, List[Tuple[str, str]]]]:
     titles = _open_three(ss)
     result: Dict[str, Dict[str, List[Tuple[str, str]]]] = {
         d: {"UNH": [], "MC": [], "On-Call": []} for d in _WEEK_ORDER_7
@@ -1080,38 +929,14 @@ def get_user_schedule(ss: gspread.Spreadsheet, _schedule_unused, oa_name: str) -
     if not titles:
         return result
 
-    name_norm = _norm_name(oa_name)
-
-    # UNH
-    if len(titles) >= 1:
-        try:
-            ws_unh = ss.worksheet(titles[0])
-            unh_ranges = _unh_mc_ranges(ws_unh, name_norm)  # Mon–Fri
-            for d, blocks in unh_ranges.items():
-                result[d]["UNH"] = blocks
-        except Exception:
-            pass
-
-    # MC
-    if len(titles) >= 2:
-        try:
-            ws_mc = ss.worksheet(titles[1])
-            mc_ranges = _unh_mc_ranges(ws_mc, name_norm)  # Mon–Fri
-            for d, blocks in mc_ranges.items():
-                result[d]["MC"] = blocks
-        except Exception:
-            pass
-
-    # On-Call (neighbor / override)
-    if len(titles) >= 3:
-        try:
-            ws_on = ss.worksheet(titles[2])
-            oc = _oncall_blocks(ws_on, name_norm)  # Sun–Sat
-            for d, blocks in oc.items():
-                result[d]["On-Call"].extend(blocks)
-        except Exception:
-            pass
-
+    _fill_user_blocks(
+        ss,
+        result,
+        _norm_name(oa_name),
+        unh_title=titles[0] if len(titles) >= 1 else None,
+        mc_title=titles[1] if len(titles) >= 2 else None,
+        oncall_title=titles[2] if len(titles) >= 3 else None,
+    )
     return result
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -1492,33 +1317,12 @@ def get_user_schedule_for_titles(
         d: {"UNH": [], "MC": [], "On-Call": []} for d in _WEEK_ORDER_7
     }
 
-    name_norm = _norm_name(oa_name)
-
-    if unh_title:
-        try:
-            ws_unh = ss.worksheet(unh_title)
-            unh_ranges = _unh_mc_ranges(ws_unh, name_norm)
-            for d, blocks in unh_ranges.items():
-                result[d]["UNH"] = blocks
-        except Exception:
-            pass
-
-    if mc_title:
-        try:
-            ws_mc = ss.worksheet(mc_title)
-            mc_ranges = _unh_mc_ranges(ws_mc, name_norm)
-            for d, blocks in mc_ranges.items():
-                result[d]["MC"] = blocks
-        except Exception:
-            pass
-
-    if oncall_title:
-        try:
-            ws_on = ss.worksheet(oncall_title)
-            oc = _oncall_blocks(ws_on, name_norm)
-            for d, blocks in oc.items():
-                result[d]["On-Call"].extend(blocks)
-        except Exception:
-            pass
-
+    _fill_user_blocks(
+        ss,
+        result,
+        _norm_name(oa_name),
+        unh_title=unh_title,
+        mc_title=mc_title,
+        oncall_title=oncall_title,
+    )
     return result
@@ -0,0 +1,196 @@
+"""Tab layout detection, cached by a fingerprint of the tab's structure.
+
+Finding a weekday column walks a chain of header scans (row 0, the first 25
+rows, range-labelled On-Call blocks, then "anywhere" and fuzzy fallbacks), most
+of them parsing cells with dateutil. Their answers only depend on a few cells:
+the first ``_HEADER_ROWS`` rows, column A (time labels) and the first block
+label of each column with the rows just above it. ``tab_layout(grid)`` copies
+those cells into a structural view, hashes it and returns the ``TabLayout`` for
+that hash, so a lane write (a new grid object, or a caller's private copy of
+the grid) still lands on the layout detected before and skips the scans.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..core.snapshot import day_column_finder
+from . import schedule_query as sq
+
+_HEADER_ROWS = 60
+_BLOCK_HEADER_SCAN = 8  # rows above a column's first block label that _infer_day_cols_by_blocks reads
+_SWAPS_HEADERS = {"shift swaps for the week"}
+_MAX_LAYOUTS = 64
+_lock = threading.Lock()
+_layouts: "OrderedDict[int, TabLayout]" = OrderedDict()
+
+
+def _structural_view(grid: List[List[str]]) -> List[List[str]]:
+    """Same-height copy of ``grid`` keeping only the cells a layout detector can read."""
+    view = [list(row or []) for row in grid[:_HEADER_ROWS]]
+    first_label: Dict[int, int] = {}
+    for r, row in enumerate(grid):
+        for c, cell in enumerate(row or []):
+            if c in first_label or not cell or not ("-" in cell or "–" in cell):
+                continue
+            if sq._RANGE_RE.match(cell):
+                first_label[c] = r
+    for r in range(_HEADER_ROWS, len(grid)):
+        row = grid[r] or []
+        view.append([row[0]] if row and row[0] else [])
+    for c, r0 in first_label.items():
+        for r in range(max(_HEADER_ROWS, r0 - _BLOCK_HEADER_SCAN), r0 + 1):
+            src = grid[r] or []
+            value = src[c] if c < len(src) else ""
+            if not value:
+                continue
+            row = view[r]
+            if c >= len(row):
+                row.extend([""] * (c + 1 - len(row)))
+            row[c] = value
+    return view
+
+
+def layout_fingerprint(view: List[List[str]]) -> int:
+    return hash(tuple(tuple(row) for row in view))
+
+
+class TabLayout:
+    """Day columns, time bands and the swap-notes column of one tab layout.
+
+    ``grid`` is the structural view the layout was detected from; it answers
+    every detector exactly like the full grid would.
+    """
+
+    def __init__(self, view: List[List[str]], fingerprint: int):
+        self.grid = view
+        self.fingerprint = fingerprint
+        self._memo: Dict[Any, Any] = {}
+
+    def memo(self, key: Any, build: Callable[[], Any]) -> Any:
+        """Per-layout cache for consumer-specific detectors that only read structural cells."""
+        try:
+            return self._memo[key]
+        except KeyError:
+            value = self._memo[key] = build()
+            return value
+
+    # ─────── day columns ───────
+    @property
+    def first_row_days(self) -> Dict[str, int]:
+        from . import chat_add as ca
+
+        return dict(self.memo("first_row_days", lambda: ca._day_cols_from_first_row(self.grid)))
+
+    @property
+    def header_days(self) -> Dict[str, int]:
+        from . import chat_add as ca
+
+        return dict(self.memo("header_days", lambda: ca._header_day_cols(self.grid)))
+
+    @property
+    def block_days(self) -> Dict[str, int]:
+        from . import chat_add as ca
+
+        return dict(self.memo("block_days", lambda: ca._infer_day_cols_by_blocks(self.grid)))
+
+    def day_col_anywhere(self, day: str) -> Optional[int]:
+        from . import chat_add as ca
+
+        return self.memo(("day_col_anywhere", day), lambda: ca._find_day_col_anywhere(self.grid, day))
+
+    def day_col_fuzzy(self, day: str) -> Optional[int]:
+        from . import chat_add as ca
+
+        return self.memo(("day_col_fuzzy", day), lambda: ca._find_day_col_fuzzy(self.grid, day))
+
+    def unh_mc_day_cols(self, day: str) -> Dict[str, int]:
+        """Header row days, plus ``day`` found anywhere if the header lacks it (copy)."""
+        day_cols = self.header_days
+        if day not in day_cols:
+            c_guess = self.day_col_anywhere(day)
+            if c_guess is not None:
+                day_cols[day] = c_guess
+        return day_cols
+
+    def oncall_day_cols(self, day: str) -> Dict[str, int]:
+        """Row 0, then header rows, block labels, anywhere and fuzzy, until ``day`` is found (copy)."""
+        day_cols = self.first_row_days
+        for fallback in (lambda: self.header_days, lambda: self.block_days):
+            if day in day_cols:
+                break
+            for k, v in fallback().items():
+                day_cols.setdefault(k, v)
+        for guess in (self.day_col_anywhere, self.day_col_fuzzy):
+            if day in day_cols:
+                break
+            c_guess = guess(day)
+            if c_guess is not None:
+                day_cols[day] = c_guess
+        return day_cols
+
+    # ─────── rows / columns ───────
+    time_col = 0
+
+    @property
+    def band_rows(self) -> Tuple[int, ...]:
+        """Rows holding a half-hour label in the time column."""
+
+        def build() -> Tuple[int, ...]:
+            rows = []
+            for r, row in enumerate(self.grid):
+                col0 = str((row[self.time_col] if row else "") or "")
+                if sq._TIME_CELL_RE.match(col0) and sq._parse_time_cell(col0):
+                    rows.append(r)
+            return tuple(rows)
+
+        return self.memo("band_rows", build)
+
+    @property
+    def lane_counts(self) -> Dict[int, int]:
+        """Band row -> number of lane rows below it."""
+        rows = self.band_rows
+        ends = list(rows[1:]) + [len(self.grid)]
+        return {r0: r1 - r0 - 1 for r0, r1 in zip(rows, ends)}
+
+    @property
+    def swaps_col(self) -> Optional[int]:
+        """Column headed "Shift swaps for the week" in the first rows, if any."""
+
+        def build() -> Optional[int]:
+            for row in self.grid[:3]:
+                for c, raw in enumerate(row):
+                    if str(raw or "").strip().lower() in _SWAPS_HEADERS:
+                        return c
+            return None
+
+        return self.memo("swaps_col", build)
+
+
+def tab_layout(grid: List[List[str]]) -> TabLayout:
+    """Shared ``TabLayout`` for any grid with the same structural cells (LRU-bounded)."""
+    view = _structural_view(grid or [])
+    fp = layout_fingerprint(view)
+    with _lock:
+        layout = _layouts.get(fp)
+        if layout is not None and layout.grid == view:
+            _layouts.move_to_end(fp)
+            return layout
+        layout = _layouts[fp] = TabLayout(view, fp)
+        while len(_layouts) > _MAX_LAYOUTS:
+            _layouts.popitem(last=False)
+        return layout
+
+
+def clear_tab_layouts() -> None:
+    with _lock:
+        _layouts.clear()
+
+
+@day_column_finder
+def _snapshot_day_cols(grid: List[List[str]]) -> List[int]:
+    """Day columns the snapshot refresh probes alongside column A."""
+    layout = tab_layout(grid)
+    return sorted(set(layout.header_days.values()) | set(layout.first_row_days.values()) | set(layout.block_days.values()))
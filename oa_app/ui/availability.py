@@ -8,16 +8,21 @@ from __future__ import annotations
 
 import re
 from datetime import datetime, timedelta
-from typing import List, Optional, Tuple
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
 
 import gspread
+import numpy as np
 import streamlit as st
 
 from .. import config as _config
 from ..config import APPROVAL_SHEET, AUDIT_SHEET, LOCKS_SHEET, ROSTER_SHEET, SIDEBAR_DENY_TABS
-from ..core.utils import fmt_time
-from ..integrations.gspread_io import with_backoff
+from ..core import labor_rules
+from ..core.occupancy import free_runs
+from ..core.utils import fmt_time, parse_time_label
+from ..core.ws_registry import open_worksheet, visible_titles
 from ..services import schedule_query
+from ..services.schedule_index import TimeBand, schedule_index
+from ..services.tab_layout import tab_layout
 
 
 try:
@@ -31,7 +36,6 @@ except Exception:
     ONCALL_WEEKDAY_CAPACITY = 9
 
 
-_TIME_CELL_RE = re.compile(r"^\s*\d{1,2}(?::\d{2})?\s*(?:AM|PM)\s*$", re.I)
 _RANGE_RE = re.compile(
     r"^\s*(\d{1,2}(?::\d{2})?\s*(?:AM|PM))\s*[-–]\s*(\d{1,2}(?::\d{2})?\s*(?:AM|PM))\s*$",
     re.I,
@@ -39,20 +43,10 @@ _RANGE_RE = re.compile(
 
 _read_grid = schedule_query._read_grid
 _sq_daycanon = getattr(schedule_query, "_canon_day_from_header", None)
-_sq_ws_titles = getattr(schedule_query, "_cached_ws_titles", None)
 
 
 def _parse_time_cell(value: str) -> Optional[datetime]:
-    txt = (value or "").strip()
-    if not txt:
-        return None
-    txt = re.sub(r"\s*(am|pm)\s*$", lambda m: f" {m.group(1).upper()}", txt, flags=re.I)
-    for fmt in ("%I:%M %p", "%I %p"):
-        try:
-            return datetime.strptime(txt, fmt)
-        except Exception:
-            continue
-    return None
+    return parse_time_label(value)
 
 
 def campus_kind(title: str) -> str:
@@ -130,13 +124,10 @@ def _resolve_day_col(grid: List[List], day_canon: str) -> Optional[int]:
     return _find_day_col_anywhere(grid, day_canon) or _find_day_col_fuzzy(grid, day_canon)
 
 
-def _time_rows(grid: List[List]) -> List[int]:
-    rows: List[int] = []
-    for r, row in enumerate(grid):
-        col0 = (row[0] if row else "") or ""
-        if _TIME_CELL_RE.match(str(col0)) and _parse_time_cell(str(col0)):
-            rows.append(r)
-    return rows
+def _layout_day_col(grid: List[List], day_canon: str) -> Optional[int]:
+    """``_resolve_day_col`` through the tab's cached layout."""
+    layout = tab_layout(grid)
+    return layout.memo(("availability_day_col", day_canon), lambda: _resolve_day_col(layout.grid, day_canon))
 
 
 def _merge_half_hours_to_ranges(labels_30m: List[Tuple[datetime, datetime]]) -> List[Tuple[datetime, datetime]]:
@@ -165,68 +156,110 @@ def _merge_half_hours_to_ranges(labels_30m: List[Tuple[datetime, datetime]]) ->
     return merged
 
 
-def _available_ranges_unh_mc(ws: gspread.Worksheet, day_canon: str) -> List[Tuple[datetime, datetime]]:
+_WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday")
+_WEEK = _WEEKDAYS + ("saturday", "sunday")
+
+
+def _open_slots_unh_mc(ws: gspread.Worksheet, days: Sequence[str]) -> Tuple[Tuple[TimeBand, ...], Dict[str, np.ndarray]]:
+    """Time bands of the tab and, per resolvable day, which bands have an open lane.
+
+    Everything comes from one lane bitmap of the tab. UNH counts the first
+    ``UNH_MC_CAPACITY`` lanes of a slot; MC only counts lanes used on some
+    weekday (the first 800 rows), or every lane of a slot where none is used.
+    """
     grid = _read_grid(ws)
     if not grid:
-        return []
+        return (), {}
 
-    day_col = _resolve_day_col(grid, day_canon)
-    if day_col is None:
-        return []
+    idx = schedule_index(grid)
+    if not idx.time_bands:
+        return (), {}
 
-    time_rows = _time_rows(grid)
-    if not time_rows:
-        return []
-    time_rows.append(len(grid))
+    def day_col(day: str) -> Optional[int]:
+        return idx.memo(("availability_day_col", day), lambda: _layout_day_col(grid, day))
 
-    is_mc = bool(re.search(r"\bmc\b|main", (ws.title or "").lower()))
-    empties: List[Tuple[datetime, datetime]] = []
-
-    weekday_cols: List[int] = []
-    for day in ("monday", "tuesday", "wednesday", "thursday", "friday"):
-        col = _resolve_day_col(grid, day)
-        if col is not None:
-            weekday_cols.append(col)
-
-    used_rows = set()
-    if is_mc and weekday_cols:
-        for rr in range(0, min(len(grid), 800)):
-            row = grid[rr] if rr < len(grid) else []
-            for col in weekday_cols:
-                if col < len(row) and not _is_blankish(row[col]):
-                    used_rows.add(rr)
-                    break
-
-    cap = int(UNH_MC_CAPACITY_DEFAULT)
-
-    for i in range(len(time_rows) - 1):
-        r0, r1 = time_rows[i], time_rows[i + 1]
-        start_label = (grid[r0][0] if len(grid[r0]) >= 1 else "") or ""
-        start_dt = _parse_time_cell(str(start_label))
-        if not start_dt:
-            continue
-        end_dt = start_dt + timedelta(minutes=30)
+    day_cols = {day: day_col(day) for day in days}
+    day_cols = {day: col for day, col in day_cols.items() if col is not None}
+    if not day_cols:
+        return idx.time_bands, {}
 
-        band_rows = list(range(r0 + 1, r1))
-        if not band_rows:
-            continue
+    # One bitmap per grid: classify every day column, whichever days were asked for.
+    week_cols = [col for col in map(day_col, _WEEK) if col is not None]
+    occ = idx.occupancy(week_cols + list(day_cols.values()), _is_blankish)
 
-        if is_mc:
-            lane_rows = [rr for rr in band_rows if rr in used_rows] or band_rows
-        else:
-            lane_rows = band_rows[: max(1, cap)]
+    is_mc = bool(re.search(r"\bmc\b|main", (ws.title or "").lower()))
+    if is_mc:
+        weekday_cols = [col for col in map(day_col, _WEEKDAYS) if col is not None]
+        used = occ.used_lanes(weekday_cols) & (occ.rows < 800)
+        lane_mask = used | ~used.any(axis=1, keepdims=True)
+    else:
+        lane_mask = np.arange(occ.lanes) < max(1, int(UNH_MC_CAPACITY_DEFAULT))
+
+    open_slots = occ.open_slots(lane_mask)
+    return idx.time_bands, {day: open_slots[occ.cols.index(col)] for day, col in day_cols.items()}
+
+
+def _available_ranges_unh_mc_week(ws: gspread.Worksheet, days: Sequence[str]) -> Dict[str, List[Tuple[datetime, datetime]]]:
+    """Open ranges of every day in ``days`` (see ``_open_slots_unh_mc``)."""
+    bands, free = _open_slots_unh_mc(ws, days)
+    out: Dict[str, List[Tuple[datetime, datetime]]] = {day: [] for day in days}
+    for day, row in free.items():
+        out[day] = _merge_half_hours_to_ranges([(bands[s].start, bands[s].end) for s in np.flatnonzero(row)])
+    return out
+
+
+class WindowOption(NamedTuple):
+    day: str
+    start: datetime
+    end: datetime
+
+    @property
+    def minutes(self) -> int:
+        return labor_rules.minutes_between(self.start, self.end)
+
+
+def exact_length_windows_week(
+    ws: gspread.Worksheet,
+    lengths: Iterable[int],
+    *,
+    days: Sequence[str] = _WEEK,
+    day_minutes: Optional[Dict[str, int]] = None,
+    week_minutes: int = 0,
+    daily_cap: int = labor_rules.MAX_DAILY_MINS,
+    weekly_cap: int = labor_rules.MAX_WEEKLY_MINS,
+) -> List[WindowOption]:
+    """Every open UNH/MC window of each length in ``lengths`` (minutes), for the whole week.
+
+    A window starts on a band, covers ``ceil(length / 30)`` back-to-back open
+    bands and ends ``length`` minutes later. Windows that would take the person
+    over ``daily_cap`` (on top of ``day_minutes[day]``) or ``weekly_cap`` (on top
+    of ``week_minutes``) are left out. Sorted by day order, start, then length.
+    """
+    bands, free = _open_slots_unh_mc(ws, days)
+    lengths = sorted({int(n) for n in lengths if int(n) > 0})
+    order = [day for day in days if day in free]
+    if not bands or not order or not lengths:
+        return []
 
-        vals = []
-        for rr in lane_rows:
-            if 0 <= rr < len(grid) and 0 <= day_col < len(grid[rr]):
-                vals.append(grid[rr][day_col])
-            else:
-                vals.append("")
+    matrix = np.array([free[day] for day in order], dtype=bool)
+    joined = np.array([a.end == b.start for a, b in zip(bands, bands[1:])], dtype=bool)
+    used = np.array([int((day_minutes or {}).get(day, 0)) for day in order])
+    room = np.minimum(int(daily_cap) - used, int(weekly_cap) - int(week_minutes))
+
+    found: List[Tuple[int, int, int]] = []
+    for length in lengths:
+        ok = free_runs(matrix, joined, -(-length // 30))
+        ok &= (room >= length)[:, None]
+        found.extend((d, s, length) for d, s in zip(*np.nonzero(ok)))
+    found.sort()
+    return [
+        WindowOption(order[d], bands[s].start, bands[s].start + timedelta(minutes=length))
+        for d, s, length in found
+    ]
 
-        if any(_is_blankish(v) for v in vals):
-            empties.append((start_dt, end_dt))
 
-    return _merge_half_hours_to_ranges(empties)
+def _available_ranges_unh_mc(ws: gspread.Worksheet, day_canon: str) -> List[Tuple[datetime, datetime]]:
+    return _available_ranges_unh_mc_week(ws, [day_canon])[day_canon]
 
 
 def _available_blocks_oncall(ws: gspread.Worksheet, day_canon: str) -> List[Tuple[datetime, datetime]]:
@@ -234,7 +267,7 @@ def _available_blocks_oncall(ws: gspread.Worksheet, day_canon: str) -> List[Tupl
     if not grid:
         return []
 
-    day_col = _resolve_day_col(grid, day_canon)
+    day_col = schedule_index(grid).memo(("availability_day_col", day_canon), lambda: _layout_day_col(grid, day_canon))
     if day_col is None:
         return []
 
@@ -242,11 +275,14 @@ def _available_blocks_oncall(ws: gspread.Worksheet, day_canon: str) -> List[Tupl
     cap = int(ONCALL_WEEKDAY_CAPACITY) if is_weekday else None
 
     blocks: List[Tuple[datetime, datetime]] = []
-    label_rows = [
-        r
-        for r in range(len(grid))
-        if _RANGE_RE.match(str((grid[r][day_col] if day_col < len(grid[r]) else "") or ""))
-    ]
+    label_rows = schedule_index(grid).memo(
+        ("availability_oncall_labels", day_col),
+        lambda: [
+            r
+            for r in range(len(grid))
+            if _RANGE_RE.match(str((grid[r][day_col] if day_col < len(grid[r]) else "") or ""))
+        ],
+    )
     for i, label_row in enumerate(label_rows):
         cell = (grid[label_row][day_col] if day_col < len(grid[label_row]) else "") or ""
         match = _RANGE_RE.match(str(cell))
@@ -269,6 +305,28 @@ def _available_blocks_oncall(ws: gspread.Worksheet, day_canon: str) -> List[Tupl
     return blocks
 
 
+def _ranges_24h(ranges) -> List[Tuple[str, str]]:
+    out = []
+    for item in ranges or []:
+        start = end = None
+        if isinstance(item, dict):
+            start = item.get("start") or item.get("s")
+            end = item.get("end") or item.get("e")
+        elif isinstance(item, (list, tuple)) and len(item) >= 2:
+            start, end = item[0], item[1]
+        elif isinstance(item, str):
+            match = re.match(r"^\s*([0-2]?\d:\d\d)\s*[-–]\s*([0-2]?\d:\d\d)\s*$", item.strip())
+            if match:
+                out.append((match.group(1), match.group(2)))
+                continue
+
+        if start is None or end is None:
+            continue
+        if hasattr(start, "strftime") and hasattr(end, "strftime"):
+            out.append((start.strftime("%H:%M"), end.strftime("%H:%M")))
+    return out
+
+
 @st.cache_data(ttl=30, show_spinner=False)
 def cached_available_ranges_for_day(ss_id: str, tab_title: str, day_canon: str, epoch: int):
     del epoch
@@ -276,76 +334,70 @@ def cached_available_ranges_for_day(ss_id: str, tab_title: str, day_canon: str,
         ss = st.session_state.get("_SS_HANDLE_BY_ID", {}).get(ss_id)
         if not ss:
             return []
-        ws = with_backoff(ss.worksheet, tab_title)
+        ws = open_worksheet(ss, tab_title)
         kind = campus_kind(tab_title)
         ranges = _available_blocks_oncall(ws, day_canon) if kind == "ONCALL" else _available_ranges_unh_mc(ws, day_canon)
-
-        out = []
-        for item in ranges or []:
-            start = end = None
-            if isinstance(item, dict):
-                start = item.get("start") or item.get("s")
-                end = item.get("end") or item.get("e")
-            elif isinstance(item, (list, tuple)) and len(item) >= 2:
-                start, end = item[0], item[1]
-            elif isinstance(item, str):
-                match = re.match(r"^\s*([0-2]?\d:\d\d)\s*[-–]\s*([0-2]?\d:\d\d)\s*$", item.strip())
-                if match:
-                    out.append((match.group(1), match.group(2)))
-                    continue
-
-            if start is None or end is None:
-                continue
-            if hasattr(start, "strftime") and hasattr(end, "strftime"):
-                out.append((start.strftime("%H:%M"), end.strftime("%H:%M")))
-        return out
+        return _ranges_24h(ranges)
     except Exception:
         return []
 
 
 @st.cache_data(ttl=30, show_spinner=False)
-def enumerate_exact_length_windows(merged_ranges_24h, need_minutes: int):
-    results = []
-    step = 30
-    pairs = []
-
-    for item in merged_ranges_24h or []:
-        if isinstance(item, (list, tuple)) and len(item) >= 2:
-            pairs.append((str(item[0]).strip(), str(item[1]).strip()))
-        elif isinstance(item, str):
-            match = re.match(r"^\s*([0-2]?\d:\d\d)\s*[-–]\s*([0-2]?\d:\d\d)\s*$", item.strip())
-            if match:
-                pairs.append((match.group(1), match.group(2)))
-
-    for start_24h, end_24h in pairs:
-        try:
-            start_base = datetime.strptime(start_24h, "%H:%M")
-            end_base = datetime.strptime(end_24h, "%H:%M")
-        except Exception:
-            continue
-        span = int((end_base - start_base).total_seconds() // 60)
-        if span < need_minutes:
-            continue
-        start = start_base
-        while start + timedelta(minutes=need_minutes) <= end_base:
-            end = start + timedelta(minutes=need_minutes)
-            results.append((start.strftime("%H:%M"), end.strftime("%H:%M")))
-            start += timedelta(minutes=step)
-
-    seen = set()
-    uniq = []
-    for start, end in sorted(results):
-        if (start, end) in seen:
-            continue
-        seen.add((start, end))
-        uniq.append((start, end))
-    return uniq
+def cached_all_day_availability(ss_id: str, tab_title: str, epoch: int):
+    """Whole-week availability of one tab, computed in a single pass over its grid."""
+    del epoch
+    days = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+    try:
+        ss = st.session_state.get("_SS_HANDLE_BY_ID", {}).get(ss_id)
+        if not ss:
+            return {day: [] for day in days}
+        ws = open_worksheet(ss, tab_title)
+        if campus_kind(tab_title) == "ONCALL":
+            ranges = {day: _available_blocks_oncall(ws, day) for day in days}
+        else:
+            ranges = _available_ranges_unh_mc_week(ws, days)
+        return {day: _ranges_24h(ranges.get(day)) for day in days}
+    except Exception:
+        return {day: [] for day in days}
 
 
 @st.cache_data(ttl=30, show_spinner=False)
-def cached_all_day_availability(ss_id: str, tab_title: str, epoch: int):
-    days = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
-    return {day: cached_available_ranges_for_day(ss_id, tab_title, day, epoch) for day in days}
+def cached_exact_length_windows(
+    ss_id: str,
+    tab_title: str,
+    lengths: Tuple[int, ...],
+    epoch: int,
+    day_minutes: Tuple[Tuple[str, int], ...] = (),
+    week_minutes: int = 0,
+):
+    """``(day, "HH:MM", "HH:MM")`` for every bookable window of the given lengths this week.
+
+    On-Call tabs only offer their fixed blocks, so a block qualifies when its
+    length is one of ``lengths``. Daily/weekly caps apply to both.
+    """
+    del epoch
+    try:
+        ss = st.session_state.get("_SS_HANDLE_BY_ID", {}).get(ss_id)
+        if not ss:
+            return []
+        ws = open_worksheet(ss, tab_title)
+        used = dict(day_minutes)
+        if campus_kind(tab_title) != "ONCALL":
+            windows = exact_length_windows_week(ws, lengths, day_minutes=used, week_minutes=week_minutes)
+        else:
+            room = {
+                day: min(labor_rules.MAX_DAILY_MINS - int(used.get(day, 0)), labor_rules.MAX_WEEKLY_MINS - int(week_minutes))
+                for day in _WEEK
+            }
+            windows = [
+                option
+                for day in _WEEK
+                for option in (WindowOption(day, start, end) for start, end in _available_blocks_oncall(ws, day))
+                if option.minutes in set(lengths) and option.minutes <= room[day]
+            ]
+        return [(w.day, w.start.strftime("%H:%M"), w.end.strftime("%H:%M")) for w in windows]
+    except Exception:
+        return []
 
 
 def render_availability_expander(st_mod, ss_id: str, tab_title: str, epoch: int):
@@ -433,9 +485,7 @@ def _visible_tabs(ss) -> List[str]:
         if str(tab).strip()
     }
 
-    titles = []
-    if callable(_sq_ws_titles):
-        titles = _sq_ws_titles(getattr(ss, "id", "")) or []
+    titles = visible_titles(ss)
     return [title for title in titles if title.strip().lower() not in deny]
 
 
@@ -471,7 +521,6 @@ def render_global_availability(st_mod, ss, epoch: int):
                 st_mod.info("No On-Call tab visible.")
 
 
-@st.cache_data(ttl=300, show_spinner=False)
 def list_tabs_for_sidebar(ss_id: str) -> List[str]:
     ss = st.session_state.get("_SS_HANDLE_BY_ID", {}).get(ss_id)
     if not ss:
@@ -483,8 +532,7 @@ def clear_caches() -> None:
     for fn in (
         cached_available_ranges_for_day,
         cached_all_day_availability,
-        enumerate_exact_length_windows,
-        list_tabs_for_sidebar,
+        cached_exact_length_windows,
     ):
         try:
             fn.clear()  # type: ignore[attr-defined]
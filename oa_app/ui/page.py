@@ -20,15 +20,23 @@ from ..config import (
     SIDEBAR_DENY_TABS,
 )
 from ..core import labor_rules, sheets_sections, utils, week_range as week_range_mod
+from ..core.action_context import action_context
 from ..core.intents import parse_intent
+from ..core.intervals import IntervalIndex
+from ..core.range_cache import shared_range_cache
 from ..core.schedule import Schedule
+from ..core.snapshot import invalidate_workbook_snapshot
+from ..core.week_timeline import WeekTimeline, make_span
+from ..core.write_plan import WritePlan
+from ..core.ws_registry import open_worksheet, visible_titles, worksheet_registry
 from ..core.utils import fmt_time, name_key
-from ..integrations.gspread_io import open_spreadsheet, retry_429, with_backoff
-from ..services import callouts_db, chat_add as chat_add_mod, pickups_db, schedule_query
+from ..integrations.gspread_io import open_spreadsheet, with_backoff
+from ..services import callouts_db, chat_add as chat_add_mod, hours_ledger, pickups_db, schedule_query
 from ..services.approvals import get_request as get_approval_request
 from ..services.approvals import read_requests as read_approval_requests
 from ..services.approvals import set_status as set_approval_status
 from ..services.approvals import submit_request as submit_approval_request
+from ..services.approvals import sync_requests as sync_approval_requests
 from ..services.audit_log import append_audit, log_action
 from ..services.chat_add import handle_add as do_add
 from ..services.chat_callout import handle_callout as do_callout
@@ -66,14 +74,13 @@ _MMDD_RE = re.compile(r"\b(\d{1,2})/(\d{1,2})\b")
 _NOTE_RED = {"red": 0.95, "green": 0.25, "blue": 0.25}
 
 
-@st.cache_data(ttl=60, show_spinner=False)
 def list_tabs_for_sidebar(_ss) -> list[str]:
     """Show only actual schedule tabs plus weekly On-Call sheets."""
-    try:
-        worksheets = retry_429(_ss.worksheets)
-    except Exception as e:
-        st.error(f"Could not list worksheets: {e}")
+    registry = worksheet_registry(_ss)
+    if registry is None:
+        st.error("Could not list worksheets.")
         return []
+    worksheets = registry.worksheets()
 
     rest = worksheets[1:]
     deny = {
@@ -226,7 +233,7 @@ def _resolve_week_titles(all_titles: list[str], seed_title: str, *, ss=None) ->
 
 def _worksheet_week_bounds(ss, campus_title: str) -> tuple[date, date] | None:
     try:
-        ws = ss.worksheet(campus_title)
+        ws = open_worksheet(ss, campus_title)
     except Exception:
         return None
     try:
@@ -568,8 +575,8 @@ def _is_overtime_request(req: dict) -> bool:
     return bool(_OVERTIME_MARKER_RE.search(details))
 
 
-@st.cache_data(ttl=5, show_spinner=False)
 def cached_approval_table(ss_id: str, approvals_epoch: int, max_rows: int = 500):
+    # one shared mirror serves every window size; it syncs incrementally every few seconds
     ss = st.session_state.get("_SS_HANDLE_BY_ID", {}).get(ss_id)
     if not ss:
         return []
@@ -701,37 +708,6 @@ def _first_empty_section_row(values: list[str]) -> int:
     return len(values)
 
 
-def _format_adjustment_cell(ws, *, row_1based: int, col_1based: int, color: dict) -> None:
-    try:
-        sheet_id = getattr(ws, "id", None)
-        if sheet_id is None:
-            sheet_id = getattr(ws, "_properties", {}).get("sheetId")
-        if sheet_id is None:
-            return
-        with_backoff(
-            ws.spreadsheet.batch_update,
-            {
-                "requests": [
-                    {
-                        "repeatCell": {
-                            "range": {
-                                "sheetId": int(sheet_id),
-                                "startRowIndex": row_1based - 1,
-                                "endRowIndex": row_1based,
-                                "startColumnIndex": col_1based - 1,
-                                "endColumnIndex": col_1based,
-                            },
-                            "cell": {"userEnteredFormat": {"backgroundColor": color}},
-                            "fields": "userEnteredFormat.backgroundColor",
-                        }
-                    }
-                ]
-            },
-        )
-    except Exception:
-        pass
-
-
 def _find_adjustment_headers(grid: list[list[str]]) -> tuple[tuple[int, int] | None, tuple[int, int] | None]:
     weekly = (
         sheets_sections.find_header_cell_best(grid, "Shift Swaps for the week")
@@ -753,8 +729,9 @@ def _append_adjustment_note_to_sheet(
     event_d: date,
     note_text: str,
     color: dict | None = None,
+    plan: WritePlan | None = None,
 ) -> None:
-    ws = ss.worksheet(campus_title)
+    ws = open_worksheet(ss, campus_title)
     grid = sheets_sections.read_top_grid(ws, max_rows=500, max_cols=160)
     weekly_loc, future_loc = _find_adjustment_headers(grid)
     if not weekly_loc and not future_loc:
@@ -781,15 +758,13 @@ def _append_adjustment_note_to_sheet(
 
     idx0 = _first_empty_section_row(flat)
     row_1based = sec.start_row + idx0
-    try:
-        import gspread.utils as a1
-
-        cell_ref = a1.rowcol_to_a1(row_1based, sec.start_col)
-    except Exception:
-        cell_ref = f"A{row_1based}"
-    with_backoff(ws.update, cell_ref, [[note_text]])
+    own_plan = plan is None
+    plan = plan if plan is not None else WritePlan()
+    plan.append_note(ws, row_1based - 1, sec.start_col - 1, note_text)
     if color:
-        _format_adjustment_cell(ws, row_1based=row_1based, col_1based=sec.start_col, color=color)
+        plan.set_background(ws, row_1based - 1, sec.start_col - 1, color)
+    if own_plan:
+        plan.commit()
 
 
 def _log_local_callout_entry(
@@ -801,7 +776,9 @@ def _log_local_callout_entry(
     start_dt: datetime,
     end_dt: datetime,
     reason: str | None = None,
+    plan: WritePlan | None = None,
 ) -> None:
+    """Append the callout note (with whatever ``plan`` already holds, in one batch), then tell the ledger."""
     kind = campus_kind(campus_title)
     campus_label = "On Call" if kind == "ONCALL" else kind
     note_text = _adjustment_note_line(
@@ -818,12 +795,35 @@ def _log_local_callout_entry(
         event_d=event_d,
         note_text=note_text,
         color=_NOTE_RED,
+        plan=plan,
     )
+    if plan is not None:
+        plan.commit()
+    _record_adjustment_event(ss, "callout", caller_name, campus_title, event_d, start_dt, end_dt)
 
 
-def _local_working_now_rows(ss, *, when: datetime | None = None) -> tuple[list[dict], list[dict]]:
-    local_when = _coerce_la_datetime(when)
-    week_bounds = _week_bounds_la(local_when.date())
+def _record_adjustment_event(
+    ss,
+    kind: str,
+    person: str,
+    campus_title: str,
+    event_d: date,
+    start_dt: datetime,
+    end_dt: datetime,
+) -> None:
+    """Tell the hours ledger about a callout/pickup note, keyed like the adjustment scan dedupes it."""
+    campus_key = "ONCALL" if campus_kind(campus_title) == "ONCALL" else str(campus_kind(campus_title)).upper()
+    mins = int(labor_rules.minutes_between(start_dt, end_dt))
+    signature = (kind, event_d.isoformat(), campus_key, fmt_time(start_dt), fmt_time(end_dt))
+    hours_ledger.record_event(
+        ss,
+        hours_ledger.HoursEvent(kind, person, utils.normalize_day(event_d.strftime("%A")), campus_key, mins, signature),
+        week_bounds=_week_bounds_la(event_d),
+    )
+
+
+def _week_adjustment_rows(ss, week_bounds: tuple[date, date]) -> tuple[list[dict], list[dict]]:
+    """Every callout and pickup of the week from adjustment notes and colored callout cells."""
     active_callouts: list[dict] = []
     active_pickups: list[dict] = []
     seen_callouts: set[tuple[str, str, str, str]] = set()
@@ -837,8 +837,6 @@ def _local_working_now_rows(ss, *, when: datetime | None = None) -> tuple[list[d
             end_at = _combine_date_time_la(event_d, note.end.time())
             if end_at <= start_at:
                 end_at = end_at + timedelta(days=1)
-            if not _interval_contains_moment(start_at, end_at, local_when):
-                continue
 
             row = {
                 "campus": "ONCALL" if note.kind == "ONCALL" else str(note.kind).upper(),
@@ -869,8 +867,6 @@ def _local_working_now_rows(ss, *, when: datetime | None = None) -> tuple[list[d
             end_at = _combine_date_time_la(event_d, window.end.time())
             if end_at <= start_at:
                 end_at = end_at + timedelta(days=1)
-            if not _interval_contains_moment(start_at, end_at, local_when):
-                continue
             signature = (
                 event_d.isoformat(),
                 "ONCALL" if window.kind == "ONCALL" else str(window.kind).upper(),
@@ -894,10 +890,28 @@ def _local_working_now_rows(ss, *, when: datetime | None = None) -> tuple[list[d
     return active_callouts, active_pickups
 
 
+def _local_working_now_rows(ss, *, when: datetime | None = None) -> tuple[list[dict], list[dict]]:
+    local_when = _coerce_la_datetime(when)
+    callouts, pickups = _week_adjustment_rows(ss, _week_bounds_la(local_when.date()))
+
+    def active(row: dict) -> bool:
+        return _interval_contains_moment(row["shift_start_at"], row["shift_end_at"], local_when)
+
+    return [row for row in callouts if active(row)], [row for row in pickups if active(row)]
+
+
 def _annotate_working_now_snapshot(snapshot: dict, *, ss=None, when: datetime | None = None) -> dict:
     local_when = _coerce_la_datetime(when)
     active_callouts, active_pickups = _local_working_now_rows(ss, when=local_when) if ss is not None else ([], [])
+    return _apply_working_now_adjustments(snapshot, local_when, active_callouts, active_pickups)
+
 
+def _apply_working_now_adjustments(
+    snapshot: dict,
+    local_when: datetime,
+    active_callouts: list[dict],
+    active_pickups: list[dict],
+) -> dict:
     callout_map: dict[tuple[str, str], list[dict]] = {}
     for row in active_callouts:
         campus_key = _coverage_campus_key(str(row.get("campus") or ""))
@@ -971,18 +985,67 @@ def _annotate_working_now_snapshot(snapshot: dict, *, ss=None, when: datetime |
     return out
 
 
-@st.cache_data(ttl=30, show_spinner=False)
-def cached_people_working_now(ss_id: str, version_key, when_key: str):
-    del version_key
+class _WorkingNowTimeline:
+    """A week of "who's on": the schedule timeline plus callout/pickup intervals.
+
+    Built once per workbook version; every minute of the week is then answered
+    with binary searches instead of re-reading tabs and notes.
+    """
+
+    def __init__(self, ss, week_bounds: tuple[date, date]):
+        self.schedule = schedule_query.WorkingTimeline(ss)
+        callouts, pickups = _week_adjustment_rows(ss, week_bounds)
+        self.callouts = IntervalIndex(self._spans(callouts))
+        self.pickups = IntervalIndex(self._spans(pickups))
+
+    @staticmethod
+    def _spans(rows: list[dict]):
+        for row in rows:
+            start_at, end_at = row["shift_start_at"], row["shift_end_at"]
+            yield start_at, end_at if end_at > start_at else end_at + timedelta(days=1), row
+
+    def at(self, when: datetime) -> dict:
+        snapshot = self.schedule.people_working_at(when) or {}
+        return _apply_working_now_adjustments(
+            snapshot,
+            when,
+            list(self.callouts.at(when)),
+            list(self.pickups.at(when)),
+        ) or snapshot
+
+
+def _shared_versions_key(ss) -> tuple:
+    """Schedule-tab write versions as every session sees them (``WS_VER`` is per session)."""
+    cache = shared_range_cache()
+    return tuple((title, cache.version(str(ss.id), title)) for title in schedule_query._open_three(ss) or [])
+
+
+# ttl: callout/pickup notes and edits made straight in Sheets bump no version
+@st.cache_resource(max_entries=4, ttl=60, show_spinner=False)
+def _cached_working_now_timeline(ss_id: str, shared_versions, week_start: str) -> _WorkingNowTimeline | None:
+    del shared_versions
     ss = st.session_state.get("_SS_HANDLE_BY_ID", {}).get(ss_id)
     if not ss:
-        return {}
+        return None
+    week_start_d = date.fromisoformat(week_start)
+    return _WorkingNowTimeline(ss, (week_start_d, week_start_d + timedelta(days=6)))
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_people_working_now(ss_id: str, version_key, when_key: str):
     try:
         when = datetime.fromisoformat(str(when_key))
     except Exception:
         when = None
-    snapshot = schedule_query.get_people_working_now(ss, when=when) or {}
-    return _annotate_working_now_snapshot(snapshot, ss=ss, when=when) or snapshot
+    local_when = _coerce_la_datetime(when)
+    week_bounds = _week_bounds_la(local_when.date())
+    ss = st.session_state.get("_SS_HANDLE_BY_ID", {}).get(ss_id)
+    if not ss:
+        return {}
+    timeline = _cached_working_now_timeline(ss_id, _shared_versions_key(ss), week_bounds[0].isoformat())
+    if timeline is None:
+        return {}
+    return timeline.at(local_when)
 
 
 def _render_people_working_now_panel(ss, epoch_key) -> None:
@@ -1085,6 +1148,10 @@ def _resolve_ws_title_from_meta(ss, schedule_global: Schedule, *, campus_fallbac
     if gid is not None:
         try:
             gid_int = int(gid)
+            registry = worksheet_registry(ss)
+            tab = registry.by_id(gid_int) if registry is not None else None
+            if tab is not None:
+                return tab.title
             if hasattr(ss, "get_worksheet_by_id"):
                 ws = ss.get_worksheet_by_id(gid_int)
                 if ws is not None and getattr(ws, "title", None):
@@ -1103,7 +1170,7 @@ def _resolve_ws_title_from_meta(ss, schedule_global: Schedule, *, campus_fallbac
     sheet_title = str(meta.get("sheet_title") or "").strip()
     if sheet_title:
         try:
-            titles = [ws.title for ws in ss.worksheets()]
+            titles = visible_titles(ss, include_hidden=True)
             if sheet_title in titles:
                 return sheet_title
         except Exception:
@@ -1114,8 +1181,7 @@ def _resolve_ws_title_from_meta(ss, schedule_global: Schedule, *, campus_fallbac
     wk_end = str(meta.get("week_end") or "").strip()
     if campus_key and wk_start and wk_end:
         try:
-            for ws in ss.worksheets():
-                title = str(getattr(ws, "title", "") or "")
+            for title in visible_titles(ss, include_hidden=True):
                 low = title.lower()
                 if campus_key.lower() in low and wk_start in title and wk_end in title:
                     return title
@@ -1296,7 +1362,7 @@ def _adjustment_scan_titles(ss, week_bounds: tuple[date, date]) -> list[str]:
 
     try:
         extra_title = "On Call General"
-        ss.worksheet(extra_title)
+        open_worksheet(ss, extra_title)
         out.append(extra_title)
     except Exception:
         pass
@@ -1436,59 +1502,6 @@ def _request_week_bounds(ss, week_titles_map: dict[str, str | None], seed_title:
     return _week_bounds_la()
 
 
-def _day_intervals(user_sched_all: dict, day_canon: str) -> list[tuple[datetime, datetime]]:
-    intervals: list[tuple[datetime, datetime]] = []
-    buckets = (user_sched_all or {}).get(day_canon, {}) or {}
-    for bucket in ("UNH", "MC", "On-Call"):
-        for start_s, end_s in buckets.get(bucket, []) or []:
-            try:
-                start_dt = datetime.strptime(start_s, "%I:%M %p")
-                end_dt = datetime.strptime(end_s, "%I:%M %p")
-            except Exception:
-                continue
-            if end_dt <= start_dt:
-                end_dt = end_dt + timedelta(days=1)
-            intervals.append((start_dt, end_dt))
-    intervals.sort(key=lambda pair: pair[0])
-    return intervals
-
-
-def _find_any_conflict(
-    user_sched_all: dict,
-    day_canon: str,
-    target_bucket: str,
-    req_start: datetime,
-    req_end: datetime,
-) -> str | None:
-    if not user_sched_all:
-        return None
-    if req_end <= req_start:
-        req_end = req_end + timedelta(days=1)
-
-    buckets_today = (user_sched_all or {}).get(day_canon, {}) or {}
-    for src, seq in buckets_today.items():
-        for start_s, end_s in seq or []:
-            try:
-                start_dt = datetime.strptime(start_s, "%I:%M %p")
-                end_dt = datetime.strptime(end_s, "%I:%M %p")
-            except Exception:
-                continue
-            if end_dt <= start_dt:
-                end_dt = end_dt + timedelta(days=1)
-            if max(req_start, start_dt) < min(req_end, end_dt):
-                if str(src) == str(target_bucket):
-                    return (
-                        f"Duplicate entry: you are already scheduled in {src} during "
-                        f"{day_canon.title()} {fmt_time(start_dt)}-{fmt_time(end_dt)}."
-                    )
-                return (
-                    f"Schedule conflict: you are already scheduled in {src} during "
-                    f"{day_canon.title()} {fmt_time(start_dt)}-{fmt_time(end_dt)}. "
-                    "You can't also work another shift during that time."
-                )
-    return None
-
-
 def _extract_details_meta(details: str) -> tuple[dict, str]:
     s = str(details or "").strip()
     match = _META_RE.search(s)
@@ -1542,6 +1555,10 @@ def _resolve_ws_title_from_meta(ss, schedule_global: Schedule, *, campus_fallbac
     if gid is not None:
         try:
             gid_int = int(gid)
+            registry = worksheet_registry(ss)
+            tab = registry.by_id(gid_int) if registry is not None else None
+            if tab is not None:
+                return tab.title
             if hasattr(ss, "get_worksheet_by_id"):
                 ws = ss.get_worksheet_by_id(gid_int)
                 if ws is not None and getattr(ws, "title", None):
@@ -1560,7 +1577,7 @@ def _resolve_ws_title_from_meta(ss, schedule_global: Schedule, *, campus_fallbac
     sheet_title = str(meta.get("sheet_title") or "").strip()
     if sheet_title:
         try:
-            titles = [ws.title for ws in ss.worksheets()]
+            titles = visible_titles(ss, include_hidden=True)
             if sheet_title in titles:
                 return sheet_title
         except Exception:
@@ -1571,8 +1588,7 @@ def _resolve_ws_title_from_meta(ss, schedule_global: Schedule, *, campus_fallbac
     wk_end = str(meta.get("week_end") or "").strip()
     if campus_key and wk_start and wk_end:
         try:
-            for ws in ss.worksheets():
-                title = str(getattr(ws, "title", "") or "")
+            for title in visible_titles(ss, include_hidden=True):
                 low = title.lower()
                 if campus_key.lower() in low and wk_start in title and wk_end in title:
                     return title
@@ -1764,59 +1780,37 @@ def _request_week_bounds(ss, week_titles_map: dict[str, str | None], seed_title:
     return _week_bounds_la()
 
 
-def _day_intervals(user_sched_all: dict, day_canon: str) -> list[tuple[datetime, datetime]]:
-    intervals: list[tuple[datetime, datetime]] = []
-    buckets = (user_sched_all or {}).get(day_canon, {}) or {}
-    for bucket in ("UNH", "MC", "On-Call"):
-        for start_s, end_s in buckets.get(bucket, []) or []:
-            try:
-                start_dt = datetime.strptime(start_s, "%I:%M %p")
-                end_dt = datetime.strptime(end_s, "%I:%M %p")
-            except Exception:
-                continue
-            if end_dt <= start_dt:
-                end_dt = end_dt + timedelta(days=1)
-            intervals.append((start_dt, end_dt))
-    intervals.sort(key=lambda pair: pair[0])
-    return intervals
-
-
 def _find_any_conflict(
-    user_sched_all: dict,
+    timeline: WeekTimeline,
     day_canon: str,
     target_bucket: str,
     req_start: datetime,
     req_end: datetime,
 ) -> str | None:
-    if not user_sched_all:
+    req = make_span(day_canon, req_start, req_end)
+    if req is None:
         return None
-    if req_end <= req_start:
-        req_end = req_end + timedelta(days=1)
 
-    buckets_today = (user_sched_all or {}).get(day_canon, {}) or {}
-    for src, seq in buckets_today.items():
-        for start_s, end_s in seq or []:
-            try:
-                start_dt = datetime.strptime(start_s, "%I:%M %p")
-                end_dt = datetime.strptime(end_s, "%I:%M %p")
-            except Exception:
-                continue
-            if end_dt <= start_dt:
-                end_dt = end_dt + timedelta(days=1)
-            if max(req_start, start_dt) < min(req_end, end_dt):
-                if str(src) == str(target_bucket):
-                    return (
-                        f"Duplicate entry: you are already scheduled in {src} during "
-                        f"{day_canon.title()} {fmt_time(start_dt)}-{fmt_time(end_dt)}."
-                    )
-                return (
-                    f"Schedule conflict: you are already scheduled in {src} during "
-                    f"{day_canon.title()} {fmt_time(start_dt)}-{fmt_time(end_dt)}. "
-                    "You can't also work another shift during that time."
-                )
+    for span in timeline.overlapping(req):
+        start_label, end_label = span.labels
+        if span.source == str(target_bucket):
+            return (
+                f"Duplicate entry: you are already scheduled in {span.source} during "
+                f"{span.day.title()} {start_label}-{end_label}."
+            )
+        return (
+            f"Schedule conflict: you are already scheduled in {span.source} during "
+            f"{span.day.title()} {start_label}-{end_label}. "
+            "You can't also work another shift during that time."
+        )
     return None
 
 
+def _violates_break_rule(timeline: WeekTimeline, day_canon: str, start_dt: datetime, end_dt: datetime) -> bool:
+    req = make_span(day_canon, start_dt, end_dt)
+    return req is not None and timeline.violates_break_rule(req)
+
+
 def _minutes_from_hours(hours_value) -> int:
     try:
         return int(round(float(hours_value or 0.0) * 60.0))
@@ -1848,38 +1842,6 @@ def _clone_user_schedule(user_sched: dict) -> dict:
     return out
 
 
-def _subtract_range_from_sched_ranges(
-    ranges: list[tuple[str, str]],
-    remove_start: datetime,
-    remove_end: datetime,
-) -> list[tuple[str, str]]:
-    if remove_end <= remove_start:
-        remove_end = remove_end + timedelta(days=1)
-
-    out: list[tuple[str, str]] = []
-    for start_s, end_s in ranges or []:
-        try:
-            cur_start = datetime.strptime(str(start_s).strip(), "%I:%M %p")
-            cur_end = datetime.strptime(str(end_s).strip(), "%I:%M %p")
-        except Exception:
-            out.append((start_s, end_s))
-            continue
-        if cur_end <= cur_start:
-            cur_end = cur_end + timedelta(days=1)
-
-        overlap_start = max(cur_start, remove_start)
-        overlap_end = min(cur_end, remove_end)
-        if overlap_start >= overlap_end:
-            out.append((start_s, end_s))
-            continue
-
-        if cur_start < remove_start:
-            out.append((fmt_time(cur_start), fmt_time(remove_start)))
-        if remove_end < cur_end:
-            out.append((fmt_time(remove_end), fmt_time(cur_end)))
-    return out
-
-
 def _subtract_sched_window(
     user_sched: dict,
     *,
@@ -1893,7 +1855,12 @@ def _subtract_sched_window(
     if day_key not in out:
         return out
     ranges = list((out.get(day_key, {}) or {}).get(bucket, []) or [])
-    out[day_key][bucket] = _subtract_range_from_sched_ranges(ranges, start_dt, end_dt)
+    cut = make_span(day_key, start_dt, end_dt)
+    if cut is None:
+        return out
+    unparsed = [pair for pair in ranges if make_span(day_key, *pair) is None]
+    kept = WeekTimeline.from_schedule({day_key: {bucket: ranges}}).subtract(cut)
+    out[day_key][bucket] = unparsed + [span.labels for span in kept.spans]
     return out
 
 
@@ -1963,16 +1930,38 @@ def _overtime_baseline_minutes(
     return week_before_mins, per_day_before
 
 
-@st.cache_data(ttl=30, show_spinner=False)
-def _cached_weekly_adjustment_summary(
+def _weekly_adjustment_scan(
+    ss,
+    user_name: str,
+    week_bounds: tuple[date, date],
+) -> tuple[dict[str, int], dict[str, int], set[tuple[str, ...]]]:
+    """Per-day callout and pickup minutes plus the note signatures behind them, for the hours ledger."""
+    (
+        _pickup_week,
+        pickup_day,
+        _callout_week,
+        callout_day,
+        pickup_sigs,
+        callout_sigs,
+    ) = _sheet_note_adjustment_minutes_for_week(ss, requester=user_name, week_bounds=week_bounds)
+    _manual_week, manual_day = _manual_colored_callout_adjustment_minutes_for_week(
+        ss,
+        requester=user_name,
+        week_bounds=week_bounds,
+        exclude_signatures=callout_sigs,
+    )
+    for day_canon, mins in manual_day.items():
+        callout_day[day_canon] = int(callout_day.get(day_canon, 0)) + int(mins)
+    signatures = {("pickup", *sig) for sig in pickup_sigs} | {("callout", *sig) for sig in callout_sigs}
+    return callout_day, pickup_day, signatures
+
+
+def _weekly_adjustment_summary(
     ss_id: str,
     user_name: str,
     week_start: str,
     week_end: str,
-    approvals_epoch: int,
-    ui_epoch: int,
 ) -> dict[str, float]:
-    del approvals_epoch, ui_epoch
     ss = st.session_state.get("_SS_HANDLE_BY_ID", {}).get(ss_id)
     if not ss:
         return {"callout_hours": 0.0, "pickup_hours": 0.0}
@@ -1980,11 +1969,20 @@ def _cached_weekly_adjustment_summary(
         week_bounds = (date.fromisoformat(week_start), date.fromisoformat(week_end))
     except Exception:
         week_bounds = _week_bounds_la()
-    pickup_week, _pickup_day, callout_week, _callout_day = _approved_adjustment_minutes_for_week(
+    entry = hours_ledger.person_adjustments(
+        ss,
         user_name,
-        week_bounds,
-        ss=ss,
+        week_bounds=week_bounds,
+        scan=lambda: _weekly_adjustment_scan(ss, user_name, week_bounds),
     )
+    if entry is not None:
+        pickup_week, callout_week = entry.pickup_minutes, entry.callout_minutes
+    else:
+        pickup_week, _pickup_day, callout_week, _callout_day = _approved_adjustment_minutes_for_week(
+            user_name,
+            week_bounds,
+            ss=ss,
+        )
     return {
         "callout_hours": float(callout_week) / 60.0,
         "pickup_hours": float(pickup_week) / 60.0,
@@ -2126,20 +2124,13 @@ def _preflight_work_request(
     )
 
     target_bucket = "On-Call" if campus_key == "ONCALL" else campus_key
-    conflict = _find_any_conflict(user_sched_all, day_canon, target_bucket, start_dt, end_dt)
+    timeline = WeekTimeline.from_schedule(user_sched_all)
+    conflict = _find_any_conflict(timeline, day_canon, target_bucket, start_dt, end_dt)
     if conflict:
         raise ValueError(conflict)
 
-    existing_intervals = _day_intervals(user_sched_all, day_canon)
     req_mins = int(labor_rules.minutes_between(start_dt, end_dt))
-    break_res = labor_rules.break_check_with_suggestions(
-        existing_intervals,
-        (start_dt, end_dt),
-        window=(start_dt, end_dt),
-        min_duration_mins=max(30, req_mins),
-        step_mins=30,
-    )
-    if not break_res.ok:
+    if _violates_break_rule(timeline, day_canon, start_dt, end_dt):
         raise ValueError("You can't work more than 5 hours continuously without a 30-minute break.")
 
     week_before_mins, per_day_before = _overtime_baseline_minutes(
@@ -2207,28 +2198,17 @@ def _preflight_change_request(
         start_dt=old_start_dt,
         end_dt=old_end_dt,
     )
-    user_sched_minus_old = _subtract_sched_window(
-        user_sched_all,
-        day_canon=old_day_canon,
-        bucket=target_bucket,
-        start_dt=old_start_dt,
-        end_dt=old_end_dt,
-    )
+    timeline = WeekTimeline.from_schedule(user_sched_all)
+    old_span = make_span(old_day_canon, old_start_dt, old_end_dt)
+    if old_span is not None:
+        timeline = timeline.subtract(old_span, source=target_bucket)
 
-    conflict = _find_any_conflict(user_sched_minus_old, new_day_canon, target_bucket, new_start_dt, new_end_dt)
+    conflict = _find_any_conflict(timeline, new_day_canon, target_bucket, new_start_dt, new_end_dt)
     if conflict:
         raise ValueError(conflict)
 
-    existing_intervals = _day_intervals(user_sched_minus_old, new_day_canon)
     req_mins = int(labor_rules.minutes_between(new_start_dt, new_end_dt))
-    break_res = labor_rules.break_check_with_suggestions(
-        existing_intervals,
-        (new_start_dt, new_end_dt),
-        window=(new_start_dt, new_end_dt),
-        min_duration_mins=max(30, req_mins),
-        step_mins=30,
-    )
-    if not break_res.ok:
+    if _violates_break_rule(timeline, new_day_canon, new_start_dt, new_end_dt):
         raise ValueError("You can't work more than 5 hours continuously without a 30-minute break.")
 
     week_before_mins, per_day_before = _overtime_baseline_minutes(
@@ -2377,6 +2357,7 @@ def _handle_chat_request(
     approval_rows = cached_approval_table(ss.id, approvals_epoch, max_rows=1000) or []
 
     if intent.kind == "callout":
+        plan = WritePlan()
         msg = do_callout(
             st,
             ss,
@@ -2387,6 +2368,7 @@ def _handle_chat_request(
             start=intent.start,
             end=intent.end,
             covered_by=None,
+            plan=plan,
         )
         try:
             event_d = _callout_event_date_for_sheet(ss, campus_title, day_canon)
@@ -2398,6 +2380,7 @@ def _handle_chat_request(
                     event_d=event_d,
                     start_dt=start_dt,
                     end_dt=end_dt,
+                    plan=plan,
                 )
         except Exception as exc:
             try:
@@ -2413,6 +2396,7 @@ def _handle_chat_request(
                 )
             except Exception:
                 pass
+        plan.commit()  # no-op once the note went out with the colours
         log_action(ss, oa_name_input, "callout", campus_title, day_canon, intent.start, intent.end, "no cover")
         invalidate_hours_caches()
         clear_availability_caches()
@@ -2729,20 +2713,13 @@ def _preflight_work_request(
     )
 
     target_bucket = "On-Call" if campus_key == "ONCALL" else campus_key
-    conflict = _find_any_conflict(user_sched_all, day_canon, target_bucket, start_dt, end_dt)
+    timeline = WeekTimeline.from_schedule(user_sched_all)
+    conflict = _find_any_conflict(timeline, day_canon, target_bucket, start_dt, end_dt)
     if conflict:
         raise ValueError(conflict)
 
-    existing_intervals = _day_intervals(user_sched_all, day_canon)
     req_mins = int(labor_rules.minutes_between(start_dt, end_dt))
-    break_res = labor_rules.break_check_with_suggestions(
-        existing_intervals,
-        (start_dt, end_dt),
-        window=(start_dt, end_dt),
-        min_duration_mins=max(30, req_mins),
-        step_mins=30,
-    )
-    if not break_res.ok:
+    if _violates_break_rule(timeline, day_canon, start_dt, end_dt):
         raise ValueError("You can't work more than 5 hours continuously without a 30-minute break.")
 
     week_before_mins, per_day_before = _overtime_baseline_minutes(
@@ -2810,28 +2787,17 @@ def _preflight_change_request(
         start_dt=old_start_dt,
         end_dt=old_end_dt,
     )
-    user_sched_minus_old = _subtract_sched_window(
-        user_sched_all,
-        day_canon=old_day_canon,
-        bucket=target_bucket,
-        start_dt=old_start_dt,
-        end_dt=old_end_dt,
-    )
+    timeline = WeekTimeline.from_schedule(user_sched_all)
+    old_span = make_span(old_day_canon, old_start_dt, old_end_dt)
+    if old_span is not None:
+        timeline = timeline.subtract(old_span, source=target_bucket)
 
-    conflict = _find_any_conflict(user_sched_minus_old, new_day_canon, target_bucket, new_start_dt, new_end_dt)
+    conflict = _find_any_conflict(timeline, new_day_canon, target_bucket, new_start_dt, new_end_dt)
     if conflict:
         raise ValueError(conflict)
 
-    existing_intervals = _day_intervals(user_sched_minus_old, new_day_canon)
     req_mins = int(labor_rules.minutes_between(new_start_dt, new_end_dt))
-    break_res = labor_rules.break_check_with_suggestions(
-        existing_intervals,
-        (new_start_dt, new_end_dt),
-        window=(new_start_dt, new_end_dt),
-        min_duration_mins=max(30, req_mins),
-        step_mins=30,
-    )
-    if not break_res.ok:
+    if _violates_break_rule(timeline, new_day_canon, new_start_dt, new_end_dt):
         raise ValueError("You can't work more than 5 hours continuously without a 30-minute break.")
 
     week_before_mins, per_day_before = _overtime_baseline_minutes(
@@ -3257,6 +3223,8 @@ def _apply_request(ss, schedule, req: dict, reviewer_name: str) -> str:
             start=sdt.time(),
             end=edt.time(),
         )
+        if event_d:
+            _record_adjustment_event(ss, "pickup", requester, campus_ws_title, event_d, sdt, edt)
         if event_d and pickups_db.supabase_pickups_enabled():
             start_at = _combine_date_time_la(event_d, sdt.time())
             end_at = _combine_date_time_la(event_d, edt.time())
@@ -3292,6 +3260,7 @@ def _apply_request(ss, schedule, req: dict, reviewer_name: str) -> str:
         return msg
 
     if action == "callout":
+        plan = WritePlan()
         msg = do_callout(
             st,
             ss,
@@ -3302,6 +3271,7 @@ def _apply_request(ss, schedule, req: dict, reviewer_name: str) -> str:
             start=sdt.time(),
             end=edt.time(),
             covered_by=None,
+            plan=plan,
         )
         if event_d:
             try:
@@ -3313,6 +3283,7 @@ def _apply_request(ss, schedule, req: dict, reviewer_name: str) -> str:
                     start_dt=sdt,
                     end_dt=edt,
                     reason=str(kv.get("reason") or "").strip() or None,
+                    plan=plan,
                 )
             except Exception as e:
                 append_audit(
@@ -3325,6 +3296,7 @@ def _apply_request(ss, schedule, req: dict, reviewer_name: str) -> str:
                     end=end_s,
                     details=str(e),
                 )
+        plan.commit()  # no-op once the note went out with the colours
         if event_d and callouts_db.supabase_callouts_enabled():
             start_at = _combine_date_time_la(event_d, sdt.time())
             end_at = _combine_date_time_la(event_d, edt.time())
@@ -3406,7 +3378,11 @@ def _render_pending_actions(ss, schedule, canon_name: str) -> None:
                     if str(fresh_req.get("Status", "")).strip().upper() != "PENDING":
                         st.info("This request has already been processed.")
                         st.rerun()
-                    msg = _apply_request(ss, schedule, fresh_req, canon_name)
+                    with action_context("approve") as action:
+                        try:
+                            msg = _apply_request(ss, schedule, fresh_req, canon_name)
+                        finally:
+                            st.session_state["LAST_ACTION_REPORT"] = action.report()
                     set_approval_status(
                         ss,
                         row=int(req.get("_row", 0)),
@@ -3529,7 +3505,7 @@ def _render_pending_actions(ss, schedule, canon_name: str) -> None:
     top_left, top_right = st.columns([1, 1])
     with top_left:
         if st.button("Refresh", key="pending_refresh"):
-            cached_approval_table.clear()
+            sync_approval_requests(ss, force=True)
             st.session_state["APPROVALS_EPOCH"] = int(st.session_state.get("APPROVALS_EPOCH", 0)) + 1
             st.rerun()
     with top_right:
@@ -3626,7 +3602,11 @@ def _render_pending_actions(ss, schedule, canon_name: str) -> None:
                         st.info("This request has already been processed.")
                         st.session_state["APPROVALS_EPOCH"] = int(st.session_state.get("APPROVALS_EPOCH", 0)) + 1
                         st.rerun()
-                    msg = _apply_request(ss, schedule, fresh_req, canon_name)
+                    with action_context("approve") as action:
+                        try:
+                            msg = _apply_request(ss, schedule, fresh_req, canon_name)
+                        finally:
+                            st.session_state["LAST_ACTION_REPORT"] = action.report()
                     set_approval_status(
                         ss,
                         row=int(req.get("_row", 0)),
@@ -3758,7 +3738,7 @@ def _render_my_requests(ss, canon_name: str) -> None:
     st.caption("Track your submitted requests (pending and approved/rejected).")
 
     if st.button("Refresh", key="my_requests_refresh"):
-        cached_approval_table.clear()
+        sync_approval_requests(ss, force=True)
         st.session_state["APPROVALS_EPOCH"] = int(st.session_state.get("APPROVALS_EPOCH", 0)) + 1
         st.rerun()
 
@@ -3987,6 +3967,7 @@ def _render_guided_callout_panel(ss, schedule, canon_name: str | None) -> None:
                     raise ValueError("Could not derive a date for the selected shift.")
 
                 campus_key = "ONCALL" if kind == "ONCALL" else kind
+                plan = WritePlan()
                 if _should_color_schedule_now(campus_key=campus_key, event_d=event_d):
                     msg = do_callout(
                         st,
@@ -3998,19 +3979,24 @@ def _render_guided_callout_panel(ss, schedule, canon_name: str | None) -> None:
                         start=callout_start.time(),
                         end=callout_end.time(),
                         covered_by=None,
+                        plan=plan,
                     )
                 else:
                     msg = "Logged future callout (no schedule color change)."
 
-                _log_local_callout_entry(
-                    ss,
-                    caller_name=canon_name,
-                    campus_title=active_tab,
-                    event_d=event_d,
-                    start_dt=callout_start,
-                    end_dt=callout_end,
-                    reason=reason,
-                )
+                try:
+                    _log_local_callout_entry(
+                        ss,
+                        caller_name=canon_name,
+                        campus_title=active_tab,
+                        event_d=event_d,
+                        start_dt=callout_start,
+                        end_dt=callout_end,
+                        reason=reason,
+                        plan=plan,
+                    )
+                finally:
+                    plan.commit()  # the colours land even if the note could not be placed
                 log_action(ss, canon_name, "callout", active_tab, day_canon, callout_start, callout_end, f"no cover | reason={reason}")
                 invalidate_hours_caches()
                 clear_availability_caches()
@@ -4480,29 +4466,24 @@ def run() -> None:
 
         if canon_name:
             try:
-                epoch_key = (_versions_key(ss), int(st.session_state.get("HOURS_EPOCH", 0)))
-                last = st.session_state.get("_LAST_HOURS")
-                if isinstance(last, dict) and last.get("user") == canon_name and last.get("epoch") == epoch_key:
-                    hours_now = float(last.get("hours", 0.0))
+                ws, we = _week_bounds_la()
+                ledger_entry = hours_ledger.person_hours(ss, canon_name, week_bounds=(ws, we))
+                if ledger_entry is not None:
+                    hours_now = ledger_entry.scheduled_minutes / 60.0
                 else:
-                    hours_now = compute_hours_fast(ss, schedule, canon_name, epoch=epoch_key)
-                st.session_state["_LAST_HOURS"] = {
-                    "user": canon_name,
-                    "epoch": epoch_key,
-                    "hours": float(hours_now),
-                }
+                    epoch_key = (_versions_key(ss), int(st.session_state.get("HOURS_EPOCH", 0)))
+                    last = st.session_state.get("_LAST_HOURS")
+                    if isinstance(last, dict) and last.get("user") == canon_name and last.get("epoch") == epoch_key:
+                        hours_now = float(last.get("hours", 0.0))
+                    else:
+                        hours_now = compute_hours_fast(ss, schedule, canon_name, epoch=epoch_key)
+                    st.session_state["_LAST_HOURS"] = {
+                        "user": canon_name,
+                        "epoch": epoch_key,
+                        "hours": float(hours_now),
+                    }
                 scheduled_h = float(hours_now)
-                ws, we = _week_bounds_la()
-                approvals_epoch = int(st.session_state.get("APPROVALS_EPOCH", 0))
-                ui_epoch = int(st.session_state.get("UI_EPOCH", 0))
-                adj = _cached_weekly_adjustment_summary(
-                    ss.id,
-                    canon_name,
-                    str(ws),
-                    str(we),
-                    approvals_epoch,
-                    ui_epoch,
-                )
+                adj = _weekly_adjustment_summary(ss.id, canon_name, str(ws), str(we))
                 callout_h = float(adj.get("callout_hours", 0.0))
                 pickup_h = float(adj.get("pickup_hours", 0.0))
                 adjusted_h = scheduled_h
@@ -4575,13 +4556,14 @@ def run() -> None:
         col1, col2 = st.columns(2)
         with col1:
             if st.button("Refresh tabs"):
-                list_tabs_for_sidebar.clear()
+                worksheet_registry(ss, refresh=True)
                 st.rerun()
         with col2:
             if st.button("Clear caches"):
                 st.cache_data.clear()
                 st.cache_resource.clear()
                 invalidate_hours_caches()
+                invalidate_workbook_snapshot()
                 clear_availability_caches()
                 pickup_scan.clear_caches()
                 st.rerun()
@@ -4613,15 +4595,19 @@ def run() -> None:
                 raise ValueError("Select a tab in the sidebar first.")
             if not scheduler_user:
                 raise ValueError("Your name is not in the hired OA list. Please use the exact name from the roster sheet.")
-            msg = _handle_chat_request(
-                ss,
-                schedule,
-                prompt=prompt,
-                oa_name_input=oa_name_input,
-                scheduler_user=scheduler_user,
-                active_tab=active_tab,
-                roster_canon_by_key=roster_canon_by_key,
-            )
+            with action_context("chat") as action:
+                try:
+                    msg = _handle_chat_request(
+                        ss,
+                        schedule,
+                        prompt=prompt,
+                        oa_name_input=oa_name_input,
+                        scheduler_user=scheduler_user,
+                        active_tab=active_tab,
+                        roster_canon_by_key=roster_canon_by_key,
+                    )
+                finally:
+                    st.session_state["LAST_ACTION_REPORT"] = action.report()
             st.session_state.messages.append({"role": "assistant", "content": msg})
         except Exception as e:
             st.session_state.messages.append({"role": "assistant", "content": f"Error: {str(e)}"})
@@ -1,11 +1,11 @@
 import pandas as pd
 import streamlit as st
 import re
-import gspread.utils as a1
 from datetime import datetime
 from dateutil import parser as dateparser
-from ..config import ONCALL_MAX_COLS, ONCALL_MAX_ROWS
-from ..core.quotas import read_cols_exact, _safe_batch_get
+from ..core.quotas import read_cols_exact
+from ..core.ws_registry import open_worksheet, worksheet_registry
+from ..services.schedule_query import _read_grid
 
 def peek_exact(schedule, tab_titles: list[str]):
     # Renders MC/UNH style (Mon–Sun header) sheets.
@@ -49,12 +49,11 @@ def peek_exact(schedule, tab_titles: list[str]):
 def peek_oncall(ss):
     # Multi-select viewer for any visible On-Call sheets (kept for your existing flows).
     with st.expander("Peek On-Call (weekly sheets, as-is)"):
-        try:
-            all_ws = ss.worksheets()
-        except Exception as e:
-            st.warning(f"Could not list worksheets: {e}")
+        registry = worksheet_registry(ss)
+        if registry is None:
+            st.warning("Could not list worksheets.")
             return
-        oc_ws = [w for w in all_ws if re.search(r"\bon\s*[- ]?\s*call\b", w.title, flags=re.I)]
+        oc_ws = [w for w in registry.worksheets(include_hidden=False) if re.search(r"\bon\s*[- ]?\s*call\b", w.title, flags=re.I)]
         if not oc_ws:
             st.info("No visible On-Call worksheets found.")
             return
@@ -72,8 +71,7 @@ def peek_oncall(ss):
         sel = st.selectbox("On-Call sheet", titles, index=0, key="oncall_sel")
         ws = next(w for w in oc_ws if w.title == sel)
 
-        end_col = a1.rowcol_to_a1(1, ONCALL_MAX_COLS).split("1")[0]
-        vals = _safe_batch_get(ws, [f"A1:{end_col}{ONCALL_MAX_ROWS}"])[0]
+        vals = _read_grid(ws)
         if not vals:
             st.info("This On-Call worksheet is empty."); return
         hdr = vals[0] if vals else []
@@ -90,13 +88,12 @@ def peek_oncall_single(ss, title: str):
     # Focused viewer for exactly one On-Call sheet (used when user selects a single tab in sidebar).
     with st.expander(f"Peek (On-Call): {title}"):
         try:
-            ws = ss.worksheet(title)
+            ws = open_worksheet(ss, title)
         except Exception as e:
             st.warning(f"Could not open worksheet '{title}': {e}")
             return
 
-        end_col = a1.rowcol_to_a1(1, ONCALL_MAX_COLS).split("1")[0]
-        vals = _safe_batch_get(ws, [f"A1:{end_col}{ONCALL_MAX_ROWS}"])[0]
+        vals = _read_grid(ws)
         if not vals:
             st.info("This On-Call worksheet is empty."); return
 
@@ -10,12 +10,14 @@ from typing import Any, Dict, List, Optional, Tuple
 import pandas as pd
 import streamlit as st
 
-from ..core.utils import fmt_time
+from ..core.range_cache import shared_range_cache, single_flight
+from ..core.utils import fmt_time, parse_time_label
 from ..integrations.gspread_io import with_backoff
+from ..services.schedule_index import schedule_index
+from ..services.tab_layout import tab_layout
 
 
 _MMDD_RE = re.compile(r"\b(\d{1,2})/(\d{1,2})\b")
-_TIME_CELL_RE = re.compile(r"^\s*\d{1,2}(?::\d{2})?\s*(?:AM|PM)\s*$", re.I)
 _RANGE_RE = re.compile(
     r"^\s*(\d{1,2}(?::\d{2})?\s*(?:AM|PM))\s*[-–]\s*(\d{1,2}(?::\d{2})?\s*(?:AM|PM))\s*$",
     re.I,
@@ -43,16 +45,7 @@ _WEEK_ORDER_7 = ["sunday", "monday", "tuesday", "wednesday", "thursday", "friday
 
 
 def _parse_time_cell(value: str) -> Optional[datetime]:
-    txt = (value or "").strip()
-    if not txt:
-        return None
-    txt = re.sub(r"\s*(am|pm)\s*$", lambda m: f" {m.group(1).upper()}", txt, flags=re.I)
-    for fmt in ("%I:%M %p", "%I %p"):
-        try:
-            return datetime.strptime(txt, fmt)
-        except Exception:
-            continue
-    return None
+    return parse_time_label(value)
 
 
 def _canon_day_from_header(value: str) -> Optional[str]:
@@ -238,9 +231,14 @@ def _fetch_griddata(ss, title: str, *, max_rows: int, max_cols: int) -> Tuple[Li
 
     end_a1 = a1.rowcol_to_a1(int(max_rows), int(max_cols))
     rng = f"{title}!A1:{end_a1}"
-    meta = with_backoff(
-        ss.fetch_sheet_metadata,
-        params={"includeGridData": True, "ranges": [rng]},
+    ss_id = str(getattr(ss, "id", ""))
+    version = shared_range_cache().version(ss_id, title)
+    meta = single_flight().do(
+        ("griddata", ss_id, rng, version),
+        lambda: with_backoff(
+            ss.fetch_sheet_metadata,
+            params={"includeGridData": True, "ranges": [rng]},
+        ),
     )
 
     sheets = (meta or {}).get("sheets") or []
@@ -271,6 +269,11 @@ def _fetch_griddata(ss, title: str, *, max_rows: int, max_cols: int) -> Tuple[Li
     return grid[:max_rows], bg_grid[:max_rows]
 
 
+def _cached_day_cols(grid: List[List[str]]) -> Dict[str, int]:
+    layout = tab_layout(grid)
+    return dict(layout.memo("pickup_scan_day_cols", lambda: _day_cols_from_grid(layout.grid)))
+
+
 def _extract_mmdd_for_col(grid: List[List[str]], col: int) -> Optional[str]:
     for r in range(min(25, len(grid))):
         value = (grid[r][col] if col < len(grid[r]) else "") or ""
@@ -291,17 +294,6 @@ def _day_cols_from_grid(grid: List[List[str]]) -> Dict[str, int]:
     return out
 
 
-def _time_rows_unh_mc(grid: List[List[str]]) -> List[int]:
-    rows: List[int] = []
-    for r, row in enumerate(grid):
-        if not row:
-            continue
-        value = (row[0] if len(row) >= 1 else "") or ""
-        if _TIME_CELL_RE.match(str(value)) and _parse_time_cell(str(value)):
-            rows.append(r)
-    return rows
-
-
 def _clean_name(cell_txt: str) -> str:
     s = (cell_txt or "").strip()
     if not s:
@@ -360,7 +352,7 @@ def build_tradeboard_unh_mc(ss, title: str, *, max_rows: int = 900, max_cols: in
     if not grid:
         return pd.DataFrame(), []
 
-    day_cols = _day_cols_from_grid(grid)
+    day_cols = _cached_day_cols(grid)
     if not day_cols:
         return pd.DataFrame(), []
 
@@ -378,8 +370,8 @@ def build_tradeboard_unh_mc(ss, title: str, *, max_rows: int = 900, max_cols: in
         mmdd = _extract_mmdd_for_col(grid, col)
         col_labels.append(f"{day.title()} {mmdd}" if mmdd else day.title())
 
-    time_rows = _time_rows_unh_mc(grid)
-    if not time_rows:
+    bands = schedule_index(grid).time_bands
+    if not bands:
         return pd.DataFrame(columns=["Time"] + col_labels), []
 
     kind = "MC" if re.search(r"\bmc\b|main", (title or "").lower()) else "UNH"
@@ -388,19 +380,13 @@ def build_tradeboard_unh_mc(ss, title: str, *, max_rows: int = 900, max_cols: in
     row_labels: List[str] = []
     halfhour_slots: List[Tuple[datetime, datetime, str, str, str, str]] = []
 
-    time_rows.append(len(grid))
-    for i in range(len(time_rows) - 1):
-        r0, r1 = time_rows[i], time_rows[i + 1]
-        t_txt = (grid[r0][0] if grid[r0] else "") or ""
-        start_dt = _parse_time_cell(str(t_txt))
-        if not start_dt:
-            continue
-        end_dt = start_dt + timedelta(minutes=30)
+    for band in bands:
+        start_dt, end_dt = band.start, band.end
 
         row_times.append(start_dt)
         row_labels.append(fmt_time(start_dt) if start_dt.minute == 0 else "")
 
-        lane_rows = list(range(r0 + 1, r1))
+        lane_rows = band.lane_rows
         for day in days_order:
             col = day_cols[day]
             for rr in lane_rows:
@@ -454,7 +440,7 @@ def build_callout_windows_unh_mc(ss, title: str, *, max_rows: int = 900, max_col
     if not grid:
         return []
 
-    day_cols = _day_cols_from_grid(grid)
+    day_cols = _cached_day_cols(grid)
     if not day_cols:
         return []
 
@@ -466,23 +452,17 @@ def build_callout_windows_unh_mc(ss, title: str, *, max_rows: int = 900, max_col
     if not days_order:
         days_order = sorted(day_cols.keys())
 
-    time_rows = _time_rows_unh_mc(grid)
-    if not time_rows:
+    bands = schedule_index(grid).time_bands
+    if not bands:
         return []
 
     kind = "MC" if re.search(r"\bmc\b|main", (title or "").lower()) else "UNH"
     halfhour_slots: List[Tuple[datetime, datetime, str, str, str, str]] = []
 
-    time_rows.append(len(grid))
-    for i in range(len(time_rows) - 1):
-        r0, r1 = time_rows[i], time_rows[i + 1]
-        t_txt = (grid[r0][0] if grid[r0] else "") or ""
-        start_dt = _parse_time_cell(str(t_txt))
-        if not start_dt:
-            continue
-        end_dt = start_dt + timedelta(minutes=30)
+    for band in bands:
+        start_dt, end_dt = band.start, band.end
 
-        lane_rows = list(range(r0 + 1, r1))
+        lane_rows = band.lane_rows
         for day in days_order:
             col = day_cols[day]
             for rr in lane_rows:
@@ -0,0 +1,35 @@
+"""Shared setUp for tests that run against a seeded fake workbook."""
+
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import streamlit as st
+
+from oa_app.core import snapshot
+from oa_app.core.range_cache import shared_range_cache
+from oa_app.integrations.fake_sheets import FakeSheetsBackend, seeded_spreadsheet
+from oa_app.services.schedule_index import clear_schedule_indexes
+
+
+class SeededWorkbookTestCase(unittest.TestCase):
+    """Fresh caches, a throwaway snapshot dir and ``self.ss`` seeded on ``self.backend``."""
+
+    seed_kwargs: dict = {}  # forwarded to ``seeded_spreadsheet``
+
+    def setUp(self):
+        st.session_state.clear()
+        shared_range_cache.clear()
+        clear_schedule_indexes()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        disk = patch.object(snapshot, "_DISK_DIR", tmp.name)
+        disk.start()
+        self.addCleanup(disk.stop)
+        snapshot._live_ids.clear()
+        snapshot._last_live.clear()
+        self.addCleanup(shared_range_cache.clear)
+        self.addCleanup(st.session_state.clear)
+        self.backend = FakeSheetsBackend()
+        self.ss = seeded_spreadsheet(self.backend, **self.seed_kwargs)
+        self.ss.id = f"fake-{id(self)}"
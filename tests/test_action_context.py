@@ -0,0 +1,54 @@
+import unittest
+from unittest.mock import patch
+
+from _fixtures import SeededWorkbookTestCase
+from oa_app.core import snapshot
+from oa_app.core.action_context import action_context, action_memo, current_action
+from oa_app.core.write_plan import WritePlan
+from oa_app.services import schedule_query
+
+
+class ActionContextTests(SeededWorkbookTestCase):
+
+    def test_repeated_reads_in_one_request_are_memo_hits(self):
+        with action_context("chat") as action:
+            first = schedule_query.get_user_schedule(self.ss, None, "Casey Fox")
+            first["monday"]["UNH"].append(("1:00 AM", "2:00 AM"))  # callers get their own copy
+            again = schedule_query.get_user_schedule(self.ss, None, "casey  fox")
+            ws = schedule_query._open_three(self.ss)[0]
+            schedule_query._read_grid(self.ss._find(ws))
+            report = action.report()
+
+        self.assertNotIn(("1:00 AM", "2:00 AM"), again["monday"]["UNH"])
+        self.assertGreaterEqual(report["memo_hits"], 2)
+        self.assertEqual(report["api_calls"], sum(self.backend.stats()["calls"].values()))
+        self.assertEqual(report["by_call"].get("values_batch_get"), 1)
+        self.assertIsNone(current_action())
+
+    def test_a_write_drops_grids_but_keeps_titles(self):
+        title = "UNH (OA and GOAs)"
+        with action_context("add") as action:
+            before = schedule_query.get_user_schedule(self.ss, None, "Casey Fox")
+            built = []
+            action_memo(("titles", "x"), lambda: built.append(1))
+            with patch.object(snapshot, "submit_background", side_effect=lambda fn: None):
+                WritePlan().set_value(self.ss._find(title), 2, 1, "OA: Casey Fox").commit()
+            after = schedule_query.get_user_schedule(self.ss, None, "Casey Fox")
+            action_memo(("titles", "x"), lambda: built.append(1))
+            report = action.report()
+
+        self.assertEqual(before["monday"]["UNH"], [])
+        self.assertEqual(after["monday"]["UNH"], [("7:00 AM", "7:30 AM")])
+        self.assertEqual(built, [1])
+        self.assertEqual(report["writes"], 1)
+
+    def test_nested_contexts_share_the_outer_one(self):
+        with action_context("change") as outer:
+            with action_context("add") as inner:
+                self.assertIs(inner, outer)
+            self.assertIs(current_action(), outer)
+        self.assertEqual(action_memo(("hours", "x"), lambda: 3), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,9 @@ from datetime import date, datetime
 from types import SimpleNamespace
 from unittest.mock import patch
 
-from oa_app.core import week_range
+import streamlit as st
+
+from oa_app.core import quotas, week_range
 from oa_app.services import hours, schedule_query
 from oa_app.ui import page, pickup_scan
 
@@ -94,6 +96,93 @@ class HoursLogicTests(unittest.TestCase):
         self.assertEqual(got["sources"], ["UNH", "MC"])
         self.assertEqual([row["name"] for row in got["entries"]], ["Alex Smith", "Jamie Doe"])
 
+    def test_working_timeline_parses_each_source_once_for_the_week(self):
+        class _FakeSS:
+            def worksheet(self, title: str):
+                return SimpleNamespace(title=title)
+
+        def _people(ws):
+            if ws.title == "UNH":
+                return {"monday": [{"name": "Alex Smith", "role": "OA", "start": "09:00 AM", "end": "11:00 AM"}]}
+            return {"tuesday": [{"name": "Jamie Doe", "role": "GOA", "start": "10:00 AM", "end": "12:00 PM"}]}
+
+        with (
+            patch.object(schedule_query, "_open_three", return_value=["UNH", "MC", "On Call 4/26 - 5/2"]),
+            patch.object(schedule_query, "_unh_mc_people_ranges", side_effect=_people) as parsed,
+        ):
+            timeline = schedule_query.WorkingTimeline(_FakeSS())
+            names = [
+                [row["name"] for row in timeline.people_working_at(when)["entries"]]
+                for when in (
+                    datetime(2026, 4, 27, 9, 0, tzinfo=page.LA_TZ),
+                    datetime(2026, 4, 27, 11, 0, tzinfo=page.LA_TZ),
+                    datetime(2026, 4, 28, 11, 59, tzinfo=page.LA_TZ),
+                )
+            ]
+
+        self.assertEqual(names, [["Alex Smith"], [], ["Jamie Doe"]])
+        self.assertEqual(parsed.call_count, 2)
+
+    def test_working_now_timeline_applies_the_weeks_callouts_by_time(self):
+        schedule = SimpleNamespace(
+            people_working_at=lambda when: {
+                "entries": [{"source": "UNH", "name": "Alex Smith", "role": "OA", "start": "09:00 AM", "end": "11:00 AM"}]
+            }
+        )
+        callout = {
+            "campus": "UNH",
+            "shift_start_at": datetime(2026, 4, 27, 10, 0, tzinfo=page.LA_TZ),
+            "shift_end_at": datetime(2026, 4, 27, 11, 0, tzinfo=page.LA_TZ),
+            "caller_name": "Alex Smith",
+        }
+
+        with (
+            patch.object(schedule_query, "WorkingTimeline", return_value=schedule),
+            patch.object(page, "_week_adjustment_rows", return_value=([callout], [])) as rows,
+        ):
+            timeline = page._WorkingNowTimeline(object(), (date(2026, 4, 26), date(2026, 5, 2)))
+            before = timeline.at(datetime(2026, 4, 27, 9, 30, tzinfo=page.LA_TZ))
+            during = timeline.at(datetime(2026, 4, 27, 10, 30, tzinfo=page.LA_TZ))
+
+        self.assertEqual(before["entries"][0]["status"], "Scheduled")
+        self.assertEqual(during["entries"][0]["status"], "No cover")
+        self.assertEqual(rows.call_count, 1)
+
+    def test_working_now_sees_another_sessions_schedule_write(self):
+        ss = SimpleNamespace(id="fake-working-now")
+        on_shift = {"names": ["Alex Smith"]}
+
+        def _schedule(_ss):
+            names = list(on_shift["names"])
+            return SimpleNamespace(
+                people_working_at=lambda when: {
+                    "entries": [
+                        {"source": "UNH", "name": n, "role": "OA", "start": "09:00 AM", "end": "11:00 AM"} for n in names
+                    ]
+                }
+            )
+
+        st.session_state.clear()
+        st.session_state["_SS_HANDLE_BY_ID"] = {ss.id: ss}
+        page._cached_working_now_timeline.clear()
+        with (
+            patch.object(schedule_query, "_open_three", return_value=["UNH", "MC", "On Call 4/26 - 5/2"]),
+            patch.object(schedule_query, "WorkingTimeline", side_effect=_schedule),
+            patch.object(page, "_week_adjustment_rows", return_value=([], [])),
+        ):
+            mine = page._versions_key(ss)  # this session never wrote: an all-zero key
+            before = page.cached_people_working_now(ss.id, mine, "2026-04-27T09:30")
+            # another session edits UNH: its WS_VER is its own, the shared version is not
+            on_shift["names"] = ["Jamie Doe"]
+            quotas.bump_ws_version(SimpleNamespace(id="UNH", title="UNH", spreadsheet_id=ss.id))
+            st.session_state["WS_VER"] = {}
+            self.assertEqual(page._versions_key(ss), mine)
+            after = page.cached_people_working_now(ss.id, mine, "2026-04-27T09:31")
+
+        st.session_state.clear()
+        self.assertEqual([e["name"] for e in before["entries"]], ["Alex Smith"])
+        self.assertEqual([e["name"] for e in after["entries"]], ["Jamie Doe"])
+
 
 class ApprovalOvertimeTests(unittest.TestCase):
     def test_approver_aliases_unlock_expected_identity(self):
@@ -0,0 +1,95 @@
+import unittest
+from unittest.mock import patch
+
+import streamlit as st
+
+from oa_app.config import APPROVAL_SHEET
+from oa_app.integrations import gspread_io
+from oa_app.integrations.fake_sheets import FakeSheetsBackend, FakeSpreadsheet
+from oa_app.integrations.gspread_io import QuotaGovernor
+from oa_app.services import approvals
+from oa_app.services.approval_index import ApprovalIndex, approval_index, request_key
+from oa_app.services.approval_mirror import approval_mirror
+
+REQ = dict(
+    requester="Sam Lee",
+    action="add",
+    campus="UNH",
+    day="monday",
+    start="9:00 AM",
+    end="10:00 AM",
+    details="",
+)
+
+
+class ApprovalIndexTests(unittest.TestCase):
+    def setUp(self):
+        st.session_state.clear()
+        approval_index.clear()
+        approval_mirror.clear()
+        self._db = patch.object(approvals, "_use_db", return_value=False)
+        self._db.start()
+        self._governor = patch.object(gspread_io, "sheets_governor", return_value=QuotaGovernor())
+        self._governor.start()
+        self.backend = FakeSheetsBackend()
+        self.ss = FakeSpreadsheet(self.backend, id=f"fake-{id(self)}")
+
+    def tearDown(self):
+        self._db.stop()
+        self._governor.stop()
+        approval_index.clear()
+        approval_mirror.clear()
+        st.session_state.clear()
+
+    def _queue(self):
+        return self.ss._find(APPROVAL_SHEET)
+
+    def test_resubmits_are_deduped_without_rescanning_the_queue(self):
+        rid = approvals.submit_request(self.ss, **REQ)
+        self.backend.reset_counts()
+        self.assertEqual(approvals.submit_request(self.ss, **dict(REQ, start=" 9:00 AM ")), rid)
+        self.assertEqual(self.backend.stats()["calls"], {"get": 1})  # the one-row confirm
+        self.assertEqual(self._queue().values()[1][13], request_key(**REQ))
+
+    def test_reviewed_requests_stop_blocking(self):
+        rid = approvals.submit_request(self.ss, **REQ)
+        row = approvals.read_requests(self.ss)[0]["_row"]
+        approvals.set_status(self.ss, row=row, status="APPROVED", reviewed_by="Boss")
+
+        self.assertNotEqual(approvals.submit_request(self.ss, **REQ), rid)
+
+    def test_edits_made_in_the_sheet_are_caught_by_the_confirm_read(self):
+        rid = approvals.submit_request(self.ss, **REQ)
+        approvals.read_requests(self.ss)
+        self._queue().set_values([["REJECTED"]], row0=1, col0=9)
+
+        again = approvals.submit_request(self.ss, **REQ)
+        self.assertNotEqual(again, rid)
+        self.assertEqual(len(approvals.read_requests(self.ss)), 2)
+
+    def test_rows_queued_before_the_key_column_still_match(self):
+        approvals.ensure_approval_sheet(self.ss)
+        self._queue().set_values([[""]], row0=0, col0=13)
+        self._queue().set_values(
+            [["old1", "2026-04-01T09:00:00", "Sam Lee", "add", "UNH", "monday", "9:00 AM", "10:00 AM", "", "PENDING"]],
+            row0=1,
+        )
+
+        self.assertEqual(approvals.submit_request(self.ss, **REQ), "old1")
+
+    def test_claims_survive_a_rebuild_that_has_not_seen_them(self):
+        index = ApprovalIndex()
+        self.assertIsNone(index.claim("ss", "k1", "r1"))
+        index.load("ss", [{"ID": "r0", "Status": "PENDING", "Key": "k0", "_row": 2}])
+
+        self.assertEqual(index.claim("ss", "k1", "r2").req_id, "r1")
+        index.load("ss", [{"ID": "r1", "Status": "APPROVED", "Key": "k1", "_row": 3}])
+        self.assertIsNone(index.lookup("ss", "k1"))
+
+    def test_appended_row_is_read_from_the_response(self):
+        self.assertEqual(approvals._appended_row({"updates": {"updatedRange": "'Pending Actions'!A17:N17"}}), 17)
+        self.assertEqual(approvals._appended_row({"updates": {"updatedRows": 1}}), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
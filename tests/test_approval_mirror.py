@@ -0,0 +1,173 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import streamlit as st
+
+from oa_app.config import APPROVAL_SHEET
+from oa_app.integrations import gspread_io
+from oa_app.integrations.fake_sheets import FakeSheetsBackend, FakeSpreadsheet
+from oa_app.integrations.gspread_io import QuotaGovernor
+from oa_app.services import approvals
+from oa_app.services.approval_index import approval_index
+from oa_app.services.approval_mirror import approval_mirror
+
+
+def _row(rid, status, requester="Sam Lee", created="2026-04-13T09:00:00"):
+    return [rid, created, requester, "add", "UNH", "monday", "9:00 AM", "10:00 AM", "", status]
+
+
+class _FakeQuery:
+    """Just enough of the supabase query builder for the approvals table."""
+
+    def __init__(self, table):
+        self.table = table
+        self.filters = []
+        self.desc = False
+        self.cap = None
+
+    def select(self, _cols):
+        return self
+
+    def gte(self, col, value):
+        self.filters.append(lambda r: str(r[col]) >= value)
+        return self
+
+    def in_(self, col, values):
+        self.filters.append(lambda r: r[col] in values)
+        return self
+
+    def order(self, _col, desc=False):
+        self.desc = desc
+        return self
+
+    def limit(self, n):
+        self.cap = n
+        return self
+
+    def execute(self):
+        self.table.calls += 1
+        rows = sorted((r for r in self.table.rows if all(f(r) for f in self.filters)), key=lambda r: r["created_at"])
+        rows = rows[::-1] if self.desc else rows
+        return SimpleNamespace(data=[dict(r) for r in rows[: self.cap or len(rows)]])
+
+
+class _FakeSupabase:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = 0
+
+    def table(self, _name):
+        return _FakeQuery(self)
+
+
+class ApprovalMirrorTests(unittest.TestCase):
+    def setUp(self):
+        st.session_state.clear()
+        approval_index.clear()
+        approval_mirror.clear()
+        self._db = patch.object(approvals, "_use_db", return_value=False)
+        self._db.start()
+        self._governor = patch.object(gspread_io, "sheets_governor", return_value=QuotaGovernor())
+        self._governor.start()
+        self.backend = FakeSheetsBackend()
+        self.ss = FakeSpreadsheet(self.backend, id=f"fake-{id(self)}")
+        self.ws = approvals.ensure_approval_sheet(self.ss)
+        self.queue = self.ss._find(APPROVAL_SHEET)
+        self.queue.set_values([_row("r1", "APPROVED"), _row("r2", "PENDING"), _row("r3", "PENDING")], row0=1)
+
+    def tearDown(self):
+        self._db.stop()
+        self._governor.stop()
+        approval_index.clear()
+        approval_mirror.clear()
+        st.session_state.clear()
+
+    def test_windows_share_one_mirror(self):
+        approvals.ensure_approval_sheet(self.ss)  # tab listing after the add
+        self.backend.reset_counts()
+        small = approvals.read_requests(self.ss, max_rows=2)
+        large = approvals.read_requests(self.ss, max_rows=1000)
+
+        self.assertEqual([r["ID"] for r in small], ["r2", "r3"])
+        self.assertEqual([r["ID"] for r in large], ["r1", "r2", "r3"])
+        self.assertEqual(self.backend.stats()["calls"], {"get": 1})
+
+    def test_sync_reads_new_rows_and_open_review_columns_only(self):
+        approvals.read_requests(self.ss)
+        self.queue.set_values([["REJECTED", "Boss"]], row0=2, col0=9)  # reviewed elsewhere
+        self.queue.set_values([_row("r4", "PENDING", created="2026-04-13T10:00:00")], row0=4)
+
+        with patch.object(self.ws, "batch_get", wraps=self.ws.batch_get) as batch:
+            approvals.sync_requests(self.ss, force=True)
+        rows = {r["ID"]: r for r in approvals.read_requests(self.ss)}
+
+        self.assertEqual(batch.call_args[0][0], ["A5:N504", "A3:N4"])
+        self.assertEqual(list(rows), ["r1", "r2", "r3", "r4"])
+        self.assertEqual((rows["r2"]["Status"], rows["r2"]["ReviewedBy"]), ("REJECTED", "Boss"))
+        self.assertEqual(rows["r4"]["_row"], 5)
+
+    def test_rows_deleted_by_hand_reload_instead_of_patching_the_wrong_request(self):
+        approvals.read_requests(self.ss)
+        # r1 deleted by hand: r2, r3 move up a row and a new append lands at the old cursor row
+        self.queue.set_values([_row("r2", "REJECTED"), _row("r3", "PENDING"), _row("r4", "PENDING")], row0=1)
+
+        approvals.sync_requests(self.ss, force=True)
+        rows = {r["ID"]: r for r in approvals.read_requests(self.ss)}
+
+        self.assertEqual(list(rows), ["r2", "r3", "r4"])
+        self.assertEqual([rows[i]["Status"] for i in rows], ["REJECTED", "PENDING", "PENDING"])
+        self.assertEqual(rows["r4"]["_row"], 4)
+
+    def test_set_status_finds_the_request_by_id_when_its_row_moved(self):
+        listed = {r["ID"]: r for r in approvals.read_requests(self.ss)}
+        self.queue.set_values([_row("r2", "PENDING"), _row("r3", "PENDING"), [""] * 10], row0=1)
+
+        approvals.set_status(self.ss, row=listed["r3"]["_row"], req_id="r3", status="APPROVED", reviewed_by="Boss")
+
+        self.assertEqual([r[9] for r in self.queue.values()[1:3]], ["PENDING", "APPROVED"])
+
+    def test_local_changes_are_patched_into_the_mirror(self):
+        approvals.read_requests(self.ss)
+        self.backend.reset_counts()
+        approvals.set_status(self.ss, row=3, status="APPROVED", reviewed_by="Boss")
+        rid = approvals.submit_request(self.ss, requester="Alex Kim", action="add", campus="MC", day="friday",
+                                       start="1:00 PM", end="2:00 PM", details="")
+        rows = {r["ID"]: r for r in approvals.read_requests(self.ss)}
+
+        self.assertEqual(rows["r2"]["Status"], "APPROVED")
+        self.assertEqual(rows[rid]["_row"], 5)
+        self.assertEqual(self.backend.stats()["calls"], {"update": 1, "append_row": 1})
+
+    def test_get_request_rereads_only_its_row(self):
+        approvals.read_requests(self.ss)
+        self.queue.set_values([["PROCESSING"]], row0=2, col0=9)
+        self.backend.reset_counts()
+
+        got = approvals.get_request(self.ss, req_id="r2")
+
+        self.assertEqual((got["Status"], got["_row"]), ("PROCESSING", 3))
+        self.assertEqual(self.backend.stats()["calls"], {"get": 1})
+
+    def test_supabase_sync_fetches_from_the_created_at_cursor(self):
+        rows = [
+            {"id": "d1", "created_at": "2026-04-13T09:00:00", "status": "PENDING"},
+            {"id": "d2", "created_at": "2026-04-13T09:05:00", "status": "APPROVED"},
+        ]
+        sb = _FakeSupabase(rows)
+        with patch.object(approvals, "_use_db", return_value=True), \
+             patch.object(approvals, "get_supabase", return_value=sb), \
+             patch.object(approvals, "with_retry", side_effect=lambda fn: fn()):
+            self.assertEqual([r["ID"] for r in approvals.read_requests(self.ss)], ["d2", "d1"])
+            rows[0]["status"] = "REJECTED"
+            rows.append({"id": "d3", "created_at": "2026-04-13T09:05:00", "status": "PENDING"})
+            sb.calls = 0
+            approvals.sync_requests(self.ss, force=True)
+            got = {r["ID"]: r["Status"] for r in approvals.read_requests(self.ss, max_rows=10)}
+
+        self.assertEqual(got, {"d1": "REJECTED", "d2": "APPROVED", "d3": "PENDING"})
+        self.assertEqual(sb.calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
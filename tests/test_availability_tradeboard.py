@@ -2,6 +2,7 @@ import unittest
 from types import SimpleNamespace
 from unittest.mock import patch
 
+from oa_app.services.schedule_index import clear_schedule_indexes, schedule_index
 from oa_app.ui import availability, pickup_scan
 
 
@@ -29,9 +30,66 @@ class AvailabilityTests(unittest.TestCase):
             [("09:00", "10:00"), ("10:30", "11:00")],
         )
 
-    def test_enumerate_exact_length_windows_steps_by_half_hour(self):
-        windows = availability.enumerate_exact_length_windows([("09:00", "10:30")], 60)
-        self.assertEqual(windows, [("09:00", "10:00"), ("09:30", "10:30")])
+    def test_week_availability_comes_from_one_bitmap_per_grid(self):
+        ws = SimpleNamespace(title="MC (OA and GOAs)")
+        grid = [
+            ["Time", "Monday", "Tuesday"],
+            ["9:00 AM", "", ""],
+            ["", "OA: Filled", ""],
+            ["", "", ""],
+            ["9:30 AM", "", ""],
+            ["", "OA: Filled", "OA: Filled"],
+            ["", "", ""],
+            ["10:00 AM", "", ""],
+        ]
+        clear_schedule_indexes()
+
+        with patch.object(availability, "_read_grid", return_value=grid):
+            week = availability._available_ranges_unh_mc_week(ws, availability._WEEK)
+            monday = availability._available_ranges_unh_mc(ws, "monday")
+
+        hm = lambda ranges: [(start.strftime("%H:%M"), end.strftime("%H:%M")) for start, end in ranges]
+        # MC only counts lanes used on some weekday: the first lane of each band here.
+        self.assertEqual(hm(week["monday"]), [])
+        self.assertEqual(hm(week["tuesday"]), [("09:00", "09:30")])
+        self.assertEqual(week["saturday"], [])
+        self.assertEqual(monday, week["monday"])
+        memos = [key for key in schedule_index(grid)._memo if isinstance(key, tuple) and key[0] == "occupancy"]
+        self.assertEqual(len(memos), 1)
+
+    def test_exact_length_windows_for_the_week_respect_gaps_and_caps(self):
+        ws = SimpleNamespace(title="UNH (OA and GOAs)")
+        grid = [
+            ["Time", "Monday", "Tuesday"],
+            ["9:00 AM", "", ""],
+            ["", "", ""],
+            ["9:30 AM", "", ""],
+            ["", "", "OA: Filled"],
+            ["", "", "OA: Filled"],
+            ["10:00 AM", "", ""],
+            ["", "", ""],
+            ["11:00 AM", "", ""],  # no 10:30 band: 10:00-10:30 and 11:00-11:30 do not join
+            ["", "", ""],
+        ]
+        clear_schedule_indexes()
+
+        with patch.object(availability, "_read_grid", return_value=grid):
+            windows = availability.exact_length_windows_week(ws, [60, 45])
+            capped = availability.exact_length_windows_week(ws, [60, 45], day_minutes={"monday": 430})
+
+        as_text = lambda options: [(w.day, w.start.strftime("%H:%M"), w.end.strftime("%H:%M")) for w in options]
+        self.assertEqual(
+            as_text(windows),
+            [
+                ("monday", "09:00", "09:45"),
+                ("monday", "09:00", "10:00"),
+                ("monday", "09:30", "10:15"),
+                ("monday", "09:30", "10:30"),
+            ],
+        )
+        self.assertEqual(as_text(capped), [("monday", "09:00", "09:45"), ("monday", "09:30", "10:15")])
+        self.assertEqual([w.minutes for w in windows], [45, 60, 45, 60])
+
 
 
 class TradeboardTests(unittest.TestCase):
@@ -1,9 +1,10 @@
 import unittest
 from datetime import time
 from types import SimpleNamespace
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from oa_app.core.intents import parse_intent
+from oa_app.core.write_plan import WritePlan
 from oa_app.services import chat_add, chat_callout
 
 
@@ -62,7 +63,7 @@ class ChatCalloutHandlerTests(unittest.TestCase):
         with (
             patch.object(chat_add, "_cached_ws_titles", return_value=[]),
             patch.object(chat_callout, "_read_grid", return_value=grid),
-            patch.object(chat_callout, "_format_cells", side_effect=lambda _ws, coords, _rgb: colored.extend(coords)),
+            patch.object(chat_callout, "_format_cells", side_effect=lambda _ws, coords, _rgb, **_kw: colored.extend(coords)),
         ):
             msg = chat_callout.handle_callout(
                 fake_st,
@@ -95,7 +96,7 @@ class ChatCalloutHandlerTests(unittest.TestCase):
         with (
             patch.object(chat_add, "_cached_ws_titles", return_value=[]),
             patch.object(chat_callout, "_read_grid", return_value=grid),
-            patch.object(chat_callout, "_format_cells", side_effect=lambda _ws, coords, _rgb: colored.extend(coords)),
+            patch.object(chat_callout, "_format_cells", side_effect=lambda _ws, coords, _rgb, **_kw: colored.extend(coords)),
         ):
             msg = chat_callout.handle_callout(
                 fake_st,
@@ -111,3 +112,29 @@ class ChatCalloutHandlerTests(unittest.TestCase):
 
         self.assertEqual(colored, [(2, 1)])
         self.assertIn("11:00 AM-3:00 PM", msg)
+
+    def test_colors_are_staged_on_the_callers_plan(self):
+        mc_ws = _FakeWorksheet("MC 4/13 - 4/19", 11)
+        mc_ws.spreadsheet = SimpleNamespace(batch_update=MagicMock())
+        ss = _FakeSpreadsheet([mc_ws])
+        grid = [["Time", "Monday"], ["10:00 AM", ""], ["", "OA: Alex Smith"], ["10:30 AM", ""]]
+        plan = WritePlan()
+
+        with (
+            patch.object(chat_add, "_cached_ws_titles", return_value=[]),
+            patch.object(chat_callout, "_read_grid", return_value=grid),
+        ):
+            chat_callout.handle_callout(
+                SimpleNamespace(session_state={}),
+                ss,
+                None,
+                canon_target_name="Alex Smith",
+                campus_title="MC",
+                day="Monday",
+                start=time(10, 0),
+                end=time(10, 30),
+                plan=plan,
+            )
+
+        self.assertEqual(len(plan), 1)
+        mc_ws.spreadsheet.batch_update.assert_not_called()
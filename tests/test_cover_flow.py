@@ -4,6 +4,8 @@ from datetime import time
 from types import SimpleNamespace
 from unittest.mock import patch
 
+import gspread.utils as a1
+
 from oa_app.core.intents import parse_intent
 from oa_app.services import chat_add, chat_cover
 
@@ -14,8 +16,9 @@ class _FakeWorksheet:
         self.id = sheet_id
         self._column_values = column_values or {}
         self.updated = []
+        self.batches = []
         self.spreadsheet = SimpleNamespace(
-            batch_update=lambda *_args, **_kwargs: None,
+            batch_update=lambda body, *_args, **_kwargs: self.batches.append(body),
             fetch_sheet_metadata=lambda *_args, **_kwargs: {},
         )
 
@@ -29,6 +32,18 @@ class _FakeWorksheet:
     def update(self, range_name, values):
         self.updated.append((range_name, values))
 
+    def value_writes(self):
+        out = []
+        for body in self.batches:
+            for req in body.get("requests", []):
+                cells = req.get("updateCells")
+                if not cells:
+                    continue
+                rng = cells["range"]
+                value = cells["rows"][0]["values"][0].get("userEnteredValue", {}).get("stringValue", "")
+                out.append((a1.rowcol_to_a1(rng["startRowIndex"] + 1, rng["startColumnIndex"] + 1), [[value]]))
+        return out
+
 
 class _FakeSpreadsheet:
     def __init__(self, worksheets):
@@ -86,7 +101,7 @@ class ChatCoverHandlerTests(unittest.TestCase):
                 "_fetch_background_colors",
                 return_value={(2, 2): chat_cover._RED, (4, 2): chat_cover._RED, (6, 2): chat_cover._RED, (8, 2): chat_cover._RED},
             ),
-            patch.object(chat_cover, "_format_cells", side_effect=lambda _ws, coords, _rgb: colored.extend(coords)),
+            patch.object(chat_cover, "_format_cells", side_effect=lambda _ws, coords, _rgb, **_kw: colored.extend(coords)),
             patch.object(chat_cover, "_note_date_label", return_value="04/14"),
         ):
             msg = chat_cover.handle_cover(
@@ -102,9 +117,54 @@ class ChatCoverHandlerTests(unittest.TestCase):
             )
 
         self.assertEqual(colored, [(2, 2), (4, 2), (6, 2), (8, 2)])
-        self.assertEqual(mc_ws.updated, [("I3", [["Alex Smith covering Vraj Patel | 04/14 | 9 AM-11 AM | MC"]])])
+        self.assertEqual(mc_ws.value_writes(), [("I3", [["Alex Smith covering Vraj Patel | 04/14 | 9 AM-11 AM | MC"]])])
+        self.assertEqual(len(mc_ws.batches), 1)
         self.assertIn("orange", msg.lower())
 
+    def test_cover_colors_and_note_share_one_batch_update(self):
+        mc_ws = _FakeWorksheet(
+            "MC (OA and GOAs)",
+            24,
+            column_values={"I": ["Shift Swaps for the week", "EX: sample"]},
+        )
+        ss = _FakeSpreadsheet([mc_ws])
+        fake_st = SimpleNamespace(session_state={})
+        grid = [
+            ["Time", "Monday", "Tuesday", "", "", "", "", "", "Shift Swaps for the week"],
+            ["9:00 AM", "", ""],
+            ["", "", "OA: Vraj Patel"],
+            ["9:30 AM", "", ""],
+            ["", "", "OA: Vraj Patel"],
+            ["10:00 AM", "", ""],
+        ]
+
+        with (
+            patch.object(chat_add, "_cached_ws_titles", return_value=[]),
+            patch.object(chat_cover, "_read_grid", return_value=grid),
+            patch.object(
+                chat_cover,
+                "_fetch_background_colors",
+                return_value={(2, 2): chat_cover._RED, (4, 2): chat_cover._RED},
+            ),
+            patch.object(chat_cover, "_note_date_label", return_value="04/14"),
+        ):
+            chat_cover.handle_cover(
+                fake_st,
+                ss,
+                None,
+                actor_name="Alex Smith",
+                canon_target_name="Vraj Patel",
+                campus_title="MC",
+                day="Tuesday",
+                start=time(9, 0),
+                end=time(10, 0),
+            )
+
+        self.assertEqual(len(mc_ws.batches), 1)
+        kinds = [next(iter(req)) for req in mc_ws.batches[0]["requests"]]
+        self.assertEqual(kinds, ["updateCells", "repeatCell", "repeatCell"])
+        self.assertEqual(mc_ws.updated, [])
+
     def test_cover_requires_red_cells(self):
         mc_ws = _FakeWorksheet("MC (OA and GOAs)", 22, column_values={"I": ["Shift Swaps for the week", "EX: sample"]})
         ss = _FakeSpreadsheet([mc_ws])
@@ -157,7 +217,7 @@ class ChatCoverHandlerTests(unittest.TestCase):
             patch.object(chat_add, "_cached_ws_titles", return_value=[]),
             patch.object(chat_cover, "_read_grid", return_value=grid),
             patch.object(chat_cover, "_fetch_background_colors", return_value={(2, 1): chat_cover._RED}),
-            patch.object(chat_cover, "_format_cells", side_effect=lambda _ws, coords, _rgb: colored.extend(coords)),
+            patch.object(chat_cover, "_format_cells", side_effect=lambda _ws, coords, _rgb, **_kw: colored.extend(coords)),
             patch.object(chat_cover, "_note_date_label", return_value="04/12"),
         ):
             msg = chat_cover.handle_cover(
@@ -173,5 +233,5 @@ class ChatCoverHandlerTests(unittest.TestCase):
             )
 
         self.assertEqual(colored, [(2, 1)])
-        self.assertEqual(oncall_ws.updated, [("K3", [["Alex Smith covering Vraj Patel | 04/12 | 11 AM-3 PM | On Call"]])])
+        self.assertEqual(oncall_ws.value_writes(), [("K3", [["Alex Smith covering Vraj Patel | 04/12 | 11 AM-3 PM | On Call"]])])
         self.assertIn("11:00 AM-3:00 PM", msg)
@@ -0,0 +1,133 @@
+import unittest
+from unittest.mock import patch
+
+from _fixtures import SeededWorkbookTestCase
+from oa_app.core import snapshot
+from oa_app.core.range_cache import shared_range_cache
+from oa_app.core.write_plan import WritePlan
+from oa_app.integrations import gspread_io
+from oa_app.integrations.fake_sheets import FakeSheetsBackend, FakeSpreadsheet
+from oa_app.integrations.gspread_io import QuotaGovernor
+from oa_app.services import schedule_query
+from oa_app.services.schedule_index import schedule_index
+from oa_app.ui import pickup_scan
+
+
+class FakeSheetsTests(SeededWorkbookTestCase):
+
+    def test_user_schedule_costs_one_listing_and_one_batch_read(self):
+        unh = self.ss._find("UNH (OA and GOAs)")
+        unh.set_values([["OA: Casey Fox"]], row0=2, col0=1)  # Monday, 7:00 AM lane 1
+        oncall = self.ss._find("On Call 4/13 - 4/19")
+        oncall.set_values([["Casey Fox"]], row0=2, col0=1)  # Sunday morning block
+
+        out = schedule_query.get_user_schedule(self.ss, None, "Casey Fox")
+
+        self.assertEqual(out["monday"]["UNH"], [("7:00 AM", "7:30 AM")])
+        self.assertEqual(out["sunday"]["On-Call"], [("7:00 AM", "12:00 PM")])
+        self.assertEqual(
+            self.backend.stats()["calls"],
+            {"fetch_sheet_metadata": 1, "values_batch_get": 1},
+        )
+
+    def test_write_plan_lands_values_and_backgrounds(self):
+        ws = self.ss._find("MC (OA and GOAs)")
+        red = {"red": 0.95, "green": 0.25, "blue": 0.25}
+        WritePlan().set_value(ws, 3, 2, "OA: Casey Fox").set_background(ws, 3, 2, red).commit()
+
+        grid, bg = pickup_scan._fetch_griddata(self.ss, ws.title, max_rows=5, max_cols=3)
+
+        self.assertEqual(grid[3][2], "OA: Casey Fox")
+        self.assertEqual(bg[3][2], red)
+        self.assertEqual(self.backend.calls["batch_update"], 1)
+
+    def test_committed_plan_is_not_sent_twice(self):
+        ws = self.ss._find("MC (OA and GOAs)")
+        plan = WritePlan().set_value(ws, 3, 2, "OA: Casey Fox")
+        plan.commit()
+        plan.commit()
+
+        self.assertEqual(self.backend.calls["batch_update"], 1)
+
+    def test_values_are_typed_like_user_entered_input(self):
+        ws = self.ss._find("MC (OA and GOAs)")
+        plan = WritePlan()
+        for col0, value in enumerate(("OA: Casey Fox", "=SUM(A1:A3)", "2.5", "true", "'007", "7:00 AM")):
+            plan.set_value(ws, 3, col0, value)
+
+        entered = [r["updateCells"]["rows"][0]["values"][0]["userEnteredValue"] for r in plan.body()["requests"]]
+
+        self.assertEqual(
+            entered,
+            [
+                {"stringValue": "OA: Casey Fox"},
+                {"formulaValue": "=SUM(A1:A3)"},
+                {"numberValue": 2.5},
+                {"boolValue": True},
+                {"stringValue": "007"},
+                {"stringValue": "7:00 AM"},
+            ],
+        )
+        plan.commit()
+        self.assertEqual(ws.get("A4:F4"), [["OA: Casey Fox", "=SUM(A1:A3)", "2.5", "TRUE", "007", "7:00 AM"]])
+
+    def test_committed_write_is_patched_into_the_snapshot(self):
+        title = "UNH (OA and GOAs)"
+        ws = self.ss._find(title)
+        before = schedule_query.workbook_snapshot(self.ss)
+        schedule_index(before.grid(title)).time_bands
+        version = shared_range_cache().version(self.ss.id, title)
+        self.backend.reset_counts()
+
+        with patch.object(snapshot, "submit_background", side_effect=lambda fn: fn()):
+            WritePlan().set_value(ws, 2, 1, "OA: Casey Fox").commit()
+            after = schedule_query.workbook_snapshot(self.ss)
+            out = schedule_query.get_user_schedule(self.ss, None, "Casey Fox")
+
+        self.assertEqual(out["monday"]["UNH"], [("7:00 AM", "7:30 AM")])
+        self.assertIsNot(after.grid(title), before.grid(title))
+        self.assertIs(after.grid("MC (OA and GOAs)"), before.grid("MC (OA and GOAs)"))
+        self.assertIn("time_bands", schedule_index(after.grid(title))._memo)
+        # one write, one background column read to verify it, no tab re-read
+        self.assertEqual(self.backend.stats()["calls"], {"batch_update": 1, "values_batch_get": 1})
+        self.assertEqual(shared_range_cache().version(self.ss.id, title), version + 1)
+
+    def test_verification_rebumps_columns_that_disagree(self):
+        title = "UNH (OA and GOAs)"
+        ws = self.ss._find(title)
+        schedule_query.workbook_snapshot(self.ss)
+        with patch.object(snapshot, "_VERIFY_WRITES", False):
+            WritePlan().set_value(ws, 2, 1, "OA: Casey Fox").commit()
+        patched = schedule_query.workbook_snapshot(self.ss)
+        ws.set_values([["OA: Riley Chen"]], row0=2, col0=1)  # someone else's edit landed after ours
+
+        bad = snapshot._verify_patch(self.ss, patched, {title: {(2, 1): "OA: Casey Fox"}})
+        self.backend.reset_counts()
+        fixed = schedule_query.workbook_snapshot(self.ss)
+
+        self.assertEqual(bad, {title: {1}})
+        self.assertEqual(fixed.grid(title)[2][1], "OA: Riley Chen")
+        self.assertEqual(self.backend.stats()["calls"], {"values_batch_get": 1})
+
+    def test_injected_quota_errors_are_retried_and_counted(self):
+        self.backend.fail_next(2)
+        with patch.object(gspread_io, "sheets_governor", return_value=QuotaGovernor()):
+            tabs = gspread_io.retry_429(self.ss.worksheets, backoff=0.001)
+
+        self.assertEqual(len(tabs), 4)
+        self.assertEqual(self.backend.stats()["quota_errors"], 2)
+        self.assertEqual(self.backend.calls["fetch_sheet_metadata"], 3)
+
+    def test_latency_is_charged_per_call(self):
+        slept = []
+        backend = FakeSheetsBackend(latency_sec=0.25, sleep=slept.append)
+        ss = FakeSpreadsheet(backend)
+        ws = ss.seed("Tab", [["a", "b"], ["c"]])
+
+        self.assertEqual(ws.get("A1:B2"), [["a", "b"], ["c"]])
+        self.assertEqual(ws.batch_get(["B1:B2"], major_dimension="COLUMNS"), [[["b"]]])
+        self.assertEqual(slept, [0.25, 0.25])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+from _fixtures import SeededWorkbookTestCase
+from oa_app.services import hours, hours_ledger, schedule_query
+from oa_app.services.hours_ledger import HoursEvent, HoursLedger
+
+PEOPLE = ("Alex Kim", "Sam Lee", "Jordan Park", "Riley Chen")
+WEEK = (date(2026, 4, 12), date(2026, 4, 18))
+
+
+class HoursLedgerTests(unittest.TestCase):
+    def test_events_update_a_loaded_week_only(self):
+        ledger = HoursLedger()
+        add = HoursEvent("add", "Sam Lee", "monday", "UNH", 90)
+        self.assertFalse(ledger.apply("ss", WEEK[0], add))
+
+        ledger.load("ss", WEEK[0], {"sam lee": hours.PersonHours("Sam Lee", scheduled={"monday": {"UNH": 60}})})
+        ledger.apply("ss", WEEK[0], add)
+        ledger.apply("ss", WEEK[0], HoursEvent("remove", "sam  lee", "monday", "UNH", 30))
+        ledger.apply("ss", WEEK[0], HoursEvent("add", "Casey Fox", "friday", "MC", 60))
+
+        self.assertEqual(ledger.person("ss", WEEK[0], "Sam Lee").scheduled_minutes, 120)
+        self.assertEqual(ledger.person("ss", WEEK[0], "Casey Fox").campus_minutes("MC"), 60)
+        self.assertEqual(ledger.person("ss", WEEK[0], "Nobody").scheduled_minutes, 0)
+        self.assertIsNone(ledger.person("ss", WEEK[1], "Sam Lee"))
+
+    def test_adjustment_events_dedupe_on_scan_signatures(self):
+        ledger = HoursLedger()
+        ledger.load("ss", WEEK[0], {})
+        sig = ("callout", "2026-04-13", "UNH", "9:00 AM", "10:00 AM")
+        callout = HoursEvent("callout", "Sam Lee", "monday", "UNH", 60, sig)
+        self.assertFalse(ledger.apply("ss", WEEK[0], callout))  # adjustments not loaded yet
+
+        ledger.load_adjustments("ss", WEEK[0], "Sam Lee", callouts={"monday": 60}, pickups={}, signatures={sig})
+        self.assertFalse(ledger.apply("ss", WEEK[0], callout))
+        ledger.apply("ss", WEEK[0], HoursEvent("pickup", "Sam Lee", "tuesday", "MC", 120, ("pickup", "x")))
+        ledger.apply("ss", WEEK[0], HoursEvent("pickup", "Sam Lee", "tuesday", "MC", 120, ("pickup", "x")))
+
+        entry = ledger.person("ss", WEEK[0], "Sam Lee")
+        self.assertEqual((entry.callout_minutes, entry.pickup_minutes), (60, 120))
+
+    def test_reconcile_reports_drift_and_replaces_the_week(self):
+        ledger = HoursLedger(reconcile_sec=60)
+        ledger.load("ss", WEEK[0], {"sam lee": hours.PersonHours("Sam Lee", scheduled={"monday": {"UNH": 60}})})
+        ledger.load_adjustments("ss", WEEK[0], "Sam Lee", callouts={"monday": 30}, pickups={})
+        fresh = {
+            "sam lee": hours.PersonHours("Sam Lee", scheduled={"monday": {"UNH": 90}}),
+            "alex kim": hours.PersonHours("Alex Kim", scheduled={"friday": {"MC": 30}}),
+        }
+
+        self.assertFalse(ledger.claim_reconcile("ss", WEEK[0]))
+        built = ledger._weeks[("ss", WEEK[0])].built_at
+        self.assertTrue(ledger.claim_reconcile("ss", WEEK[0], now=built + 61))
+        self.assertFalse(ledger.claim_reconcile("ss", WEEK[0], now=built + 62))
+        drift = ledger.reconcile("ss", WEEK[0], fresh)
+
+        self.assertEqual(drift, {"sam lee": -30, "alex kim": -30})
+        self.assertEqual(ledger.stats()["last_drift"], drift)
+        self.assertEqual(ledger.person("ss", WEEK[0], "Sam Lee").scheduled_minutes, 90)
+        self.assertFalse(ledger.has_adjustments("ss", WEEK[0], "Sam Lee"))
+
+    def test_reconcile_is_dropped_when_an_event_lands_during_the_read(self):
+        ledger = HoursLedger(reconcile_sec=60)
+        ledger.load("ss", WEEK[0], {"sam lee": hours.PersonHours("Sam Lee", scheduled={"monday": {"UNH": 60}})})
+        mark = ledger.event_mark("ss", WEEK[0])
+        stale = {"sam lee": hours.PersonHours("Sam Lee", scheduled={"monday": {"UNH": 60}})}
+        ledger.apply("ss", WEEK[0], HoursEvent("add", "Sam Lee", "tuesday", "MC", 120))
+
+        self.assertIsNone(ledger.reconcile("ss", WEEK[0], stale, since=mark))
+        self.assertEqual(ledger.person("ss", WEEK[0], "Sam Lee").scheduled_minutes, 180)
+        self.assertEqual(ledger.stats()["skipped_reconciles"], 1)
+
+        fresh = {"sam lee": hours.PersonHours("Sam Lee", scheduled={"monday": {"UNH": 60}, "tuesday": {"MC": 120}})}
+        self.assertEqual(ledger.reconcile("ss", WEEK[0], fresh, since=ledger.event_mark("ss", WEEK[0])), {})
+
+
+class HoursLedgerSheetTests(SeededWorkbookTestCase):
+    seed_kwargs = {"people": PEOPLE, "seed": 3}
+
+    def setUp(self):
+        hours_ledger.hours_ledger.clear()
+        super().setUp()
+        self.addCleanup(hours_ledger.hours_ledger.clear)
+
+    def test_lookups_after_the_first_need_no_sheet_reads(self):
+        first = hours_ledger.person_hours(self.ss, "Sam Lee", week_bounds=WEEK)
+        self.backend.reset_counts()
+        with patch.object(hours_ledger, "compute_hours_for_all") as everyone:
+            again = {name: hours_ledger.person_hours(self.ss, name, week_bounds=WEEK) for name in PEOPLE}
+
+        everyone.assert_not_called()
+        self.assertEqual(self.backend.stats()["calls"], {})
+        self.assertEqual(again["Sam Lee"].scheduled_minutes, first.scheduled_minutes)
+        for name in PEOPLE:
+            user_sched = schedule_query.get_user_schedule(self.ss, None, name)
+            expected = round(hours._hours_from_user_sched(user_sched) * 60)
+            self.assertEqual(again[name].scheduled_minutes, expected, name)
+
+    def test_recorded_events_move_week_hours(self):
+        before = hours_ledger.week_hours(self.ss, None, "Alex Kim")
+        bounds = hours_ledger.current_week_bounds()
+
+        self.assertTrue(hours_ledger.record_event(self.ss, HoursEvent("add", "Alex Kim", "monday", "UNH", 90)))
+        self.assertEqual(hours_ledger.week_hours(self.ss, None, "Alex Kim"), before + 1.5)
+        self.assertFalse(
+            hours_ledger.record_event(
+                self.ss,
+                HoursEvent("add", "Alex Kim", "monday", "UNH", 90),
+                week_bounds=(bounds[0].replace(year=bounds[0].year - 1), bounds[1]),
+            )
+        )
+
+    def test_loaded_week_is_trusted_for_people_without_shifts(self):
+        with patch.object(hours_ledger, "total_hours_from_unh_mc_and_neighbor") as parse:
+            got = hours_ledger.week_hours(self.ss, None, "Casey Fox")
+
+        parse.assert_not_called()
+        self.assertEqual(got, 0.0)
+
+
+class HoursNameMatchingTests(SeededWorkbookTestCase):
+    seed_kwargs = {"people": ("Jo-Ann Lee", "Pat O'Brien", "Sam Lee"), "seed": 5}
+
+    def setUp(self):
+        hours_ledger.hours_ledger.clear()
+        hours.clear_hours_breakdowns()
+        super().setUp()
+        self.addCleanup(hours_ledger.hours_ledger.clear)
+        self.addCleanup(hours.clear_hours_breakdowns)
+
+    def test_ledger_and_breakdown_match_the_same_names(self):
+        for name in ("Jo-Ann Lee", "Pat O'Brien", "Jo Ann Lee", "Pat O Brien"):
+            ledger_entry = hours_ledger.person_hours(self.ss, name, week_bounds=WEEK)
+            breakdown = hours.hours_breakdown(self.ss, name)
+            self.assertEqual(ledger_entry.scheduled_minutes, breakdown.minutes, name)
+        self.assertGreater(hours.hours_breakdown(self.ss, "Pat O'Brien").minutes, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from datetime import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from oa_app.core.models import TimeBlock
+from oa_app.core.occupancy import Occupancy, first_open_window, window_open
+from oa_app.core.schedule import Schedule
+
+
+class OccupancyTests(unittest.TestCase):
+    def test_bitmap_counts_and_open_slots(self):
+        values = {(1, 1): "OA: Ann Lee", (2, 1): "OA: Bo Kim", (4, 2): "OA: Ann Lee"}
+        occ = Occupancy.from_lane_rows(
+            [[1, 2], [4]],
+            [1, 2],
+            lambda r, c: values.get((r, c), ""),
+            lambda v: not v,
+        )
+
+        self.assertEqual(occ.fill_counts(1).tolist(), [2, 0])
+        self.assertEqual(occ.open_slots().tolist(), [[False, True], [True, False]])
+        self.assertEqual(occ.rows.tolist(), [[1, 2], [4, -1]])
+        self.assertFalse(occ.column(7).any())
+
+    def test_windows_need_the_same_lane_free_throughout(self):
+        open_lanes = np.array([[True, False], [False, True], [True, True], [True, True]])
+
+        self.assertEqual(window_open(open_lanes, 2).tolist(), [[False, False], [False, True], [True, True]])
+        self.assertEqual(first_open_window(open_lanes, 2), (1, 1))
+        self.assertEqual(first_open_window(open_lanes, 3, start=2), (1, 1))  # wraps to earlier slots
+        self.assertIsNone(first_open_window(open_lanes, 5))
+
+
+class ScheduleWindowTests(unittest.TestCase):
+    def test_suggest_next_window_skips_filled_lanes_and_wraps(self):
+        times = [time(9, 0), time(9, 30), time(10, 0), time(10, 30)]
+        blocks = {t: TimeBlock(t, [3 * i + 2, 3 * i + 3]) for i, t in enumerate(times)}
+        info = SimpleNamespace(times_sorted=times, blocks_by_time=blocks)
+        # 9:00 and 9:30 have a free second lane; 10:00 onwards is full.
+        day_col_map = {2: "OA: Ann Lee", 3: "OA:", 5: "OA: Bo Kim", 8: "OA: Ann Lee", 9: "OA: Bo Kim", 11: "x", 12: "y"}
+        schedule = Schedule.__new__(Schedule)
+
+        self.assertEqual(schedule._find_empty_lane_index(day_col_map, [blocks[times[0]], blocks[times[1]]]), 1)
+        self.assertEqual(
+            schedule._suggest_next_window(info, 2, day_col_map, start_from=time(10, 0), needed_slots=2),
+            (time(9, 0), time(10, 0)),
+        )
+        self.assertIsNone(schedule._suggest_next_window(info, 2, day_col_map, start_from=time(9, 0), needed_slots=3))
+
+
+if __name__ == "__main__":
+    unittest.main()
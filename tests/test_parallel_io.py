@@ -0,0 +1,84 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from oa_app.integrations import gspread_io
+from oa_app.integrations.gspread_io import PRIORITY_BACKGROUND, run_parallel, sheets_priority
+from oa_app.services import schedule_query
+
+
+class RunParallelTests(unittest.TestCase):
+    def test_calls_overlap_and_failures_are_dropped(self):
+        barrier = threading.Barrier(2, timeout=2)
+
+        def slow(tag):
+            def fn():
+                barrier.wait()
+                return tag
+            return fn
+
+        def broken():
+            raise RuntimeError("boom")
+
+        found = run_parallel({"a": slow("A"), "b": slow("B"), "c": broken})
+
+        self.assertEqual(found, {"a": "A", "b": "B"})
+
+    def test_timed_out_call_is_left_out(self):
+        release = threading.Event()
+
+        def hangs():
+            release.wait(2)
+            return "late"
+
+        t0 = time.monotonic()
+        found = run_parallel({"fast": lambda: "ok", "slow": hangs}, timeout=0.1)
+        release.set()
+
+        self.assertEqual(found, {"fast": "ok"})
+        self.assertLess(time.monotonic() - t0, 1.5)
+
+    def test_workers_inherit_caller_priority(self):
+        seen = []
+
+        def probe():
+            seen.append(gspread_io._priority_var.get())
+            return True
+
+        with sheets_priority(PRIORITY_BACKGROUND):
+            run_parallel({"a": probe, "b": probe})
+
+        self.assertEqual(seen, [PRIORITY_BACKGROUND, PRIORITY_BACKGROUND])
+
+    def test_pool_of_one_runs_inline(self):
+        with patch.object(gspread_io, "_IO_POOL_SIZE", 1):
+            found = run_parallel({"a": lambda: threading.current_thread().name, "b": lambda: 2})
+
+        self.assertEqual(found["a"], threading.current_thread().name)
+
+
+class UserScheduleFanOutTests(unittest.TestCase):
+    def test_explicit_titles_are_read_concurrently(self):
+        barrier = threading.Barrier(3, timeout=2)
+
+        def ranges(ws, name_norm):
+            barrier.wait()
+            return {"monday": [(ws, "9:00 AM")]}
+
+        with patch.object(schedule_query, "open_worksheet", side_effect=lambda ss, t: t), \
+             patch.object(schedule_query, "workbook_snapshot", return_value=None), \
+             patch.object(schedule_query, "_unh_mc_ranges", side_effect=ranges), \
+             patch.object(schedule_query, "_oncall_blocks", side_effect=ranges):
+            out = schedule_query.get_user_schedule_for_titles(
+                object(), None, "Alex Kim", unh_title="U", mc_title="M", oncall_title="O"
+            )
+
+        self.assertEqual(out["monday"]["UNH"], [("U", "9:00 AM")])
+        self.assertEqual(out["monday"]["MC"], [("M", "9:00 AM")])
+        self.assertEqual(out["monday"]["On-Call"], [("O", "9:00 AM")])
+        self.assertEqual(out["tuesday"]["UNH"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
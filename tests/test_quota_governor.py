@@ -0,0 +1,58 @@
+import unittest
+from unittest.mock import patch
+
+from oa_app.integrations import gspread_io
+from oa_app.integrations.gspread_io import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_WRITE,
+    QuotaGovernor,
+)
+
+
+class QuotaGovernorTests(unittest.TestCase):
+    def test_read_bucket_runs_dry_without_touching_writes(self):
+        gov = QuotaGovernor(reads_per_min=2, writes_per_min=2)
+        self.assertTrue(gov.acquire("read", PRIORITY_INTERACTIVE, max_wait=0))
+        self.assertTrue(gov.acquire("read", PRIORITY_INTERACTIVE, max_wait=0))
+        self.assertFalse(gov.acquire("read", PRIORITY_INTERACTIVE, max_wait=0))
+        self.assertTrue(gov.acquire("write", PRIORITY_WRITE, max_wait=0))
+        self.assertEqual(gov.stats()["throttled"], 1)
+
+    def test_waiting_higher_priority_goes_first(self):
+        gov = QuotaGovernor(reads_per_min=60, writes_per_min=60)
+        gov._waiting["read"][PRIORITY_INTERACTIVE] = 1
+        self.assertFalse(gov.acquire("read", PRIORITY_BACKGROUND, max_wait=0))
+        self.assertTrue(gov.acquire("read", PRIORITY_WRITE, max_wait=0))
+
+    def test_quota_error_cools_down_the_shared_governor(self):
+        gov = QuotaGovernor()
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("APIError: [429]: Quota exceeded for quota metric 'Read requests'")
+            return "ok"
+
+        with patch.object(gspread_io, "sheets_governor", return_value=gov):
+            self.assertEqual(gspread_io.retry_429(flaky, backoff=0.01), "ok")
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(gov.stats()["quota_errors"], 1)
+        self.assertEqual(gov.stats()["admitted"]["read"], 2)
+
+    def test_call_kind_classifies_writes(self):
+        class _Ws:
+            def update_cell(self):
+                pass
+
+            def batch_get(self):
+                pass
+
+        self.assertEqual(gspread_io.call_kind(_Ws().update_cell), "write")
+        self.assertEqual(gspread_io.call_kind(_Ws().batch_get), "read")
+
+
+if __name__ == "__main__":
+    unittest.main()
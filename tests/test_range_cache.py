@@ -0,0 +1,103 @@
+import threading
+import unittest
+
+from oa_app.core.range_cache import MISS, SharedRangeCache, SingleFlight, approx_nbytes
+
+
+class SharedRangeCacheTests(unittest.TestCase):
+    def test_hit_miss_counts(self):
+        cache = SharedRangeCache(max_bytes=10_000, ttl_sec=0)
+        self.assertIs(cache.get("ss", "1", ("A1:B2",)), MISS)
+        cache.put("ss", "1", ("A1:B2",), [[["a", "b"]]])
+        self.assertEqual(cache.get("ss", "1", ("A1:B2",)), [[["a", "b"]]])
+
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_bump_invalidates_only_that_sheet(self):
+        cache = SharedRangeCache(max_bytes=10_000, ttl_sec=0)
+        cache.put("ss", "1", ("A1",), [[["x"]]])
+        cache.put("ss", "2", ("A1",), [[["y"]]])
+        cache.bump("ss", "1")
+
+        self.assertIs(cache.get("ss", "1", ("A1",)), MISS)
+        self.assertEqual(cache.get("ss", "2", ("A1",)), [[["y"]]])
+
+    def test_put_with_stale_version_is_not_served(self):
+        cache = SharedRangeCache(max_bytes=10_000, ttl_sec=0)
+        version = cache.version("ss", "1")
+        cache.bump("ss", "1")  # a write landed while the read was in flight
+        cache.put("ss", "1", ("A1",), [[["old"]]], version=version)
+
+        self.assertIs(cache.get("ss", "1", ("A1",)), MISS)
+
+    def test_lru_eviction_under_byte_budget(self):
+        value = [[["x" * 100]]]
+        budget = approx_nbytes(value) * 2
+        cache = SharedRangeCache(max_bytes=budget, ttl_sec=0)
+        cache.put("ss", "1", ("a",), value)
+        cache.put("ss", "1", ("b",), value)
+        cache.get("ss", "1", ("a",))
+        cache.put("ss", "1", ("c",), value)
+
+        self.assertIsNot(cache.get("ss", "1", ("a",)), MISS)
+        self.assertIs(cache.get("ss", "1", ("b",)), MISS)
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertLessEqual(cache.stats()["bytes"], budget)
+
+
+    def test_column_log_unions_known_writes(self):
+        cache = SharedRangeCache(max_bytes=10_000, ttl_sec=0)
+        cache.bump("ss", "1", columns=[2])
+        cache.bump("ss", "1", columns=[5, 2])
+        self.assertEqual(cache.columns_changed_since("ss", "1", 0), frozenset({2, 5}))
+        self.assertEqual(cache.columns_changed_since("ss", "1", 2), frozenset())
+
+        cache.bump("ss", "1")  # write without column info
+        self.assertIsNone(cache.columns_changed_since("ss", "1", 1))
+
+class SingleFlightTests(unittest.TestCase):
+    def test_concurrent_callers_share_one_fetch(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        fetches = []
+
+        def fetch():
+            fetches.append(1)
+            release.wait(2)
+            return [["grid"]]
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do(("ss", "UNH", 0), fetch)))
+        leader.start()
+        while not flight.stats()["in_flight"]:
+            pass
+        followers = [
+            threading.Thread(target=lambda: results.append(flight.do(("ss", "UNH", 0), fetch)))
+            for _ in range(3)
+        ]
+        for t in followers:
+            t.start()
+        while flight.stats()["saved"] < 3:
+            pass
+        release.set()
+        for t in [leader, *followers]:
+            t.join(2)
+
+        self.assertEqual(len(fetches), 1)
+        self.assertEqual(results, [[["grid"]]] * 4)
+        self.assertEqual(flight.stats(), {"calls": 1, "saved": 3, "in_flight": 0})
+
+    def test_errors_are_shared_and_not_cached(self):
+        flight = SingleFlight()
+
+        def boom():
+            raise RuntimeError("429")
+
+        with self.assertRaises(RuntimeError):
+            flight.do("k", boom)
+        self.assertEqual(flight.do("k", lambda: "ok"), "ok")
+
+
+if __name__ == "__main__":
+    unittest.main()
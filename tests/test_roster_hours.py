@@ -0,0 +1,101 @@
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+from _fixtures import SeededWorkbookTestCase
+from oa_app.services import hours, schedule_query
+
+PEOPLE = ("Alex Kim", "Sam Lee", "Jordan Park", "Riley Chen")
+
+
+class RosterHoursTests(SeededWorkbookTestCase):
+    seed_kwargs = {"people": PEOPLE, "seed": 3}
+
+    def setUp(self):
+        super().setUp()
+        self.week = (date(2026, 4, 12), date(2026, 4, 18))
+
+    def test_one_pass_matches_per_person_schedules(self):
+        snap = schedule_query.workbook_snapshot(self.ss)
+        everyone = hours.compute_hours_for_all(snap, include_adjustments=False)
+
+        for name in PEOPLE:
+            user_sched = schedule_query.get_user_schedule(self.ss, None, name)
+            expected = round(hours._hours_from_user_sched(user_sched) * 60)
+            self.assertEqual(everyone[name.lower()].week_minutes, expected, name)
+            unh = sum(hours._mins_between_12h(s, e) for b in user_sched.values() for s, e in b["UNH"])
+            self.assertEqual(everyone[name.lower()].campus_minutes("UNH"), unh, name)
+
+    def test_callouts_and_pickups_are_read_once_for_everyone(self):
+        snap = schedule_query.workbook_snapshot(self.ss)
+        base = hours.compute_hours_for_all(snap, include_adjustments=False)
+        monday = base["sam lee"].day_minutes("monday")
+        callouts = [{"event_date": "2026-04-13", "duration_hours": 1.0, "caller_name": "Sam Lee", "campus": "UNH"}]
+        pickups = [
+            {"event_date": "2026-04-14", "duration_hours": 2.5, "picker_name": "Alex  Kim", "campus": "MC"},
+            {"event_date": "2026-04-14", "duration_hours": 1.0, "picker_name": "Casey Fox", "campus": "On Call"},
+        ]
+
+        with patch.object(hours.callouts_db, "list_callouts_in_range", return_value=callouts) as co, \
+             patch.object(hours.pickups_db, "list_pickups_in_range", return_value=pickups) as pu:
+            everyone = hours.compute_hours_for_all(snap, week_bounds=self.week)
+
+        co.assert_called_once_with(week_start=self.week[0], week_end=self.week[1])
+        pu.assert_called_once_with(week_start=self.week[0], week_end=self.week[1])
+        self.assertEqual(everyone["sam lee"].day_minutes("monday"), max(0, monday - 60))
+        self.assertEqual(everyone["alex kim"].pickups, {"tuesday": {"MC": 150}})
+        self.assertEqual(everyone["alex kim"].week_minutes, base["alex kim"].week_minutes + 150)
+        self.assertEqual(everyone["casey fox"].week_minutes, 60)
+        self.assertEqual(everyone["casey fox"].pickups, {"tuesday": {"ONCALL": 60}})
+
+
+class HoursBreakdownTests(SeededWorkbookTestCase):
+    seed_kwargs = {"people": PEOPLE, "seed": 3}
+
+    def setUp(self):
+        super().setUp()
+        hours.clear_hours_breakdowns()
+        self.addCleanup(hours.clear_hours_breakdowns)
+
+    def test_slots_carry_the_rule_that_counted_them(self):
+        for name in PEOPLE:
+            got = hours.hours_breakdown(self.ss, name)
+            user_sched = schedule_query.get_user_schedule(self.ss, None, name)
+            self.assertEqual(got.hours, hours._hours_from_user_sched(user_sched), name)
+            self.assertLessEqual(set(got.by_rule()), {"lane_range", "oncall_block"}, name)
+            self.assertEqual(got.errors, ())
+            for slot in got.slots:
+                self.assertEqual(slot.rule == "oncall_block", slot.campus == "ONCALL", name)
+
+    def test_zero_hours_are_cached_without_a_second_parse(self):
+        real = schedule_query.get_user_schedule_for_titles
+        with patch.object(hours.schedule_query, "get_user_schedule_for_titles", side_effect=real) as parse:
+            first = hours.hours_breakdown(self.ss, "Casey Fox")
+            self.backend.reset_counts()
+            again = hours.hours_breakdown(self.ss, "casey  fox")
+
+        self.assertEqual(first.minutes, 0)
+        self.assertIs(again, first)
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(self.backend.stats()["calls"], {})
+
+    def test_mentions_count_when_no_range_parses(self):
+        mention_only = {"monday": {"UNH": [], "MC": [], "On-Call": []}}
+        ws = self.ss._find("MC (OA and GOAs)")
+        ws.set_values([["Casey Fox"], ["Casey Fox"]], row0=3, col0=2)
+        with patch.object(hours.schedule_query, "get_user_schedule_for_titles", return_value=mention_only):
+            got = hours.hours_breakdown(self.ss, "Casey Fox")
+
+        self.assertEqual(got.by_rule(), {"half_hour_mention": 60})
+        self.assertEqual({slot.campus for slot in got.slots}, {"MC"})
+
+    def test_parser_errors_are_reported_not_swallowed(self):
+        with patch.object(hours.schedule_query, "get_user_schedule_for_titles", side_effect=RuntimeError("boom")):
+            got = hours.hours_breakdown(self.ss, "Sam Lee")
+
+        self.assertEqual(got.errors, ("schedule: boom",))
+        self.assertEqual(set(got.by_rule()) - {"half_hour_mention", "oncall_mention"}, set())
+
+
+if __name__ == "__main__":
+    unittest.main()
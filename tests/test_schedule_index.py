@@ -0,0 +1,106 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from oa_app.integrations.fake_sheets import oncall_layout, unh_mc_layout
+from oa_app.services import chat_add, chat_callout, hours, schedule_index, schedule_query
+from oa_app.ui import availability
+
+
+class ScheduleIndexTests(unittest.TestCase):
+    def setUp(self):
+        schedule_index.clear_schedule_indexes()
+        self.unh = unh_mc_layout(["Alex Kim", "Sam Lee"], lanes=2, start_hour=7, end_hour=9, fill=0.0)
+        self.unh[2][1] = "OA: Alex Kim"  # Monday 7:00 lane 1
+        self.unh[5][1] = "GOA: Sam Lee / Alex Kim"  # Monday 7:30 lane 1
+        self.oncall = oncall_layout([], lanes=2)
+        self.ws = SimpleNamespace(title="UNH (OA and GOAs)")
+        self.ws_on = SimpleNamespace(title="On Call General")
+
+    def test_bands_and_occupants_come_from_one_parse(self):
+        calls = []
+        real = schedule_query._people_from_cell
+
+        def counting(cell):
+            calls.append(cell)
+            return real(cell)
+
+        with patch.object(schedule_query, "_read_grid", return_value=self.unh), \
+             patch.object(schedule_query, "_people_from_cell", side_effect=counting):
+            first = schedule_query._unh_mc_people_ranges(self.ws)
+            parsed = len(calls)
+            again = schedule_query._unh_mc_people_ranges(self.ws)
+            ranges = schedule_query._unh_mc_ranges(self.ws, "alex kim")
+
+        self.assertEqual(first, again)
+        self.assertEqual(len(calls), parsed)
+        self.assertEqual(ranges, {"monday": [("7:00 AM", "8:00 AM")]})
+        self.assertEqual(
+            [(r["name"], r["role"], r["start"], r["end"]) for r in first["monday"]],
+            [("Alex Kim", "OA", "7:00 AM", "8:00 AM"), ("Sam Lee", "GOA", "7:30 AM", "8:00 AM")],
+        )
+
+    def test_oncall_blocks_use_indexed_bands(self):
+        grid = [row[:] for row in self.oncall]
+        grid[2][2] = "Alex Kim"  # Monday, first block
+        with patch.object(schedule_query, "_read_grid", return_value=grid):
+            blocks = schedule_query._oncall_blocks(self.ws_on, "alex kim")
+            idx = schedule_index.schedule_index(grid)
+
+        self.assertEqual(blocks["monday"], [("7:00 AM", "12:00 PM")])
+        self.assertEqual([b.r_label for b in idx.oncall_bands(2)], [1, 4, 7])
+
+    def test_consumers_share_the_same_index(self):
+        with patch.object(availability, "_read_grid", return_value=self.unh):
+            availability._available_ranges_unh_mc(self.ws, "monday")
+        idx = schedule_index.schedule_index(self.unh)
+
+        self.assertIn(("availability_day_col", "monday"), idx._memo)
+        self.assertEqual(chat_add._slot_bands_by_time(self.unh)["7:30 AM"], (4, 7))
+        self.assertEqual(chat_add._time_row_indices(self.unh), [1, 4, 7, 10])
+
+
+class PersonLookupTests(unittest.TestCase):
+    def setUp(self):
+        schedule_index.clear_schedule_indexes()
+        self.unh = unh_mc_layout([], lanes=2, start_hour=7, end_hour=9, fill=0.0)
+        self.unh[2][1] = "OA: Alex Kim"
+        self.unh[3][2] = "OA: Alex Kimball"
+        self.unh[5][1] = "GOA: Sam Lee / Alex Kim"
+        self.ws = SimpleNamespace(title="UNH (OA and GOAs)")
+
+    def test_name_lookups_test_each_distinct_text_once(self):
+        tested = []
+        real = schedule_query._norm_has_name
+
+        def counting(cell_norm, name_norm):
+            tested.append(cell_norm)
+            return real(cell_norm, name_norm)
+
+        idx = schedule_index.schedule_index(self.unh)
+        with patch.object(schedule_query, "_norm_has_name", side_effect=counting):
+            cells = idx.name_cells("alex kim")
+            again = idx.name_cells("alex kim")
+
+        self.assertEqual(cells, {(2, 1), (5, 1)})
+        self.assertIs(again, cells)
+        self.assertEqual(len(tested), len(set(tested)))
+
+    def test_hours_and_callout_targets_read_the_index(self):
+        def mention_minutes(name):
+            return sum(slot.minutes for slot in hours._mention_slots(self.unh, self.ws.title, "UNH", name))
+
+        self.assertEqual(mention_minutes("Alex Kim"), 60)
+        self.assertEqual(mention_minutes("Sam Lee"), 30)
+        self.assertEqual(mention_minutes("Nobody"), 0)
+
+        idx = schedule_index.schedule_index(self.unh)
+        self.assertIn(("hours_mention_counts", 0), idx._memo)
+        self.assertEqual(
+            chat_callout._loose_name_cells(self.unh, "Alex Kim"),
+            {(2, 1), (3, 2), (5, 1)},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
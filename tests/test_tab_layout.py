@@ -0,0 +1,60 @@
+import unittest
+from unittest.mock import patch
+
+from oa_app.integrations.fake_sheets import oncall_layout, unh_mc_layout
+from oa_app.services import chat_add, chat_callout, tab_layout
+
+
+class TabLayoutTests(unittest.TestCase):
+    def setUp(self):
+        tab_layout.clear_tab_layouts()
+        self.unh = unh_mc_layout([], lanes=3, fill=0.0)
+        self.oncall = oncall_layout([], lanes=2)
+
+    def test_lane_write_reuses_the_detected_layout(self):
+        copy = [list(row) for row in self.unh]
+        copy[90][1] = "OA: Alex Kim"  # below the header rows
+        real = chat_add._header_day_cols
+
+        with patch.object(chat_add, "_header_day_cols", side_effect=real) as scans:
+            first = tab_layout.tab_layout(self.unh).unh_mc_day_cols("monday")
+            again = tab_layout.tab_layout(copy).unh_mc_day_cols("tuesday")
+
+        self.assertIs(tab_layout.tab_layout(copy), tab_layout.tab_layout(self.unh))
+        self.assertEqual(scans.call_count, 1)
+        self.assertEqual(first["monday"], 1)
+        self.assertEqual(again["tuesday"], 2)
+
+    def test_header_change_gets_its_own_layout(self):
+        moved = [list(row) for row in self.unh]
+        moved[0][1], moved[0][2] = moved[0][2], moved[0][1]
+
+        self.assertIsNot(tab_layout.tab_layout(moved), tab_layout.tab_layout(self.unh))
+        self.assertEqual(tab_layout.tab_layout(moved).unh_mc_day_cols("monday")["monday"], 2)
+
+    def test_oncall_chain_and_structure(self):
+        layout = tab_layout.tab_layout(self.oncall)
+
+        self.assertEqual(chat_callout._resolve_oncall_day_col(self.oncall, "monday"), 2)
+        self.assertEqual(layout.oncall_day_cols("saturday")["saturday"], 7)
+        self.assertEqual(layout.band_rows, ())
+        self.assertEqual(tab_layout.tab_layout(self.unh).band_rows[:3], (1, 5, 9))
+        self.assertEqual(set(tab_layout.tab_layout(self.unh).lane_counts.values()), {3})
+        self.assertIsNone(layout.swaps_col)
+
+    def test_block_labels_below_the_header_rows_are_kept(self):
+        tall = [[""] for _ in range(70)] + [list(row) for row in self.oncall]
+        tall[72][3] = "1:00 PM - 5:00 PM"  # block labelled in the Tuesday column
+        view = tab_layout._structural_view(tall)
+
+        self.assertEqual(len(view), len(tall))
+        self.assertEqual(view[70][3], "Tuesday")
+        self.assertEqual(tab_layout.tab_layout(tall).block_days, {"tuesday": 3})
+        self.assertEqual(
+            tab_layout.tab_layout(tall).block_days,
+            chat_add._infer_day_cols_by_blocks(tall),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
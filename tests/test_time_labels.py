@@ -0,0 +1,86 @@
+import os
+import timeit
+import unittest
+from datetime import datetime, time
+from unittest.mock import patch
+
+from dateutil import parser as dateparser
+
+from oa_app.core import utils
+from oa_app.services import schedule_query
+from oa_app.ui import availability, pickup_scan
+
+
+def _dateutil_time(label):
+    dt = dateparser.parse(label)
+    return time(dt.hour, dt.minute)
+
+
+def _strptime_label(label):
+    txt = utils._AMPM_SUFFIX_RE.sub(lambda m: f" {m.group(1).upper()}", label.strip())
+    for fmt in ("%I:%M %p", "%I %p"):
+        try:
+            return datetime.strptime(txt, fmt)
+        except Exception:
+            continue
+    return None
+
+
+class TimeLabelTableTests(unittest.TestCase):
+    def test_table_agrees_with_dateutil_and_strptime(self):
+        for key, value in utils._TIME_STR_TABLE.items():
+            self.assertEqual(_dateutil_time(key), value, key)
+        for key, value in utils._TIME_LABEL_TABLE.items():
+            self.assertEqual(_strptime_label(key), value, key)
+
+    def test_variants_and_misses(self):
+        self.assertEqual(utils.parse_time_str("7 PM"), time(19, 0))
+        self.assertEqual(utils.parse_time_str("07:30a.m."), time(7, 30))
+        self.assertEqual(utils.parse_time_str("12am"), time(0, 0))
+        self.assertEqual(utils.parse_time_str("7:15 pm"), time(19, 15))  # off-grid: dateutil fallback
+        self.assertIsNone(utils.is_time_token("OA: Alex Kim"))
+        self.assertEqual(utils.parse_time_label("7:00pm"), datetime(1900, 1, 1, 19, 0))
+        self.assertEqual(utils.parse_time_label("7:05 PM"), datetime(1900, 1, 1, 19, 5))
+        self.assertIsNone(utils.parse_time_label("19:00"))
+        for parse in (schedule_query._parse_time_cell, pickup_scan._parse_time_cell, availability._parse_time_cell):
+            self.assertEqual(parse("07 AM"), datetime(1900, 1, 1, 7, 0))
+
+    def test_column_a_scan_never_reaches_dateutil(self):
+        # Column A as Schedule._build_sheet_info_lazy sees it: a label every few rows, lanes blank.
+        labels = [utils.fmt_time(t) for t in utils._grid_times()[14:48]]
+        column = [labels[i // 4] if i % 4 == 0 else "" for i in range(len(labels) * 4)]
+        column += [label.lower().replace(" ", "") for label in labels]
+        utils._parse_time_slow.cache_clear()
+
+        with patch.object(utils.dateparser, "parse", wraps=utils.dateparser.parse) as slow:
+            scanned = [utils.is_time_token(cell) for cell in column]
+            self.assertEqual(slow.call_count, 0)
+            self.assertEqual(utils.is_time_token("7:15 pm"), time(19, 15))
+            self.assertEqual(slow.call_count, 1)
+
+        self.assertEqual(sum(t is not None for t in scanned), 2 * len(labels))
+
+@unittest.skipUnless(os.environ.get("OA_BENCH"), "set OA_BENCH=1 to run the time-label benchmark")
+class TimeLabelBenchmark(unittest.TestCase):
+    def test_column_a_table_vs_dateutil(self):
+        # 2000 cells of column A: a grid label every fourth row, lanes blank.
+        labels = [utils.fmt_time(t) for t in utils._grid_times()]
+        column = [labels[(i // 4) % len(labels)] if i % 4 == 0 else "" for i in range(2000)]
+
+        def table_scan():
+            for cell in column:
+                if cell:
+                    utils.parse_time_str(cell)
+
+        def dateutil_scan():
+            for cell in column:
+                if cell:
+                    dateparser.parse(cell)
+
+        table = min(timeit.repeat(table_scan, number=5, repeat=5))
+        slow = min(timeit.repeat(dateutil_scan, number=5, repeat=5))
+        print(f"\ncolumn A x2000: table {table * 1000:.2f} ms, dateutil {slow * 1000:.2f} ms, {slow / table:.1f}x")
+
+
+if __name__ == "__main__":
+    unittest.main()
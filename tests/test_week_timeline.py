@@ -0,0 +1,99 @@
+import unittest
+from datetime import date, datetime
+
+from oa_app.core import labor_rules
+from oa_app.core.week_timeline import DAY_MINUTES, Span, WeekTimeline, clock_label, make_span
+from oa_app.ui import page
+
+
+def _at(day, hh, mm=0):
+    # chat requests are anchored on real dates, the user schedule on 1900-01-01
+    return datetime.combine(day, datetime.min.time()).replace(hour=hh, minute=mm)
+
+
+class WeekTimelineTests(unittest.TestCase):
+    def setUp(self):
+        self.sched = {
+            "monday": {"UNH": [("9:00 AM", "11:00 AM")], "MC": [("1:00 PM", "3:00 PM")], "On-Call": []},
+            "sunday": {"On-Call": [("7:00 PM", "12:00 AM")]},
+            "saturday": {"On-Call": [("10:00 PM", "2:00 AM")]},
+        }
+        self.timeline = WeekTimeline.from_schedule(self.sched)
+
+    def test_overlapping_finds_spans_across_days_and_midnight(self):
+        monday = make_span("monday", "10:30 AM", "1:30 PM")
+        self.assertEqual([s.source for s in self.timeline.overlapping(monday)], ["UNH", "MC"])
+
+        sunday_end = self.timeline.overlapping(make_span("sunday", "11:30 PM", "11:45 PM"))
+        self.assertEqual(sunday_end[0].labels, ("7:00 PM", "12:00 AM"))
+        self.assertEqual(self.timeline.overlapping(make_span("monday", "11:00 AM", "1:00 PM")), [])
+
+        overnight = self.timeline.overlapping(make_span("saturday", "11:00 PM", "11:30 PM"))
+        self.assertEqual(overnight[0].minutes, 4 * 60)
+
+    def test_subtract_cuts_only_the_named_source(self):
+        cut = self.timeline.subtract(make_span("monday", "9:30 AM", "10:00 AM"), source="UNH")
+        monday_unh = [s.labels for s in cut.spans if s.source == "UNH"]
+        self.assertEqual(monday_unh, [("9:00 AM", "9:30 AM"), ("10:00 AM", "11:00 AM")])
+
+        untouched = self.timeline.subtract(make_span("monday", "1:00 PM", "2:00 PM"), source="UNH")
+        self.assertIs(untouched, self.timeline)
+
+    def test_break_rule_only_checks_the_run_the_request_joins(self):
+        long_day = WeekTimeline([make_span("tuesday", "7:00 AM", "1:00 PM", "UNH")])
+        far = make_span("thursday", "9:00 AM", "10:00 AM")
+        near = make_span("monday", "9:00 AM", "12:00 PM")
+        joining = make_span("monday", "11:15 AM", "1:00 PM")
+
+        self.assertFalse(long_day.violates_break_rule(far))
+        self.assertFalse(self.timeline.violates_break_rule(near))
+        # 9-11 UNH, 11:15-1 request and 1-3 MC merge into one six hour run
+        self.assertTrue(self.timeline.violates_break_rule(joining))
+        self.assertEqual(self.timeline.run_with(joining), (DAY_MINUTES + 9 * 60, DAY_MINUTES + 15 * 60))
+
+    def test_runs_match_labor_rules_merge(self):
+        spans = [Span(0, 60), Span(75, 120), Span(150, 200), Span(190, 210)]
+        self.assertEqual(WeekTimeline(spans).runs(), [(0, 120), (150, 210)])
+        self.assertEqual(labor_rules.merge_minute_runs([(s.start, s.end) for s in spans]), [(0, 120), (150, 210)])
+
+    def test_clock_label_matches_schedule_labels(self):
+        self.assertEqual(clock_label(0), "12:00 AM")
+        self.assertEqual(clock_label(13 * 60 + 30), "1:30 PM")
+        self.assertIsNone(make_span("someday", "9:00 AM", "10:00 AM"))
+
+
+class RequestConflictTests(unittest.TestCase):
+    def setUp(self):
+        self.timeline = WeekTimeline.from_schedule({"monday": {"UNH": [("9:00 AM", "11:00 AM")]}})
+
+    def test_conflict_ignores_the_date_part_of_chat_requests(self):
+        today = date(2026, 10, 19)
+        msg = page._find_any_conflict(self.timeline, "monday", "MC", _at(today, 10), _at(today, 12))
+
+        self.assertIn("Schedule conflict", msg)
+        self.assertIn("UNH during Monday 9:00 AM-11:00 AM", msg)
+
+    def test_same_bucket_overlap_is_a_duplicate(self):
+        msg = page._find_any_conflict(self.timeline, "monday", "UNH", _at(date(1900, 1, 1), 9), _at(date(1900, 1, 1), 10))
+
+        self.assertTrue(msg.startswith("Duplicate entry"))
+        self.assertIsNone(
+            page._find_any_conflict(self.timeline, "tuesday", "UNH", _at(date(1900, 1, 1), 9), _at(date(1900, 1, 1), 10))
+        )
+
+    def test_subtract_sched_window_keeps_the_outside_pieces(self):
+        sched = {"monday": {"UNH": [("9:00 AM", "1:00 PM"), ("3:00 PM", "4:00 PM")], "MC": [("10:00 AM", "11:00 AM")]}}
+        got = page._subtract_sched_window(
+            sched,
+            day_canon="Monday",
+            bucket="UNH",
+            start_dt=_at(date(1900, 1, 1), 10),
+            end_dt=_at(date(1900, 1, 1), 11, 30),
+        )
+        self.assertEqual(got["monday"]["UNH"], [("9:00 AM", "10:00 AM"), ("11:30 AM", "1:00 PM"), ("3:00 PM", "4:00 PM")])
+        self.assertEqual(got["monday"]["MC"], [("10:00 AM", "11:00 AM")])
+        self.assertEqual(len(sched["monday"]["UNH"]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
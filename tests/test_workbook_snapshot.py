@@ -0,0 +1,218 @@
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import streamlit as st
+
+from oa_app.core import quotas, snapshot
+from oa_app.core.range_cache import shared_range_cache
+from oa_app.services import hours, schedule_query, tab_layout  # noqa: F401  (registers the day-column probe)
+
+
+class _FakeSpreadsheet:
+    def __init__(self, grids):
+        self.id = "ss-1"
+        self.grids = grids
+        self.batch_calls = []
+
+    def values_batch_get(self, ranges, params=None):
+        self.batch_calls.append(list(ranges))
+        out = []
+        for rng in ranges:
+            title, cells = rng.rsplit("!", 1)
+            grid = self.grids.get(title.strip("'").replace("''", "'"), [])
+            if (params or {}).get("majorDimension") == "COLUMNS":
+                col0 = ord(cells[0]) - ord("A")
+                column = [row[col0] if col0 < len(row) else "" for row in grid]
+                while column and not column[-1]:
+                    column.pop()
+                out.append({"range": rng, "values": [column] if column else []})
+            else:
+                out.append({"range": rng, "values": grid})
+        return {"valueRanges": out}
+
+
+class _FakeWorksheet:
+    def __init__(self, spreadsheet, title):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.id = hash(title) & 0xFFFF
+        self.batch_get_calls = 0
+
+    def batch_get(self, ranges, major_dimension=None):
+        self.batch_get_calls += 1
+        return [[["direct"]]]
+
+
+class WorkbookSnapshotTests(unittest.TestCase):
+    def setUp(self):
+        st.session_state.clear()
+        shared_range_cache.clear()
+        self._tmp = tempfile.TemporaryDirectory()
+        self._disk = patch.object(snapshot, "_DISK_DIR", self._tmp.name)
+        self._disk.start()
+        snapshot._live_ids.clear()
+        snapshot._last_live.clear()
+        snapshot._refreshing.clear()
+        self.ss = _FakeSpreadsheet(
+            {
+                "UNH (OA and GOAs)": [["", "Monday"], ["7:00 AM", "OA: Alex Kim"]],
+                "MC (OA and GOAs)": [["", "Monday"], ["7:00 AM", ""]],
+                "On Call 4/13 - 4/19": [["", "Sunday"], ["7:00 AM - 12:00 PM", "Alex Kim"]],
+            }
+        )
+        self.titles = list(self.ss.grids)
+
+    def tearDown(self):
+        st.session_state.clear()
+        shared_range_cache.clear()
+        self._disk.stop()
+        self._tmp.cleanup()
+
+    def test_three_tabs_are_read_in_one_batch(self):
+        with patch.object(schedule_query, "_open_three", return_value=self.titles):
+            grids = [schedule_query._read_grid(_FakeWorksheet(self.ss, t)) for t in self.titles]
+            again = schedule_query._read_grid(_FakeWorksheet(self.ss, self.titles[0]))
+
+        self.assertEqual(len(self.ss.batch_calls), 1)
+        self.assertEqual(len(self.ss.batch_calls[0]), 3)
+        self.assertEqual(self.ss.batch_calls[0][2], "'On Call 4/13 - 4/19'!A1:CV1000")
+        self.assertEqual(grids[0][1][1], "OA: Alex Kim")
+        self.assertIs(again, grids[0])
+
+    def test_version_bump_refetches_snapshot(self):
+        ws = _FakeWorksheet(self.ss, self.titles[0])
+        with patch.object(schedule_query, "_open_three", return_value=self.titles):
+            schedule_query._read_grid(ws)
+            quotas.bump_ws_version(ws)
+            schedule_query._read_grid(ws)
+
+        self.assertEqual(len(self.ss.batch_calls), 2)
+
+    def test_unknown_tab_falls_back_to_range_read(self):
+        ws = _FakeWorksheet(self.ss, "Some Other Tab")
+        with patch.object(schedule_query, "_open_three", return_value=self.titles):
+            grid = schedule_query._read_grid(ws)
+
+        self.assertEqual(grid, [["direct"]])
+        self.assertEqual(ws.batch_get_calls, 1)
+
+    def test_hours_grid_counter_reads_from_snapshot(self):
+        ws = _FakeWorksheet(self.ss, self.titles[0])
+        with patch.object(schedule_query, "_open_three", return_value=self.titles):
+            grid = schedule_query._read_grid(ws)
+        slots = hours._mention_slots(grid, ws.title, "UNH", "Alex Kim")
+
+        self.assertEqual(sum(slot.minutes for slot in slots), 30)
+        self.assertEqual(ws.batch_get_calls, 0)
+        self.assertEqual(snapshot.grid_a1_range(), "A1:CV1000")
+
+    def test_new_session_reuses_shared_grids(self):
+        with patch.object(schedule_query, "_open_three", return_value=self.titles):
+            schedule_query._read_grid(_FakeWorksheet(self.ss, self.titles[1]))
+            st.session_state.clear()
+            grid = schedule_query._read_grid(_FakeWorksheet(self.ss, self.titles[1]))
+
+        self.assertEqual(len(self.ss.batch_calls), 1)
+        self.assertEqual(grid[0][1], "Monday")
+
+    def _cold_restart(self):
+        st.session_state.clear()
+        shared_range_cache.clear()
+        snapshot._live_ids.clear()
+        snapshot._last_live.clear()
+
+    def test_cold_start_serves_disk_copy_then_refreshes(self):
+        snapshot.load_workbook_snapshot(self.ss, self.titles)
+        self.ss.grids["UNH (OA and GOAs)"][1][1] = "OA: Sam Lee"
+        self._cold_restart()
+
+        stale = snapshot.load_workbook_snapshot(self.ss, self.titles)
+        self.assertTrue(stale.stale)
+        self.assertEqual(stale.grid("UNH (OA and GOAs)")[1][1], "OA: Alex Kim")
+
+        snapshot._refreshing[self.ss.id].result(timeout=5)
+        fresh = snapshot.load_workbook_snapshot(self.ss, self.titles)
+        self.assertFalse(fresh.stale)
+        self.assertEqual(fresh.grid("UNH (OA and GOAs)")[1][1], "OA: Sam Lee")
+        self.assertEqual(len(self.ss.batch_calls), 2)
+
+    def test_write_handlers_never_see_the_disk_copy(self):
+        snapshot.load_workbook_snapshot(self.ss, self.titles)
+        self.ss.grids["MC (OA and GOAs)"][1][1] = "OA: Sam Lee"
+        self._cold_restart()
+
+        read = snapshot.fresh_snapshots(lambda: snapshot.load_workbook_snapshot(self.ss, self.titles))
+        snap = read()
+
+        self.assertFalse(snap.stale)
+        self.assertEqual(snap.grid("MC (OA and GOAs)")[1][1], "OA: Sam Lee")
+
+    def test_disk_copy_is_ignored_once_a_tab_was_written(self):
+        snapshot.load_workbook_snapshot(self.ss, self.titles)
+        self._cold_restart()
+        quotas.bump_ws_version(_FakeWorksheet(self.ss, self.titles[0]))
+
+        snap = snapshot.load_workbook_snapshot(self.ss, self.titles)
+
+        self.assertFalse(snap.stale)
+        self.assertEqual(len(self.ss.batch_calls), 2)
+
+    def test_written_column_is_refetched_alone(self):
+        before = snapshot.load_workbook_snapshot(self.ss, self.titles)
+        self.ss.grids["UNH (OA and GOAs)"].append(["7:30 AM", "OA: Sam Lee"])
+        quotas.bump_ws_version(_FakeWorksheet(self.ss, self.titles[0]), columns={1})
+
+        after = snapshot.load_workbook_snapshot(self.ss, self.titles)
+
+        self.assertEqual(self.ss.batch_calls[-1], ["'UNH (OA and GOAs)'!B1:B1000"])
+        self.assertEqual(after.grid(self.titles[0]), self.ss.grids[self.titles[0]][:2] + [["", "OA: Sam Lee"]])
+        self.assertIs(after.grid(self.titles[1]), before.grid(self.titles[1]))
+
+    def test_formatting_only_write_needs_no_read(self):
+        snapshot.load_workbook_snapshot(self.ss, self.titles)
+        quotas.bump_ws_version(_FakeWorksheet(self.ss, self.titles[2]), columns=())
+
+        snap = snapshot.load_workbook_snapshot(self.ss, self.titles)
+
+        self.assertEqual(len(self.ss.batch_calls), 1)
+        self.assertEqual(snap.versions, snapshot._versions_for(self.ss.id, self.titles))
+
+    def test_foreign_edit_after_ttl_splices_only_the_probed_day_column(self):
+        before = snapshot.load_workbook_snapshot(self.ss, self.titles)
+        self.ss.grids["MC (OA and GOAs)"][1][1] = "OA: Sam Lee"
+        st.session_state.clear()
+
+        with patch("time.time", return_value=before.fetched_at + 300):
+            after = snapshot.load_workbook_snapshot(self.ss, self.titles)
+
+        self.assertEqual(
+            self.ss.batch_calls[-1],
+            [
+                "'UNH (OA and GOAs)'!A1:A1000",
+                "'UNH (OA and GOAs)'!B1:B1000",
+                "'MC (OA and GOAs)'!A1:A1000",
+                "'MC (OA and GOAs)'!B1:B1000",
+                "'On Call 4/13 - 4/19'!A1:A1000",
+                "'On Call 4/13 - 4/19'!B1:B1000",
+            ],
+        )
+        self.assertEqual(after.grid(self.titles[1]), [["", "Monday"], ["7:00 AM", "OA: Sam Lee"]])
+        self.assertIs(after.grid(self.titles[0]), before.grid(self.titles[0]))
+        self.assertIs(after.grid(self.titles[2]), before.grid(self.titles[2]))
+
+    def test_moved_time_column_rereads_the_whole_tab(self):
+        before = snapshot.load_workbook_snapshot(self.ss, self.titles)
+        self.ss.grids["UNH (OA and GOAs)"][1][0] = "7:30 AM"
+        st.session_state.clear()
+
+        with patch("time.time", return_value=before.fetched_at + 300):
+            after = snapshot.load_workbook_snapshot(self.ss, self.titles)
+
+        self.assertEqual(self.ss.batch_calls[-1], ["'UNH (OA and GOAs)'!A1:CV1000"])
+        self.assertEqual(after.grid(self.titles[0])[1][0], "7:30 AM")
+        self.assertIs(after.grid(self.titles[1]), before.grid(self.titles[1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+from gspread.exceptions import WorksheetNotFound
+
+from oa_app.core import ws_registry
+
+
+class _FakeWorksheet:
+    def __init__(self, title, sheet_id, hidden=False, rows=1000):
+        self.title = title
+        self.id = sheet_id
+        self._properties = {"hidden": hidden, "gridProperties": {"rowCount": rows, "columnCount": 26}}
+
+
+class _FakeSpreadsheet:
+    def __init__(self, worksheets):
+        self.id = "fake-ss"
+        self._worksheets = list(worksheets)
+        self.list_calls = 0
+
+    def worksheets(self):
+        self.list_calls += 1
+        return list(self._worksheets)
+
+    def worksheet(self, title):
+        raise AssertionError("registry should not fall back to ss.worksheet")
+
+
+class WorksheetRegistryTests(unittest.TestCase):
+    def setUp(self):
+        self.ss = _FakeSpreadsheet(
+            [
+                _FakeWorksheet("(Names of hired OAs)", 0),
+                _FakeWorksheet("UNH (OA and GOAs)", 11),
+                _FakeWorksheet("Old On Call", 12, hidden=True),
+            ]
+        )
+
+    def test_handles_and_titles_come_from_one_listing(self):
+        ws = ws_registry.open_worksheet(self.ss, "UNH (OA and GOAs)")
+        again = ws_registry.open_worksheet(self.ss, "UNH (OA and GOAs)")
+        titles = ws_registry.visible_titles(self.ss)
+
+        self.assertIs(ws, again)
+        self.assertEqual(titles, ["(Names of hired OAs)", "UNH (OA and GOAs)"])
+        self.assertEqual(self.ss.list_calls, 1)
+
+        reg = ws_registry.worksheet_registry(self.ss)
+        self.assertTrue(reg.meta("Old On Call").hidden)
+        self.assertEqual(reg.by_id(11).row_count, 1000)
+
+    def test_unknown_title_refreshes_once_then_raises(self):
+        ws_registry.worksheet_registry(self.ss).checked_at -= 60
+        self.ss._worksheets.append(_FakeWorksheet("MC (OA and GOAs)", 13))
+
+        self.assertEqual(ws_registry.open_worksheet(self.ss, "MC (OA and GOAs)").id, 13)
+        with self.assertRaises(WorksheetNotFound):
+            ws_registry.open_worksheet(self.ss, "Nope")
+        self.assertEqual(self.ss.list_calls, 2)
+
+    def test_resized_tab_refreshes_its_meta_on_recheck(self):
+        reg = ws_registry.worksheet_registry(self.ss)
+        reg.checked_at -= ws_registry._RECHECK_SEC + 1
+        self.ss._worksheets[1] = _FakeWorksheet("UNH (OA and GOAs)", 11, rows=2000)
+
+        fresh = ws_registry.worksheet_registry(self.ss)
+
+        self.assertIsNot(fresh, reg)
+        self.assertEqual(fresh.meta("UNH (OA and GOAs)").row_count, 2000)
+        self.assertIs(fresh.worksheet("UNH (OA and GOAs)"), self.ss._worksheets[1])
+
+
+if __name__ == "__main__":
+    unittest.main()